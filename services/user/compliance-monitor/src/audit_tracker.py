@@ -5,6 +5,7 @@ Tracks all audit events across healthcare services
 
 import asyncio
 import logging
+from collections.abc import Callable
 from datetime import datetime, timedelta
 from typing import Any
 from uuid import uuid4
@@ -37,6 +38,9 @@ class AuditTracker:
         self.event_buffer = []
         self.buffer_lock = asyncio.Lock()
 
+        # Optional batched writer with durable spill (see use_audit_writer)
+        self.audit_writer = None
+
         # Event categorization for compliance
         self.phi_related_events = {
             AuditEventType.PHI_ACCESS,
@@ -82,12 +86,15 @@ class AuditTracker:
         )
 
         # Add to buffer for batch processing
-        async with self.buffer_lock:
-            self.event_buffer.append(audit_event)
+        if self.audit_writer:
+            self.audit_writer.submit(audit_event.dict())
+        else:
+            async with self.buffer_lock:
+                self.event_buffer.append(audit_event)
 
-            # Flush if buffer is full
-            if len(self.event_buffer) >= self.batch_size:
-                await self._flush_events()
+                # Flush if buffer is full
+                if len(self.event_buffer) >= self.batch_size:
+                    await self._flush_events()
 
         # Handle critical events immediately
         if request.event_type in self.critical_events:
@@ -232,7 +239,45 @@ class AuditTracker:
             "format": format_type,
         }
 
+    async def use_audit_writer(self, writer_factory: Callable[..., Any], **options: Any):
+        """
+        Route events through a batched audit writer instead of the plain buffer
+
+        writer_factory is healthcare-api's BatchedAuditWriter (core/database/audit_writer.py,
+        standard library only) or anything with its constructor and
+        submit/start/close/get_metrics interface. Events are journaled to the
+        writer's spill_dir option until stored, so they survive storage outages
+        and restarts instead of only being re-buffered in memory.
+        """
+        self.audit_writer = writer_factory(
+            self._store_event_records,
+            name="compliance_audit_events",
+            batch_size=self.batch_size,
+            flush_interval_seconds=self.flush_interval_seconds,
+            **options,
+        )
+        await self.audit_writer.start()
+
+        # Hand over anything already buffered
+        async with self.buffer_lock:
+            for event in self.event_buffer:
+                self.audit_writer.submit(event.dict())
+            self.event_buffer.clear()
+        return self.audit_writer
+
+    async def close(self):
+        """Flush buffered events before shutdown"""
+        if self.audit_writer:
+            await self.audit_writer.close()
+        else:
+            async with self.buffer_lock:
+                await self._flush_events()
+
     # Internal methods
+    async def _store_event_records(self, records: list[dict[str, Any]]):
+        """Audit writer sink; rebuilds events from their journaled form"""
+        await self._store_events_batch([AuditEvent(**record) for record in records])
+
     async def _flush_events(self):
         """Flush events from buffer to storage"""
         if not self.event_buffer:
@@ -11,7 +11,7 @@ from typing import Any
 from src.healthcare_mcp.phi_detection import PHIDetectionResult
 
 from core.infrastructure.healthcare_logger import get_healthcare_logger, log_healthcare_event
-from core.phi_sanitizer import get_phi_detector, sanitize_text_content
+from core.phi_sanitizer import get_phi_detector
 
 
 class PHIRedactor:
@@ -83,24 +83,7 @@ class PHIRedactor:
         try:
             # Use existing PHI detector
             result = await self.phi_detector.detect_phi(text)
-
-            # Log PHI detection event for HIPAA audit
-            if result.phi_detected:
-                log_healthcare_event(
-                    self.logger,
-                    logging.WARNING,
-                    "PHI detected in document content",
-                    context={
-                        "phi_types": result.phi_types,
-                        "text_length": len(text),
-                        "detection_count": len(result.detection_details),
-                        "confidence_scores": result.confidence_scores,
-                        "administrative_detection": True,
-                    },
-                    operation_type="phi_detection",
-                    is_phi_related=True,
-                )
-
+            self._log_phi_detection(text, result)
             return result
 
         except Exception as e:
@@ -114,6 +97,55 @@ class PHIRedactor:
                 detection_details=[],
             )
 
+    def _log_phi_detection(self, text: str, result: PHIDetectionResult) -> None:
+        """Log PHI detection event for HIPAA audit"""
+        if result.phi_detected:
+            log_healthcare_event(
+                self.logger,
+                logging.WARNING,
+                "PHI detected in document content",
+                context={
+                    "phi_types": result.phi_types,
+                    "text_length": len(text),
+                    "detection_count": len(result.detection_details),
+                    "confidence_scores": result.confidence_scores,
+                    "administrative_detection": True,
+                },
+                operation_type="phi_detection",
+                is_phi_related=True,
+            )
+
+    def _complete_redaction(
+        self,
+        text: str,
+        phi_result: PHIDetectionResult,
+        redaction_level: str,
+    ) -> tuple[str, PHIDetectionResult]:
+        """Return the redacted text from a detection result and log the redaction"""
+        if not phi_result.phi_detected:
+            return text, phi_result
+
+        # The detector already masked every match; no second scan is needed
+        redacted_text = phi_result.masked_text
+
+        # Log redaction event
+        log_healthcare_event(
+            self.logger,
+            logging.INFO,
+            "PHI redaction completed",
+            context={
+                "redaction_level": redaction_level,
+                "phi_types": phi_result.phi_types,
+                "original_length": len(text),
+                "redacted_length": len(redacted_text),
+                "administrative_redaction": True,
+            },
+            operation_type="phi_redaction",
+            is_phi_related=True,
+        )
+
+        return redacted_text, phi_result
+
     async def redact_phi(
         self,
         text: str,
@@ -143,39 +175,7 @@ class PHIRedactor:
         try:
             # Analyze for PHI first
             phi_result = await self.analyze_phi(text)
-
-            if not phi_result.phi_detected:
-                return text, phi_result
-
-            # Apply redaction using existing sanitizer
-            redacted_text = sanitize_text_content(text)
-
-            # Create updated result with redacted text
-            updated_result = PHIDetectionResult(
-                phi_detected=phi_result.phi_detected,
-                phi_types=phi_result.phi_types,
-                confidence_scores=phi_result.confidence_scores,
-                masked_text=redacted_text,
-                detection_details=phi_result.detection_details,
-            )
-
-            # Log redaction event
-            log_healthcare_event(
-                self.logger,
-                logging.INFO,
-                "PHI redaction completed",
-                context={
-                    "redaction_level": redaction_level,
-                    "phi_types": phi_result.phi_types,
-                    "original_length": len(text),
-                    "redacted_length": len(redacted_text),
-                    "administrative_redaction": True,
-                },
-                operation_type="phi_redaction",
-                is_phi_related=True,
-            )
-
-            return redacted_text, updated_result
+            return self._complete_redaction(text, phi_result, redaction_level)
 
         except Exception as e:
             self.logger.exception(f"PHI redaction failed: {e}")
@@ -296,9 +296,25 @@ class PHIRedactor:
         """
         results = []
 
+        # Detect PHI in every non-empty text with one batch call
+        try:
+            batch_results = self.phi_detector.detect_phi_batch(
+                {str(i): text for i, text in enumerate(texts) if text and text.strip()},
+            )
+        except Exception as e:
+            self.logger.exception(f"Batch PHI detection failed, analyzing texts individually: {e}")
+            batch_results = None
+
         for i, text in enumerate(texts):
             try:
-                redacted_text, phi_result = await self.redact_phi(text, redaction_level)
+                if batch_results is not None and str(i) in batch_results:
+                    phi_result = batch_results[str(i)]
+                    self._log_phi_detection(text, phi_result)
+                    redacted_text, phi_result = self._complete_redaction(
+                        text, phi_result, redaction_level,
+                    )
+                else:
+                    redacted_text, phi_result = await self.redact_phi(text, redaction_level)
                 results.append((redacted_text, phi_result))
 
                 # Log batch progress
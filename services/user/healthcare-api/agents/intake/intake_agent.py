@@ -116,6 +116,8 @@ class VoiceIntakeProcessor:
                 "start_time": datetime.now(),
                 "form_data": {},
                 "transcription_buffer": [],
+                # Transcribed text not yet parsed for form fields
+                "pending_form_text": "",
                 "current_question": None,
                 "completion_percentage": 0.0,
                 "medical_terms_collected": [],
@@ -201,8 +203,14 @@ class VoiceIntakeProcessor:
                 "medical_terms": medical_terms,
             })
 
-            # Extract form field data from transcription
-            form_updates = await self._extract_form_data_from_speech(transcribed_text, session_data)
+            # Extract form field data once the text ends at a word or sentence
+            # boundary, so a phrase split across chunks is parsed whole
+            session_data["pending_form_text"] += transcribed_text
+            pending_text = session_data["pending_form_text"]
+            form_updates = {}
+            if pending_text[-1:].isspace() or pending_text[-1:] in (".", "!", "?"):
+                form_updates = await self._extract_form_data_from_speech(pending_text, session_data)
+                session_data["pending_form_text"] = ""
 
             # Update form data
             session_data["form_data"].update(form_updates)
@@ -397,6 +405,22 @@ class VoiceIntakeProcessor:
 
             session_data = self.active_voice_sessions[voice_session_id]
 
+            # Pick up the transcript tail held back for cross-chunk PHI scanning
+            tail = self.transcription_agent.finish_real_time_session(voice_session_id)
+            if tail["transcription"]:
+                session_data["transcription_buffer"].append({
+                    "text": tail["transcription"],
+                    "confidence": 0.0,
+                    "timestamp": datetime.now(),
+                    "medical_terms": [],
+                })
+            remaining_text = session_data["pending_form_text"] + tail["transcription"]
+            session_data["pending_form_text"] = ""
+            if remaining_text:
+                session_data["form_data"].update(
+                    await self._extract_form_data_from_speech(remaining_text, session_data),
+                )
+
             # Create final session summary
             session_summary = {
                 "voice_session_id": voice_session_id,
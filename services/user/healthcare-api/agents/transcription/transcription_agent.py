@@ -25,6 +25,10 @@ from core.infrastructure.healthcare_logger import (
     log_healthcare_event,
 )
 from core.infrastructure.phi_monitor import phi_monitor_decorator as phi_monitor, scan_for_phi
+from src.healthcare_mcp.incremental_phi_scanner import (
+    IncrementalPHIScanner,
+    create_transcript_scanner,
+)
 
 logger = get_healthcare_logger("agent.transcription")
 
@@ -111,6 +115,9 @@ class TranscriptionAgent(BaseHealthcareAgent):
             "quality_assurance",
         ]
 
+        # Per-session incremental PHI scanners for live transcription
+        self._transcript_scanners: dict[str, IncrementalPHIScanner] = {}
+
         # Initialize comprehensive medical terminology dictionary
         self.medical_terms = {
             # Vital signs and measurements
@@ -464,19 +471,20 @@ class TranscriptionAgent(BaseHealthcareAgent):
             )
 
             # Simulate real-time processing (in production, integrate with WhisperLive)
-            transcribed_chunk = await self._process_real_time_chunk(audio_chunk_data, audio_format)
+            raw_chunk = await self._process_real_time_chunk(audio_chunk_data, audio_format)
 
-            # Apply PHI detection to real-time transcript
-            phi_result = scan_for_phi(transcribed_chunk)
-            if phi_result.get("phi_detected", False):
-                # Apply PHI sanitization to real-time transcript
-                transcribed_chunk = self._sanitize_phi_in_transcript(transcribed_chunk)
+            # Redact PHI incrementally: only the new text and the boundary window are
+            # scanned, and text near the boundary is held back until the next chunk
+            scanner = self._get_transcript_scanner(session_id)
+            redactions_before = sum(scanner.phi_counts.values())
+            transcribed_chunk = scanner.feed(raw_chunk)
+            phi_detected = sum(scanner.phi_counts.values()) > redactions_before
 
             # Identify medical terms in the chunk
-            medical_terms = self._identify_medical_terms(transcribed_chunk)
+            medical_terms = self._identify_medical_terms(raw_chunk)
 
             # Calculate confidence score (simulated)
-            confidence_score = TRANSCRIPTION_CONFIG.quality.min_confidence_for_medical_terms + (len(transcribed_chunk) * TRANSCRIPTION_CONFIG.quality.confidence_boost_per_char)
+            confidence_score = TRANSCRIPTION_CONFIG.quality.min_confidence_for_medical_terms + (len(raw_chunk) * TRANSCRIPTION_CONFIG.quality.confidence_boost_per_char)
             confidence_score = min(confidence_score, TRANSCRIPTION_CONFIG.quality.max_confidence_cap)
 
             log_healthcare_event(
@@ -485,10 +493,11 @@ class TranscriptionAgent(BaseHealthcareAgent):
                 "Real-time transcription chunk completed",
                 context={
                     "session_id": session_id,
-                    "chunk_length": len(transcribed_chunk),
+                    "chunk_length": len(raw_chunk),
+                    "pending_length": scanner.pending_length,
                     "confidence": confidence_score,
                     "medical_terms_count": len(medical_terms),
-                    "phi_detected": phi_result.get("phi_detected", False),
+                    "phi_detected": phi_detected,
                 },
                 operation_type="real_time_chunk_completed",
             )
@@ -498,7 +507,7 @@ class TranscriptionAgent(BaseHealthcareAgent):
                 "confidence": confidence_score,
                 "medical_terms": medical_terms,
                 "session_id": session_id,
-                "phi_sanitized": phi_result.get("phi_detected", False),
+                "phi_sanitized": phi_detected,
                 "processing_timestamp": datetime.now().isoformat(),
             }
 
@@ -549,21 +558,37 @@ class TranscriptionAgent(BaseHealthcareAgent):
         import random
         return random.choice(chunk_templates)
 
-    def _sanitize_phi_in_transcript(self, transcript: str) -> str:
-        """Apply PHI sanitization to real-time transcript"""
+    def _new_transcript_scanner(self) -> IncrementalPHIScanner:
+        """Create a streaming PHI scanner with the transcript redaction labels"""
+        return create_transcript_scanner(TRANSCRIPTION_CONFIG.realtime.phi_boundary_window_chars)
 
-        # Simple PHI patterns for real-time sanitization
-        phi_patterns = {
-            r"\b\d{3}-\d{2}-\d{4}\b": "[SSN_REDACTED]",  # SSN
-            r"\b\d{10,11}\b": "[PHONE_REDACTED]",  # Phone numbers
-            r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b": "[EMAIL_REDACTED]",  # Email
-        }
+    def _get_transcript_scanner(self, session_id: str) -> IncrementalPHIScanner:
+        scanner = self._transcript_scanners.get(session_id)
+        if scanner is None:
+            scanner = self._transcript_scanners[session_id] = self._new_transcript_scanner()
+        return scanner
 
-        sanitized = transcript
-        for pattern, replacement in phi_patterns.items():
-            sanitized = re.sub(pattern, replacement, sanitized)
+    def finish_real_time_session(self, session_id: str) -> dict[str, Any]:
+        """
+        Release a live session's PHI scanner and return its held-back transcript tail
 
-        return sanitized
+        Real-time chunks lag the audio by up to the PHI boundary window; the
+        tail returned here completes the session transcript.
+        """
+        scanner = self._transcript_scanners.pop(session_id, None)
+        if scanner is None:
+            return {"transcription": "", "phi_counts": {}, "session_id": session_id}
+
+        return {
+            "transcription": scanner.flush(),
+            "phi_counts": dict(scanner.phi_counts),
+            "session_id": session_id,
+        }
+
+    def _sanitize_phi_in_transcript(self, transcript: str) -> str:
+        """Apply PHI sanitization to a complete transcript"""
+        scanner = self._new_transcript_scanner()
+        return scanner.feed(transcript) + scanner.flush()
 
     async def _generate_mock_transcription(self, encounter_type: str) -> str:
         """Generate mock transcription text based on encounter type"""
@@ -1223,6 +1248,19 @@ class TranscriptionAgent(BaseHealthcareAgent):
         temp_files = []
 
         try:
+            # End of a live session: emit the transcript tail held back for PHI scanning
+            if request.get("real_time") and request.get("end_session"):
+                session_id = request.get("session_id", "default")
+                result = self.finish_real_time_session(session_id)
+
+                return {
+                    "success": True,
+                    "transcription": result["transcription"],
+                    "phi_counts": result["phi_counts"],
+                    "session_id": session_id,
+                    "timestamp": datetime.now().isoformat(),
+                }
+
             # Check for real-time transcription request first
             if request.get("real_time") and "audio_data" in request:
                 # Process real-time audio chunk
@@ -1330,6 +1368,9 @@ class TranscriptionAgent(BaseHealthcareAgent):
             if transcription_temp_files:
                 await self._cleanup_temporary_files(transcription_temp_files)
 
+            # Drop streaming PHI state for sessions that never ended cleanly
+            self._transcript_scanners.clear()
+
             # Call parent cleanup for database connections
             await super().cleanup()
 
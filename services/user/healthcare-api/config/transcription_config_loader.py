@@ -67,6 +67,7 @@ class RealtimeConfig:
     batch_size: int
     enable_live_corrections: bool
     streaming_enabled: bool
+    phi_boundary_window_chars: int = 64
 
 
 @dataclass
@@ -277,6 +278,7 @@ def create_default_transcription_config() -> dict[str, Any]:
             "batch_size": 5,
             "enable_live_corrections": True,
             "streaming_enabled": True,
+            "phi_boundary_window_chars": 64,
         },
         "integration": {
             "soap_generation_enabled": True,
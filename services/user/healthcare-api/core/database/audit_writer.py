@@ -0,0 +1,490 @@
+"""
+Batched Audit Writer with Durable Local Spill
+Moves audit inserts off the query path into background batch flushes
+
+Every submitted record is first appended to a local journal segment, then
+queued in memory. A background task hands batches to an async sink (e.g.
+asyncpg ``copy_records_to_table``) when ``batch_size`` records are waiting or
+``flush_interval_seconds`` has passed. A segment file is deleted only after
+all of its records were delivered, so records survive a slow database, a
+failing sink or a process crash and are replayed on the next ``start()``.
+
+When the in-memory queue is full, new records stay in the journal only and
+are read back in order once the queue drains. Delivery is at-least-once: a
+crash between a successful flush and deleting its segment replays that batch.
+
+A batch that keeps failing is split in halves to find records the sink will
+never accept (e.g. a value too long for its column). Such records are moved
+to a ``<name>.rejected`` file next to the journal so the rest can be stored.
+Journal and rejected files hold raw audit records and are created readable
+by the owner only (0600).
+
+The module depends only on the standard library so other services (such as
+compliance-monitor's AuditTracker) can use it with their own sink.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, TextIO
+
+AuditRecord = dict[str, Any]
+AuditSink = Callable[[list[AuditRecord]], Awaitable[None]]
+PermanentErrorCheck = Callable[[Exception], bool]
+
+logger = logging.getLogger(__name__)
+
+# Journal and rejected files hold PHI access details
+_FILE_MODE = 0o600
+
+
+def _open_private(path: str, flags: int) -> int:
+    """``open`` opener that creates files readable and writable by the owner only"""
+    return os.open(path, flags, _FILE_MODE)
+
+
+def _encode_value(value: Any) -> Any:
+    """JSON encoder for journal lines; datetimes round-trip, anything else becomes str"""
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    if hasattr(value, "value"):  # Enum members
+        return value.value
+    return str(value)
+
+
+def _decode_value(obj: dict[str, Any]) -> Any:
+    if len(obj) == 1:
+        if "$datetime" in obj:
+            return datetime.fromisoformat(obj["$datetime"])
+        if "$date" in obj:
+            return date.fromisoformat(obj["$date"])
+    return obj
+
+
+@dataclass
+class _Segment:
+    """One journal file; records are delivered in file order"""
+
+    path: Path
+    handle: TextIO | None = None
+    written: int = 0
+    queued: int = 0  # leading records handed to the memory queue
+    delivered: int = 0
+
+    @property
+    def sealed(self) -> bool:
+        return self.handle is None
+
+
+class BatchedAuditWriter:
+    """Bounded in-memory audit queue with a background flush task and local spill"""
+
+    def __init__(
+        self,
+        sink: AuditSink,
+        *,
+        name: str = "audit",
+        batch_size: int = 500,
+        flush_interval_seconds: float = 1.0,
+        max_queue_size: int = 10_000,
+        spill_dir: str | Path | None = None,
+        segment_max_records: int = 5_000,
+        fsync: bool = False,
+        max_batch_failures: int = 3,
+        is_permanent_error: PermanentErrorCheck | None = None,
+    ):
+        """
+        Args:
+            sink: Async callable that durably stores a batch of records
+            name: Prefix for journal segment files
+            batch_size: Records per sink call; a full batch triggers a flush
+            flush_interval_seconds: Maximum delay before queued records are flushed
+            max_queue_size: Records held in memory; beyond it records wait on disk
+            spill_dir: Absolute journal directory; without one, records are only
+                held in memory and dropped once the queue is full. A relative path
+                is refused since it would depend on the working directory, and a
+                restart from elsewhere would not replay the journal.
+            segment_max_records: Records per journal segment before rotating
+            fsync: fsync the journal after each record (survives power loss,
+                not only process crashes)
+            max_batch_failures: Consecutive failed flushes before the batch is
+                split to isolate records the sink rejects
+            is_permanent_error: Whether a sink error means the record itself is
+                invalid; without it, a single record is rejected only when other
+                records of its batch could be stored
+        """
+        if batch_size < 1 or max_queue_size < batch_size:
+            msg = "batch_size must be positive and no larger than max_queue_size"
+            raise ValueError(msg)
+        if spill_dir and not Path(spill_dir).is_absolute():
+            msg = f"spill_dir must be an absolute path, got {spill_dir!r}"
+            raise ValueError(msg)
+
+        self.sink = sink
+        self.name = name
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_queue_size = max_queue_size
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.segment_max_records = segment_max_records
+        self.fsync = fsync
+        self.max_batch_failures = max(1, max_batch_failures)
+        self.is_permanent_error = is_permanent_error
+
+        self._queue: deque[tuple[_Segment | None, AuditRecord]] = deque()
+        self._segments: deque[_Segment] = deque()
+        self._next_segment = 0
+        # While records wait on disk, new ones must queue behind them
+        self._spilling = False
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._closed = False
+        self._consecutive_failures = 0
+
+        # Metrics
+        self.submitted_records = 0
+        self.flushed_records = 0
+        self.spilled_records = 0
+        self.replayed_records = 0
+        self.dropped_records = 0
+        self.rejected_records = 0
+        self.flush_count = 0
+        self.failed_flushes = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+        self.last_error: str | None = None
+
+        if self.spill_dir:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            self._recover_segments()
+
+    async def start(self) -> None:
+        """Start the background flush task"""
+        if self._task is None or self._task.done():
+            self._closed = False
+            self._task = asyncio.create_task(self._run(), name=f"{self.name}-audit-writer")
+
+    def submit(self, record: AuditRecord) -> None:
+        """
+        Journal and enqueue one audit record without waiting for the sink
+
+        Raises:
+            RuntimeError: If the writer has been closed
+        """
+        if self._closed:
+            msg = f"{self.name} audit writer is closed"
+            raise RuntimeError(msg)
+
+        self.submitted_records += 1
+        segment = self._journal(record) if self.spill_dir else None
+
+        if self._spilling or len(self._queue) >= self.max_queue_size:
+            if segment is None:
+                self.dropped_records += 1
+                logger.error(f"{self.name} audit queue full without spill directory; record dropped")
+                return
+            self._spilling = True
+            self.spilled_records += 1
+        else:
+            self._queue.append((segment, record))
+            if segment:
+                segment.queued += 1
+
+        if len(self._queue) >= self.batch_size:
+            self._wake.set()
+
+    async def flush(self) -> int:
+        """
+        Deliver everything currently pending, including records waiting on disk
+
+        Returns:
+            Number of records delivered or rejected; stops early if the sink fails
+        """
+        delivered = 0
+        async with self._flush_lock:
+            while True:
+                if self._spilling:
+                    self._refill_from_disk()
+                if not self._queue:
+                    break
+                count = await self._deliver_batch()
+                if not count:
+                    break
+                delivered += count
+        return delivered
+
+    async def close(self) -> None:
+        """Stop the flush task after a final flush; undelivered records stay on disk"""
+        self._closed = True
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+        await self.flush()
+        for segment in self._segments:
+            self._seal(segment)
+
+        pending = self.pending_records
+        if pending:
+            if self.spill_dir:
+                logger.warning(f"{self.name} audit writer closed with {pending} records left in {self.spill_dir}")
+            else:
+                logger.error(f"{self.name} audit writer closed with {pending} undelivered records")
+
+    @property
+    def queue_depth(self) -> int:
+        """Records held in memory"""
+        return len(self._queue)
+
+    @property
+    def pending_records(self) -> int:
+        """Records not yet delivered, in memory or on disk"""
+        if not self.spill_dir:
+            return len(self._queue)
+        return sum(segment.written - segment.delivered for segment in self._segments)
+
+    @property
+    def rejected_path(self) -> Path | None:
+        """File that collects records the sink refused, when spilling"""
+        return self.spill_dir / f"{self.name}.rejected" if self.spill_dir else None
+
+    @property
+    def rejected_file_bytes(self) -> int:
+        """Size of the rejected file; it is never truncated, so alert on growth"""
+        if self.rejected_path is None:
+            return 0
+        try:
+            return self.rejected_path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Queue depth, backlog and flush latency for monitoring"""
+        return {
+            "queue_depth": self.queue_depth,
+            "pending_records": self.pending_records,
+            "spill_segments": len(self._segments),
+            "spilling": self._spilling,
+            "submitted_records": self.submitted_records,
+            "flushed_records": self.flushed_records,
+            "spilled_records": self.spilled_records,
+            "replayed_records": self.replayed_records,
+            "dropped_records": self.dropped_records,
+            "rejected_records": self.rejected_records,
+            "rejected_file_bytes": self.rejected_file_bytes,
+            "flush_count": self.flush_count,
+            "failed_flushes": self.failed_flushes,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "avg_flush_ms": round(self._total_flush_ms / self.flush_count, 3) if self.flush_count else 0.0,
+            "max_flush_ms": round(self.max_flush_ms, 3),
+            "last_error": self.last_error,
+        }
+
+    async def _run(self) -> None:
+        # Checking _closed as well as cancelling: wait_for can swallow a
+        # cancellation that races with the wake event
+        while not self._closed:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval_seconds)
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception(f"{self.name} audit flush loop error")
+
+    async def _deliver_batch(self) -> int:
+        # Seal the active segment so it can be deleted once delivered
+        if self._segments and not self._segments[-1].sealed:
+            self._seal(self._segments[-1])
+
+        count = min(self.batch_size, len(self._queue))
+        batch = [self._queue[index] for index in range(count)]
+
+        start = time.perf_counter()
+        try:
+            await self.sink([record for _, record in batch])
+        except Exception as e:
+            self.failed_flushes += 1
+            self.last_error = str(e)
+            self._consecutive_failures += 1
+            if self._consecutive_failures < self.max_batch_failures:
+                logger.warning(f"{self.name} audit flush of {count} records failed, will retry: {e}")
+                return 0
+            logger.warning(
+                f"{self.name} audit flush of {count} records failed {self._consecutive_failures} "
+                f"times, isolating rejected records: {e}",
+            )
+            self._consecutive_failures = 0
+            return await self._isolate_batch(batch, e)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        self._consecutive_failures = 0
+        self._complete(batch, set(range(count)))
+
+        self.flush_count += 1
+        self.flushed_records += count
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        self._total_flush_ms += elapsed_ms
+        return count
+
+    async def _isolate_batch(self, batch: list[tuple[_Segment | None, AuditRecord]], error: Exception) -> int:
+        """
+        Deliver a repeatedly failing batch in halves and reject the records that
+        fail on their own
+
+        Stops without rejecting anything when a single record fails, nothing has
+        been stored yet and the error is not known to be permanent: that looks
+        like the sink being down rather than a bad record.
+
+        Returns:
+            Number of records delivered or rejected
+        """
+        delivered: set[int] = set()
+        rejected: list[tuple[int, Exception]] = []
+        failed = [(range(len(batch)), error)]
+        while failed:
+            indexes, exc = failed.pop()
+            if len(indexes) == 1:
+                permanent = self.is_permanent_error is not None and self.is_permanent_error(exc)
+                if not (delivered or permanent):
+                    break
+                rejected.append((indexes[0], exc))
+                continue
+            middle = len(indexes) // 2
+            for half in (indexes[middle:], indexes[:middle]):
+                try:
+                    await self.sink([batch[index][1] for index in half])
+                except Exception as e:
+                    failed.append((half, e))
+                else:
+                    delivered.update(half)
+
+        if rejected:
+            self._reject([(batch[index][1], exc) for index, exc in sorted(rejected, key=lambda item: item[0])])
+        self.flushed_records += len(delivered)
+        done = delivered | {index for index, _ in rejected}
+        self._complete(batch, done)
+        return len(done)
+
+    def _complete(self, batch: list[tuple[_Segment | None, AuditRecord]], done: set[int]) -> None:
+        """Drop delivered or rejected records from the front of the queue; keep the rest in order"""
+        for _ in batch:
+            self._queue.popleft()
+        for index in reversed(range(len(batch))):
+            if index not in done:
+                self._queue.appendleft(batch[index])
+        for index in done:
+            segment = batch[index][0]
+            if segment:
+                segment.delivered += 1
+        while self._segments and self._segments[0].sealed and (
+            self._segments[0].delivered == self._segments[0].written
+        ):
+            self._segments.popleft().path.unlink(missing_ok=True)
+
+    def _reject(self, records: list[tuple[AuditRecord, Exception]]) -> None:
+        """Keep records the sink refuses out of the queue, in the rejected file when spilling"""
+        self.rejected_records += len(records)
+        if not self.spill_dir:
+            logger.error(f"{self.name} audit sink rejected {len(records)} records; dropped: {records[0][1]}")
+            return
+        path = self.rejected_path
+        with open(path, "a", encoding="utf-8", opener=_open_private) as f:
+            for record, exc in records:
+                f.write(json.dumps({"error": str(exc), "record": record}, default=_encode_value) + "\n")
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        logger.error(f"{self.name} audit sink rejected {len(records)} records, moved to {path}: {records[0][1]}")
+
+    def _journal(self, record: AuditRecord) -> _Segment:
+        segment = self._segments[-1] if self._segments else None
+        if segment is None or segment.sealed or segment.written >= self.segment_max_records:
+            if segment and not segment.sealed:
+                self._seal(segment)
+            segment = self._open_segment()
+
+        segment.handle.write(json.dumps(record, default=_encode_value) + "\n")
+        segment.handle.flush()
+        if self.fsync:
+            os.fsync(segment.handle.fileno())
+        segment.written += 1
+        return segment
+
+    def _open_segment(self) -> _Segment:
+        path = self.spill_dir / f"{self.name}-{self._next_segment:010d}.jsonl"
+        self._next_segment += 1
+        # Stays open for appends until _seal closes it
+        handle = open(path, "a", encoding="utf-8", opener=_open_private)  # noqa: SIM115
+        segment = _Segment(path=path, handle=handle)
+        self._segments.append(segment)
+        return segment
+
+    def _seal(self, segment: _Segment) -> None:
+        if segment.handle:
+            segment.handle.close()
+            segment.handle = None
+
+    def _read_segment(self, path: Path) -> list[AuditRecord]:
+        records = []
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # torn write from a crash
+                try:
+                    records.append(json.loads(line, object_hook=_decode_value))
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping unreadable audit journal line in {path.name}")
+        return records
+
+    def _recover_segments(self) -> None:
+        """Adopt segments left by a previous process; their records are replayed first"""
+        for path in sorted(self.spill_dir.glob(f"{self.name}-*.jsonl")):
+            written = len(self._read_segment(path))
+            if not written:
+                path.unlink(missing_ok=True)
+                continue
+            self._segments.append(_Segment(path=path, written=written))
+            self._next_segment = max(self._next_segment, int(path.stem.rsplit("-", 1)[-1]) + 1)
+
+        if self._segments:
+            self._spilling = True
+            pending = self.pending_records
+            logger.warning(f"Recovered {pending} undelivered {self.name} audit records from {self.spill_dir}")
+
+    def _refill_from_disk(self) -> None:
+        """Move disk-only records into the memory queue in journal order"""
+        room = self.max_queue_size - len(self._queue)
+        for segment in self._segments:
+            if segment.queued == segment.written:
+                continue
+            if room <= 0:
+                return
+            # New submissions go to a fresh segment from here on
+            self._seal(segment)
+            records = self._read_segment(segment.path)
+            # Unreadable lines are skipped; count them as delivered
+            segment.written = len(records)
+            take = records[segment.queued : segment.queued + room]
+            self._queue.extend((segment, record) for record in take)
+            segment.queued += len(take)
+            self.replayed_records += len(take)
+            room -= len(take)
+            if segment.queued < segment.written:
+                return
+        self._spilling = False
@@ -74,6 +74,7 @@ class MedicalDatabaseAccess:
                 query,
                 max_results,
                 database=DatabaseType.PUBLIC,
+                prepared=True,
                 tables=["pubmed_articles"],
             )
 
@@ -144,6 +145,7 @@ class MedicalDatabaseAccess:
                 query,
                 max_results,
                 database=DatabaseType.PUBLIC,
+                prepared=True,
                 tables=["clinical_trials"],
             )
 
@@ -230,6 +232,7 @@ class MedicalDatabaseAccess:
                 query,
                 max_results,
                 database=DatabaseType.PUBLIC,
+                prepared=True,
                 tables=["fda_drugs"],
             )
 
@@ -297,6 +300,7 @@ class MedicalDatabaseAccess:
                 query,
                 max_results,
                 database=DatabaseType.PUBLIC,
+                prepared=True,
                 tables=["health_topics"],
             )
 
@@ -369,6 +373,7 @@ class MedicalDatabaseAccess:
                 query,
                 max_results,
                 database=DatabaseType.PUBLIC,
+                prepared=True,
                 tables=["food_items"],
             )
 
@@ -450,7 +455,7 @@ class MedicalDatabaseAccess:
                 params.append(equipment)
 
             param_count += 1
-            params.append(str(max_results))
+            params.append(max_results)
 
             # Search exercises with actual schema
             search_sql = f"""
@@ -466,7 +471,7 @@ class MedicalDatabaseAccess:
             """
 
             rows = await db_manager.fetch(
-                search_sql, *params, database=DatabaseType.PUBLIC, tables=["exercises"],
+                search_sql, *params, database=DatabaseType.PUBLIC, prepared=True, tables=["exercises"],
             )
 
             exercises = []
@@ -523,7 +528,7 @@ class MedicalDatabaseAccess:
                     LIMIT 1
                 """
                 rows = await db_manager.fetch(
-                    search_sql, query.upper(), database=DatabaseType.PUBLIC, tables=["icd10_codes"],
+                    search_sql, query.upper(), database=DatabaseType.PUBLIC, prepared=True, tables=["icd10_codes"],
                 )
             else:
                 # Full-text search
@@ -542,6 +547,7 @@ class MedicalDatabaseAccess:
                     query,
                     max_results,
                     database=DatabaseType.PUBLIC,
+                    prepared=True,
                     tables=["icd10_codes"],
                 )
 
@@ -597,7 +603,7 @@ class MedicalDatabaseAccess:
                 params.append(code_type.upper())
 
             param_count += 1
-            params.append(str(max_results))
+            params.append(max_results)
 
             # Search billing codes with actual schema
             search_sql = f"""
@@ -612,7 +618,7 @@ class MedicalDatabaseAccess:
             """
 
             rows = await db_manager.fetch(
-                search_sql, *params, database=DatabaseType.PUBLIC, tables=["billing_codes"],
+                search_sql, *params, database=DatabaseType.PUBLIC, prepared=True, tables=["billing_codes"],
             )
 
             codes = []
@@ -6,15 +6,22 @@ Manages connections to both public and private databases with proper security co
 import asyncio
 import hashlib
 import os
+import re
+import time
+from collections import OrderedDict
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+from pathlib import Path
 from typing import Any
 
 import asyncpg
 import yaml
+from asyncpg.prepared_stmt import PreparedStatement
 from cryptography.fernet import Fernet
 
+from core.database.audit_writer import AuditRecord, BatchedAuditWriter
 from core.infrastructure.healthcare_logger import get_healthcare_logger
 from core.infrastructure.phi_detector import PHIDetector
 
@@ -35,6 +42,104 @@ class QueryType(Enum):
     TRANSACTION = "TRANSACTION"
 
 
+@dataclass(frozen=True)
+class QueryRoute:
+    """Routing and audit classification of one SQL text, cached by the manager"""
+    database: DatabaseType
+    query_type: QueryType
+    tables: tuple[str, ...]
+    label: str  # Statement key for latency stats: type, tables, query hash
+
+
+# Table names following FROM/JOIN/INTO/UPDATE/TABLE, for QueryRoute.tables
+_TABLE_REFERENCE = re.compile(r"\b(?:from|join|into|update|table)\s+([a-z_][a-z0-9_.]*)")
+
+
+class StatementLatencyHistogram:
+    """Latency histogram for one statement, in milliseconds"""
+
+    BUCKETS_MS = (1.0, 2.5, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0, float("inf"))
+
+    def __init__(self):
+        self.bucket_counts = [0 for _ in self.BUCKETS_MS]
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, elapsed_ms: float):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        # Increment first bucket whose upper bound >= duration
+        for i, upper in enumerate(self.BUCKETS_MS):
+            if elapsed_ms <= upper:
+                self.bucket_counts[i] += 1
+                break
+
+    def as_dict(self) -> dict[str, Any]:
+        """Count, mean, max and cumulative (Prometheus-style) bucket counts"""
+        buckets = {}
+        cumulative = 0
+        for upper, count in zip(self.BUCKETS_MS, self.bucket_counts, strict=True):
+            cumulative += count
+            buckets["+Inf" if upper == float("inf") else f"{upper:g}"] = cumulative
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "buckets_ms": buckets,
+        }
+
+
+class HotStatementConnection(asyncpg.Connection):
+    """
+    Pool connection that keeps explicit prepared statements for hot queries
+
+    asyncpg's implicit statement cache is shared with every ad-hoc query on the
+    connection, so churn from dynamic SQL can evict the search queries that run
+    most often. Statements prepared here stay pinned until this connection's
+    own limit is reached.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.hot_statements: OrderedDict[str, PreparedStatement] = OrderedDict()
+
+    async def prepare_hot(self, query: str, limit: int) -> PreparedStatement:
+        """Prepared statement for query, prepared on first use on this connection"""
+        statement = self.hot_statements.get(query)
+        if statement is not None:
+            self.hot_statements.move_to_end(query)
+            return statement
+
+        statement = await self.prepare(query)
+        self.hot_statements[query] = statement
+        while len(self.hot_statements) > limit:
+            self.hot_statements.popitem(last=False)
+        return statement
+
+    def drop_hot(self, query: str):
+        self.hot_statements.pop(query, None)
+
+
+# phi_access_audit columns written by the batched audit writer
+PHI_AUDIT_COLUMNS = (
+    "table_name",
+    "operation",
+    "user_id",
+    "accessed_at",
+    "query_hash",
+    "session_id",
+    "success",
+    "error_message",
+)
+
+
+def _is_invalid_audit_row(error: Exception) -> bool:
+    """Errors caused by the audit row itself, which no retry will fix"""
+    return isinstance(error, (asyncpg.DataError, asyncpg.IntegrityConstraintViolationError))
+
+
 class SecureDatabaseManager:
     """
     Manages secure connections to public and private databases
@@ -67,6 +172,19 @@ class SecureDatabaseManager:
         self.phi_tables = set(self.config.get("routing", {}).get("phi_tables", []))
         self.public_tables = set(self.config.get("routing", {}).get("public_tables", []))
 
+        # PHI access audit rows are batched off the query path
+        self.audit_writer = self._create_audit_writer()
+
+        # Memoized routing, prepared hot statements and per-statement latency
+        query_cache_config = self.config.get("query_cache", {})
+        self.route_cache_size = query_cache_config.get("route_cache_size", 1024)
+        self.max_prepared_statements = query_cache_config.get("prepared_statements_per_connection", 64)
+        self.latency_stats_size = query_cache_config.get("latency_histogram_statements", 256)
+        self._route_cache: OrderedDict[str, QueryRoute] = OrderedDict()
+        self.route_cache_hits = 0
+        self.route_cache_misses = 0
+        self.statement_latency: OrderedDict[str, StatementLatencyHistogram] = OrderedDict()
+
     def _load_config(self) -> dict[str, Any]:
         """Load database configuration from YAML file"""
         try:
@@ -96,6 +214,40 @@ class SecureDatabaseManager:
 
         return Fernet(key.encode() if isinstance(key, str) else key)
 
+    def _create_audit_writer(self) -> BatchedAuditWriter:
+        """Create the batched phi_access_audit writer with its local spill directory"""
+        writer_config = self.config.get("security", {}).get("audit_writer", {})
+        # AUDIT_SPILL_DIR must be absolute; a configured relative spill_dir is
+        # taken relative to the healthcare-api directory, not the working directory
+        spill_dir = os.getenv("AUDIT_SPILL_DIR") or (
+            Path(__file__).resolve().parents[2] / writer_config.get("spill_dir", "logs/audit_spill")
+        )
+        return BatchedAuditWriter(
+            self._write_audit_batch,
+            name="phi_access_audit",
+            batch_size=writer_config.get("batch_size", 500),
+            flush_interval_seconds=writer_config.get("flush_interval_seconds", 1.0),
+            max_queue_size=writer_config.get("max_queue_size", 10_000),
+            spill_dir=spill_dir,
+            fsync=writer_config.get("fsync", False),
+            max_batch_failures=writer_config.get("max_batch_failures", 3),
+            is_permanent_error=_is_invalid_audit_row,
+        )
+
+    async def _write_audit_batch(self, records: list[AuditRecord]) -> None:
+        """Store a batch of audit records with a single COPY into phi_access_audit"""
+        if not self.private_pool:
+            msg = "private database pool not initialized"
+            raise RuntimeError(msg)
+
+        rows = [tuple(record[column] for column in PHI_AUDIT_COLUMNS) for record in records]
+        async with self.private_pool.acquire() as conn:
+            await conn.copy_records_to_table(
+                "phi_access_audit",
+                records=rows,
+                columns=PHI_AUDIT_COLUMNS,
+            )
+
     async def initialize(self):
         """Initialize database connection pools"""
         try:
@@ -110,6 +262,7 @@ class SecureDatabaseManager:
                 min_size=public_config.get("min_pool_size", 5),
                 max_size=public_config.get("max_pool_size", 50),
                 command_timeout=public_config.get("timeout", 30),
+                connection_class=HotStatementConnection,
                 ssl=None,  # Disable SSL for local development
             )
 
@@ -124,6 +277,7 @@ class SecureDatabaseManager:
                 min_size=private_config.get("min_pool_size", 2),
                 max_size=private_config.get("max_pool_size", 25),
                 command_timeout=private_config.get("timeout", 30),
+                connection_class=HotStatementConnection,
                 ssl=None,  # Disable SSL for local development (enable in production)
             )
 
@@ -132,6 +286,9 @@ class SecureDatabaseManager:
             # Test connections
             await self._test_connections()
 
+            # Replays audit records spilled by a previous process
+            await self.audit_writer.start()
+
         except Exception as e:
             self.logger.exception(f"Failed to initialize database pools: {e}")
             raise
@@ -156,7 +313,8 @@ class SecureDatabaseManager:
             raise
 
     async def close(self):
-        """Close database connection pools"""
+        """Flush pending audit records and close database connection pools"""
+        await self.audit_writer.close()
         if self.public_pool:
             await self.public_pool.close()
         if self.private_pool:
@@ -174,30 +332,54 @@ class SecureDatabaseManager:
         Returns:
             DatabaseType indicating which database to use
         """
+        return self._route_database(self._route_query(query), tables)
+
+    def _route_database(self, route: QueryRoute, tables: list[str] = None) -> DatabaseType:
         # If tables are explicitly provided, check them
         if tables:
             for table in tables:
                 if table.lower() in self.phi_tables:
                     return DatabaseType.PRIVATE
 
+        return route.database
+
+    def _classify_query(self, query: str) -> QueryType:
+        """Classify the type of query for auditing"""
+        return self._route_query(query).query_type
+
+    def _route_query(self, query: str) -> QueryRoute:
+        """Cached routing for a SQL text; the same statements repeat on every request"""
+        route = self._route_cache.get(query)
+        if route is not None:
+            self._route_cache.move_to_end(query)
+            self.route_cache_hits += 1
+            return route
+
+        self.route_cache_misses += 1
+        route = self._build_route(query)
+        self._route_cache[query] = route
+        while len(self._route_cache) > self.route_cache_size:
+            self._route_cache.popitem(last=False)
+        return route
+
+    def _build_route(self, query: str) -> QueryRoute:
         # Parse query to find table names
         query_lower = query.lower()
 
-        # Check for PHI tables in query
-        for phi_table in self.phi_tables:
-            if phi_table.lower() in query_lower:
-                return DatabaseType.PRIVATE
+        # Any PHI table mentioned in the query routes to the private database;
+        # everything else, including unknown tables, stays public (no PHI
+        # access by default)
+        phi_tables = [table for table in sorted(self.phi_tables) if table.lower() in query_lower]
+        public_tables = [table for table in sorted(self.public_tables) if table.lower() in query_lower]
+        database = DatabaseType.PRIVATE if phi_tables else DatabaseType.PUBLIC
 
-        # Check for explicit public tables
-        for public_table in self.public_tables:
-            if public_table.lower() in query_lower:
-                return DatabaseType.PUBLIC
+        query_type = self._parse_query_type(query)
+        tables = tuple(dict.fromkeys(phi_tables + public_tables + _TABLE_REFERENCE.findall(query_lower)))
+        label = f"{query_type.value} {','.join(tables) or '-'} {hashlib.sha256(query.encode()).hexdigest()[:8]}"
+        return QueryRoute(database, query_type, tables, label)
 
-        # Default to public for safety (no PHI access by default)
-        return DatabaseType.PUBLIC
-
-    def _classify_query(self, query: str) -> QueryType:
-        """Classify the type of query for auditing"""
+    @staticmethod
+    def _parse_query_type(query: str) -> QueryType:
         query_upper = query.strip().upper()
 
         if query_upper.startswith("SELECT"):
@@ -214,6 +396,58 @@ class SecureDatabaseManager:
             return QueryType.TRANSACTION
         return QueryType.SELECT  # Default
 
+    async def _run_query(
+        self,
+        conn: asyncpg.Connection,
+        method: str,
+        query: str,
+        params: tuple[Any, ...],
+        label: str,
+        prepared: bool = False,
+        timeout: float = None,
+        **kwargs,
+    ) -> Any:
+        """Run conn.<method> (or a pinned prepared statement) and record its latency under label
+
+        Failed and timed-out queries are recorded too, so slow errors show up in the histogram.
+        """
+        start = time.perf_counter()
+        try:
+            if prepared and hasattr(conn, "prepare_hot"):
+                call = self._run_prepared(conn, method, query, params, **kwargs)
+            else:
+                call = getattr(conn, method)(query, *params, **kwargs)
+            return await asyncio.wait_for(call, timeout=timeout) if timeout else await call
+        finally:
+            self._observe_latency(label, (time.perf_counter() - start) * 1000)
+
+    async def _run_prepared(
+        self,
+        conn: HotStatementConnection,
+        method: str,
+        query: str,
+        params: tuple[Any, ...],
+        **kwargs,
+    ) -> Any:
+        statement = await conn.prepare_hot(query, self.max_prepared_statements)
+        try:
+            return await getattr(statement, method)(*params, **kwargs)
+        except (asyncpg.exceptions.InvalidCachedStatementError, asyncpg.exceptions.OutdatedSchemaCacheError):
+            # Schema changed under the statement; prepare it again once
+            conn.drop_hot(query)
+            statement = await conn.prepare_hot(query, self.max_prepared_statements)
+            return await getattr(statement, method)(*params, **kwargs)
+
+    def _observe_latency(self, label: str, elapsed_ms: float):
+        histogram = self.statement_latency.get(label)
+        if histogram is None:
+            histogram = self.statement_latency[label] = StatementLatencyHistogram()
+            while len(self.statement_latency) > self.latency_stats_size:
+                self.statement_latency.popitem(last=False)
+        else:
+            self.statement_latency.move_to_end(label)
+        histogram.observe(elapsed_ms)
+
     async def _audit_query(
         self,
         database: DatabaseType,
@@ -224,6 +458,7 @@ class SecureDatabaseManager:
         success: bool = True,
         error: str = None,
         rows_affected: int = None,
+        route: QueryRoute = None,
     ):
         """Log query execution for audit purposes"""
         if not self.audit_enabled:
@@ -234,8 +469,9 @@ class SecureDatabaseManager:
             return
 
         try:
+            timestamp = datetime.utcnow()
             audit_data = {
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": timestamp.isoformat(),
                 "database": database.value,
                 "query_type": query_type.value,
                 "user_id": user_id or "system",
@@ -246,17 +482,24 @@ class SecureDatabaseManager:
                 "rows_affected": rows_affected,
             }
 
-            # Log to audit system (could be database, file, or external service)
+            # Queue for the phi_access_audit table; the writer flushes in batches
             if database == DatabaseType.PRIVATE:
-                # Store in phi_access_audit table
-                async with self.private_pool.acquire() as conn:
-                    await conn.execute("""
-                        INSERT INTO phi_access_audit
-                        (user_id, session_id, access_type, query_hash,
-                         success, error_message, rows_affected)
-                        VALUES ($1, $2, $3, $4, $5, $6, $7)
-                    """, user_id or "system", session_id, query_type.value,
-                    audit_data["query_hash"], success, error, rows_affected)
+                self.audit_writer.submit({
+                    "table_name": self._audit_table_name(route or self._route_query(query)),
+                    # BEGIN/COMMIT/ROLLBACK rather than TRANSACTION, which
+                    # does not fit the VARCHAR(10) column
+                    "operation": (
+                        query.split(None, 1)[0].upper()
+                        if query_type == QueryType.TRANSACTION
+                        else query_type.value
+                    ),
+                    "user_id": audit_data["user_id"],
+                    "accessed_at": timestamp,
+                    "query_hash": audit_data["query_hash"],
+                    "session_id": session_id,
+                    "success": success,
+                    "error_message": error,
+                })
 
             # Also log to application logs
             if success:
@@ -267,6 +510,13 @@ class SecureDatabaseManager:
         except Exception as e:
             self.logger.exception(f"Failed to audit query: {e}")
 
+    def _audit_table_name(self, route: QueryRoute) -> str:
+        """PHI table referenced by the query, for the audit row's table_name"""
+        for table in route.tables:
+            if table in self.phi_tables:
+                return table
+        return "unknown"
+
     def _sanitize_params(self, params: tuple[Any, ...]) -> tuple[Any, ...]:
         """
         Sanitize parameters to remove potential PHI before logging
@@ -369,9 +619,10 @@ class SecureDatabaseManager:
         Returns:
             Query result status
         """
-        # Determine database if not specified
+        # Route once; database, audit table and latency label all come from it
+        route = self._route_query(query)
         if database is None:
-            database = self._determine_database(query, tables)
+            database = self._route_database(route, tables)
 
         # Select appropriate pool
         pool = self.private_pool if database == DatabaseType.PRIVATE else self.public_pool
@@ -380,21 +631,16 @@ class SecureDatabaseManager:
             msg = f"{database.value} database pool not initialized"
             raise RuntimeError(msg)
 
-        # Classify query type
-        query_type = self._classify_query(query)
+        query_type = route.query_type
 
         # Sanitize parameters for logging
         safe_params = self._sanitize_params(params)
 
         try:
             async with pool.acquire() as conn:
-                if timeout:
-                    result = await asyncio.wait_for(
-                        conn.execute(query, *params),
-                        timeout=timeout,
-                    )
-                else:
-                    result = await conn.execute(query, *params)
+                result = await self._run_query(
+                    conn, "execute", query, params, route.label, timeout=timeout,
+                )
 
                 # Extract rows affected
                 rows_affected = int(result.split()[-1]) if result else None
@@ -402,7 +648,7 @@ class SecureDatabaseManager:
                 # Audit successful query
                 await self._audit_query(
                     database, query, query_type, user_id, session_id,
-                    rows_affected=rows_affected,
+                    rows_affected=rows_affected, route=route,
                 )
 
                 self.logger.debug(
@@ -416,13 +662,13 @@ class SecureDatabaseManager:
             error = f"Query timeout after {timeout} seconds"
             await self._audit_query(
                 database, query, query_type, user_id, session_id,
-                success=False, error=error,
+                success=False, error=error, route=route,
             )
             raise
         except Exception as e:
             await self._audit_query(
                 database, query, query_type, user_id, session_id,
-                success=False, error=str(e),
+                success=False, error=str(e), route=route,
             )
             self.logger.exception(
                 f"Query execution failed: {e}",
@@ -439,6 +685,7 @@ class SecureDatabaseManager:
         user_id: str = None,
         session_id: str = None,
         timeout: float = None,
+        prepared: bool = False,
     ) -> list[asyncpg.Record]:
         """
         Fetch multiple rows from the appropriate database
@@ -451,13 +698,16 @@ class SecureDatabaseManager:
             user_id: User ID for audit logging
             session_id: Session ID for audit logging
             timeout: Query timeout in seconds
+            prepared: Run through a prepared statement kept on the pool
+                connection; for hot queries with fixed SQL text
 
         Returns:
             List of records
         """
-        # Determine database if not specified
+        # Route once; database, audit table and latency label all come from it
+        route = self._route_query(query)
         if database is None:
-            database = self._determine_database(query, tables)
+            database = self._route_database(route, tables)
 
         # Select appropriate pool
         pool = self.private_pool if database == DatabaseType.PRIVATE else self.public_pool
@@ -471,18 +721,14 @@ class SecureDatabaseManager:
 
         try:
             async with pool.acquire() as conn:
-                if timeout:
-                    rows = await asyncio.wait_for(
-                        conn.fetch(query, *params),
-                        timeout=timeout,
-                    )
-                else:
-                    rows = await conn.fetch(query, *params)
+                rows = await self._run_query(
+                    conn, "fetch", query, params, route.label, prepared, timeout,
+                )
 
                 # Audit successful query
                 await self._audit_query(
                     database, query, QueryType.SELECT, user_id, session_id,
-                    rows_affected=len(rows),
+                    rows_affected=len(rows), route=route,
                 )
 
                 self.logger.debug(
@@ -496,13 +742,13 @@ class SecureDatabaseManager:
             error = f"Query timeout after {timeout} seconds"
             await self._audit_query(
                 database, query, QueryType.SELECT, user_id, session_id,
-                success=False, error=error,
+                success=False, error=error, route=route,
             )
             raise
         except Exception as e:
             await self._audit_query(
                 database, query, QueryType.SELECT, user_id, session_id,
-                success=False, error=str(e),
+                success=False, error=str(e), route=route,
             )
             self.logger.exception(
                 f"Query fetch failed: {e}",
@@ -519,6 +765,7 @@ class SecureDatabaseManager:
         user_id: str = None,
         session_id: str = None,
         timeout: float = None,
+        prepared: bool = False,
     ) -> asyncpg.Record | None:
         """
         Fetch a single row from the appropriate database
@@ -531,13 +778,16 @@ class SecureDatabaseManager:
             user_id: User ID for audit logging
             session_id: Session ID for audit logging
             timeout: Query timeout in seconds
+            prepared: Run through a prepared statement kept on the pool
+                connection; for hot queries with fixed SQL text
 
         Returns:
             Single record or None
         """
-        # Determine database if not specified
+        # Route once; database, audit table and latency label all come from it
+        route = self._route_query(query)
         if database is None:
-            database = self._determine_database(query, tables)
+            database = self._route_database(route, tables)
 
         # Select appropriate pool
         pool = self.private_pool if database == DatabaseType.PRIVATE else self.public_pool
@@ -551,18 +801,14 @@ class SecureDatabaseManager:
 
         try:
             async with pool.acquire() as conn:
-                if timeout:
-                    row = await asyncio.wait_for(
-                        conn.fetchrow(query, *params),
-                        timeout=timeout,
-                    )
-                else:
-                    row = await conn.fetchrow(query, *params)
+                row = await self._run_query(
+                    conn, "fetchrow", query, params, route.label, prepared, timeout,
+                )
 
                 # Audit successful query
                 await self._audit_query(
                     database, query, QueryType.SELECT, user_id, session_id,
-                    rows_affected=1 if row else 0,
+                    rows_affected=1 if row else 0, route=route,
                 )
 
                 self.logger.debug(
@@ -576,13 +822,13 @@ class SecureDatabaseManager:
             error = f"Query timeout after {timeout} seconds"
             await self._audit_query(
                 database, query, QueryType.SELECT, user_id, session_id,
-                success=False, error=error,
+                success=False, error=error, route=route,
             )
             raise
         except Exception as e:
             await self._audit_query(
                 database, query, QueryType.SELECT, user_id, session_id,
-                success=False, error=str(e),
+                success=False, error=str(e), route=route,
             )
             self.logger.exception(
                 f"Query fetchrow failed: {e}",
@@ -600,6 +846,7 @@ class SecureDatabaseManager:
         user_id: str = None,
         session_id: str = None,
         timeout: float = None,
+        prepared: bool = False,
     ) -> Any:
         """
         Fetch a single value from the appropriate database
@@ -613,13 +860,16 @@ class SecureDatabaseManager:
             user_id: User ID for audit logging
             session_id: Session ID for audit logging
             timeout: Query timeout in seconds
+            prepared: Run through a prepared statement kept on the pool
+                connection; for hot queries with fixed SQL text
 
         Returns:
             Single value or None
         """
-        # Determine database if not specified
+        # Route once; database, audit table and latency label all come from it
+        route = self._route_query(query)
         if database is None:
-            database = self._determine_database(query, tables)
+            database = self._route_database(route, tables)
 
         # Select appropriate pool
         pool = self.private_pool if database == DatabaseType.PRIVATE else self.public_pool
@@ -633,18 +883,14 @@ class SecureDatabaseManager:
 
         try:
             async with pool.acquire() as conn:
-                if timeout:
-                    value = await asyncio.wait_for(
-                        conn.fetchval(query, *params, column=column),
-                        timeout=timeout,
-                    )
-                else:
-                    value = await conn.fetchval(query, *params, column=column)
+                value = await self._run_query(
+                    conn, "fetchval", query, params, route.label, prepared, timeout, column=column,
+                )
 
                 # Audit successful query
                 await self._audit_query(
                     database, query, QueryType.SELECT, user_id, session_id,
-                    rows_affected=1 if value is not None else 0,
+                    rows_affected=1 if value is not None else 0, route=route,
                 )
 
                 self.logger.debug(
@@ -658,13 +904,13 @@ class SecureDatabaseManager:
             error = f"Query timeout after {timeout} seconds"
             await self._audit_query(
                 database, query, QueryType.SELECT, user_id, session_id,
-                success=False, error=error,
+                success=False, error=error, route=route,
             )
             raise
         except Exception as e:
             await self._audit_query(
                 database, query, QueryType.SELECT, user_id, session_id,
-                success=False, error=str(e),
+                success=False, error=str(e), route=route,
             )
             self.logger.exception(
                 f"Query fetchval failed: {e}",
@@ -730,7 +976,9 @@ class SecureDatabaseManager:
         Get connection pool statistics
 
         Returns:
-            Dictionary with pool statistics for each database
+            Dictionary with pool statistics for each database, the audit
+            writer's queue depth and flush latency, routing cache counters
+            and per-statement latency histograms
         """
         stats = {}
 
@@ -752,6 +1000,17 @@ class SecureDatabaseManager:
                 "min_size": self.private_pool.get_min_size(),
             }
 
+        stats["audit_writer"] = self.audit_writer.get_metrics()
+        stats["query_routing"] = {
+            "cached_routes": len(self._route_cache),
+            "max_routes": self.route_cache_size,
+            "hits": self.route_cache_hits,
+            "misses": self.route_cache_misses,
+        }
+        stats["statements"] = {
+            label: histogram.as_dict() for label, histogram in self.statement_latency.items()
+        }
+
         return stats
 
 
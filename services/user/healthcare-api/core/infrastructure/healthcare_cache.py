@@ -3,19 +3,48 @@ Healthcare-Specific Performance Caching
 Optimized caching for medical literature, drug interactions, and clinical data
 """
 
+import asyncio
 import hashlib
 import json
-from dataclasses import asdict, dataclass
+import os
+import time
+import uuid
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 from typing import Any
 
 import redis.asyncio as redis
+from cachetools import TTLCache
+from redis.exceptions import ResponseError
 
 from core.infrastructure.healthcare_logger import get_healthcare_logger
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional fast serializer
+    orjson = None  # type: ignore[assignment]
+
 logger = get_healthcare_logger("healthcare_cache")
 
+# Hit path: read payload + security level and bump access metadata in one
+# round trip, without rewriting (or re-encoding) the payload. Also returns the
+# remaining TTL in ms (PTTL) so an L1 copy never outlives the Redis entry.
+# Returns nil on a miss so no stray hash is created for absent keys.
+_CACHE_HIT_SCRIPT = """
+local entry = redis.call('HMGET', KEYS[1], 'payload', 'fmt', 'security_level')
+if not entry[1] then
+    return nil
+end
+redis.call('HINCRBY', KEYS[1], 'access_count', 1)
+redis.call('HSET', KEYS[1], 'last_accessed', ARGV[1])
+entry[4] = redis.call('PTTL', KEYS[1])
+return entry
+"""
+
+# Pub/sub channel used to evict L1 entries in other workers after set/delete
+L1_INVALIDATION_CHANNEL = "healthcare_cache:l1_invalidate"
+
 
 class CacheSecurityLevel(Enum):
     """Cache security levels for healthcare data"""
@@ -42,12 +71,67 @@ class CacheEntry:
     encrypted: bool = False
 
 
+class CacheSerializer:
+    """Payload codec for cache entries.
+
+    ``json`` is always available; ``orjson`` is a faster binary-safe option
+    used when the package is installed. The format name is stored with each
+    entry so entries written under one setting stay readable under another.
+    """
+
+    JSON = "json"
+    ORJSON = "orjson"
+
+    def __init__(self, name: str = JSON):
+        if name == self.ORJSON and orjson is None:
+            logger.warning("orjson not installed; falling back to json cache serializer")
+            name = self.JSON
+        if name not in (self.JSON, self.ORJSON):
+            raise ValueError(f"Unknown cache serializer: {name}")
+        self.name = name
+
+    def dumps(self, data: Any) -> bytes:
+        if self.name == self.ORJSON:
+            return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(data, default=str).encode()
+
+    @staticmethod
+    def loads(payload: bytes, fmt: str) -> Any:
+        if fmt == CacheSerializer.ORJSON:
+            if orjson is None:
+                raise RuntimeError("Cache entry written with orjson but orjson is not installed")
+            return orjson.loads(payload)
+        return json.loads(payload)
+
+
 class HealthcareCacheManager:
-    """Healthcare-specific caching with PHI protection and compliance"""
+    """Healthcare-specific caching with PHI protection and compliance
 
-    def __init__(self, redis_url: str = "redis://localhost:6379/1"):
+    Entries are stored as Redis hashes: the serialized ``payload`` lives in its
+    own field next to small metadata fields (security level, TTL, context,
+    access_count, last_accessed). A cache hit is a single script call that
+    returns the payload and bumps the access metadata in place.
+
+    An optional in-process L1 tier sits in front of Redis for non-PHI levels.
+    It holds serialized payloads (callers always get a fresh object), has a
+    size bound and TTL per security level, never keeps an entry past its
+    remaining Redis TTL, and is invalidated across workers through Redis
+    pub/sub. L1 hits do not bump the Redis access metadata.
+    """
+
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379/1",
+        serializer: str | None = None,
+        l1_enabled: bool | None = None,
+        l1_maxsize: int | None = None,
+    ):
         self.redis_url = redis_url
         self.redis_client: redis.Redis | None = None
+        self.serializer = CacheSerializer(
+            serializer or os.getenv("HEALTHCARE_CACHE_SERIALIZER", CacheSerializer.JSON),
+        )
+        self._hit_script: Any = None
 
         # Cache TTL configurations (in seconds)
         self.cache_ttls = {
@@ -57,6 +141,31 @@ class HealthcareCacheManager:
             CacheSecurityLevel.NO_CACHE: 0,  # Never cache
         }
 
+        # L1 (in-process) TTLs; PHI_PROTECTED and NO_CACHE are never held in process memory
+        self.l1_ttls = {
+            CacheSecurityLevel.PUBLIC: 300,  # 5 minutes
+            CacheSecurityLevel.HEALTHCARE_SENSITIVE: 60,  # 1 minute
+        }
+        if l1_enabled is None:
+            l1_enabled = os.getenv("HEALTHCARE_CACHE_L1_ENABLED", "true").lower() == "true"
+        self.l1_enabled = l1_enabled
+        l1_size = l1_maxsize or int(os.getenv("HEALTHCARE_CACHE_L1_SIZE", "1000"))
+        # Values are (payload, fmt, expires_at on time.monotonic())
+        self._l1: dict[CacheSecurityLevel, TTLCache[str, tuple[bytes, str, float]]] = {
+            level: TTLCache(maxsize=l1_size, ttl=ttl) for level, ttl in self.l1_ttls.items()
+        }
+        self._instance_id = uuid.uuid4().hex
+        self._pubsub: Any = None
+        self._invalidation_task: asyncio.Task[None] | None = None
+        self._l1_stats = {
+            "hits": 0,
+            "misses": 0,
+            "hit_seconds": 0.0,
+            "l2_lookups": 0,
+            "l2_seconds": 0.0,
+            "invalidations_received": 0,
+        }
+
         # Cache prefixes for organization
         self.cache_prefixes = {
             "medical_literature": "med_lit:",
@@ -76,7 +185,10 @@ class HealthcareCacheManager:
         try:
             self.redis_client = redis.from_url(self.redis_url)
             await self.redis_client.ping()
+            self._hit_script = self.redis_client.register_script(_CACHE_HIT_SCRIPT)
             logger.info("Redis connection established for healthcare cache")
+            if self.l1_enabled:
+                await self._start_l1_invalidation_listener()
         except Exception as e:
             logger.exception(f"Failed to connect to Redis: {e}")
             raise
@@ -86,6 +198,8 @@ class HealthcareCacheManager:
         if not self.redis_client:
             await self.initialize()
         assert self.redis_client is not None, "Redis client should be initialized"
+        if self._hit_script is None:
+            self._hit_script = self.redis_client.register_script(_CACHE_HIT_SCRIPT)
         return self.redis_client
 
     async def get(
@@ -98,44 +212,65 @@ class HealthcareCacheManager:
         if security_level == CacheSecurityLevel.NO_CACHE:
             return None
 
+        l1 = self._l1_for(security_level)
+        if l1 is not None:
+            started = time.perf_counter()
+            local = l1.get(cache_key)
+            if local is not None and local[2] <= time.monotonic():
+                # Expired in Redis by now, even though the L1 TTL has not run out
+                l1.pop(cache_key, None)
+                local = None
+            if local is not None:
+                data = CacheSerializer.loads(local[0], local[1])
+                self._l1_stats["hits"] += 1
+                self._l1_stats["hit_seconds"] += time.perf_counter() - started
+                return data
+            self._l1_stats["misses"] += 1
+
         if not self.redis_client:
             await self.initialize()
 
         redis_client = await self._ensure_redis_client()
 
         try:
-            # Get cache entry
-            cached_data = await redis_client.get(cache_key)
-            if not cached_data:
+            l2_started = time.perf_counter()
+            # Payload + security level, with access metadata bumped server-side
+            try:
+                entry = await self._hit_script(
+                    keys=[cache_key], args=[time.time()], client=redis_client,
+                )
+            except ResponseError as e:
+                if "WRONGTYPE" not in str(e):
+                    raise
+                # Entry written by the old single-JSON-string layout; drop it
+                await redis_client.delete(cache_key)
+                return None
+            if not entry:
                 return None
 
-            # Deserialize
-            cache_entry_data = json.loads(cached_data)
-            cache_entry = CacheEntry(**cache_entry_data)
+            payload, fmt, stored_level, remaining_ms = entry
+            stored_level = stored_level.decode() if isinstance(stored_level, bytes) else stored_level
 
             # Validate security level
-            if cache_entry.security_level != security_level:
+            if stored_level != security_level.value:
                 logger.warning(
                     f"Cache security level mismatch for key: {cache_key}",
                     extra={
                         "operation_type": "cache_security_mismatch",
                         "expected_level": security_level.value,
-                        "actual_level": cache_entry.security_level.value,
+                        "actual_level": stored_level,
                     },
                 )
                 return None
 
-            # Update access metadata
-            cache_entry.last_accessed = datetime.utcnow()
-            cache_entry.access_count += 1
-
-            # Update in cache
-            redis_client = await self._ensure_redis_client()
-            await redis_client.setex(
-                cache_key,
-                self.cache_ttls[security_level],
-                json.dumps(asdict(cache_entry), default=str),
-            )
+            fmt = (fmt.decode() if isinstance(fmt, bytes) else fmt) or CacheSerializer.JSON
+            data = CacheSerializer.loads(payload, fmt)
+            if l1 is not None:
+                # PTTL is -1 for an entry without expiry
+                remaining = None if remaining_ms == -1 else int(remaining_ms) / 1000
+                self._l1_store(security_level, cache_key, payload, fmt, remaining)
+                self._l1_stats["l2_lookups"] += 1
+                self._l1_stats["l2_seconds"] += time.perf_counter() - l2_started
 
             logger.debug(
                 f"Cache hit for key: {cache_key}",
@@ -143,11 +278,10 @@ class HealthcareCacheManager:
                     "operation_type": "cache_hit",
                     "cache_key": cache_key,
                     "security_level": security_level.value,
-                    "access_count": cache_entry.access_count,
                 },
             )
 
-            return cache_entry.data
+            return data
 
         except Exception as e:
             logger.exception(
@@ -160,6 +294,36 @@ class HealthcareCacheManager:
             )
             return None
 
+    async def get_entry_metadata(self, cache_key: str) -> CacheEntry | None:
+        """Return entry metadata (without the payload) for monitoring/debugging"""
+
+        redis_client = await self._ensure_redis_client()
+
+        try:
+            fields = await redis_client.hgetall(cache_key)
+        except ResponseError:
+            return None
+        if not fields:
+            return None
+
+        meta = {
+            (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+            for k, v in fields.items()
+            if k not in (b"payload", "payload")
+        }
+        return CacheEntry(
+            key=cache_key,
+            data=None,
+            security_level=CacheSecurityLevel(meta["security_level"]),
+            ttl_seconds=int(meta.get("ttl_seconds", 0)),
+            created_at=datetime.fromtimestamp(float(meta.get("created_at", 0))),
+            last_accessed=datetime.fromtimestamp(float(meta.get("last_accessed", 0))),
+            access_count=int(meta.get("access_count", 0)),
+            healthcare_context=json.loads(meta.get("healthcare_context", "{}")),
+            phi_detected=meta.get("phi_detected") == "1",
+            encrypted=meta.get("encrypted") == "1",
+        )
+
     async def set(
         self,
         cache_key: str,
@@ -194,27 +358,34 @@ class HealthcareCacheManager:
                 )
                 return False
 
-            # Create cache entry
-            cache_entry = CacheEntry(
-                key=cache_key,
-                data=data,
-                security_level=security_level,
-                ttl_seconds=ttl_override or self.cache_ttls[security_level],
-                created_at=datetime.utcnow(),
-                last_accessed=datetime.utcnow(),
-                access_count=0,
-                healthcare_context=healthcare_context or {},
-                phi_detected=phi_detected,
-                encrypted=False,  # Encryption would be implemented here if needed
-            )
+            ttl_seconds = ttl_override or self.cache_ttls[security_level]
+            now = time.time()
+            payload = self.serializer.dumps(data)
+
+            # Payload is encoded once here and never rewritten on reads
+            entry_fields = {
+                "payload": payload,
+                "fmt": self.serializer.name,
+                "security_level": security_level.value,
+                "ttl_seconds": ttl_seconds,
+                "created_at": now,
+                "last_accessed": now,
+                "access_count": 0,
+                "healthcare_context": json.dumps(healthcare_context or {}, default=str),
+                "phi_detected": int(phi_detected),
+                "encrypted": 0,  # Encryption would be implemented here if needed
+            }
 
-            # Set in Redis
+            # Set in Redis (replace any previous entry atomically)
             redis_client = await self._ensure_redis_client()
-            await redis_client.setex(
-                cache_key,
-                cache_entry.ttl_seconds,
-                json.dumps(asdict(cache_entry), default=str),
-            )
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.delete(cache_key)
+                pipe.hset(cache_key, mapping=entry_fields)
+                pipe.expire(cache_key, ttl_seconds)
+                await pipe.execute()
+
+            await self._l1_invalidate([cache_key])
+            self._l1_store(security_level, cache_key, payload, self.serializer.name, ttl_seconds)
 
             logger.debug(
                 f"Cache set for key: {cache_key}",
@@ -222,7 +393,7 @@ class HealthcareCacheManager:
                     "operation_type": "cache_set",
                     "cache_key": cache_key,
                     "security_level": security_level.value,
-                    "ttl_seconds": cache_entry.ttl_seconds,
+                    "ttl_seconds": ttl_seconds,
                     "phi_detected": phi_detected,
                 },
             )
@@ -251,6 +422,7 @@ class HealthcareCacheManager:
 
         try:
             result = await self.redis_client.delete(cache_key)
+            await self._l1_invalidate([cache_key])
 
             logger.debug(
                 f"Cache delete for key: {cache_key}",
@@ -439,6 +611,9 @@ class HealthcareCacheManager:
 
             if keys:
                 deleted_count = await self.redis_client.delete(*keys)
+                await self._l1_invalidate(
+                    [k.decode() if isinstance(k, bytes) else k for k in keys],
+                )
 
                 logger.info(
                     f"Cleared session cache for {session_id}",
@@ -457,6 +632,103 @@ class HealthcareCacheManager:
             logger.exception(f"Failed to clear session cache for {session_id}: {e}")
             return 0
 
+    # ------------------------------------------------------------------
+    # L1 (in-process) tier
+    # ------------------------------------------------------------------
+    def _l1_for(
+        self, security_level: CacheSecurityLevel,
+    ) -> TTLCache[str, tuple[bytes, str, float]] | None:
+        if not self.l1_enabled:
+            return None
+        return self._l1.get(security_level)
+
+    def _l1_store(
+        self,
+        security_level: CacheSecurityLevel,
+        cache_key: str,
+        payload: bytes,
+        fmt: str,
+        remaining_seconds: float | None,
+    ) -> None:
+        """Hold a payload in L1 for the level's L1 TTL, capped by its remaining Redis TTL."""
+        l1 = self._l1_for(security_level)
+        if l1 is None:
+            return
+        ttl = self.l1_ttls[security_level]
+        if remaining_seconds is not None:
+            if remaining_seconds <= 0:
+                return
+            ttl = min(ttl, remaining_seconds)
+        l1[cache_key] = (payload, fmt, time.monotonic() + ttl)
+
+    async def _l1_invalidate(self, keys: list[str]) -> None:
+        """Evict keys locally and tell other workers to do the same."""
+        if not self.l1_enabled or not keys:
+            return
+        for l1 in self._l1.values():
+            for key in keys:
+                l1.pop(key, None)
+        if self.redis_client is None:
+            return
+        try:
+            await self.redis_client.publish(
+                L1_INVALIDATION_CHANNEL,
+                json.dumps({"origin": self._instance_id, "keys": keys}),
+            )
+        except Exception as e:
+            logger.warning(f"Failed to publish L1 cache invalidation: {e}")
+
+    async def _start_l1_invalidation_listener(self) -> None:
+        if self._invalidation_task is not None and not self._invalidation_task.done():
+            return
+        assert self.redis_client is not None
+        self._pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(L1_INVALIDATION_CHANNEL)
+        self._invalidation_task = asyncio.create_task(self._listen_l1_invalidations())
+
+    async def _listen_l1_invalidations(self) -> None:
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    event = json.loads(message["data"])
+                    if event.get("origin") == self._instance_id:
+                        continue
+                    self._l1_stats["invalidations_received"] += 1
+                    for l1 in self._l1.values():
+                        for key in event.get("keys", []):
+                            l1.pop(key, None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Missed invalidations can't be replayed; drop L1 rather than serve stale data
+                logger.warning(f"L1 invalidation listener error, clearing L1: {e}")
+                for l1 in self._l1.values():
+                    l1.clear()
+                await asyncio.sleep(1)
+
+    def _get_l1_stats(self) -> dict[str, Any]:
+        stats = self._l1_stats
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            "enabled": self.l1_enabled,
+            "hits": stats["hits"],
+            "misses": stats["misses"],
+            "hit_ratio": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+            "avg_hit_latency_ms": (
+                round(stats["hit_seconds"] / stats["hits"] * 1000, 4) if stats["hits"] else None
+            ),
+            "avg_l2_latency_ms": (
+                round(stats["l2_seconds"] / stats["l2_lookups"] * 1000, 4)
+                if stats["l2_lookups"]
+                else None
+            ),
+            "invalidations_received": stats["invalidations_received"],
+            "entries_by_level": {level.value: len(l1) for level, l1 in self._l1.items()},
+            "ttl_by_level": {level.value: ttl for level, ttl in self.l1_ttls.items()},
+        }
+
     async def get_cache_stats(self) -> dict[str, Any]:
         """Get cache statistics for monitoring"""
 
@@ -485,12 +757,14 @@ class HealthcareCacheManager:
                 },
                 "key_counts_by_type": key_counts,
                 "cache_levels": {level.value: ttl for level, ttl in self.cache_ttls.items()},
+                "serializer": self.serializer.name,
+                "l1": self._get_l1_stats(),
                 "timestamp": datetime.utcnow().isoformat(),
             }
 
         except Exception as e:
             logger.exception(f"Failed to get cache stats: {e}")
-            return {"error": str(e)}
+            return {"error": str(e), "l1": self._get_l1_stats()}
 
     def _generate_cache_key(self, cache_type: str, primary_key: str, **kwargs: Any) -> str:
         """Generate consistent cache key"""
@@ -525,6 +799,12 @@ class HealthcareCacheManager:
 
     async def cleanup(self) -> None:
         """Cleanup Redis connection"""
+        if self._invalidation_task is not None:
+            self._invalidation_task.cancel()
+            self._invalidation_task = None
+        if self._pubsub is not None:
+            await self._pubsub.close()
+            self._pubsub = None
         if self.redis_client:
             await self.redis_client.close()
 
@@ -17,6 +17,7 @@ from enum import Enum
 from typing import Any
 
 from config.phi_detection_config_loader import phi_config
+from src.healthcare_mcp.phi_scan_engine import PHIScanEngine, get_phi_scan_engine
 
 from .healthcare_logger import get_healthcare_logger, log_phi_alert
 
@@ -116,6 +117,7 @@ class PHIMonitor:
             self._phi_field_names = phi_config.get_phi_field_names()
             self._risk_mappings = phi_config.get_risk_mappings()
             self._recommendations_config = phi_config.get_recommendations()
+            self._build_scanners()
 
             # Update instance settings from config
             if not hasattr(self, "enable_synthetic_detection"):
@@ -137,6 +139,31 @@ class PHIMonitor:
                 "low_risk_types": [],
             }
             self._recommendations_config = {}
+            self._build_scanners()
+
+    def _build_scanners(self) -> None:
+        """Fold the configured patterns into single-pass compiled scanners."""
+        self._scan_engine: PHIScanEngine = get_phi_scan_engine(
+            tuple(
+                (phi_type, pattern.pattern)
+                for phi_type, patterns in self._compiled_patterns.items()
+                for pattern in patterns
+            ),
+        )
+        self._synthetic_scanner = (
+            re.compile(
+                "|".join(f"(?:{pattern.pattern})" for pattern in self._synthetic_patterns),
+                re.IGNORECASE,
+            )
+            if self._synthetic_patterns
+            else None
+        )
+        field_names = "|".join(re.escape(name) for name in sorted(self._phi_field_names))
+        self._field_name_scanner = (
+            re.compile(rf"\b({field_names})\s*[:=]", re.IGNORECASE)
+            if self._phi_field_names
+            else None
+        )
 
     def reload_configuration(self) -> None:
         """Reload PHI detection configuration (useful for runtime updates)."""
@@ -189,23 +216,17 @@ class PHIMonitor:
         detected_phi_types: list[PHIType] = []
         detection_details: dict[str, Any] = {"matches": {}, "context": context}
 
-        for phi_type_str, patterns in self._compiled_patterns.items():
-            matches = []
-            for pattern in patterns:
-                found_matches = pattern.findall(scan_text)
-                if found_matches:
-                    matches.extend(found_matches)
-
-            if matches:
-                # Convert string to PHIType enum if possible
-                try:
-                    phi_type = PHIType(phi_type_str)
-                    detected_phi_types.append(phi_type)
-                    detection_details["matches"][str(phi_type)] = len(matches)
-                except ValueError:
-                    # If conversion fails, log and skip
-                    self.logger.warning(f"Unknown PHI type: {phi_type_str}")
-                    continue
+        # One sweep over the text for every configured pattern
+        for phi_type_str, match_count in self._scan_engine.count_by_type(scan_text).items():
+            # Convert string to PHIType enum if possible
+            try:
+                phi_type = PHIType(phi_type_str)
+                detected_phi_types.append(phi_type)
+                detection_details["matches"][str(phi_type)] = match_count
+            except ValueError:
+                # If conversion fails, log and skip
+                self.logger.warning(f"Unknown PHI type: {phi_type_str}")
+                continue
 
         # Check field names for PHI indicators
         phi_field_matches = self._scan_field_names(data)
@@ -264,7 +285,9 @@ class PHIMonitor:
         if not self.enable_synthetic_detection:
             return False
 
-        return any(pattern.search(text) for pattern in self._synthetic_patterns)
+        if self._synthetic_scanner is None:
+            return False
+        return self._synthetic_scanner.search(text) is not None
 
     def _scan_field_names(self, data: str | dict[str, Any] | list[Any]) -> list[str]:
         """Scan for PHI field names in data structure."""
@@ -276,10 +299,9 @@ class PHIMonitor:
                     phi_fields.append(key)
         elif isinstance(data, str):
             # Check if the string contains field-like patterns
-            for field_name in self._phi_field_names:
-                pattern = rf"\b{re.escape(field_name)}\s*[:=]"
-                if re.search(pattern, data, re.IGNORECASE):
-                    phi_fields.append(field_name)
+            if self._field_name_scanner is not None:
+                found = self._field_name_scanner.finditer(data)
+                phi_fields.extend(sorted({match.group(1).lower() for match in found}))
 
         return phi_fields
 
@@ -8,6 +8,8 @@ medical emergency bypass, and healthcare-appropriate thresholds.
 import logging
 import os
 import time
+from collections import OrderedDict
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
@@ -363,6 +365,207 @@ def _metric_key(role: HealthcareRole, limit_type: RateLimitType, outcome: str) -
     return f"{role.value}:{limit_type.value}:{outcome}"
 
 
+# Token bucket + minute/hour window check for one or more limit types in one call.
+# KEYS: bucket, minute counter, hour counter per type.
+# ARGV: now, then capacity, fill_rate, rpm, rph per type.
+# Nothing is consumed unless every type allows the request.
+# Returns {all_allowed, then allowed, tokens, minute_count, hour_count, retry_after per type};
+# tokens is returned as a string because Redis truncates Lua numbers to integers.
+_RATE_LIMIT_LUA = """
+local now = tonumber(ARGV[1])
+local n = #KEYS / 3
+local state = {}
+local all_allowed = 1
+
+for i = 1, n do
+    local base = 1 + 4 * (i - 1)
+    local capacity = tonumber(ARGV[base + 1])
+    local fill_rate = tonumber(ARGV[base + 2])
+    local rpm = tonumber(ARGV[base + 3])
+    local rph = tonumber(ARGV[base + 4])
+
+    local data = redis.call('HMGET', KEYS[3 * i - 2], 'tokens', 'ts')
+    local tokens = tonumber(data[1]) or capacity
+    local ts = tonumber(data[2]) or now
+    if now > ts and fill_rate > 0 then
+        tokens = math.min(capacity, tokens + (now - ts) * fill_rate)
+    end
+    local minute_count = tonumber(redis.call('GET', KEYS[3 * i - 1]) or '0')
+    local hour_count = tonumber(redis.call('GET', KEYS[3 * i]) or '0')
+
+    local allowed = 1
+    local retry_after = 0
+    if tokens < 1 then
+        allowed = 0
+        if fill_rate > 0 then
+            retry_after = math.max(1, math.floor((1 - tokens) / fill_rate))
+        else
+            retry_after = 60
+        end
+    elseif minute_count >= rpm or hour_count >= rph then
+        -- window exceeded; client can retry after minute boundary
+        allowed = 0
+        retry_after = 60
+    end
+    if allowed == 0 then
+        all_allowed = 0
+    end
+    state[i] = {allowed, tokens, minute_count, hour_count, retry_after}
+end
+
+if all_allowed == 1 then
+    for i = 1, n do
+        local s = state[i]
+        s[2] = s[2] - 1
+        s[3] = s[3] + 1
+        s[4] = s[4] + 1
+        redis.call('HSET', KEYS[3 * i - 2], 'tokens', s[2], 'ts', now)
+        redis.call('EXPIRE', KEYS[3 * i - 2], 3600)
+        redis.call('INCR', KEYS[3 * i - 1])
+        redis.call('EXPIRE', KEYS[3 * i - 1], 120)
+        redis.call('INCR', KEYS[3 * i])
+        redis.call('EXPIRE', KEYS[3 * i], 7200)
+    end
+end
+
+local result = {all_allowed}
+for i = 1, n do
+    local s = state[i]
+    table.insert(result, s[1])
+    table.insert(result, tostring(s[2]))
+    table.insert(result, s[3])
+    table.insert(result, s[4])
+    table.insert(result, s[5])
+end
+return result
+"""
+
+# (allowed, tokens_remaining, minute_count, hour_count, retry_after) for one limit type
+LimitCheck = tuple[bool, float, int, int, int]
+
+
+@dataclass
+class _MemoryBucket:
+    """Per-(user, limit type) state mirroring the Redis token bucket + window counters."""
+
+    tokens: float
+    ts: float
+    minute_window: int
+    minute_count: int
+    hour_window: int
+    hour_count: int
+    last_seen: float
+
+
+class InMemoryRateLimitStore:
+    """Per-process token bucket + minute/hour window counters.
+
+    Used when Redis is not configured or unreachable. ``consume_many`` follows
+    the Redis Lua script step for step (same refill, all-or-nothing commit and
+    retry_after rules) so limits do not change when the limiter degrades. Buckets are kept
+    in last-used order; idle ones are dropped from the front and the total is
+    capped at ``max_keys``.
+    """
+
+    def __init__(self, max_keys: int = 10000, idle_ttl: float = 3600.0):
+        self.max_keys = max(1, max_keys)
+        # After an hour idle both windows have rolled over and the bucket is full again
+        self.idle_ttl = idle_ttl
+        self._buckets: OrderedDict[tuple[str, str], _MemoryBucket] = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _evict(self, now: float) -> None:
+        while self._buckets:
+            oldest = next(iter(self._buckets.values()))
+            if now - oldest.last_seen <= self.idle_ttl and len(self._buckets) <= self.max_keys:
+                break
+            self._buckets.popitem(last=False)
+            self.evictions += 1
+
+    def _bucket(self, key: tuple[str, str], capacity: float, now: float) -> _MemoryBucket:
+        minute_window = int(now // 60)
+        hour_window = int(now // 3600)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = _MemoryBucket(capacity, now, minute_window, 0, hour_window, 0, now)
+            self._buckets[key] = bucket
+        else:
+            self._buckets.move_to_end(key)
+            bucket.last_seen = now
+        if bucket.minute_window != minute_window:
+            bucket.minute_window, bucket.minute_count = minute_window, 0
+        if bucket.hour_window != hour_window:
+            bucket.hour_window, bucket.hour_count = hour_window, 0
+        return bucket
+
+    def consume_many(
+        self,
+        user_id: str,
+        limits: list[tuple[str, float, float, int, int]],
+        now: float,
+    ) -> tuple[bool, list[LimitCheck]]:
+        """Check (limit_type, capacity, fill_rate, rpm, rph) entries; consume from all or none."""
+        pending: list[tuple[_MemoryBucket, bool, float, int]] = []
+        all_allowed = True
+        for limit_type, capacity, fill_rate, rpm, rph in limits:
+            bucket = self._bucket((user_id, limit_type), capacity, now)
+            tokens = bucket.tokens
+            if now > bucket.ts and fill_rate > 0:
+                tokens = min(capacity, tokens + (now - bucket.ts) * fill_rate)
+
+            allowed = True
+            retry_after = 0
+            if tokens < 1:
+                allowed = False
+                retry_after = max(1, int((1 - tokens) // fill_rate)) if fill_rate > 0 else 60
+            elif bucket.minute_count >= rpm or bucket.hour_count >= rph:
+                allowed = False
+                retry_after = 60
+            all_allowed = all_allowed and allowed
+            pending.append((bucket, allowed, tokens, retry_after))
+
+        checks: list[LimitCheck] = []
+        for bucket, allowed, tokens, retry_after in pending:
+            if all_allowed:
+                tokens -= 1
+                bucket.tokens, bucket.ts = tokens, now
+                bucket.minute_count += 1
+                bucket.hour_count += 1
+            checks.append((allowed, tokens, bucket.minute_count, bucket.hour_count, retry_after))
+
+        self._evict(now)
+        return all_allowed, checks
+
+    def consume(
+        self,
+        user_id: str,
+        limit_type: str,
+        now: float,
+        capacity: float,
+        fill_rate: float,
+        rpm: int,
+        rph: int,
+    ) -> LimitCheck:
+        """Take one request from a single limit type."""
+        _, checks = self.consume_many(user_id, [(limit_type, capacity, fill_rate, rpm, rph)], now)
+        return checks[0]
+
+    def drain(self, now: float) -> list[tuple[str, str, _MemoryBucket]]:
+        """Remove and return live buckets (used to hand state back to Redis)."""
+        self._evict(now)
+        drained = [(user_id, limit_type, b) for (user_id, limit_type), b in self._buckets.items()]
+        self._buckets.clear()
+        return drained
+
+    def restore(self, buckets: list[tuple[str, str, _MemoryBucket]]) -> None:
+        """Put drained buckets back (hand-off to Redis failed)."""
+        for user_id, limit_type, bucket in buckets:
+            self._buckets.setdefault((user_id, limit_type), bucket)
+
+
 class HealthcareRateLimiter:
     """Healthcare-focused rate limiter with role-based limits and emergency bypass.
 
@@ -372,6 +575,18 @@ class HealthcareRateLimiter:
     def __init__(self, redis_client: redis.Redis | None = None):
         self.redis_client = redis_client
         self.emergency_bypass_active: dict[str, datetime] = {}
+        self.memory_store = InMemoryRateLimitStore(
+            max_keys=int(os.getenv("RL_MEMORY_MAX_KEYS", "10000")),
+        )
+        # Set while Redis is failing; local state is pushed back on recovery
+        self._redis_degraded = False
+        # While degraded, Redis is probed at most once per interval instead of per request
+        self.redis_recovery_interval = float(os.getenv("RL_REDIS_RECOVERY_SECONDS", "5"))
+        self._next_recovery_attempt = 0.0
+        # Sent once (SCRIPT LOAD on first NOSCRIPT), then invoked by SHA via EVALSHA
+        self._rate_limit_script = (
+            redis_client.register_script(_RATE_LIMIT_LUA) if redis_client is not None else None
+        )
         logger.info(
             "Healthcare rate limiter initialized (policy_version=%s, source=%s)",
             RATE_LIMITS_POLICY_VERSION,
@@ -394,19 +609,43 @@ class HealthcareRateLimiter:
             request_id: Optional request identifier for tracking
             is_emergency: Whether this is an emergency medical request
         """
+        return await self.check_rate_limits(user, [limit_type], request_id, is_emergency)
+
+    async def check_rate_limits(
+        self,
+        user: AuthenticatedUser,
+        limit_types: Sequence[RateLimitType],
+        request_id: str | None = None,
+        is_emergency: bool = False,
+    ) -> RateLimitStatus:
+        """
+        Check a request that counts against several limit types at once
+
+        The request is allowed only if every type allows it, and is then counted
+        against all of them; a denied request consumes nothing. The returned
+        status describes the denying type with the longest retry, or the most
+        constrained type when allowed.
+        """
+        limit_types = list(dict.fromkeys(limit_types))
+        if not limit_types:
+            msg = "At least one RateLimitType is required"
+            raise ValueError(msg)
+        primary_type = limit_types[0]
 
         # Get rate limit configuration for user role and operation type
         role_limits = HEALTHCARE_RATE_LIMITS.get(user.role, {})
-        limit_config = role_limits.get(limit_type)
-
-        if not limit_config:
-            # Default limits for unknown combinations
-            limit_config = RateLimitConfig(
-                requests_per_minute=30,
-                requests_per_hour=900,
-                burst_allowance=5,
-                description="Default healthcare rate limit",
-            )
+        limits: list[tuple[RateLimitType, RateLimitConfig]] = []
+        for limit_type in limit_types:
+            limit_config = role_limits.get(limit_type)
+            if not limit_config:
+                # Default limits for unknown combinations
+                limit_config = RateLimitConfig(
+                    requests_per_minute=30,
+                    requests_per_hour=900,
+                    burst_allowance=5,
+                    description="Default healthcare rate limit",
+                )
+            limits.append((limit_type, limit_config))
 
         # Prune expired emergency bypass entries lazily
         if self.emergency_bypass_active:
@@ -416,14 +655,14 @@ class HealthcareRateLimiter:
                 self.emergency_bypass_active.pop(uid, None)
 
         # Activate emergency bypass if requested and allowed
-        if is_emergency and limit_config.emergency_bypass:
+        if is_emergency and any(config.emergency_bypass for _, config in limits):
             duration_minutes = int(os.getenv("RL_EMERGENCY_DEFAULT_MINUTES", "30"))
             expiry = datetime.now() + timedelta(minutes=duration_minutes)
             logger.info(
                 "Emergency bypass activated - user=%s role=%s type=%s duration=%sm",  # noqa: E501
                 user.user_id,
                 user.role.value,
-                limit_type.value,
+                primary_type.value,
                 duration_minutes,
             )
             self.emergency_bypass_active[user.user_id] = expiry
@@ -434,7 +673,7 @@ class HealthcareRateLimiter:
                 allowed=True,
                 requests_remaining=999,
                 reset_time=expiry,
-                limit_type=limit_type,
+                limit_type=primary_type,
                 user_role=user.role,
                 user_id=user.user_id,
             )
@@ -446,36 +685,22 @@ class HealthcareRateLimiter:
                 allowed=True,
                 requests_remaining=999,
                 reset_time=active_expiry,
-                limit_type=limit_type,
+                limit_type=primary_type,
                 user_role=user.role,
                 user_id=user.user_id,
             )
 
-        # Check sliding window rate limits
         current_time = time.time()
-        minute_key = f"rate_limit:{user.user_id}:{limit_type.value}:minute"
-        hour_key = f"rate_limit:{user.user_id}:{limit_type.value}:hour"
 
         try:
             if self.redis_client:
                 # Use Redis for distributed rate limiting (token bucket + counters)
-                status = await self._check_redis_rate_limit(
-                    user,
-                    limit_config,
-                    limit_type,
-                    minute_key,
-                    hour_key,
-                    current_time,
-                )
+                status = await self._check_redis_rate_limit(user, limits, current_time)
             else:
                 # Fallback to in-memory rate limiting
-                status = await self._check_memory_rate_limit(
-                    user,
-                    limit_config,
-                    limit_type,
-                    current_time,
-                )
+                status = await self._check_memory_rate_limit(user, limits, current_time)
 
+            limit_type = status.limit_type or primary_type
             # Log rate limit status for healthcare audit
             if not status.allowed:
                 logger.warning(
@@ -502,121 +727,95 @@ class HealthcareRateLimiter:
                 allowed=True,
                 requests_remaining=100,
                 reset_time=datetime.now() + timedelta(minutes=1),
-                limit_type=limit_type,
+                limit_type=primary_type,
                 user_role=user.role,
             )
 
     async def _check_redis_rate_limit(
         self,
         user: AuthenticatedUser,
-        config: RateLimitConfig,
-        limit_type: RateLimitType,
-        minute_key: str,
-        hour_key: str,
+        limits: list[tuple[RateLimitType, RateLimitConfig]],
         current_time: float,
     ) -> RateLimitStatus:
-        """Check rate limits using atomic Redis Lua script for token bucket + guardrails.
+        """Check rate limits using the preloaded Lua script (EVALSHA) for token bucket + guardrails.
 
-        Lua script returns array:
-            [ allowed(int 1/0), tokens_remaining(float), minute_count(int), hour_count(int), retry_after(int) ]
+        One script call covers every limit type, see ``_RATE_LIMIT_LUA`` for the reply layout.
         """
-        tb_key = f"rl:tb:{user.user_id}:{limit_type.value}"
         minute_window = int(current_time // 60)
         hour_window = int(current_time // 3600)
-        minute_counter_key = f"{minute_key}:{minute_window}"
-        hour_counter_key = f"{hour_key}:{hour_window}"
-        capacity = max(1, config.burst_allowance)
-        fill_rate_per_sec = (
-            config.requests_per_minute / 60.0 if config.requests_per_minute > 0 else 0.0
-        )
-        lua = """
-local tb_key = KEYS[1]
-local minute_key = KEYS[2]
-local hour_key = KEYS[3]
-local now = tonumber(ARGV[1])
-local capacity = tonumber(ARGV[2])
-local fill_rate = tonumber(ARGV[3])
-local rpm = tonumber(ARGV[4])
-local rph = tonumber(ARGV[5])
-
-local data = redis.call('HMGET', tb_key, 'tokens', 'ts')
-local tokens = tonumber(data[1]) or capacity
-local ts = tonumber(data[2]) or now
-if now > ts then
-    local elapsed = now - ts
-    if fill_rate > 0 then
-        tokens = math.min(capacity, tokens + elapsed * fill_rate)
-    end
-end
-local allowed = 0
-local retry_after = 0
-if tokens >= 1 then
-    tokens = tokens - 1
-    allowed = 1
-    redis.call('HMSET', tb_key, 'tokens', tokens, 'ts', now)
-    redis.call('EXPIRE', tb_key, 3600)
-end
+        keys: list[str] = []
+        args: list[float | int] = [current_time]
+        for limit_type, config in limits:
+            base = f"rate_limit:{user.user_id}:{limit_type.value}"
+            keys.extend(
+                [
+                    f"rl:tb:{user.user_id}:{limit_type.value}",
+                    f"{base}:minute:{minute_window}",
+                    f"{base}:hour:{hour_window}",
+                ],
+            )
+            args.extend(
+                [
+                    max(1, config.burst_allowance),
+                    config.requests_per_minute / 60.0 if config.requests_per_minute > 0 else 0.0,
+                    config.requests_per_minute,
+                    config.requests_per_hour,
+                ],
+            )
 
-local minute_count = tonumber(redis.call('GET', minute_key) or '0')
-local hour_count = tonumber(redis.call('GET', hour_key) or '0')
+        if self._redis_degraded and not await self._try_recover_redis(current_time):
+            return await self._check_memory_rate_limit(user, limits, current_time)
 
-if allowed == 1 then
-    if minute_count >= rpm or hour_count >= rph then
-        -- rollback token
-        tokens = math.min(capacity, tokens + 1)
-        redis.call('HMSET', tb_key, 'tokens', tokens, 'ts', now)
-        allowed = 0
-    else
-        minute_count = minute_count + 1
-        hour_count = hour_count + 1
-        redis.call('INCR', minute_key)
-        redis.call('EXPIRE', minute_key, 120)
-        redis.call('INCR', hour_key)
-        redis.call('EXPIRE', hour_key, 7200)
-    end
-end
-
-if allowed == 0 then
-    if tokens < 1 and fill_rate > 0 then
-        local need = 1 - tokens
-        retry_after = math.max(1, math.floor(need / fill_rate))
-    else
-        -- window exceed
-        retry_after = 60 -- conservative default; client can retry after minute boundary
-    end
-end
-return {allowed, tokens, minute_count, hour_count, retry_after}
-        """
         try:
-            result = await self.redis_client.eval(
-                lua,
-                3,
-                tb_key,
-                minute_counter_key,
-                hour_counter_key,
-                current_time,
-                capacity,
-                fill_rate_per_sec,
-                config.requests_per_minute,
-                config.requests_per_hour,
-            )  # type: ignore
+            if self._rate_limit_script is None:
+                self._rate_limit_script = self.redis_client.register_script(_RATE_LIMIT_LUA)  # type: ignore[union-attr]
+            # AsyncScript uses EVALSHA and reloads the script transparently on NOSCRIPT
+            result = await self._rate_limit_script(keys=keys, args=args)
         except Exception as e:  # pragma: no cover
             logger.debug("Lua rate limit script failed, falling back to Python logic: %s", e)
-            return await self._legacy_python_bucket(
-                user,
-                config,
-                limit_type,
-                minute_key,
-                hour_key,
-                current_time,
+            return await self._legacy_python_bucket(user, limits, current_time)
+
+        checks: list[LimitCheck] = [
+            (
+                int(result[i]) == 1,
+                float(result[i + 1]),
+                int(result[i + 2]),
+                int(result[i + 3]),
+                int(result[i + 4]),
             )
+            for i in range(1, len(result), 5)
+        ]
+        return self._combine_status(user, limits, current_time, int(result[0]) == 1, checks)
 
-        allowed_flag = int(result[0]) == 1
-        tokens_remaining = float(result[1])
-        minute_count = int(result[2])
-        hour_count = int(result[3])
-        retry_after = int(result[4])
-
+    def _combine_status(
+        self,
+        user: AuthenticatedUser,
+        limits: list[tuple[RateLimitType, RateLimitConfig]],
+        current_time: float,
+        all_allowed: bool,
+        checks: list[LimitCheck],
+    ) -> RateLimitStatus:
+        statuses = [
+            self._build_status(user, config, limit_type, current_time, all_allowed, *check[1:])
+            for (limit_type, config), check in zip(limits, checks, strict=True)
+        ]
+        if all_allowed:
+            return min(statuses, key=lambda status: status.requests_remaining)
+        denying = [status for status, check in zip(statuses, checks, strict=True) if not check[0]]
+        return max(denying, key=lambda status: status.retry_after_seconds or 0)
+
+    def _build_status(
+        self,
+        user: AuthenticatedUser,
+        config: RateLimitConfig,
+        limit_type: RateLimitType,
+        current_time: float,
+        allowed_flag: bool,
+        tokens_remaining: float,
+        minute_count: int,
+        hour_count: int,
+        retry_after: int,
+    ) -> RateLimitStatus:
         if not allowed_flag:
             return RateLimitStatus(
                 allowed=False,
@@ -647,39 +846,81 @@ return {allowed, tokens, minute_count, hour_count, retry_after}
     async def _legacy_python_bucket(
         self,
         user: AuthenticatedUser,
-        config: RateLimitConfig,
-        limit_type: RateLimitType,
-        minute_key: str,
-        hour_key: str,
+        limits: list[tuple[RateLimitType, RateLimitConfig]],
         current_time: float,
     ) -> RateLimitStatus:
-        # Minimal fallback: allow to avoid hard failure
-        return RateLimitStatus(
-            allowed=True,
-            requests_remaining=config.requests_per_minute,
-            reset_time=datetime.fromtimestamp(current_time + 60),
-            limit_type=limit_type,
-            user_role=user.role,
-            tokens_remaining=float(config.burst_allowance),
-            user_id=user.user_id,
-        )
+        """Redis is configured but failing: enforce limits locally until it recovers."""
+        if not self._redis_degraded:
+            logger.warning("Redis rate limiting unavailable; enforcing limits in-process")
+            self._redis_degraded = True
+            self._next_recovery_attempt = current_time + self.redis_recovery_interval
+        return await self._check_memory_rate_limit(user, limits, current_time)
+
+    async def _try_recover_redis(self, current_time: float) -> bool:
+        """Probe Redis once per recovery interval; hand local state back once it answers PING."""
+        if current_time < self._next_recovery_attempt:
+            return False
+        self._next_recovery_attempt = current_time + self.redis_recovery_interval
+        try:
+            await self.redis_client.ping()  # type: ignore[union-attr]
+            await self._sync_memory_to_redis(current_time)
+        except Exception as e:
+            logger.debug("Redis rate limiting still unavailable: %s", e)
+            return False
+        return True
 
     async def _check_memory_rate_limit(
         self,
         user: AuthenticatedUser,
-        config: RateLimitConfig,
-        limit_type: RateLimitType,
+        limits: list[tuple[RateLimitType, RateLimitConfig]],
         current_time: float,
     ) -> RateLimitStatus:
-        """Fallback in-memory rate limiting"""
-        # Simple implementation - in production, Redis should be preferred
-        return RateLimitStatus(
-            allowed=True,
-            requests_remaining=config.requests_per_minute,
-            reset_time=datetime.fromtimestamp(current_time + 60),
-            limit_type=limit_type,
-            user_role=user.role,
+        """In-process token bucket + window counters (same rules as the Lua script)."""
+        all_allowed, checks = self.memory_store.consume_many(
+            user.user_id,
+            [
+                (
+                    limit_type.value,
+                    max(1, config.burst_allowance),
+                    config.requests_per_minute / 60.0 if config.requests_per_minute > 0 else 0.0,
+                    config.requests_per_minute,
+                    config.requests_per_hour,
+                )
+                for limit_type, config in limits
+            ],
+            current_time,
         )
+        return self._combine_status(user, limits, current_time, all_allowed, checks)
+
+    async def _sync_memory_to_redis(self, current_time: float) -> None:
+        """Push buckets and window counts accumulated during an outage back into Redis.
+
+        Raises if the sync fails, which keeps the limiter on the in-process path.
+        """
+        assert self.redis_client is not None
+        minute_window = int(current_time // 60)
+        hour_window = int(current_time // 3600)
+        buckets = self.memory_store.drain(current_time)
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for user_id, limit_type, bucket in buckets:
+                    base = f"rate_limit:{user_id}:{limit_type}"
+                    tb_key = f"rl:tb:{user_id}:{limit_type}"
+                    pipe.hset(tb_key, mapping={"tokens": bucket.tokens, "ts": bucket.ts})
+                    pipe.expire(tb_key, 3600)
+                    if bucket.minute_window == minute_window and bucket.minute_count:
+                        pipe.incrby(f"{base}:minute:{minute_window}", bucket.minute_count)
+                        pipe.expire(f"{base}:minute:{minute_window}", 120)
+                    if bucket.hour_window == hour_window and bucket.hour_count:
+                        pipe.incrby(f"{base}:hour:{hour_window}", bucket.hour_count)
+                        pipe.expire(f"{base}:hour:{hour_window}", 7200)
+                await pipe.execute()
+        except Exception:
+            # Still down; keep the local state
+            self.memory_store.restore(buckets)
+            raise
+        self._redis_degraded = False
+        logger.info("Redis rate limiting recovered; synced %d in-process buckets", len(buckets))
 
     async def activate_emergency_bypass(
         self,
@@ -834,17 +1075,21 @@ async def apply_healthcare_rate_limit(
     user: AuthenticatedUser,
     limit_type: RateLimitType = RateLimitType.API_GENERAL,
     is_emergency: bool = False,
+    additional_limit_types: Sequence[RateLimitType] = (),
 ) -> Response | None:
     """
     Apply healthcare rate limiting to request
 
+    ``additional_limit_types`` lists further buckets the endpoint counts against
+    (e.g. MEDICAL_QUERY on top of API_GENERAL); all are checked in one round trip.
+
     Returns None if request is allowed, Response with 429 if rate limited
     """
     rate_limiter = get_healthcare_rate_limiter()
 
-    status = await rate_limiter.check_rate_limit(
+    status = await rate_limiter.check_rate_limits(
         user=user,
-        limit_type=limit_type,
+        limit_types=[limit_type, *additional_limit_types],
         request_id=request.headers.get("X-Request-ID"),
         is_emergency=is_emergency,
     )
@@ -856,7 +1101,7 @@ async def apply_healthcare_rate_limit(
             status_code=429,  # HTTP 429 Too Many Requests
             detail={
                 "error": "Rate limit exceeded",
-                "message": f"Too many {limit_type.value} requests",
+                "message": f"Too many {(status.limit_type or limit_type).value} requests",
                 "retry_after_seconds": status.retry_after_seconds,
                 "healthcare_role": status.user_role.value if status.user_role else None,
                 "emergency_bypass_available": user.role
@@ -1,20 +1,17 @@
 """
 Direct MCP Client using JSON-RPC communication.
 
-This implementation follows the handoff document's recommendation to spawn fresh
-MCP subprocess for each call, avoiding the problematic mcp.client.stdio library.
-Fixed: Implements connection pooling and proper subprocess lifecycle management
-to resolve broken pipe errors when called from LangChain agents.
+This implementation talks JSON-RPC to the stdio MCP server directly, avoiding
+the problematic mcp.client.stdio library. Calls go through a small pool of
+asyncio subprocesses with a multiplexed transport (see stdio_transport), so
+concurrent tool calls from LangChain agents no longer run one after another.
 """
 
-import asyncio
-import json
 import os
-import subprocess
-from contextlib import asynccontextmanager
 from typing import Any
 
 from core.infrastructure.healthcare_logger import get_healthcare_logger
+from core.mcp.stdio_transport import MCPConnectionPool
 
 logger = get_healthcare_logger("infrastructure.mcp.direct")
 
@@ -23,8 +20,8 @@ class DirectMCPClient:
     """
     Direct MCP Client using JSON-RPC communication.
 
-    Uses connection pooling and proper subprocess lifecycle management
-    to prevent broken pipe errors during LangChain agent execution.
+    Uses a pool of long-lived MCP server processes; each process accepts many
+    in-flight requests matched by JSON-RPC id.
     """
 
     def __init__(self) -> None:
@@ -38,8 +35,6 @@ class DirectMCPClient:
         self._is_container_environment = self._detect_container_environment()
         self.mcp_server_path = self._detect_mcp_server_path(container_path, host_path)
 
-        self._active_connections: dict[str, subprocess.Popen] = {}
-        self._connection_lock = asyncio.Lock()
 
         # Environment variables to pass to MCP server subprocess
         # Construct DATABASE_URL if not already set
@@ -71,13 +66,22 @@ class DirectMCPClient:
             "LOG_LEVEL": os.getenv("LOG_LEVEL", "info"),
         }
 
+        # Pool sizing: a few server processes, each multiplexing several requests
+        self._pool = MCPConnectionPool(
+            self._build_server_command,
+            env=self.mcp_env,
+            size=int(os.getenv("MCP_POOL_SIZE", "2")),
+            max_in_flight=int(os.getenv("MCP_MAX_IN_FLIGHT", "8")),
+        )
+
         logger.info(
             "Direct MCP client initialized with connection pooling",
             extra={
                 "healthcare_context": {
                     "operation_type": "mcp_init",
                     "server_path": self.mcp_server_path,
-                    "communication_method": "pooled_jsonrpc",
+                    "communication_method": "multiplexed_jsonrpc",
+                    "pool_size": self._pool.size,
                     "fix_applied": "broken_pipe_resolution",
                     "container_environment": self._is_container_environment,
                 },
@@ -130,111 +134,28 @@ class DirectMCPClient:
         )
         return host_path  # Return for clear error messaging
 
-    @asynccontextmanager
-    async def _get_mcp_connection(self, connection_id: str = "default"):
-        """
-        Async context manager for MCP connections with proper lifecycle management.
-
-        Implements connection pooling to prevent rapid create/destroy cycles
-        that cause broken pipe errors in LangChain agent execution.
-        """
-        async with self._connection_lock:
-            # Reuse existing connection if available and healthy
-            if connection_id in self._active_connections:
-                process = self._active_connections[connection_id]
-                if process.poll() is None:  # Process still running
-                    logger.debug(f"Reusing existing MCP connection: {connection_id}")
-                    yield process
-                    return
-                else:
-                    # Clean up dead connection
-                    del self._active_connections[connection_id]
-                    logger.debug(f"Cleaned up dead MCP connection: {connection_id}")
-
-            # Create new connection
-            logger.debug(f"Creating new MCP connection: {connection_id}")
-
-            # Check if MCP server exists
-            if not os.path.exists(self.mcp_server_path):
-                error_msg = (
-                    f"MCP server not found at {self.mcp_server_path}. "
-                    f"Ensure the healthcare-mcp container is built and running."
-                )
-                logger.error(error_msg)
-                raise FileNotFoundError(error_msg)
-
-            # Build command based on server type
-            if hasattr(self, "mcp_server_args"):
-                # Python-based server
-                cmd = [self.mcp_server_path] + self.mcp_server_args
-            else:
-                # Node.js-based server
-                cmd = ["node", self.mcp_server_path]
-
-            try:
-                process = subprocess.Popen(
-                    cmd,
-                    stdin=subprocess.PIPE,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    env=self.mcp_env,
-                )
-            except (FileNotFoundError, OSError) as e:
-                error_msg = f"Failed to start MCP server: {e}. Check that node.js is installed and MCP server is built."
-                logger.exception(error_msg)
-                raise RuntimeError(error_msg) from e
-
-            try:
-                # Wait for server to start with shorter timeout for pooled connections
-                await asyncio.sleep(0.5)
-
-                # Initialize MCP session
-                init_request = {
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "initialize",
-                    "params": {
-                        "protocolVersion": "2024-11-05",
-                        "capabilities": {},
-                        "clientInfo": {"name": "healthcare-api", "version": "1.0.0"},
-                    },
-                }
-
-                process.stdin.write(json.dumps(init_request) + "\n")
-                process.stdin.flush()
-
-                # Read initialization response
-                response_line = await asyncio.wait_for(
-                    asyncio.to_thread(process.stdout.readline), timeout=10,
-                )
-
-                if not response_line:
-                    raise RuntimeError("No response from MCP server during initialization")
-
-                # Store active connection for reuse
-                self._active_connections[connection_id] = process
-                logger.debug(f"MCP connection established: {connection_id}")
-
-                yield process
+    def _build_server_command(self) -> list[str]:
+        """Build the MCP server command, checking the server build exists."""
+        if not os.path.exists(self.mcp_server_path):
+            error_msg = (
+                f"MCP server not found at {self.mcp_server_path}. "
+                f"Ensure the healthcare-mcp container is built and running."
+            )
+            logger.error(error_msg)
+            raise FileNotFoundError(error_msg)
 
-            except Exception as e:
-                # Clean up on error
-                logger.exception(f"Failed to establish MCP connection {connection_id}: {e}")
-                try:
-                    process.terminate()
-                    process.wait(timeout=5)
-                except Exception:
-                    process.kill()
-                    process.wait()
-                raise
+        if hasattr(self, "mcp_server_args"):
+            # Python-based server
+            return [self.mcp_server_path] + self.mcp_server_args
+        # Node.js-based server
+        return ["node", self.mcp_server_path]
 
     async def call_tool(self, tool_name: str, arguments: dict[str, Any]) -> dict[str, Any]:
         """
         Call an MCP tool using pooled connection with proper lifecycle management.
 
-        This implementation uses connection pooling to prevent broken pipe errors
-        that occur during LangChain agent execution due to rapid subprocess cycling.
+        Requests are multiplexed over pooled server processes, so concurrent
+        calls do not wait for each other.
         """
         logger.info(
             f"Calling MCP tool: {tool_name}",
@@ -243,47 +164,19 @@ class DirectMCPClient:
                     "operation_type": "mcp_tool_call",
                     "tool_name": tool_name,
                     "arguments": arguments,
-                    "connection_strategy": "pooled",
+                    "connection_strategy": "multiplexed",
                 },
             },
         )
 
         try:
-            # Use connection pool with tool-specific connection ID
-            connection_id = f"tool_{tool_name}"
-
-            async with self._get_mcp_connection(connection_id) as process:
-                # Call the tool
-                tool_request = {
-                    "jsonrpc": "2.0",
-                    "id": 2,
-                    "method": "tools/call",
-                    "params": {"name": tool_name, "arguments": arguments},
-                }
-
-                logger.debug(f"Sending tool request: {tool_name}")
-                process.stdin.write(json.dumps(tool_request) + "\n")
-                process.stdin.flush()
-
-                # Read tool response with longer timeout for medical searches
-                response_line = await asyncio.wait_for(
-                    asyncio.to_thread(process.stdout.readline), timeout=30,
-                )
-
-                if not response_line:
-                    msg = f"No response from MCP server for tool: {tool_name}"
-                    raise RuntimeError(msg)
-
-                # Parse response
-                result = json.loads(response_line.strip())
-
-                if "error" in result:
-                    logger.error(f"MCP tool error: {result['error']}")
-                    msg = f"MCP tool error: {result['error']}"
-                    raise RuntimeError(msg)
-
-                logger.info(f"MCP tool {tool_name} completed successfully")
-                return result.get("result", {})
+            logger.debug(f"Sending tool request: {tool_name}")
+            # Longer timeout for medical searches
+            result = await self._pool.request(
+                "tools/call", {"name": tool_name, "arguments": arguments}, timeout=30,
+            )
+            logger.info(f"MCP tool {tool_name} completed successfully")
+            return result
 
         except Exception as e:
             logger.exception(
@@ -301,47 +194,22 @@ class DirectMCPClient:
 
     async def cleanup_connections(self) -> None:
         """Clean up all active MCP connections."""
-        async with self._connection_lock:
-            for connection_id, process in list(self._active_connections.items()):
-                try:
-                    process.terminate()
-                    process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    process.kill()
-                    process.wait()
-                except Exception as e:
-                    logger.warning(f"Error cleaning up connection {connection_id}: {e}")
-
-            self._active_connections.clear()
-            logger.info("All MCP connections cleaned up")
+        await self._pool.close()
+        logger.info("All MCP connections cleaned up")
+
+    def get_pool_stats(self) -> dict[str, Any]:
+        """Connection pool statistics (live processes, in-flight requests)."""
+        return self._pool.stats()
 
     async def get_available_tools(self) -> list[dict[str, Any]]:
         """Get list of available MCP tools using pooled connection."""
         logger.info("Listing available MCP tools")
 
         try:
-            async with self._get_mcp_connection("tools_list") as process:
-                # List tools
-                tools_request = {"jsonrpc": "2.0", "id": 2, "method": "tools/list", "params": {}}
-
-                process.stdin.write(json.dumps(tools_request) + "\n")
-                process.stdin.flush()
-
-                # Read tools response
-                response_line = await asyncio.wait_for(
-                    asyncio.to_thread(process.stdout.readline), timeout=10,
-                )
-
-                # Parse response
-                result = json.loads(response_line.strip())
-
-                if "error" in result:
-                    logger.error(f"Failed to list tools: {result['error']}")
-                    return []
-
-                tools = result.get("result", {}).get("tools", [])
-                logger.info(f"Found {len(tools)} available MCP tools")
-                return tools
+            result = await self._pool.request("tools/list", {}, timeout=10)
+            tools = result.get("tools", []) if isinstance(result, dict) else []
+            logger.info(f"Found {len(tools)} available MCP tools")
+            return tools
 
         except Exception as e:
             logger.exception(f"Failed to list MCP tools: {e}")
@@ -408,9 +276,9 @@ class DirectMCPClient:
         logger.info("Testing MCP connection with new pooled implementation")
         try:
             # Test connection pool
-            async with self._get_mcp_connection("debug") as process:
-                if process.poll() is None:
-                    logger.info("✅ MCP connection pool working correctly")
+            connection = await self._pool.acquire()
+            if connection.is_alive:
+                logger.info("✅ MCP connection pool working correctly")
 
             # Test actual tool call
             result = await self.call_tool("search-pubmed", {"query": "test connection"})
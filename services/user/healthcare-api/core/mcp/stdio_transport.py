@@ -0,0 +1,424 @@
+"""
+Asyncio-native, multiplexed JSON-RPC transport for stdio MCP servers.
+
+Each MCPStdioConnection owns one server subprocess started with
+asyncio.create_subprocess_exec. Requests get unique ids and are written
+without waiting for earlier replies; a background reader task resolves the
+matching future when a response line arrives, so many calls can be in flight
+on one process. MCPConnectionPool spreads requests over a small number of
+such processes and replaces processes that exit.
+
+A connection's pipes and reader task belong to the event loop that started
+it, so the pool keeps separate connections per running loop. Callers that run
+each call in a fresh loop (asyncio.run in a worker thread) get their own
+processes instead of hanging on another loop's streams.
+"""
+
+import asyncio
+import contextlib
+import itertools
+import json
+import threading
+from collections.abc import Callable
+from typing import Any
+
+from core.infrastructure.healthcare_logger import get_healthcare_logger
+
+logger = get_healthcare_logger("infrastructure.mcp.transport")
+
+MCP_PROTOCOL_VERSION = "2024-11-05"
+
+# Server responses (e.g. large literature results) can exceed asyncio's 64 KiB default
+STREAM_LIMIT_BYTES = 16 * 1024 * 1024
+
+# Read-only methods the pool may resend on a fresh process after a transport
+# failure; anything else (notably tools/call) may already have taken effect
+RETRYABLE_METHODS = frozenset(
+    {"ping", "tools/list", "resources/list", "resources/read", "prompts/list", "prompts/get"},
+)
+
+
+class MCPTransportError(RuntimeError):
+    """Raised when the MCP server process is unavailable or exits mid-request."""
+
+
+class MCPRequestNotSentError(MCPTransportError):
+    """Raised when a request could not be written, so the server never saw it."""
+
+
+class MCPStdioConnection:
+    """One MCP server subprocess with id-matched, concurrent JSON-RPC requests."""
+
+    def __init__(
+        self,
+        command: list[str],
+        env: dict[str, str] | None = None,
+        client_info: dict[str, str] | None = None,
+        name: str = "mcp",
+    ) -> None:
+        self.command = command
+        self.env = env
+        self.name = name
+        self.client_info = client_info or {"name": "healthcare-api", "version": "1.0.0"}
+
+        self._process: asyncio.subprocess.Process | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._reader_task: asyncio.Task[None] | None = None
+        self._stderr_task: asyncio.Task[None] | None = None
+        self._pending: dict[int, asyncio.Future[dict[str, Any]]] = {}
+        self._ids = itertools.count(1)
+        self._write_lock = asyncio.Lock()
+        self._closed = False
+
+        self.requests_sent = 0
+        self.server_info: dict[str, Any] = {}
+
+    @property
+    def is_alive(self) -> bool:
+        """True if the process is running and usable from the current event loop."""
+        return (
+            not self._closed
+            and self._on_own_loop()
+            and self._process is not None
+            and self._process.returncode is None
+            and self._reader_task is not None
+            and not self._reader_task.done()
+        )
+
+    def _on_own_loop(self) -> bool:
+        if self._loop is None or self._loop.is_closed():
+            return False
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop to compare against, e.g. stats() from sync code
+            return True
+        return running is self._loop
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    async def start(self, init_timeout: float = 10.0) -> None:
+        """Spawn the server process and complete the MCP initialize handshake."""
+        self._loop = asyncio.get_running_loop()
+        try:
+            self._process = await asyncio.create_subprocess_exec(
+                *self.command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=self.env,
+                limit=STREAM_LIMIT_BYTES,
+            )
+        except (FileNotFoundError, OSError) as e:
+            msg = f"Failed to start MCP server: {e}. Check that node.js is installed and MCP server is built."
+            raise MCPTransportError(msg) from e
+
+        self._reader_task = asyncio.create_task(self._read_responses())
+        self._stderr_task = asyncio.create_task(self._drain_stderr())
+
+        try:
+            init_result = await self.request(
+                "initialize",
+                {
+                    "protocolVersion": MCP_PROTOCOL_VERSION,
+                    "capabilities": {},
+                    "clientInfo": self.client_info,
+                },
+                timeout=init_timeout,
+            )
+            self.server_info = init_result.get("serverInfo", {}) if isinstance(init_result, dict) else {}
+            await self.notify("notifications/initialized")
+        except BaseException:
+            await self.close()
+            raise
+
+        logger.debug(f"MCP connection established: {self.name}")
+
+    async def request(
+        self, method: str, params: dict[str, Any] | None = None, timeout: float = 30.0,
+    ) -> Any:
+        """Send a request and wait for the response carrying the same id.
+
+        Returns the JSON-RPC ``result``; raises RuntimeError for JSON-RPC errors,
+        asyncio.TimeoutError on timeout and MCPTransportError if the process dies.
+        MCPRequestNotSentError means the request never reached the server.
+        """
+        if self._process is None or self._process.stdin is None or self._closed:
+            raise MCPRequestNotSentError(f"MCP connection {self.name} is not running")
+        if not self._on_own_loop():
+            msg = f"MCP connection {self.name} belongs to another event loop"
+            raise MCPRequestNotSentError(msg)
+
+        request_id = next(self._ids)
+        future: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}}
+
+        try:
+            await self._write(message)
+            self.requests_sent += 1
+            response = await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+        if "error" in response:
+            msg = f"MCP error for {method}: {response['error']}"
+            raise RuntimeError(msg)
+        return response.get("result", {})
+
+    async def notify(self, method: str, params: dict[str, Any] | None = None) -> None:
+        """Send a JSON-RPC notification (no id, no response)."""
+        message: dict[str, Any] = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        await self._write(message)
+
+    async def _write(self, message: dict[str, Any]) -> None:
+        assert self._process is not None and self._process.stdin is not None
+        data = (json.dumps(message) + "\n").encode()
+        try:
+            async with self._write_lock:
+                self._process.stdin.write(data)
+                await self._process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError) as e:
+            msg = f"MCP connection {self.name} closed while writing: {e}"
+            raise MCPRequestNotSentError(msg) from e
+
+    async def _read_responses(self) -> None:
+        """Resolve pending futures by response id until the server closes stdout."""
+        assert self._process is not None and self._process.stdout is not None
+        stdout = self._process.stdout
+        try:
+            while True:
+                line = await stdout.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    # Some servers log to stdout; ignore anything that is not JSON-RPC
+                    logger.debug(f"Ignoring non-JSON line from MCP server {self.name}")
+                    continue
+                if not isinstance(message, dict):
+                    continue
+                if "method" in message:
+                    # Server-initiated notification/request; ids there are the server's own
+                    logger.debug(f"MCP message from {self.name}: {message.get('method')}")
+                    continue
+                future = self._pending.get(message.get("id"))  # type: ignore[arg-type]
+                if future is not None and not future.done():
+                    future.set_result(message)
+        except Exception as e:
+            logger.warning(f"MCP reader for {self.name} stopped: {e}")
+        finally:
+            self._fail_pending(MCPTransportError(f"MCP server {self.name} closed its output"))
+
+    async def _drain_stderr(self) -> None:
+        # Keep the stderr pipe from filling up and blocking the server
+        assert self._process is not None and self._process.stderr is not None
+        stderr = self._process.stderr
+        while True:
+            line = await stderr.readline()
+            if not line:
+                return
+            logger.debug(f"MCP server {self.name} stderr: {line.decode(errors='replace').rstrip()}")
+
+    def _fail_pending(self, exc: Exception) -> None:
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(exc)
+        self._pending.clear()
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Terminate the server process and stop the background tasks."""
+        self._closed = True
+        process = self._process
+        if process is not None and process.returncode is None:
+            try:
+                if process.stdin is not None:
+                    process.stdin.close()
+                process.terminate()
+                await asyncio.wait_for(process.wait(), timeout=timeout)
+            except (asyncio.TimeoutError, ProcessLookupError):
+                try:
+                    process.kill()
+                    await process.wait()
+                except ProcessLookupError:
+                    pass
+            except Exception as e:
+                logger.warning(f"Error closing MCP connection {self.name}: {e}")
+        for task in (self._reader_task, self._stderr_task):
+            if task is not None and not task.done():
+                task.cancel()
+        self._fail_pending(MCPTransportError(f"MCP connection {self.name} closed"))
+
+    def abandon(self) -> None:
+        """Kill the process of a connection whose event loop is gone or elsewhere.
+
+        Its tasks and futures belong to that loop and cannot be awaited from the
+        caller's loop, so the process is killed without waiting for it. The
+        subprocess transport is closed here as well; left to the garbage
+        collector, it would try to schedule its cleanup on the closed loop.
+        """
+        self._closed = True
+        self._pending.clear()
+        process = self._process
+        if process is None:
+            return
+        with contextlib.suppress(ProcessLookupError, RuntimeError):
+            process.kill()
+        # Process has no public accessor for its SubprocessTransport
+        transport = process._transport  # type: ignore[attr-defined]
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            # Transports are not thread-safe; let the owning loop close it
+            loop.call_soon_threadsafe(transport.close)
+            return
+        # The pipe transports cannot schedule their connection_lost callbacks
+        # on a closed loop, but the transport is marked closed before that
+        with contextlib.suppress(RuntimeError):
+            transport.close()
+
+
+class _LoopConnections:
+    """Connections and spawn lock owned by one event loop."""
+
+    def __init__(self) -> None:
+        self.connections: list[MCPStdioConnection] = []
+        self.spawn_lock = asyncio.Lock()
+
+
+class MCPConnectionPool:
+    """Small pool of multiplexed MCP server processes.
+
+    Requests go to the least-loaded live connection. A new process is spawned
+    only when every existing one already has ``max_in_flight`` requests
+    outstanding and the pool is below ``size``; dead processes are replaced on
+    the next request. ``size`` applies per event loop, and processes of loops
+    that have since closed are killed when a new loop first uses the pool.
+    """
+
+    def __init__(
+        self,
+        command_factory: Callable[[], list[str]],
+        env: dict[str, str] | None = None,
+        size: int = 2,
+        max_in_flight: int = 8,
+        init_timeout: float = 10.0,
+    ) -> None:
+        self.command_factory = command_factory
+        self.env = env
+        self.size = max(1, size)
+        self.max_in_flight = max(1, max_in_flight)
+        self.init_timeout = init_timeout
+
+        # Loops may run in other threads (safe_async_call), hence the thread lock
+        self._loops: dict[asyncio.AbstractEventLoop, _LoopConnections] = {}
+        self._loops_lock = threading.Lock()
+        self._spawned = 0
+
+    @property
+    def connections(self) -> list[MCPStdioConnection]:
+        with self._loops_lock:
+            return [c for state in self._loops.values() for c in state.connections]
+
+    def _loop_connections(self) -> _LoopConnections:
+        loop = asyncio.get_running_loop()
+        with self._loops_lock:
+            state = self._loops.get(loop)
+            if state is None:
+                self._abandon_loops(lambda other: other.is_closed())
+                state = self._loops[loop] = _LoopConnections()
+            return state
+
+    def _abandon_loops(self, predicate: Callable[[asyncio.AbstractEventLoop], bool]) -> None:
+        # Caller holds _loops_lock
+        for loop in [loop for loop in self._loops if predicate(loop)]:
+            for conn in self._loops.pop(loop).connections:
+                conn.abandon()
+
+    def _least_loaded(self, state: _LoopConnections) -> MCPStdioConnection | None:
+        live = [c for c in state.connections if c.is_alive]
+        if not live:
+            return None
+        return min(live, key=lambda c: c.in_flight)
+
+    def _should_spawn(self, state: _LoopConnections, least_loaded: MCPStdioConnection | None) -> bool:
+        if least_loaded is None:
+            return True
+        live = sum(1 for c in state.connections if c.is_alive)
+        return least_loaded.in_flight >= self.max_in_flight and live < self.size
+
+    async def acquire(self) -> MCPStdioConnection:
+        """Return the least-loaded live connection, spawning one if all are saturated."""
+        state = self._loop_connections()
+        conn = self._least_loaded(state)
+        if not self._should_spawn(state, conn):
+            assert conn is not None
+            return conn
+
+        # Only spawning is serialized; requests on existing processes never wait here
+        async with state.spawn_lock:
+            state.connections = [c for c in state.connections if c.is_alive]
+            conn = self._least_loaded(state)
+            if not self._should_spawn(state, conn):
+                assert conn is not None
+                return conn
+
+            self._spawned += 1
+            new_conn = MCPStdioConnection(
+                self.command_factory(), env=self.env, name=f"mcp-{self._spawned}",
+            )
+            await new_conn.start(init_timeout=self.init_timeout)
+            state.connections.append(new_conn)
+            return new_conn
+
+    async def request(
+        self, method: str, params: dict[str, Any] | None = None, timeout: float = 30.0,
+    ) -> Any:
+        """Send a request on the pool.
+
+        If the chosen process died, the request is resent once on a fresh process
+        when it never reached the server or ``method`` is read-only (see
+        RETRYABLE_METHODS). Otherwise MCPTransportError is raised, since the
+        server may already have acted on it.
+        """
+        for attempt in range(2):
+            conn = await self.acquire()
+            try:
+                return await conn.request(method, params, timeout=timeout)
+            except MCPTransportError as e:
+                await conn.close()
+                retryable = isinstance(e, MCPRequestNotSentError) or method in RETRYABLE_METHODS
+                if attempt == 1 or not retryable:
+                    raise
+                logger.warning(f"MCP connection {conn.name} lost, retrying {method} on a fresh process")
+        raise MCPTransportError("unreachable")  # pragma: no cover
+
+    async def close(self) -> None:
+        """Close this loop's processes; processes of other loops are killed."""
+        loop = asyncio.get_running_loop()
+        with self._loops_lock:
+            state = self._loops.pop(loop, None)
+            self._abandon_loops(lambda other: True)
+        if state is not None:
+            async with state.spawn_lock:
+                await asyncio.gather(*(c.close() for c in state.connections), return_exceptions=True)
+                state.connections.clear()
+
+    def stats(self) -> dict[str, Any]:
+        connections = self.connections
+        return {
+            "size": self.size,
+            "max_in_flight": self.max_in_flight,
+            "event_loops": len(self._loops),
+            "live_connections": sum(1 for c in connections if c.is_alive),
+            "in_flight": sum(c.in_flight for c in connections),
+            "processes_spawned": self._spawned,
+            "requests_sent": sum(c.requests_sent for c in connections),
+        }
@@ -10,6 +10,7 @@ from datetime import datetime
 from typing import Any
 
 from src.healthcare_mcp.phi_detection import PHIDetector
+from src.healthcare_mcp.phi_scan_engine import PHIScanEngine
 
 from core.infrastructure.healthcare_logger import get_healthcare_logger
 
@@ -38,6 +39,91 @@ def get_phi_detector() -> PHIDetector:
     return _phi_detector
 
 
+# Clear external medical source indicators
+EXTERNAL_INDICATORS = [
+    "pubmed.ncbi.nlm.nih.gov",
+    "doi.org/",
+    "clinicaltrials.gov",
+    "ncbi.nlm.nih.gov",
+    "nih.gov",
+    "who.int",
+    "cdc.gov",
+    "fda.gov",
+    "medical journal",
+    "peer reviewed",
+    "published in",
+    "abstract:",
+    "citation:",
+    "pmid:",
+    "issn:",
+    "volume",
+    "issue",
+]
+
+# Medical terminology that should be exempted from PHI detection
+MEDICAL_TERMS = [
+    "cardiovascular",
+    "diabetes",
+    "hypertension",
+    "cancer",
+    "treatment",
+    "prevention",
+    "symptoms",
+    "diagnosis",
+    "therapy",
+    "medication",
+    "research",
+    "study",
+    "clinical",
+    "health",
+    "disease",
+    "condition",
+    "patient care",
+    "healthcare",
+    "medical",
+    "guidelines",
+    "protocol",
+    "intervention",
+    "management",
+    "prognosis",
+    "pathology",
+    "epidemiology",
+    "immunology",
+    "neurology",
+    "cardiology",
+    "oncology",
+    "psychiatry",
+    "pediatrics",
+    "geriatrics",
+    "surgery",
+    "radiology",
+    "pathophysiology",
+]
+
+# Medical query patterns that indicate legitimate medical research
+MEDICAL_QUERY_PATTERNS = [
+    "find.*research",
+    "recent.*studies",
+    "treatment.*options",
+    "prevention.*strategies",
+    "clinical.*guidelines",
+    "medical.*literature",
+    "health.*information",
+    "disease.*management",
+    "therapeutic.*approaches",
+]
+
+# One engine sweep tags every match with its group, so a single pass over the
+# content tells which of the three checks below apply
+_EXTERNAL_MEDICAL_CONTENT = PHIScanEngine(
+    [
+        ("external_source", "|".join(map(re.escape, EXTERNAL_INDICATORS))),
+        ("medical_terminology", "|".join(map(re.escape, MEDICAL_TERMS))),
+        ("medical_query", "|".join(f"(?:{pattern})" for pattern in MEDICAL_QUERY_PATTERNS)),
+    ],
+)
+
+
 def _is_external_medical_content(content: str) -> bool:
     """
     Check if content appears to be external medical literature/research content
@@ -53,98 +139,17 @@ def _is_external_medical_content(content: str) -> bool:
     if not content or not isinstance(content, str):
         return False
 
-    content_lower = content.lower()
-
-    # Check for clear external medical source indicators
-    external_indicators = [
-        "pubmed.ncbi.nlm.nih.gov",
-        "doi.org/",
-        "clinicaltrials.gov",
-        "ncbi.nlm.nih.gov",
-        "nih.gov",
-        "who.int",
-        "cdc.gov",
-        "fda.gov",
-        "medical journal",
-        "peer reviewed",
-        "published in",
-        "abstract:",
-        "citation:",
-        "pmid:",
-        "issn:",
-        "volume",
-        "issue",
-    ]
-
-    # Medical terminology that should be exempted from PHI detection
-    medical_terms = [
-        "cardiovascular",
-        "diabetes",
-        "hypertension",
-        "cancer",
-        "treatment",
-        "prevention",
-        "symptoms",
-        "diagnosis",
-        "therapy",
-        "medication",
-        "research",
-        "study",
-        "clinical",
-        "health",
-        "disease",
-        "condition",
-        "patient care",
-        "healthcare",
-        "medical",
-        "guidelines",
-        "protocol",
-        "intervention",
-        "management",
-        "prognosis",
-        "pathology",
-        "epidemiology",
-        "immunology",
-        "neurology",
-        "cardiology",
-        "oncology",
-        "psychiatry",
-        "pediatrics",
-        "geriatrics",
-        "surgery",
-        "radiology",
-        "pathophysiology",
-    ]
-
-    # Medical query patterns that indicate legitimate medical research
-    medical_query_patterns = [
-        "find.*research",
-        "recent.*studies",
-        "treatment.*options",
-        "prevention.*strategies",
-        "clinical.*guidelines",
-        "medical.*literature",
-        "health.*information",
-        "disease.*management",
-        "therapeutic.*approaches",
-    ]
-
-    # Check if content contains clear external source indicators
-    if any(indicator in content_lower for indicator in external_indicators):
+    groups = _EXTERNAL_MEDICAL_CONTENT.count_by_type(content)
+    if not groups:
+        return False
+    if "external_source" in groups:
         return True
-
-    # Check if content contains medical terminology
-    if any(term in content_lower for term in medical_terms):
+    if "medical_terminology" in groups:
         logger.info(f"🏥 Medical terminology detected, exempting from PHI: {content[:50]}...")
         return True
 
-    # Check for medical query patterns
-    for pattern in medical_query_patterns:
-        if re.search(pattern, content_lower):
-            logger.info(f"🔬 Medical query pattern detected, exempting from PHI: {content[:50]}...")
-            return True
-
-    return False
+    logger.info(f"🔬 Medical query pattern detected, exempting from PHI: {content[:50]}...")
+    return True
 
 
 def sanitize_request_data(request_data: dict[str, Any]) -> dict[str, Any]:
@@ -161,6 +166,9 @@ def sanitize_request_data(request_data: dict[str, Any]) -> dict[str, Any]:
         detector = get_phi_detector()
         sanitized_data = request_data.copy()
 
+        # Collect every field to scan, then detect PHI in one batch
+        fields: dict[str, str] = {}
+
         # Sanitize messages content if present (OpenAI format)
         if "messages" in sanitized_data:
             for i, message in enumerate(sanitized_data["messages"]):
@@ -173,25 +181,30 @@ def sanitize_request_data(request_data: dict[str, Any]) -> dict[str, Any]:
                                 f"🔬 External medical content detected, skipping PHI sanitization: {content[:50]}...",
                             )
                             continue
-
-                        result = detector.detect_phi_sync(content)
-                        if result.phi_detected:
-                            sanitized_data["messages"][i]["content"] = result.masked_text
-                            logger.warning(
-                                f"🛡️ PHI detected in request message {i}, types: {result.phi_types}",
-                            )
+                        fields[f"messages.{i}"] = content
 
         # Sanitize top-level message field (if present)
         if "message" in sanitized_data and isinstance(sanitized_data["message"], str):
             # Skip PHI detection for external medical content
             if not _is_external_medical_content(sanitized_data["message"]):
-                result = detector.detect_phi_sync(sanitized_data["message"])
-                if result.phi_detected:
-                    sanitized_data["message"] = result.masked_text
-                    logger.warning(f"🛡️ PHI detected in request message, types: {result.phi_types}")
+                fields["message"] = sanitized_data["message"]
             else:
                 logger.info("🔬 External medical content detected, skipping PHI sanitization")
 
+        results = detector.detect_phi_batch(fields) if fields else {}
+        for field, result in results.items():
+            if not result.phi_detected:
+                continue
+            if field == "message":
+                sanitized_data["message"] = result.masked_text
+                logger.warning(f"🛡️ PHI detected in request message, types: {result.phi_types}")
+            else:
+                i = int(field.removeprefix("messages."))
+                sanitized_data["messages"][i]["content"] = result.masked_text
+                logger.warning(
+                    f"🛡️ PHI detected in request message {i}, types: {result.phi_types}",
+                )
+
         return sanitized_data
 
     except Exception as e:
@@ -214,6 +227,9 @@ def sanitize_response_data(response_data: dict[str, Any]) -> dict[str, Any]:
         detector = get_phi_detector()
         sanitized_data = response_data.copy()
 
+        # Collect every field to scan, then detect PHI in one batch
+        fields: dict[str, str] = {}
+
         # Sanitize choices content if present (OpenAI format)
         if "choices" in sanitized_data:
             for i, choice in enumerate(sanitized_data["choices"]):
@@ -228,29 +244,32 @@ def sanitize_response_data(response_data: dict[str, Any]) -> dict[str, Any]:
                                     f"🔬 External medical content detected in response, skipping PHI sanitization: {content[:50]}...",
                                 )
                                 continue
-
-                            result = detector.detect_phi_sync(content)
-                            if result.phi_detected:
-                                sanitized_data["choices"][i]["message"]["content"] = (
-                                    result.masked_text
-                                )
-                                logger.warning(
-                                    f"🛡️ PHI detected in response choice {i}, types: {result.phi_types}",
-                                )
+                            fields[f"choices.{i}"] = content
 
         # Sanitize top-level response content (if present)
         if "response" in sanitized_data and isinstance(sanitized_data["response"], str):
             # Skip PHI detection for external medical content
             if not _is_external_medical_content(sanitized_data["response"]):
-                result = detector.detect_phi_sync(sanitized_data["response"])
-                if result.phi_detected:
-                    sanitized_data["response"] = result.masked_text
-                    logger.warning(f"🛡️ PHI detected in response, types: {result.phi_types}")
+                fields["response"] = sanitized_data["response"]
             else:
                 logger.info(
                     "🔬 External medical content detected in response, skipping PHI sanitization",
                 )
 
+        results = detector.detect_phi_batch(fields) if fields else {}
+        for field, result in results.items():
+            if not result.phi_detected:
+                continue
+            if field == "response":
+                sanitized_data["response"] = result.masked_text
+                logger.warning(f"🛡️ PHI detected in response, types: {result.phi_types}")
+            else:
+                i = int(field.removeprefix("choices."))
+                sanitized_data["choices"][i]["message"]["content"] = result.masked_text
+                logger.warning(
+                    f"🛡️ PHI detected in response choice {i}, types: {result.phi_types}",
+                )
+
         return sanitized_data
 
     except Exception as e:
@@ -8,6 +8,7 @@ import base64
 import hashlib
 import json
 import logging
+import os
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any, Optional
@@ -15,7 +16,12 @@ from typing import Any, Optional
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from fastapi import WebSocket
 
+from config.transcription_config_loader import TRANSCRIPTION_CONFIG
 from core.infrastructure.healthcare_logger import get_healthcare_logger
+from src.healthcare_mcp.incremental_phi_scanner import (
+    IncrementalPHIScanner,
+    create_transcript_scanner,
+)
 from src.security.encryption_manager import EncryptionLevel, EncryptionManager
 
 # Import configuration system
@@ -39,6 +45,7 @@ class ChunkContext:
     previous_transcription_tail: str  # Last words for context
     medical_context: dict[str, Any]  # Accumulated medical entities
     soap_progress: dict[str, str]  # Progressive SOAP building
+    phi_scanner: IncrementalPHIScanner | None = None  # Streaming PHI state across chunks
 
 
 class SecureTranscriptionHandler:
@@ -74,6 +81,9 @@ class SecureTranscriptionHandler:
                 self.max_concurrent_chunks = config.performance.max_concurrent_chunks
                 self.chunk_processing_timeout = config.performance.chunk_processing_timeout_seconds
                 
+                # PHI protection configuration
+                self.phi_protection_enabled = config.phi_protection.enabled
+                
                 self.logger.info(f"Loaded chunked transcription config: chunks={self.chunk_duration}s, "
                                f"overlap={self.chunk_overlap}s, sample_rate={self.sample_rate}Hz, "
                                f"encryption={self.encryption_enabled}")
@@ -84,6 +94,9 @@ class SecureTranscriptionHandler:
         else:
             self._set_default_config()
         
+        # Transcript text held back per chunk boundary for cross-chunk PHI
+        self.phi_boundary_window_chars = TRANSCRIPTION_CONFIG.realtime.phi_boundary_window_chars
+        
         # Security configuration
         self.encryption_level = EncryptionLevel.HEALTHCARE
         self.session_keys: dict[str, bytes] = {}  # Session-specific encryption keys
@@ -99,6 +112,7 @@ class SecureTranscriptionHandler:
         self.key_rotation_interval = 3600  # 1 hour
         self.max_concurrent_chunks = 10
         self.chunk_processing_timeout = 30
+        self.phi_protection_enabled = True
     
     async def handle_encrypted_chunk(
         self,
@@ -137,6 +151,12 @@ class SecureTranscriptionHandler:
                 merged_audio, context
             )
             
+            # 4a. Redact PHI in the new text only; the scanner carries the boundary
+            if self.phi_protection_enabled:
+                transcription_result["text"] = self._redact_transcript_phi(
+                    context, transcription_result.get("text", "")
+                )
+            
             # 5. Extract medical entities and generate insights
             medical_insights = await self._generate_medical_insights(
                 transcription_result, context
@@ -148,18 +168,7 @@ class SecureTranscriptionHandler:
             )
             
             # 7. Encrypt and send insights back
-            encrypted_response = await self._encrypt_insights(
-                session_id, medical_insights
-            )
-            
-            await websocket.send_json({
-                "type": "medical_insights",
-                "session_id": session_id,
-                "chunk_number": context.chunk_number,
-                "encrypted_data": encrypted_response["data"],
-                "nonce": encrypted_response["nonce"],
-                "timestamp": datetime.utcnow().isoformat()
-            })
+            await self._send_insights(websocket, session_id, context, medical_insights)
             
             # Increment chunk counter
             context.chunk_number += 1
@@ -173,6 +182,32 @@ class SecureTranscriptionHandler:
                 "error_code": "CHUNK_PROCESSING_ERROR"
             })
     
+    async def _send_insights(
+        self,
+        websocket: WebSocket,
+        session_id: str,
+        context: ChunkContext,
+        medical_insights: dict[str, Any],
+        final: bool = False
+    ) -> None:
+        """Encrypt insights with the session key and send them to the client"""
+        
+        encrypted_response = await self._encrypt_insights(
+            session_id, medical_insights
+        )
+        
+        message = {
+            "type": "medical_insights",
+            "session_id": session_id,
+            "chunk_number": context.chunk_number,
+            "encrypted_data": encrypted_response["data"],
+            "nonce": encrypted_response["nonce"],
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        if final:
+            message["final"] = True
+        await websocket.send_json(message)
+    
     async def initialize_secure_session(
         self,
         websocket: WebSocket,
@@ -424,7 +459,7 @@ class SecureTranscriptionHandler:
         
         # Encrypt with AES-GCM
         aesgcm = AESGCM(session_key)
-        nonce = AESGCM.generate_key(bit_length=96)  # 12 bytes for GCM
+        nonce = os.urandom(12)  # 96-bit GCM nonce
         encrypted_insights = aesgcm.encrypt(nonce, insights_bytes, None)
         
         return {
@@ -432,6 +467,18 @@ class SecureTranscriptionHandler:
             "nonce": base64.b64encode(nonce).decode()
         }
     
+    def _redact_transcript_phi(self, context: ChunkContext, text: str) -> str:
+        """
+        Redact PHI incrementally for a session
+        
+        Returns masked text that is final; text near the chunk boundary is held
+        back until the next chunk so PHI split across chunks is still caught
+        """
+        
+        if context.phi_scanner is None:
+            context.phi_scanner = create_transcript_scanner(self.phi_boundary_window_chars)
+        return context.phi_scanner.feed(text)
+    
     def _get_or_create_context(self, session_id: str) -> ChunkContext:
         """Get existing context or create new one"""
         
@@ -459,8 +506,28 @@ class SecureTranscriptionHandler:
         
         return self.chunk_contexts[session_id]
     
-    async def cleanup_session(self, session_id: str) -> None:
-        """Clean up session data and keys"""
+    async def cleanup_session(self, session_id: str, websocket: Optional[WebSocket] = None) -> None:
+        """
+        Clean up session data and keys
+        
+        The transcript tail held back by the PHI scanner is redacted first and,
+        when the websocket is still open, sent as the session's final insights
+        """
+        
+        context = self.chunk_contexts.get(session_id)
+        if context is not None and context.phi_scanner is not None:
+            tail = context.phi_scanner.flush()
+            if tail and websocket is not None and session_id in self.session_keys:
+                try:
+                    transcription_result = {"text": tail, "confidence": 0.0}
+                    medical_insights = await self._generate_medical_insights(
+                        transcription_result, context
+                    )
+                    await self._send_insights(
+                        websocket, session_id, context, medical_insights, final=True
+                    )
+                except Exception as e:
+                    self.logger.warning(f"Failed to send transcript tail for {session_id}: {e}")
         
         # Remove session key
         if session_id in self.session_keys:
@@ -1247,7 +1247,23 @@ class SessionManager:
             session["status"] = "completed"
             session["end_time"] = datetime.utcnow()
 
-            full_transcription = " ".join([
+            # Collect the transcript tail held back for cross-chunk PHI scanning
+            transcription_agent = discovered_agents.get("transcription")
+            if transcription_agent:
+                tail = await transcription_agent.process_request({
+                    "real_time": True,
+                    "end_session": True,
+                    "session_id": session_id,
+                })
+                if tail.get("success") and tail.get("transcription"):
+                    session["transcription_buffer"].append({
+                        "timestamp": datetime.utcnow().isoformat(),
+                        "text": tail["transcription"],
+                        "confidence": 0.0,
+                    })
+
+            # Chunk texts are consecutive slices of one redacted transcript
+            full_transcription = "".join([
                 chunk["text"] for chunk in session["transcription_buffer"]
             ])
 
@@ -1447,7 +1463,7 @@ async def generate_soap_from_session_endpoint(request: GenerateSOAPRequest):
             raise HTTPException(status_code=400, detail="No transcription data in session")
 
         # Create session summary
-        full_transcription = " ".join([
+        full_transcription = "".join([
             chunk["text"] for chunk in session["transcription_buffer"]
         ])
 
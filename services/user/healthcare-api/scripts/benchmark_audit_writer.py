@@ -0,0 +1,150 @@
+"""
+PHI access audit write benchmark for SecureDatabaseManager.
+
+Runs a burst of concurrent PHI queries and audits each one two ways:
+- inline: acquire a private-pool connection and INSERT one phi_access_audit row
+  per query before returning, which is the previous behaviour
+- batched: BatchedAuditWriter.submit journals the row to the local spill and
+  returns; the background task stores rows with one COPY per batch
+
+The database is simulated with an asyncio semaphore for the pool and a sleep
+per round trip plus a per-row cost, so the numbers show audit latency added to
+each query and how many round trips the audit table takes.
+
+Run: python3 services/user/healthcare-api/scripts/benchmark_audit_writer.py [--queries 5000]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# healthcare-api package root is one level up from this script's directory
+API_PATH = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(API_PATH / "core" / "database"))
+
+# Imported from its directory: core/__init__ pulls in the full service stack
+from audit_writer import BatchedAuditWriter  # noqa: E402
+
+
+class SimulatedPool:
+    """Connection pool whose statements cost a round trip plus a per-row cost"""
+
+    def __init__(self, size: int, round_trip: float, per_row: float) -> None:
+        self.connections = asyncio.Semaphore(size)
+        self.round_trip = round_trip
+        self.per_row = per_row
+        self.statements = 0
+        self.rows = 0
+
+    async def write(self, rows: int) -> None:
+        async with self.connections:
+            self.statements += 1
+            self.rows += rows
+            await asyncio.sleep(self.round_trip + self.per_row * rows)
+
+
+def audit_row(index: int) -> dict:
+    return {
+        "table_name": "appointments",
+        "operation": "SELECT",
+        "user_id": f"provider_{index % 40}",
+        "accessed_at": datetime.utcnow(),
+        "query_hash": f"{index:064x}",
+        "session_id": f"session_{index % 200}",
+        "success": True,
+        "error_message": None,
+    }
+
+
+async def run_queries(queries: int, concurrency: int, audit) -> list[float]:
+    """Per-query audit latency in seconds"""
+    latencies: list[float] = []
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(index: int) -> None:
+        async with slots:
+            start = time.perf_counter()
+            await audit(audit_row(index))
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(index) for index in range(queries)))
+    return latencies
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def benchmark(args: argparse.Namespace) -> None:
+    round_trip = args.round_trip_ms / 1000
+    per_row = args.per_row_us / 1e6
+
+    inline_pool = SimulatedPool(args.pool_size, round_trip, per_row)
+
+    async def inline(record: dict) -> None:
+        await inline_pool.write(1)
+
+    start = time.perf_counter()
+    inline_latencies = await run_queries(args.queries, args.concurrency, inline)
+    inline_total = time.perf_counter() - start
+
+    batched_pool = SimulatedPool(args.pool_size, round_trip, per_row)
+
+    async def sink(records: list[dict]) -> None:
+        await batched_pool.write(len(records))
+
+    with tempfile.TemporaryDirectory() as spill_dir:
+        writer = BatchedAuditWriter(
+            sink, batch_size=args.batch_size, flush_interval_seconds=0.05, spill_dir=spill_dir,
+        )
+        await writer.start()
+
+        async def batched(record: dict) -> None:
+            writer.submit(record)
+
+        start = time.perf_counter()
+        batched_latencies = await run_queries(args.queries, args.concurrency, batched)
+        submitted = time.perf_counter() - start
+        await writer.close()
+        batched_total = time.perf_counter() - start
+        metrics = writer.get_metrics()
+
+    assert batched_pool.rows == args.queries, "batched writer lost audit rows"
+
+    print(
+        f"{args.queries} audited PHI queries, concurrency {args.concurrency}, "
+        f"pool {args.pool_size}, {args.round_trip_ms} ms round trip",
+    )
+    for label, latencies, pool, total in (
+        ("inline", inline_latencies, inline_pool, inline_total),
+        ("batched", batched_latencies, batched_pool, batched_total),
+    ):
+        print(
+            f"  {label:8s} audit p50 {percentile(latencies, 0.5) * 1e6:9.1f} us  "
+            f"p99 {percentile(latencies, 0.99) * 1e6:9.1f} us  "
+            f"{pool.statements:6d} audit statements  all stored after {total * 1e3:8.1f} ms",
+        )
+    print(
+        f"  batched submit phase {submitted * 1e3:.1f} ms; {metrics['flush_count']} flushes, "
+        f"avg {metrics['avg_flush_ms']} ms, max {metrics['max_flush_ms']} ms",
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--pool-size", type=int, default=25, help="private pool max_size")
+    parser.add_argument("--round-trip-ms", type=float, default=0.5, help="simulated DB latency")
+    parser.add_argument("--per-row-us", type=float, default=5.0, help="simulated insert cost per row")
+    parser.add_argument("--batch-size", type=int, default=500)
+    asyncio.run(benchmark(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
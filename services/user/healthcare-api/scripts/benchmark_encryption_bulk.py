@@ -0,0 +1,166 @@
+"""
+Bulk PHI field encryption benchmark for HealthcareEncryptionManager.
+
+Encrypts and decrypts a synthetic patient-record set three ways:
+- uncached: key cache disabled and key usage rows written one at a time, which
+  is the previous behaviour (SELECT + master-key unwrap + usage INSERT per field)
+- cached: encrypt_phi_data/decrypt_data per field with the data-key cache and
+  batched usage logging
+- bulk: encrypt_many/decrypt_many over the whole record set with one cipher
+
+The database is an in-memory DB-API connection that sleeps for a configurable
+round trip per statement, so the numbers show how much of each path is spent
+waiting on PostgreSQL rather than encrypting.
+
+Run: python3 services/user/healthcare-api/scripts/benchmark_encryption_bulk.py [--records 500]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+from cryptography.fernet import Fernet
+
+# healthcare-api package root is one level up from this script's directory
+API_PATH = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(API_PATH))
+os.environ.setdefault("ENVIRONMENT", "development")
+
+from src.security.encryption_manager import (  # noqa: E402
+    EncryptionLevel,
+    HealthcareEncryptionManager,
+)
+
+
+class LatencyCursor:
+    """Just enough of a psycopg2 cursor for the key tables"""
+
+    def __init__(self, db: "LatencyConnection") -> None:
+        self.db = db
+        self.result: list[tuple] = []
+
+    def __enter__(self) -> "LatencyCursor":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+    def execute(self, sql: str, params: tuple | list = ()) -> None:
+        self.db.statements += 1
+        time.sleep(self.db.round_trip)
+        statement = " ".join(sql.split())
+        keys = self.db.keys
+        if statement.startswith("INSERT INTO encryption_keys"):
+            key_id, *_, encrypted_key, is_active, expires_at = params
+            keys[key_id] = [encrypted_key, is_active, expires_at]
+        elif statement.startswith("SELECT key_id, encryption_level"):
+            self.result = [(key_id, key_id.removeprefix("default_")) for key_id in keys]
+        elif statement.startswith("UPDATE encryption_keys SET key_id"):
+            new_id, old_id = params
+            keys[new_id] = keys.pop(old_id)
+        elif statement.startswith("SELECT encrypted_key"):
+            row = keys.get(params[0])
+            self.result = [tuple(row)] if row else []
+
+    def fetchone(self) -> tuple | None:
+        return self.result[0] if self.result else None
+
+    def fetchall(self) -> list[tuple]:
+        return self.result
+
+
+class LatencyConnection:
+    def __init__(self, round_trip: float) -> None:
+        self.round_trip = round_trip
+        self.keys: dict[str, list] = {}
+        self.statements = 0
+
+    def create_connection(self) -> "LatencyConnection":
+        return self
+
+    def cursor(self) -> LatencyCursor:
+        return LatencyCursor(self)
+
+    def commit(self) -> None:
+        return None
+
+    def rollback(self) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+def make_records(rng: random.Random, count: int) -> list[dict]:
+    first = ["Maria", "James", "Aisha", "Robert", "Linh", "Carlos"]
+    last = ["Garcia", "Thompson", "Okafor", "Nguyen", "Patel", "Reyes"]
+    return [
+        {
+            "name": f"{rng.choice(first)} {rng.choice(last)}",
+            "dob": f"19{rng.randint(30, 99)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "mrn": f"MED{rng.randint(100000, 999999)}",
+            "phone": f"{rng.randint(201, 989)}-{rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+            "notes": "Follow-up for hypertension, continue lisinopril 10 mg daily.",
+        }
+        for _ in range(count)
+    ]
+
+
+def build_manager(round_trip: float, cached: bool) -> tuple[HealthcareEncryptionManager, LatencyConnection]:
+    db = LatencyConnection(round_trip)
+    config = {"master_key_override": Fernet.generate_key()}
+    if not cached:
+        config.update({"key_cache_ttl_seconds": 0, "key_usage_log_batch_size": 1})
+    manager = HealthcareEncryptionManager(db, config)
+    db.statements = 0
+    return manager, db
+
+
+def run(manager, db, records, level, bulk: bool) -> tuple[float, int, list]:
+    start = time.perf_counter()
+    if bulk:
+        packages = manager.encrypt_many(records, level)
+        decrypted = manager.decrypt_many(packages)
+    else:
+        packages = [manager._encrypt_data(record, level) for record in records]
+        decrypted = [manager.decrypt_data(package) for package in packages]
+    manager.flush_key_usage_log()
+    return time.perf_counter() - start, db.statements, decrypted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=500)
+    parser.add_argument("--round-trip-ms", type=float, default=0.3, help="simulated DB latency")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    records = make_records(random.Random(args.seed), args.records)
+    round_trip = args.round_trip_ms / 1000
+
+    print(f"{args.records} records, {args.round_trip_ms} ms simulated round trip")
+    for level in (EncryptionLevel.HEALTHCARE, EncryptionLevel.CRITICAL):
+        print(f"  {level.value}:")
+        baseline = None
+        for label, cached, bulk in (
+            ("uncached", False, False),
+            ("cached", True, False),
+            ("bulk", True, True),
+        ):
+            manager, db = build_manager(round_trip, cached)
+            elapsed, statements, decrypted = run(manager, db, records, level, bulk)
+            assert decrypted == records, f"{label} round trip mismatch"
+            baseline = baseline or elapsed
+            print(
+                f"    {label:9s} {elapsed / args.records * 1e6:9.1f} us/record  "
+                f"{statements:6d} DB statements  {baseline / elapsed:6.1f}x",
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+HealthcareCacheManager hit-path benchmark.
+
+Compares the previous hit path (GET full JSON entry, json.loads, bump access
+metadata, json.dumps, SETEX) with the current one (single hash script call
+returning only the payload) for a medical-literature sized result, plus
+json vs orjson payload codec cost.
+
+Run: python3 services/user/healthcare-api/scripts/benchmark_healthcare_cache.py [--redis-url redis://localhost:6379/15]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# healthcare-api package root is one level up from this script's directory
+API_PATH = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(API_PATH))
+
+from core.infrastructure.healthcare_cache import (  # noqa: E402
+    CacheSecurityLevel,
+    CacheSerializer,
+    HealthcareCacheManager,
+)
+
+
+def literature_payload(articles: int = 50) -> list[dict]:
+    return [
+        {
+            "pmid": str(30000000 + i),
+            "title": f"Randomized trial of intervention {i} in adults with hypertension",
+            "abstract": "Background: " + "Blood pressure outcomes were assessed. " * 40,
+            "authors": [f"Author {j}" for j in range(8)],
+            "journal": "Journal of Clinical Hypertension",
+            "publication_date": "2023-05-01",
+            "mesh_terms": ["Hypertension", "Antihypertensive Agents", "Adult"],
+        }
+        for i in range(articles)
+    ]
+
+
+def bench_codecs(payload: list[dict], iterations: int) -> None:
+    print(f"Codec cost per op ({iterations} iterations):")
+    for name in (CacheSerializer.JSON, CacheSerializer.ORJSON):
+        codec = CacheSerializer(name)
+        if codec.name != name:
+            print(f"  {name:7s}: not installed")
+            continue
+        start = time.perf_counter()
+        for _ in range(iterations):
+            encoded = codec.dumps(payload)
+        dump_us = (time.perf_counter() - start) / iterations * 1e6
+        start = time.perf_counter()
+        for _ in range(iterations):
+            CacheSerializer.loads(encoded, name)
+        load_us = (time.perf_counter() - start) / iterations * 1e6
+        print(f"  {name:7s}: dumps {dump_us:8.1f}us  loads {load_us:8.1f}us  size {len(encoded)} bytes")
+
+
+async def legacy_get(client, key: str) -> object:
+    """Previous hit path: full read, decode, re-encode and rewrite of the entry."""
+    raw = await client.get(key)
+    entry = json.loads(raw)
+    entry["last_accessed"] = datetime.now().isoformat()
+    entry["access_count"] += 1
+    await client.setex(key, 3600, json.dumps(entry, default=str))
+    return entry["data"]
+
+
+async def bench_redis(redis_url: str, payload: list[dict], iterations: int) -> None:
+    for serializer in (CacheSerializer.JSON, CacheSerializer.ORJSON):
+        manager = HealthcareCacheManager(redis_url, serializer=serializer)
+        try:
+            await manager.initialize()
+        except Exception as e:
+            print(f"Redis unavailable at {redis_url} ({e}); skipping round-trip benchmark")
+            return
+        client = manager.redis_client
+        assert client is not None
+
+        if serializer == CacheSerializer.JSON:
+            legacy_key = "bench:legacy"
+            await client.set(
+                legacy_key,
+                json.dumps({"data": payload, "access_count": 0, "last_accessed": None}),
+            )
+            start = time.perf_counter()
+            for _ in range(iterations):
+                await legacy_get(client, legacy_key)
+            legacy_ms = (time.perf_counter() - start) / iterations * 1e3
+            await client.delete(legacy_key)
+            print(f"  legacy GET+SETEX (json) : {legacy_ms:7.3f} ms/hit, 2 round trips, payload re-encoded")
+
+        key = f"bench:hash:{serializer}"
+        await manager.set(key, payload, CacheSecurityLevel.PUBLIC)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await manager.get(key, CacheSecurityLevel.PUBLIC)
+        current_ms = (time.perf_counter() - start) / iterations * 1e3
+        meta = await manager.get_entry_metadata(key)
+        await manager.delete(key)
+        await manager.cleanup()
+        print(
+            f"  hash script ({manager.serializer.name:7s}) : {current_ms:7.3f} ms/hit, 1 round trip"
+            f" (access_count={meta.access_count if meta else '?'})",
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--articles", type=int, default=50)
+    args = parser.parse_args()
+
+    payload = literature_payload(args.articles)
+    bench_codecs(payload, args.iterations)
+    print(f"Cache hit latency ({args.iterations} hits, {args.articles} articles):")
+    asyncio.run(bench_redis(args.redis_url, payload, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Streaming PHI redaction benchmark for an hour-long live transcription session.
+
+Compares two ways of catching PHI that straddles chunk boundaries:
+- full rescan: re-scan and re-mask the whole transcript on every chunk, so the
+  per-chunk cost grows with the visit and the session total is quadratic
+- incremental: IncrementalPHIScanner scans only the new chunk plus the bounded
+  boundary window, so per-chunk cost is flat and the session total is linear
+
+The concatenated incremental deltas are checked against masking the whole
+transcript at once before timing. Chunks are split at arbitrary word positions,
+so dictated phone numbers and emails regularly span two chunks.
+
+Run: python3 services/user/healthcare-api/scripts/benchmark_incremental_phi.py [--minutes 60]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# healthcare-api package root is one level up from this script's directory
+API_PATH = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(API_PATH))
+
+from src.healthcare_mcp.incremental_phi_scanner import (  # noqa: E402
+    TRANSCRIPT_PHI_REPLACEMENTS,
+    create_transcript_scanner,
+)
+
+SENTENCES = [
+    "Patient reports worsening shortness of breath when climbing stairs.",
+    "Blood pressure today is 142 over 88 and heart rate is 92.",
+    "You can reach me at {phone} most afternoons.",
+    "My daughter's number is {digits} if I don't pick up.",
+    "Please send the results to {email} when they are ready.",
+    "Social security number is {ssn} for the insurance form.",
+    "We'll increase the furosemide to 40 milligrams twice daily.",
+    "Any chest pain, palpitations, or fainting spells? No, none of that.",
+    "Let's recheck the potassium and creatinine in one week.",
+    "Continue metoprolol and lisinopril at the current doses.",
+]
+
+# Spoken dictation runs around 150 words per minute
+WORDS_PER_MINUTE = 150
+
+
+def make_session(rng: random.Random, minutes: int, chunk_seconds: float) -> list[str]:
+    def fill(template: str) -> str:
+        return template.format(
+            phone=f"{rng.randint(201, 989)} {rng.randint(200, 999)} {rng.randint(1000, 9999)}",
+            digits=f"{rng.randint(2010000000, 9899999999)}",
+            email=f"pt{rng.randint(1, 9999)}@mailhost.org",
+            ssn=f"{rng.randint(100, 899)}-{rng.randint(10, 99)}-{rng.randint(1000, 9999)}",
+        )
+
+    words: list[str] = []
+    while len(words) < minutes * WORDS_PER_MINUTE:
+        words.extend(fill(rng.choice(SENTENCES)).split())
+
+    per_chunk = max(1, round(WORDS_PER_MINUTE * chunk_seconds / 60))
+    chunks = []
+    position = 0
+    while position < len(words):
+        size = rng.randint(max(1, per_chunk // 2), per_chunk * 3 // 2)
+        chunks.append(" ".join(words[position : position + size]))
+        position += size
+    return chunks
+
+
+def full_rescan(chunks: list[str]) -> list[float]:
+    """Mask the whole transcript on every chunk; returns per-chunk seconds"""
+    timings = []
+    transcript = ""
+    for chunk in chunks:
+        start = time.perf_counter()
+        transcript = f"{transcript} {chunk}" if transcript else chunk
+        scanner = create_transcript_scanner(len(transcript) + 1)
+        scanner.feed(transcript)
+        scanner.flush()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def incremental(chunks: list[str]) -> tuple[list[float], str, int]:
+    """Feed chunks to one streaming scanner; returns per-chunk seconds, output, chars scanned"""
+    scanner = create_transcript_scanner()
+    timings = []
+    parts = []
+    for chunk in chunks:
+        start = time.perf_counter()
+        parts.append(scanner.feed(chunk))
+        timings.append(time.perf_counter() - start)
+    parts.append(scanner.flush())
+    return timings, "".join(parts), scanner.scanned_chars
+
+
+def quarter_means(timings: list[float]) -> str:
+    size = max(1, len(timings) // 4)
+    quarters = [timings[i : i + size] for i in range(0, size * 4, size)]
+    return "  ".join(f"{sum(q) / len(q) * 1e6:8.1f}" for q in quarters if q)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--minutes", type=int, default=60, help="session length")
+    parser.add_argument("--chunk-seconds", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    chunks = make_session(rng, args.minutes, args.chunk_seconds)
+    transcript = " ".join(chunks)
+
+    reference = create_transcript_scanner(len(transcript) + 1)
+    expected = reference.feed(transcript) + reference.flush()
+    inc_timings, streamed, scanned = incremental(chunks)
+    assert streamed == expected, "incremental output differs from whole-transcript masking"
+    labels = set(TRANSCRIPT_PHI_REPLACEMENTS.values())
+    redactions = sum(expected.count(label) for label in labels)
+
+    full_timings = full_rescan(chunks)
+
+    print(
+        f"{args.minutes} min session: {len(chunks)} chunks, {len(transcript):,} chars, "
+        f"{redactions} redactions",
+    )
+    print("  per-chunk mean by session quarter (us):")
+    print(f"    full rescan  {quarter_means(full_timings)}")
+    print(f"    incremental  {quarter_means(inc_timings)}")
+    full_total = sum(full_timings)
+    inc_total = sum(inc_timings)
+    print(
+        f"  session total: full rescan {full_total * 1e3:8.1f} ms  "
+        f"incremental {inc_total * 1e3:8.1f} ms  speedup {full_total / inc_total:6.1f}x",
+    )
+    print(f"  chars scanned by incremental: {scanned:,} ({scanned / len(transcript):.2f}x transcript)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+MCP transport concurrency benchmark against a stub stdio MCP server.
+
+Compares the old behaviour (one request at a time on one process, as the
+connection lock in DirectMCPClient used to enforce) with the multiplexed
+MCPConnectionPool issuing all calls concurrently.
+
+Run: python3 services/user/healthcare-api/scripts/benchmark_mcp_transport.py [--calls 200] [--latency 0.05]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+# healthcare-api package root is one level up from this script's directory
+API_PATH = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(API_PATH))
+
+
+async def _run_stub_server(latency: float) -> None:
+    """Minimal stdio MCP server: answers tools/call after ``latency`` seconds, out of order."""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    pending: set[asyncio.Task[None]] = set()
+
+    def respond(request_id: int, result: dict) -> None:
+        sys.stdout.write(json.dumps({"jsonrpc": "2.0", "id": request_id, "result": result}) + "\n")
+        sys.stdout.flush()
+
+    async def handle_call(request_id: int, params: dict) -> None:
+        await asyncio.sleep(latency)
+        respond(request_id, {"content": [{"type": "text", "text": json.dumps(params)}]})
+
+    while line := await reader.readline():
+        message = json.loads(line)
+        if "id" not in message:
+            continue  # notification
+        if message["method"] == "initialize":
+            respond(message["id"], {"serverInfo": {"name": "stub", "version": "0"}, "capabilities": {}})
+        elif message["method"] == "tools/list":
+            respond(message["id"], {"tools": [{"name": "search-pubmed"}]})
+        else:
+            task = asyncio.create_task(handle_call(message["id"], message.get("params", {})))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+
+async def _benchmark(calls: int, latency: float, pool_size: int) -> None:
+    from core.mcp.stdio_transport import MCPConnectionPool
+
+    def command() -> list[str]:
+        return [sys.executable, str(Path(__file__).resolve()), "--stub-server", "--latency", str(latency)]
+
+    # Serialized baseline: one process, one request at a time
+    serial_pool = MCPConnectionPool(command, size=1)
+    await serial_pool.acquire()
+    start = time.perf_counter()
+    for i in range(calls):
+        await serial_pool.request("tools/call", {"name": "search-pubmed", "arguments": {"i": i}})
+    serial_time = time.perf_counter() - start
+    await serial_pool.close()
+
+    # Multiplexed: all calls in flight at once across the pool
+    pool = MCPConnectionPool(command, size=pool_size)
+    await pool.acquire()
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(
+            pool.request("tools/call", {"name": "search-pubmed", "arguments": {"i": i}})
+            for i in range(calls)
+        ),
+    )
+    concurrent_time = time.perf_counter() - start
+    stats = pool.stats()
+    await pool.close()
+
+    # Every response must belong to its own request
+    mismatched = sum(
+        1 for i, r in enumerate(results) if json.loads(r["content"][0]["text"])["arguments"]["i"] != i
+    )
+
+    print(f"calls={calls} stub_latency={latency * 1000:.0f}ms pool_size={pool_size}")
+    print(f"  serialized : {serial_time:8.3f}s  {calls / serial_time:8.1f} calls/s")
+    print(f"  multiplexed: {concurrent_time:8.3f}s  {calls / concurrent_time:8.1f} calls/s")
+    print(f"  speedup    : {serial_time / concurrent_time:8.1f}x")
+    print(f"  mismatched responses: {mismatched}")
+    print(f"  pool stats : {stats}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="stub tool latency (s)")
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--stub-server", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.stub_server:
+        asyncio.run(_run_stub_server(args.latency))
+    else:
+        asyncio.run(_benchmark(args.calls, args.latency, args.pool_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+PHI scanning benchmark on synthetic clinical notes.
+
+Compares the previous per-type scans with the single-pass PHIScanEngine:
+- BasicPHIDetector: nine re.finditer passes with uncompiled patterns, a
+  per-match synthetic re-check and reverse string slicing, vs one combined
+  sweep with the allowlist folded in
+- PHIMonitor patterns: one findall per configured pattern vs count_by_type
+
+Results are checked for equality before timing. Notes are generated from
+clinical templates with realistic PHI density (names, dates, MRNs, phones,
+addresses) at message, progress note and discharge summary sizes.
+
+Run: python3 services/user/healthcare-api/scripts/benchmark_phi_scan.py [--notes 200]
+"""
+
+import argparse
+import logging
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# healthcare-api package root is one level up from this script's directory
+API_PATH = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(API_PATH))
+
+from config.phi_detection_config_loader import phi_config  # noqa: E402
+from src.healthcare_mcp.phi_detection import (  # noqa: E402
+    BasicPHIDetector,
+    apply_replacements_in_reverse,
+)
+from src.healthcare_mcp.phi_scan_engine import PHIScanEngine  # noqa: E402
+
+FIRST_NAMES = ["Maria", "James", "Aisha", "Robert", "Linh", "Carlos", "Emily", "David"]
+LAST_NAMES = ["Garcia", "Thompson", "Okafor", "Nguyen", "Patel", "Kowalski", "Reyes"]
+STREETS = ["Maple Street", "Oak Avenue", "Cedar Road", "Lakeview Drive", "Elm Lane"]
+SENTENCES = [
+    "Patient {name} presents with worsening dyspnea on exertion over two weeks.",
+    "DOB: {dob}. MRN: {mrn}. Seen in clinic with daughter.",
+    "Contact phone {phone}; alternate email {email}.",
+    "Lives at {street_no} {street}, Springfield {zip}.",
+    "Insurance number: {insurance}. Prior authorization requested.",
+    "BP 142/88, HR 92, SpO2 94% on room air, temperature 37.1 C.",
+    "Assessment: acute on chronic HFrEF, EF 30% on echo dated {date}.",
+    "Plan: furosemide 40 mg IV twice daily, daily weights, strict I/O.",
+    "Continue metoprolol succinate 50 mg daily and lisinopril 10 mg daily.",
+    "Labs notable for BNP 1450, creatinine 1.4, potassium 4.1.",
+    "Discussed goals of care with {name}; full code confirmed.",
+    "Follow up with cardiology in 2 weeks; call {phone} with concerns.",
+    "No chest pain, syncope, or palpitations. Denies orthopnea.",
+    "Teaching case reviewed with Jane Doe, callback 555-555-1234.",
+]
+
+
+def make_note(rng: random.Random, sentences: int) -> str:
+    def fill(template: str) -> str:
+        return template.format(
+            name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            dob=f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/{rng.randint(1930, 2005)}",
+            date=f"{rng.randint(2019, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            mrn=f"MED{rng.randint(100000, 999999)}",
+            phone=f"({rng.randint(201, 989)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+            email=f"{rng.choice(FIRST_NAMES).lower()}.{rng.randint(1, 99)}@mailhost.org",
+            street_no=rng.randint(10, 9999),
+            street=rng.choice(STREETS),
+            zip=f"{rng.randint(10000, 99999)}",
+            insurance=f"BC{rng.randint(10**8, 10**9)}",
+        )
+
+    return " ".join(fill(rng.choice(SENTENCES)) for _ in range(sentences))
+
+
+def legacy_detect(detector: BasicPHIDetector, text: str) -> tuple[list[tuple[str, int, int]], str]:
+    """Previous BasicPHIDetector.detect_phi matching and masking"""
+
+    def individual_synthetic(value: str) -> bool:
+        if re.match(r"^[X*]+(-[X*]+)*$", value):
+            return False
+        for pattern in detector.synthetic_patterns.values():
+            if re.fullmatch(pattern, value, re.IGNORECASE):
+                return True
+        return value.lower() in [v.lower() for v in detector.synthetic_values]
+
+    if detector._is_entirely_synthetic_data(text):
+        return [], text
+
+    found = []
+    replacements = []
+    for phi_type, pattern_info in detector.phi_patterns.items():
+        for match in re.finditer(pattern_info["pattern"], text, re.IGNORECASE):
+            if individual_synthetic(match.group()):
+                continue
+            found.append((phi_type, match.start(), match.end()))
+            replacements.append((match.start(), match.end(), "*" * len(match.group())))
+    return found, apply_replacements_in_reverse(replacements, text)
+
+
+def legacy_monitor_counts(text: str) -> dict[str, int]:
+    """Previous PHIMonitor.scan_for_phi pattern loop"""
+    counts = {}
+    for phi_type, patterns in phi_config.get_compiled_patterns().items():
+        matches = []
+        for pattern in patterns:
+            matches.extend(pattern.findall(text))
+        if matches:
+            counts[phi_type] = len(matches)
+    return counts
+
+
+def timed(func, notes: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for note in notes:
+            func(note)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notes", type=int, default=200, help="notes per size class")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    rng = random.Random(args.seed)
+    detector = BasicPHIDetector()
+    monitor_engine = PHIScanEngine(
+        [
+            (phi_type, pattern.pattern)
+            for phi_type, patterns in phi_config.get_compiled_patterns().items()
+            for pattern in patterns
+        ],
+    )
+
+    sizes = {"message": 3, "progress note": 30, "discharge summary": 300}
+    for label, sentences in sizes.items():
+        notes = [make_note(rng, sentences) for _ in range(max(1, args.notes // (sentences // 3)))]
+        chars = sum(len(note) for note in notes)
+
+        for note in notes:
+            result = detector.detect_phi(note)
+            expected, masked = legacy_detect(detector, note)
+            actual = [(d["type"], d["start"], d["end"]) for d in result.detection_details]
+            assert actual == expected, f"detector mismatch on {label}"
+            assert result.masked_text == masked, f"masking mismatch on {label}"
+            assert monitor_engine.count_by_type(note) == legacy_monitor_counts(note)
+
+        print(f"{label}: {len(notes)} notes, {chars / len(notes):,.0f} chars avg")
+        for name, before, after in (
+            (
+                "BasicPHIDetector",
+                lambda note: legacy_detect(detector, note),
+                detector.detect_phi,
+            ),
+            ("PHIMonitor patterns", legacy_monitor_counts, monitor_engine.count_by_type),
+        ):
+            old = timed(before, notes, args.repeat)
+            new = timed(after, notes, args.repeat)
+            print(
+                f"  {name:20s} per-type {old / chars * 1e9:8.1f} ns/char  "
+                f"single-pass {new / chars * 1e9:8.1f} ns/char  speedup {old / new:5.1f}x",
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+In-process rate limiter microbenchmark.
+
+Measures the per-request cost of the in-memory token bucket used when Redis
+is not configured or unavailable: the raw store operation and the full
+HealthcareRateLimiter.check_rate_limit call, over many distinct users so the
+idle-eviction / size-bound bookkeeping is exercised.
+
+Run: python3 services/user/healthcare-api/scripts/benchmark_rate_limiter.py [--requests 200000] [--users 5000]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# healthcare-api package root is one level up from this script's directory
+API_PATH = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(API_PATH))
+
+from core.infrastructure.authentication import AuthenticatedUser, HealthcareRole  # noqa: E402
+from core.infrastructure.rate_limiting import (  # noqa: E402
+    HealthcareRateLimiter,
+    InMemoryRateLimitStore,
+    RateLimitType,
+)
+
+
+def bench_store(requests: int, users: int, max_keys: int) -> None:
+    store = InMemoryRateLimitStore(max_keys=max_keys)
+    user_ids = [f"user-{i}" for i in range(users)]
+    now = time.time()
+    denied = 0
+    start = time.perf_counter()
+    for i in range(requests):
+        # Advance a simulated clock by 1ms per request
+        allowed, *_ = store.consume(
+            user_ids[i % users], "api_general", now + i / 1000, 10, 2.0, 120, 5000,
+        )
+        denied += not allowed
+    elapsed = time.perf_counter() - start
+    print(f"  store.consume     : {elapsed / requests * 1e6:7.2f} us/request "
+          f"(denied={denied}, buckets={len(store)}, evictions={store.evictions})")
+
+
+async def bench_limiter(requests: int, users: int) -> None:
+    limiter = HealthcareRateLimiter(redis_client=None)
+    accounts = [
+        AuthenticatedUser(user_id=f"user-{i}", role=HealthcareRole.DOCTOR) for i in range(users)
+    ]
+    denied = 0
+    start = time.perf_counter()
+    for i in range(requests):
+        status = await limiter.check_rate_limit(accounts[i % users], RateLimitType.API_GENERAL)
+        denied += not status.allowed
+    elapsed = time.perf_counter() - start
+    print(f"  check_rate_limit  : {elapsed / requests * 1e6:7.2f} us/request (denied={denied})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--max-keys", type=int, default=10000)
+    args = parser.parse_args()
+
+    print(f"requests={args.requests} users={args.users} max_keys={args.max_keys}")
+    bench_store(args.requests, args.users, args.max_keys)
+    asyncio.run(bench_limiter(args.requests, args.users))
+
+
+if __name__ == "__main__":
+    main()
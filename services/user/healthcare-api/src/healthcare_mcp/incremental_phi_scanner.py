@@ -0,0 +1,205 @@
+"""
+Incremental PHI Scanning for Streaming Transcripts
+
+Live transcription produces text a chunk at a time. Re-scanning the whole
+transcript on every chunk costs O(n) per chunk and O(n²) per visit, while
+scanning each chunk on its own misses PHI split across a chunk boundary
+("call 415 832" | "1190"). IncrementalPHIScanner keeps per-session state and
+scans only the new text plus a bounded window around the boundary, emitting
+masked deltas that concatenate to the masked transcript.
+
+The last ``boundary_window`` characters are held back until more text arrives
+(or ``flush`` is called) because a match could still extend into the next
+chunk. The window must be at least as long as the longest PHI match expected;
+matches longer than the window may be split at an emission cut. Emission cuts
+fall after whitespace, so each delta ends on a word boundary unless a single
+run of non-space text outgrows the window.
+
+MEDICAL DISCLAIMER: This system provides administrative PHI protection and HIPAA compliance
+support only. It does not provide medical advice, diagnosis, or treatment recommendations.
+"""
+
+from collections.abc import Mapping
+
+from .phi_scan_engine import PHIMatch, PHIScanEngine, get_phi_scan_engine
+
+# Identifiers redacted from live transcripts and the labels that replace them.
+# The phone pattern also covers dictated numbers spoken in digit groups, which
+# are the matches most likely to straddle a chunk boundary.
+TRANSCRIPT_PHI_PATTERNS = (
+    ("ssn", r"\b\d{3}-\d{2}-\d{4}\b"),
+    ("phone", r"\b(?:1[-.\s]?)?\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b"),
+    ("email", r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"),
+)
+TRANSCRIPT_PHI_REPLACEMENTS = {
+    "ssn": "[SSN_REDACTED]",
+    "phone": "[PHONE_REDACTED]",
+    "email": "[EMAIL_REDACTED]",
+}
+
+
+class IncrementalPHIScanner:
+    """Per-session streaming PHI scanner built on a shared PHIScanEngine"""
+
+    def __init__(
+        self,
+        engine: PHIScanEngine,
+        boundary_window: int = 64,
+        replacements: Mapping[str, str] | None = None,
+        mask_char: str = "*",
+        separator: str = " ",
+    ) -> None:
+        """
+        Args:
+            engine: Compiled engine for the PHI patterns to redact
+            boundary_window: Characters held back and re-scanned at each chunk boundary
+            replacements: Redaction label per PHI type; types without one are masked
+                with mask_char at the original length
+            mask_char: Mask character for types without a replacement label
+            separator: Text inserted between consecutive chunks
+        """
+        if boundary_window < 1:
+            msg = "boundary_window must be positive"
+            raise ValueError(msg)
+
+        self.engine = engine
+        self.boundary_window = boundary_window
+        self.replacements = dict(replacements or {})
+        self.mask_char = mask_char
+        self.separator = separator
+
+        # Raw transcript text from absolute offset _base; everything before
+        # _emitted has been returned, the rest is the held-back boundary
+        self._buffer = ""
+        self._base = 0
+        self._emitted = 0
+        self._chunks = 0
+
+        self.phi_counts: dict[str, int] = {}
+        self.scanned_chars = 0
+
+    @property
+    def transcript_length(self) -> int:
+        """Length of the raw transcript fed so far, separators included"""
+        return self._base + len(self._buffer)
+
+    @property
+    def pending_length(self) -> int:
+        """Characters received but not yet emitted"""
+        return self.transcript_length - self._emitted
+
+    @property
+    def phi_detected(self) -> bool:
+        return bool(self.phi_counts)
+
+    def feed(self, text: str) -> str:
+        """
+        Add a transcript chunk
+
+        Returns:
+            Masked text that is now final; may be empty while the boundary
+            window fills, and lags the input by at most two boundary windows
+        """
+        if not text:
+            return ""
+        if self._chunks:
+            text = self.separator + text
+        self._chunks += 1
+        self._buffer += text
+        return self._emit(final=False)
+
+    def flush(self) -> str:
+        """Emit the held-back boundary at the end of the session"""
+        return self._emit(final=True)
+
+    def _emit(self, final: bool) -> str:
+        buffer = self._buffer
+        base = self._base
+        end = base + len(buffer)
+
+        # Only the lookback, held-back boundary and new text are scanned.
+        # Position 0 is context for \b; a match there may be a truncated word.
+        matches = [
+            match
+            for match in self.engine.scan(buffer)
+            if match.start > 0 or base == 0
+        ]
+        self.scanned_chars += len(buffer)
+
+        cut = end if final else self._word_cut(buffer, base, end - self.boundary_window)
+        # Never cut through a match; hold the whole match back instead. Matches
+        # come ordered by start, so walking backwards settles the cut in one pass.
+        for match in reversed(matches):
+            start = base + match.start
+            if start < cut < base + match.end:
+                cut = max(self._emitted, start)
+
+        delta = self._render(buffer, base, matches, self._emitted, cut)
+        # Count by start inside the newly emitted range so matches re-found
+        # in the lookback (or truncated by it) are not counted twice
+        for match in matches:
+            if self._emitted <= base + match.start < cut:
+                self.phi_counts[match.phi_type] = self.phi_counts.get(match.phi_type, 0) + 1
+        self._emitted = cut
+
+        # Keep one window of already-emitted text as lookback for the next scan
+        keep_from = max(base, cut - self.boundary_window - 1)
+        self._buffer = buffer[keep_from - base :]
+        self._base = keep_from
+        return delta
+
+    def _word_cut(self, buffer: str, base: int, limit: int) -> int:
+        """Latest cut at or before ``limit`` that does not split a word"""
+        if limit <= self._emitted:
+            return self._emitted
+        pending = buffer[self._emitted - base : limit - base]
+        space = max(pending.rfind(" "), pending.rfind("\n"), pending.rfind("\t"))
+        if space >= 0:
+            return self._emitted + space + 1
+        # No whitespace yet: keep holding unless the run outgrew another window
+        return limit if len(pending) >= self.boundary_window else self._emitted
+
+    def _render(
+        self,
+        buffer: str,
+        base: int,
+        matches: list[PHIMatch],
+        start: int,
+        stop: int,
+    ) -> str:
+        """Masked text for absolute range [start, stop)"""
+        if stop <= start:
+            return ""
+
+        spans = sorted(
+            (base + match.start, base + match.end, match.phi_type)
+            for match in matches
+            if base + match.end > start and base + match.start < stop
+        )
+        parts: list[str] = []
+        position = start
+        index = 0
+        while index < len(spans):
+            span_start, span_end, phi_type = spans[index]
+            index += 1
+            while index < len(spans) and spans[index][0] < span_end:
+                span_end = max(span_end, spans[index][1])
+                index += 1
+            span_start = max(span_start, start)
+            span_end = min(span_end, stop)
+            parts.append(buffer[position - base : span_start - base])
+            parts.append(
+                self.replacements.get(phi_type, self.mask_char * (span_end - span_start)),
+            )
+            position = span_end
+        parts.append(buffer[position - base : stop - base])
+        return "".join(parts)
+
+
+def create_transcript_scanner(boundary_window: int = 64) -> IncrementalPHIScanner:
+    """Streaming scanner for one transcript with the shared transcript pattern engine"""
+    return IncrementalPHIScanner(
+        get_phi_scan_engine(TRANSCRIPT_PHI_PATTERNS, flags=0),
+        boundary_window=boundary_window,
+        replacements=TRANSCRIPT_PHI_REPLACEMENTS,
+    )
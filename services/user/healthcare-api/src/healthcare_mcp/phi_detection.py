@@ -16,6 +16,8 @@ from datetime import datetime
 from io import StringIO
 from typing import TYPE_CHECKING, Any, cast
 
+from .phi_scan_engine import get_phi_scan_engine
+
 if TYPE_CHECKING:
     from presidio_analyzer import AnalyzerEngine
     from presidio_anonymizer import AnonymizerEngine
@@ -352,6 +354,46 @@ class BasicPHIDetector:
             },
         }
 
+        # Specific synthetic values that are never PHI
+        self.synthetic_values = [
+            "555-555-1234",
+            "123-45-6789",
+            "test@example.com",
+            "test@synthetic.test",
+            # Synthetic names
+            "John Doe",
+            "Jane Doe",
+            "Test Patient",
+            "Synthetic Patient",
+        ]
+
+        # Markers meaning the whole text is synthetic
+        self.entirely_synthetic_indicators = [
+            "synthetic patient",
+            "test patient",
+            "example patient",
+            "@synthetic.",
+            "@test.",
+            "@example.",
+            "pat001",
+            "pat002",
+            "pat003",
+        ]
+
+        self._type_rank = {phi_type: rank for rank, phi_type in enumerate(self.phi_patterns)}
+        self._entirely_synthetic = re.compile(
+            "|".join(re.escape(marker) for marker in self.entirely_synthetic_indicators),
+            re.IGNORECASE,
+        )
+        # Broad name pattern goes last so specific identifiers win the combined sweep;
+        # the match set does not depend on this order, only the number of re-checks
+        scan_order = sorted(self.phi_patterns, key=lambda phi_type: phi_type == "name")
+        self.engine = get_phi_scan_engine(
+            tuple((phi_type, self.phi_patterns[phi_type]["pattern"]) for phi_type in scan_order),
+            allowlist_patterns=tuple(self.synthetic_patterns.values()),
+            allowlist_values=tuple(self.synthetic_values),
+        )
+
     def _is_synthetic_data(self, text: str) -> bool:
         """Check if text contains synthetic data patterns"""
         for pattern_name, pattern in self.synthetic_patterns.items():
@@ -385,49 +427,13 @@ class BasicPHIDetector:
 
     def _is_individual_synthetic_pattern(self, text: str) -> bool:
         """Check if an individual matched pattern is synthetic"""
-        # Don't treat already masked patterns as synthetic - they should be re-masked
-        if re.match(r"^[X*]+(-[X*]+)*$", text):
-            return False
-
-        # Check against synthetic patterns for individual matches
-        for _pattern_name, pattern in self.synthetic_patterns.items():
-            if re.fullmatch(pattern, text, re.IGNORECASE):
-                return True
-
-        # Check for specific synthetic values
-        synthetic_values = [
-            "555-555-1234",
-            "123-45-6789",
-            "test@example.com",
-            "test@synthetic.test",
-            # Synthetic names
-            "John Doe",
-            "Jane Doe",
-            "Test Patient",
-            "Synthetic Patient",
-        ]
-
-        return text.lower() in [v.lower() for v in synthetic_values]
+        # Already masked patterns are never synthetic - they should be re-masked
+        return self.engine.is_allowlisted(text)
 
     def _is_entirely_synthetic_data(self, text: str) -> bool:
         """Check if the entire text is synthetic data (not just containing synthetic elements)"""
         # Only skip PHI detection if the text is clearly entirely synthetic
-        text_lower = text.lower()
-
-        # Full synthetic indicators
-        entirely_synthetic_indicators = [
-            "synthetic patient",
-            "test patient",
-            "example patient",
-            "@synthetic.",
-            "@test.",
-            "@example.",
-            "pat001",
-            "pat002",
-            "pat003",
-        ]
-
-        return any(indicator in text_lower for indicator in entirely_synthetic_indicators)
+        return self._entirely_synthetic.search(text) is not None
 
     def _process_and_mask_matches(
         self,
@@ -488,58 +494,34 @@ class BasicPHIDetector:
                 detection_details=[],
             )
 
-        phi_detected = False
-        phi_types = []
-        confidence_scores = []
-        detection_details = []
-
-        # Collect all replacements first
-        replacements = []
-
-        for phi_type, pattern_info in self.phi_patterns.items():
-            pattern = pattern_info["pattern"]
-            matches = list(re.finditer(pattern, text, re.IGNORECASE))
-
-            for match in matches:
-                # Always mask detected patterns, even if already masked
-                matched_text = match.group()
-
-                # Skip if it's clearly synthetic test data (but not already masked data)
-                if self._is_individual_synthetic_pattern(matched_text):
-                    self.logger.debug(f"Skipping synthetic match: {matched_text}")
-                    continue
-
-                phi_detected = True
-                phi_types.append(phi_type)
-                confidence_scores.append(0.8)
-
-                detection_details.append(
-                    {
-                        "type": phi_type,
-                        "description": pattern_info["description"],
-                        "start": match.start(),
-                        "end": match.end(),
-                        "text": match.group(),
-                        "confidence": 0.8,
-                    },
-                )
-
-                # Collect replacement
-                mask_length = len(match.group())
-                mask = "*" * mask_length
-                replacements.append((match.start(), match.end(), mask))
-
-        # Apply all replacements using utility function
-        masked_text = apply_replacements_in_reverse(replacements, text)
+        # One sweep finds every type; synthetic matches are already dropped.
+        # Report them grouped by type in phi_patterns order, as before.
+        matches = sorted(self.engine.scan(text), key=lambda m: self._type_rank[m.phi_type])
+
+        detection_details = [
+            {
+                "type": match.phi_type,
+                "description": self.phi_patterns[match.phi_type]["description"],
+                "start": match.start,
+                "end": match.end,
+                "text": match.text,
+                "confidence": 0.8,
+            }
+            for match in matches
+        ]
 
         return PHIDetectionResult(
-            phi_detected=phi_detected,
-            phi_types=list(set(phi_types)),
-            confidence_scores=confidence_scores,
-            masked_text=masked_text,
+            phi_detected=bool(matches),
+            phi_types=list({match.phi_type for match in matches}),
+            confidence_scores=[0.8] * len(matches),
+            masked_text=self.engine.mask(text, matches),
             detection_details=detection_details,
         )
 
+    def detect_phi_batch(self, texts: list[str]) -> list[PHIDetectionResult]:
+        """Detect PHI in many texts with the shared compiled engine"""
+        return [self.detect_phi(text) for text in texts]
+
 
 class PresidioPHIDetector:
     """Advanced PHI detector using Microsoft Presidio"""
@@ -770,11 +752,11 @@ class PHIDetector:
         self.logger.debug(f"Starting batch PHI detection for {field_count} fields")
 
         results = {}
+        scan_fields = {}
 
-        # Process each field (can be optimized further with true batch processing)
         for field_name, text_value in field_data.items():
             if isinstance(text_value, str) and text_value.strip():
-                results[field_name] = self.detector.detect_phi(text_value)
+                scan_fields[field_name] = text_value
             else:
                 # Empty or non-string values
                 results[field_name] = PHIDetectionResult(
@@ -785,6 +767,14 @@ class PHIDetector:
                     detection_details=[],
                 )
 
+        if isinstance(self.detector, BasicPHIDetector):
+            # All fields go through the one compiled scan engine
+            batch_results = self.detector.detect_phi_batch(list(scan_fields.values()))
+        else:
+            batch_results = [self.detector.detect_phi(text) for text in scan_fields.values()]
+        results.update(zip(scan_fields, batch_results, strict=True))
+        results = {field_name: results[field_name] for field_name in field_data}
+
         processing_time = time.time() - start_time
         phi_detected_count = sum(1 for result in results.values() if result.phi_detected)
 
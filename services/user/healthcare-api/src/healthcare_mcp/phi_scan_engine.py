@@ -0,0 +1,234 @@
+"""
+Single-pass PHI Scanning Engine
+
+Compiles every PHI pattern into one named-group alternation so a text is swept
+once instead of once per PHI type, with the synthetic-data allowlist folded
+into a single precompiled full-match check. Shared by BasicPHIDetector,
+PHIMonitor, the Open WebUI sanitizer and the document processor's redactor.
+
+Match semantics are the same as running ``finditer`` separately for every
+pattern: matches of one pattern never overlap each other, matches of different
+patterns may. Where several patterns match at the same position, the combined
+sweep reports the first and the later ones are confirmed with an anchored
+``match`` at that position only.
+
+MEDICAL DISCLAIMER: This system provides administrative PHI protection and HIPAA compliance
+support only. It does not provide medical advice, diagnosis, or treatment recommendations.
+"""
+
+import re
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+
+# Already-masked values (XXX-XX-XXXX, ****) are never allowlisted so they are re-masked
+_MASKED_VALUE = r"(?-i:[X*]+(?:-[X*]+)*)$"
+
+
+def _top_level_branches(pattern: str) -> list[str]:
+    """Split a regex on its top-level ``|`` (outside groups and character classes)"""
+    branches = []
+    depth = 0
+    branch_start = 0
+    in_class = False
+    escaped = False
+    for index, char in enumerate(pattern):
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            branches.append(pattern[branch_start:index])
+            branch_start = index + 1
+    branches.append(pattern[branch_start:])
+    return branches
+
+
+def _starts_at_word_boundary(pattern: str) -> bool:
+    """True when every top-level branch of pattern begins with ``\b``"""
+    return all(branch.startswith(r"\b") for branch in _top_level_branches(pattern))
+
+
+@dataclass(frozen=True, slots=True)
+class PHIMatch:
+    """One PHI match found by the engine"""
+
+    phi_type: str
+    start: int
+    end: int
+    text: str
+
+
+class PHIScanEngine:
+    """Precompiled single-pass scanner for a fixed set of PHI patterns"""
+
+    def __init__(
+        self,
+        patterns: Sequence[tuple[str, str]],
+        allowlist_patterns: Sequence[str] = (),
+        allowlist_values: Sequence[str] = (),
+        flags: int = re.IGNORECASE,
+    ) -> None:
+        """
+        Compile the combined scanner
+
+        Args:
+            patterns: Ordered (phi_type, regex) pairs; a type may appear several times.
+                Order does not change the matches, but earlier pairs win the combined
+                sweep at a shared position, so specific identifiers before broad ones
+                such as names means fewer anchored re-checks.
+            allowlist_patterns: Regexes for synthetic test data; a match whose text
+                fully matches one of them is dropped
+            allowlist_values: Literal synthetic values dropped case-insensitively
+            flags: Regex flags applied to every pattern
+        """
+        # Patterns that can only start at a word boundary share one hoisted \b, so
+        # mid-word positions are rejected once instead of once per pattern.
+        # Alternatives are kept in combined-regex order for the same-position re-check.
+        anchored = [pair for pair in patterns if _starts_at_word_boundary(pair[1])]
+        unanchored = [pair for pair in patterns if not _starts_at_word_boundary(pair[1])]
+        ordered = anchored + unanchored
+
+        self.phi_types = list(dict.fromkeys(phi_type for phi_type, _ in patterns))
+        self._alternative_types = [phi_type for phi_type, _ in ordered]
+        self._singles = [re.compile(pattern, flags) for _, pattern in ordered]
+
+        self._combined: re.Pattern[str] | None = None
+        self._alternative_by_group: dict[int, int] = {}
+        if ordered:
+            groups = [f"(?P<p{i}>{pattern})" for i, (_, pattern) in enumerate(ordered)]
+            branches = []
+            if anchored:
+                branches.append(rf"\b(?:{'|'.join(groups[: len(anchored)])})")
+            branches.extend(groups[len(anchored) :])
+            self._combined = re.compile("|".join(branches), flags)
+            self._alternative_by_group = {
+                self._combined.groupindex[f"p{i}"]: i for i in range(len(ordered))
+            }
+
+        allowed = [f"(?:{pattern})" for pattern in allowlist_patterns]
+        allowed.extend(re.escape(value) for value in allowlist_values)
+        self._allowlist: re.Pattern[str] | None = None
+        if allowed:
+            self._allowlist = re.compile(
+                f"(?!{_MASKED_VALUE})(?:{'|'.join(allowed)})",
+                flags | re.IGNORECASE,
+            )
+
+    def is_allowlisted(self, value: str) -> bool:
+        """Check whether a matched value is known synthetic test data"""
+        return self._allowlist is not None and self._allowlist.fullmatch(value) is not None
+
+    def scan(self, text: str) -> list[PHIMatch]:
+        """
+        Find every PHI match in text in one sweep
+
+        Returns:
+            Matches ordered by start position, allowlisted values removed
+        """
+        if self._combined is None or not text:
+            return []
+
+        search = self._combined.search
+        singles = self._singles
+        phi_types = self._alternative_types
+        alternative_by_group = self._alternative_by_group
+        allowlisted = self.is_allowlisted
+        count = len(singles)
+        # End of the last accepted match per pattern, mirroring finditer
+        pattern_end = [0] * count
+
+        matches: list[PHIMatch] = []
+        pos = 0
+        while True:
+            found = search(text, pos)
+            if found is None:
+                break
+            start = found.start()
+            first = alternative_by_group[found.lastindex]
+
+            if start >= pattern_end[first]:
+                end = found.end()
+                pattern_end[first] = end
+                value = found.group()
+                if not allowlisted(value):
+                    matches.append(PHIMatch(phi_types[first], start, end, value))
+
+            # Earlier alternatives already failed here; later ones may also match
+            for index in range(first + 1, count):
+                if start < pattern_end[index]:
+                    continue
+                other = singles[index].match(text, start)
+                if other is None:
+                    continue
+                end = other.end()
+                pattern_end[index] = end
+                value = other.group()
+                if not allowlisted(value):
+                    matches.append(PHIMatch(phi_types[index], start, end, value))
+
+            pos = start + 1
+
+        return matches
+
+    def scan_batch(self, texts: Iterable[str]) -> list[list[PHIMatch]]:
+        """Scan many fields with the same compiled engine"""
+        return [self.scan(text) if isinstance(text, str) else [] for text in texts]
+
+    def count_by_type(self, text: str) -> dict[str, int]:
+        """Number of matches per PHI type, in pattern order"""
+        counts: dict[str, int] = {}
+        for match in self.scan(text):
+            counts[match.phi_type] = counts.get(match.phi_type, 0) + 1
+        return {
+            phi_type: counts[phi_type]
+            for phi_type in self.phi_types
+            if phi_type in counts
+        }
+
+    @staticmethod
+    def mask(text: str, matches: Sequence[PHIMatch], mask_char: str = "*") -> str:
+        """
+        Replace every matched span with mask characters of the same length
+
+        Overlapping spans are merged, and the result is built in one join rather
+        than by re-slicing the string per match.
+        """
+        if not matches:
+            return text
+
+        spans = sorted((match.start, match.end) for match in matches)
+        parts: list[str] = []
+        position = 0
+        span_start, span_end = spans[0]
+        for start, end in spans[1:]:
+            if start <= span_end:
+                span_end = max(span_end, end)
+                continue
+            parts.append(text[position:span_start])
+            parts.append(mask_char * (span_end - span_start))
+            position = span_end
+            span_start, span_end = start, end
+        parts.append(text[position:span_start])
+        parts.append(mask_char * (span_end - span_start))
+        parts.append(text[span_end:])
+        return "".join(parts)
+
+
+@lru_cache(maxsize=32)
+def get_phi_scan_engine(
+    patterns: tuple[tuple[str, str], ...],
+    allowlist_patterns: tuple[str, ...] = (),
+    allowlist_values: tuple[str, ...] = (),
+    flags: int = re.IGNORECASE,
+) -> PHIScanEngine:
+    """Shared engine for a pattern set; compiled once per process"""
+    return PHIScanEngine(patterns, allowlist_patterns, allowlist_values, flags)
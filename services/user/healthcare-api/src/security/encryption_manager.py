@@ -3,6 +3,7 @@ Healthcare Data Encryption Manager
 Advanced encryption and key management for healthcare data protection
 """
 
+import atexit
 import base64
 import json
 import logging
@@ -11,7 +12,11 @@ import os
 import secrets
 import string
 import sys
-from collections import Counter
+import threading
+import time
+import weakref
+from collections import Counter, deque
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
@@ -21,7 +26,7 @@ from cryptography.fernet import Fernet
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import rsa
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 from src.security.environment_detector import Environment, EnvironmentDetector
 
@@ -59,6 +64,45 @@ class EncryptionKey:
     is_active: bool
 
 
+@dataclass(slots=True)
+class _CachedKey:
+    """Unwrapped data key held in memory between database revalidations"""
+
+    raw_key: bytes
+    expires_at: datetime | None
+    loaded_at: float  # time.monotonic() of the last database read
+
+
+# KeyManagers with a usage log buffer, flushed once more at interpreter exit
+_LIVE_KEY_MANAGERS: "weakref.WeakSet[KeyManager]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_key_usage_logs_at_exit() -> None:
+    for key_manager in list(_LIVE_KEY_MANAGERS):
+        key_manager.close()
+
+
+def _flush_usage_periodically(
+    manager_ref: "weakref.ref[KeyManager]",
+    stop: threading.Event,
+    interval: float,
+) -> None:
+    """Flush a KeyManager's usage buffer every interval until it is closed or collected"""
+    while not stop.wait(interval):
+        key_manager = manager_ref()
+        if key_manager is None:
+            return
+        if key_manager._usage_buffer:
+            key_manager.flush_key_usage_log()
+        del key_manager
+
+
+def _is_data_error(error: Exception) -> bool:
+    """True for errors caused by the row values (SQLSTATE classes 22 and 23), not the database"""
+    return str(getattr(error, "pgcode", None) or "")[:2] in {"22", "23"}
+
+
 class KeyManager:
     """Manages encryption keys with rotation and versioning"""
 
@@ -66,8 +110,18 @@ class KeyManager:
     MIN_ENTROPY_THRESHOLD = 4.0  # Minimum Shannon entropy for cryptographic keys
     MIN_KEY_LENGTH = 32  # Minimum key length in bytes (256 bits)
 
+    # Key cache and usage log defaults, overridable through config
+    DEFAULT_KEY_CACHE_TTL_SECONDS = 300.0  # Revalidate is_active/expiry against the DB
+    DEFAULT_USAGE_LOG_BATCH_SIZE = 100
+    DEFAULT_USAGE_LOG_FLUSH_SECONDS = 5.0
+    MAX_PENDING_USAGE_RECORDS = 10_000  # Cap on rows kept for retry after a failed flush
+    USAGE_LOG_ROWS_PER_INSERT = 1_000
+
     def __init__(self, postgres_conn: Any, config: Any | None = None) -> None:
         self.postgres_conn = postgres_conn
+        # Held for every statement and commit on postgres_conn, so the background
+        # usage flusher never commits or rolls back a request thread's transaction
+        self.connection_lock = threading.RLock()
         self.logger = logging.getLogger(f"{__name__}.KeyManager")
 
         # Support configuration injection for testing
@@ -77,6 +131,39 @@ class KeyManager:
 
         # Master key for key encryption (would be stored in HSM in production)
         self.master_key = self._get_or_create_master_key()
+        self._master_fernet = Fernet(self.master_key)
+
+        # Unwrapped data keys; a TTL of 0 disables caching
+        self.key_cache_ttl = float(
+            self._config_value("key_cache_ttl_seconds", self.DEFAULT_KEY_CACHE_TTL_SECONDS),
+        )
+        self._key_cache: dict[str, _CachedKey] = {}
+        self._key_cache_lock = threading.Lock()
+
+        # Key usage rows are buffered and written with one executemany per batch;
+        # a batch size of 1 writes every row immediately
+        self.usage_log_batch_size = max(
+            1,
+            int(self._config_value("key_usage_log_batch_size", self.DEFAULT_USAGE_LOG_BATCH_SIZE)),
+        )
+        self.usage_log_flush_interval = float(
+            self._config_value("key_usage_log_flush_seconds", self.DEFAULT_USAGE_LOG_FLUSH_SECONDS),
+        )
+        self._usage_buffer: list[tuple[str, str, str | None, str | None, datetime, bool]] = []
+        self._usage_buffer_lock = threading.Lock()
+        self._usage_flush_lock = threading.Lock()
+        self._last_usage_flush = time.monotonic()
+        # Flushes quiet buffers without waiting for the next _log_key_usage call;
+        # started with the first buffered row
+        self._usage_flusher: threading.Thread | None = None
+        self._usage_flusher_stop = threading.Event()
+        _LIVE_KEY_MANAGERS.add(self)
+
+    def _config_value(self, name: str, default: Any) -> Any:
+        """Read an optional setting from dict-style configuration"""
+        if isinstance(self.config, dict) and self.config.get(name) is not None:
+            return self.config[name]
+        return default
 
     def _init_key_tables(self) -> None:
         """Initialize key management tables"""
@@ -428,8 +515,7 @@ class KeyManager:
         )
 
         # Encrypt with properly encoded master key
-        master_fernet = Fernet(self.master_key)  # self.master_key is now properly base64 encoded
-        encrypted_private = master_fernet.encrypt(private_pem)
+        encrypted_private = self._master_fernet.encrypt(private_pem)
 
         return encrypted_private, public_pem
 
@@ -481,8 +567,7 @@ class KeyManager:
             )
 
         # Encrypt the key with master key
-        master_fernet = Fernet(self.master_key)
-        encrypted_key = master_fernet.encrypt(raw_key)
+        encrypted_key = self._master_fernet.encrypt(raw_key)
 
         # Store key metadata
         key_metadata = EncryptionKey(
@@ -497,38 +582,50 @@ class KeyManager:
         )
 
         try:
-            with self.postgres_conn.cursor() as cursor:
-                cursor.execute(
-                    """
-                    INSERT INTO encryption_keys
-                    (key_id, key_type, encryption_level, algorithm, key_size,
-                     encrypted_key, is_active, expires_at)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                    (
-                        key_id,
-                        key_type.value,
-                        encryption_level.value,
-                        algorithm,
-                        key_size,
-                        base64.b64encode(encrypted_key).decode(),
-                        True,
-                        key_metadata.expires_at,
-                    ),
-                )
-            self.postgres_conn.commit()
+            with self.connection_lock:
+                with self.postgres_conn.cursor() as cursor:
+                    cursor.execute(
+                        """
+                        INSERT INTO encryption_keys
+                        (key_id, key_type, encryption_level, algorithm, key_size,
+                         encrypted_key, is_active, expires_at)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                    """,
+                        (
+                            key_id,
+                            key_type.value,
+                            encryption_level.value,
+                            algorithm,
+                            key_size,
+                            base64.b64encode(encrypted_key).decode(),
+                            True,
+                            key_metadata.expires_at,
+                        ),
+                    )
+                self.postgres_conn.commit()
 
             self.logger.info(f"Generated new {key_type.value} key: {key_id}")
             return key_metadata
 
         except Exception as e:
             self.logger.exception(f"Failed to store encryption key: {e}")
+            self._rollback()
             raise
 
     def get_key(self, key_id: str) -> bytes | None:
-        """Retrieve and decrypt encryption key"""
+        """
+        Retrieve and decrypt encryption key
+
+        Unwrapped keys are cached for key_cache_ttl seconds. Expiry is checked on
+        every call, rotation in this process evicts the old key immediately, and
+        deactivation elsewhere is picked up when the entry is revalidated.
+        """
+        cached = self._cached_key(key_id)
+        if cached is not None:
+            return cached
+
         try:
-            with self.postgres_conn.cursor() as cursor:
+            with self.connection_lock, self.postgres_conn.cursor() as cursor:
                 cursor.execute(
                     """
                     SELECT encrypted_key, is_active, expires_at
@@ -537,82 +634,118 @@ class KeyManager:
                 """,
                     (key_id,),
                 )
-
                 result = cursor.fetchone()
-                if not result:
-                    return None
 
-                encrypted_key_b64, is_active, expires_at = result
+            if not result:
+                return None
+
+            encrypted_key_b64, is_active, expires_at = result
 
-                # Check if key is active and not expired
-                if not is_active:
-                    self.logger.warning(f"Attempted to use inactive key: {key_id}")
-                    return None
+            # Check if key is active and not expired
+            if not is_active:
+                self.logger.warning(f"Attempted to use inactive key: {key_id}")
+                return None
 
-                if expires_at and datetime.now() > expires_at:
-                    self.logger.warning(f"Attempted to use expired key: {key_id}")
-                    return None
+            if expires_at and datetime.now() > expires_at:
+                self.logger.warning(f"Attempted to use expired key: {key_id}")
+                return None
 
-                # Decrypt key with master key
-                master_fernet = Fernet(self.master_key)
-                encrypted_key = base64.b64decode(encrypted_key_b64.encode())
-                raw_key_bytes = master_fernet.decrypt(encrypted_key)
+            # Decrypt key with master key
+            encrypted_key = base64.b64decode(encrypted_key_b64.encode())
+            raw_key_bytes = self._master_fernet.decrypt(encrypted_key)
 
-                # Fernet.decrypt() always returns bytes, so we can safely cast
-                raw_key: bytes = raw_key_bytes
+            # Fernet.decrypt() always returns bytes, so we can safely cast
+            raw_key: bytes = raw_key_bytes
 
-                # Log key usage
-                self._log_key_usage(key_id, "retrieve")
+            if self.key_cache_ttl > 0:
+                with self._key_cache_lock:
+                    self._key_cache[key_id] = _CachedKey(
+                        raw_key,
+                        expires_at,
+                        time.monotonic(),
+                    )
 
-                return raw_key
+            # Log key usage (once per unwrap, not per cache hit); outside
+            # connection_lock, since a due flush takes the flush lock first
+            self._log_key_usage(key_id, "retrieve")
 
         except Exception as e:
             self.logger.exception(f"Failed to retrieve key {key_id}: {e}")
+            self._rollback()
             return None
+        else:
+            return raw_key
+
+    def _cached_key(self, key_id: str) -> bytes | None:
+        """Return a cached unwrapped key if it is still fresh and unexpired"""
+        with self._key_cache_lock:
+            entry = self._key_cache.get(key_id)
+            if entry is None:
+                return None
+            if time.monotonic() - entry.loaded_at >= self.key_cache_ttl:
+                # Stale: reload so is_active and expiry are re-read from the DB
+                del self._key_cache[key_id]
+                return None
+            if entry.expires_at and datetime.now() > entry.expires_at:
+                del self._key_cache[key_id]
+                self.logger.warning(f"Attempted to use expired key: {key_id}")
+                return None
+            return entry.raw_key
+
+    def invalidate_key(self, key_id: str | None = None) -> None:
+        """Drop one cached key, or every cached key when key_id is None"""
+        with self._key_cache_lock:
+            if key_id is None:
+                self._key_cache.clear()
+            else:
+                self._key_cache.pop(key_id, None)
 
     def rotate_key(self, old_key_id: str) -> EncryptionKey:
         """Rotate encryption key"""
         # Get old key metadata
         try:
-            with self.postgres_conn.cursor() as cursor:
-                cursor.execute(
-                    """
-                    SELECT key_type, encryption_level, algorithm
-                    FROM encryption_keys
-                    WHERE key_id = %s
-                """,
-                    (old_key_id,),
-                )
-
-                result = cursor.fetchone()
-                if not result:
-                    msg = f"Key not found: {old_key_id}"
-                    raise ValueError(msg)
-
-                key_type_str, encryption_level_str, algorithm = result
-                key_type = KeyType(key_type_str)
-                encryption_level = EncryptionLevel(encryption_level_str)
-
-                # Generate new key
-                new_key = self.generate_key(encryption_level, key_type)
+            with self.connection_lock:
+                with self.postgres_conn.cursor() as cursor:
+                    cursor.execute(
+                        """
+                        SELECT key_type, encryption_level, algorithm
+                        FROM encryption_keys
+                        WHERE key_id = %s
+                    """,
+                        (old_key_id,),
+                    )
 
-                # Deactivate old key
-                cursor.execute(
-                    """
-                    UPDATE encryption_keys
-                    SET is_active = FALSE, rotated_from = %s
-                    WHERE key_id = %s
-                """,
-                    (new_key.key_id, old_key_id),
-                )
+                    result = cursor.fetchone()
+                    if not result:
+                        msg = f"Key not found: {old_key_id}"
+                        raise ValueError(msg)
+
+                    key_type_str, encryption_level_str, algorithm = result
+                    key_type = KeyType(key_type_str)
+                    encryption_level = EncryptionLevel(encryption_level_str)
+
+                    # Generate new key
+                    new_key = self.generate_key(encryption_level, key_type)
+
+                    # Deactivate old key
+                    cursor.execute(
+                        """
+                        UPDATE encryption_keys
+                        SET is_active = FALSE, rotated_from = %s
+                        WHERE key_id = %s
+                    """,
+                        (new_key.key_id, old_key_id),
+                    )
 
-            self.postgres_conn.commit()
+                self.postgres_conn.commit()
+            self.invalidate_key(old_key_id)
 
             self.logger.info(f"Rotated key {old_key_id} to {new_key.key_id}")
             return new_key
 
         except Exception as e:
             self.logger.exception(f"Failed to rotate key {old_key_id}: {e}")
+            self._rollback()
             raise
 
     def _log_key_usage(
@@ -622,20 +755,124 @@ class KeyManager:
         data_type: str | None = None,
         user_id: str | None = None,
     ) -> None:
-        """Log key usage for audit"""
-        try:
-            with self.postgres_conn.cursor() as cursor:
-                cursor.execute(
-                    """
-                    INSERT INTO key_usage_log
-                    (key_id, operation, data_type, user_id)
-                    VALUES (%s, %s, %s, %s)
-                """,
-                    (key_id, operation, data_type, user_id),
-                )
-            self.postgres_conn.commit()
-        except Exception as e:
-            self.logger.exception(f"Failed to log key usage: {e}")
+        """
+        Log key usage for audit
+
+        Rows are buffered with their own timestamp and written in batches when the
+        buffer reaches usage_log_batch_size or usage_log_flush_interval has passed;
+        a background thread flushes on the interval even if no further calls come.
+        """
+        with self._usage_buffer_lock:
+            self._usage_buffer.append(
+                (key_id, operation, data_type, user_id, datetime.now(), True),
+            )
+            if self._usage_flusher is None:
+                self._start_usage_flusher()
+            due = (
+                len(self._usage_buffer) >= self.usage_log_batch_size
+                or time.monotonic() - self._last_usage_flush >= self.usage_log_flush_interval
+            )
+
+        if due:
+            self.flush_key_usage_log()
+
+    def _start_usage_flusher(self) -> None:
+        # Caller holds _usage_buffer_lock
+        if self.usage_log_flush_interval <= 0 or self._usage_flusher_stop.is_set():
+            return
+        self._usage_flusher = threading.Thread(
+            target=_flush_usage_periodically,
+            args=(weakref.ref(self), self._usage_flusher_stop, self.usage_log_flush_interval),
+            name="key-usage-log-flusher",
+            daemon=True,
+        )
+        self._usage_flusher.start()
+
+    def close(self) -> None:
+        """Stop the periodic flush and write any buffered usage rows"""
+        self._usage_flusher_stop.set()
+        self.flush_key_usage_log()
+
+    def flush_key_usage_log(self) -> int:
+        """
+        Write buffered key usage rows in one batch
+
+        Returns:
+            int: Number of rows written
+        """
+        with self._usage_flush_lock:
+            with self._usage_buffer_lock:
+                rows = self._usage_buffer
+                self._usage_buffer = []
+                self._last_usage_flush = time.monotonic()
+
+            if not rows:
+                return 0
+
+            written, kept = self._insert_usage_rows(rows)
+            if kept:
+                # Keep the rows for the next flush, bounded so a dead DB cannot grow memory
+                with self._usage_buffer_lock:
+                    pending = kept + self._usage_buffer
+                    dropped = len(pending) - self.MAX_PENDING_USAGE_RECORDS
+                    if dropped > 0:
+                        self.logger.error(f"Dropped {dropped} key usage log rows after failed flushes")
+                        pending = pending[dropped:]
+                    self._usage_buffer = pending
+            return written
+
+    def _insert_usage_rows(self, rows: list[tuple]) -> tuple[int, list[tuple]]:
+        """
+        Insert usage rows, committing one multi-row INSERT per chunk
+
+        A chunk rejected for its values (e.g. a user_id longer than the column) is
+        split until the offending rows are found; those are dropped and the rest
+        written. Any other error keeps the unwritten rows for the next flush.
+
+        Returns:
+            tuple: (rows written, rows to retry)
+        """
+        written = 0
+        chunks = deque(
+            rows[start : start + self.USAGE_LOG_ROWS_PER_INSERT]
+            for start in range(0, len(rows), self.USAGE_LOG_ROWS_PER_INSERT)
+        )
+        while chunks:
+            chunk = chunks.popleft()
+            try:
+                # One multi-row INSERT per chunk; psycopg2's executemany would
+                # still send one statement per row
+                with self.connection_lock:
+                    with self.postgres_conn.cursor() as cursor:
+                        values = ", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(chunk))
+                        cursor.execute(
+                            "INSERT INTO key_usage_log "
+                            "(key_id, operation, data_type, user_id, timestamp, success) "
+                            f"VALUES {values}",
+                            [value for row in chunk for value in row],
+                        )
+                    self.postgres_conn.commit()
+                written += len(chunk)
+            except Exception as e:
+                self._rollback()
+                if not _is_data_error(e):
+                    self.logger.exception(f"Failed to log key usage: {e}")
+                    return written, [row for pending in (chunk, *chunks) for row in pending]
+                if len(chunk) == 1:
+                    key_id, operation = chunk[0][:2]
+                    self.logger.error(f"Dropped invalid key usage log row ({key_id}, {operation}): {e}")
+                    continue
+                middle = len(chunk) // 2
+                chunks.extendleft((chunk[middle:], chunk[:middle]))
+        return written, []
+
+    def _rollback(self) -> None:
+        """End a failed transaction so the shared connection stays usable"""
+        with self.connection_lock:
+            try:
+                self.postgres_conn.rollback()
+            except Exception as e:
+                self.logger.warning(f"Rollback after failed key statement failed: {e}")
 
 
 class HealthcareEncryptionManager:
@@ -659,6 +896,9 @@ class HealthcareEncryptionManager:
 
         self.key_manager = KeyManager(postgres_conn, self.config)
 
+        # Cipher objects per (key_id, algorithm), rebuilt whenever the key bytes change
+        self._ciphers: dict[tuple[str, str], tuple[bytes, Fernet | AESGCM]] = {}
+
         # Initialize default keys for different encryption levels
         self._init_default_keys()
 
@@ -670,6 +910,9 @@ class HealthcareEncryptionManager:
             "audit_logging": True,
             "entropy_threshold": self.MIN_ENTROPY_THRESHOLD,
             "min_key_length": self.MIN_KEY_LENGTH,
+            "key_cache_ttl_seconds": KeyManager.DEFAULT_KEY_CACHE_TTL_SECONDS,
+            "key_usage_log_batch_size": KeyManager.DEFAULT_USAGE_LOG_BATCH_SIZE,
+            "key_usage_log_flush_seconds": KeyManager.DEFAULT_USAGE_LOG_FLUSH_SECONDS,
         }
 
         if EnvironmentDetector.is_development():
@@ -778,39 +1021,56 @@ class HealthcareEncryptionManager:
     ) -> dict[str, Any]:
         """Internal method to encrypt data"""
         try:
-            # Convert data to string if needed
-            data_str = json.dumps(data, sort_keys=True) if isinstance(data, dict) else str(data)
+            return self.encrypt_many([data], level, user_id)[0]
+        except Exception as e:
+            self.logger.exception(f"Encryption failed: {e}")
+            raise
 
-            # Get encryption key
-            key_id = f"default_{level.value}"
-            raw_key = self.key_manager.get_key(key_id)
+    def encrypt_many(
+        self,
+        records: Iterable[str | dict[str, Any]],
+        level: EncryptionLevel = EncryptionLevel.HEALTHCARE,
+        user_id: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Encrypt a record set with one key lookup and one cipher object
 
-            if not raw_key:
-                msg = f"Encryption key not found: {key_id}"
-                raise ValueError(msg)
+        Args:
+            records: Values to encrypt; dicts are serialized as sorted JSON
+            level: Encryption level for every record
+            user_id: User recorded in the key usage log
 
-            # Encrypt based on level
-            if level == EncryptionLevel.CRITICAL:
-                encrypted_data = self._encrypt_aes_gcm(data_str.encode(), raw_key)
+        Returns:
+            list: Encrypted packages in input order, same shape as encrypt_phi_data
+        """
+        key_id = f"default_{level.value}"
+        algorithm = "AES-256-GCM" if level == EncryptionLevel.CRITICAL else "Fernet"
+        cipher = self._get_cipher(key_id, algorithm, "Encryption")
+
+        packages = []
+        for data in records:
+            # Convert data to string if needed
+            data_str = json.dumps(data, sort_keys=True) if isinstance(data, dict) else str(data)
+
+            if isinstance(cipher, AESGCM):
+                encrypted_data = self._aes_gcm_encrypt_with(cipher, data_str.encode())
             else:
-                # Use Fernet for basic and healthcare levels
-                fernet = Fernet(raw_key)
-                encrypted_data = fernet.encrypt(data_str.encode())
+                encrypted_data = cipher.encrypt(data_str.encode())
 
             # Log encryption
             self.key_manager._log_key_usage(key_id, "encrypt", "phi_data", user_id)
 
-            return {
-                "encrypted_data": base64.b64encode(encrypted_data).decode(),
-                "key_id": key_id,
-                "encryption_level": level.value,
-                "algorithm": "AES-256-GCM" if level == EncryptionLevel.CRITICAL else "Fernet",
-                "encrypted_at": datetime.now().isoformat(),
-            }
+            packages.append(
+                {
+                    "encrypted_data": base64.b64encode(encrypted_data).decode(),
+                    "key_id": key_id,
+                    "encryption_level": level.value,
+                    "algorithm": algorithm,
+                    "encrypted_at": datetime.now().isoformat(),
+                },
+            )
 
-        except Exception as e:
-            self.logger.exception(f"Encryption failed: {e}")
-            raise
+        return packages
 
     def decrypt_data(
         self,
@@ -819,25 +1079,41 @@ class HealthcareEncryptionManager:
     ) -> str | dict[str, Any]:
         """Decrypt data package"""
         try:
+            return self.decrypt_many([encrypted_package], user_id)[0]
+        except Exception as e:
+            self.logger.exception(f"Decryption failed: {e}")
+            raise
+
+    def decrypt_many(
+        self,
+        encrypted_packages: Sequence[dict[str, Any]],
+        user_id: str | None = None,
+    ) -> list[str | dict[str, Any]]:
+        """
+        Decrypt a set of packages, looking up each distinct key once
+
+        Returns:
+            list: Decrypted values in input order; JSON payloads are parsed
+        """
+        ciphers: dict[tuple[str, str], Fernet | AESGCM] = {}
+        results: list[str | dict[str, Any]] = []
+        for encrypted_package in encrypted_packages:
             key_id = encrypted_package["key_id"]
-            encrypted_data_b64 = encrypted_package["encrypted_data"]
             algorithm = encrypted_package.get("algorithm", "Fernet")
-
-            # Get decryption key
-            raw_key = self.key_manager.get_key(key_id)
-            if not raw_key:
-                msg = f"Decryption key not found: {key_id}"
-                raise ValueError(msg)
+            cipher = ciphers.get((key_id, algorithm))
+            if cipher is None:
+                cipher = ciphers[key_id, algorithm] = self._get_cipher(
+                    key_id,
+                    algorithm,
+                    "Decryption",
+                )
 
             # Decrypt data
-            encrypted_data = base64.b64decode(encrypted_data_b64.encode())
-
-            if algorithm == "AES-256-GCM":
-                decrypted_data = self._decrypt_aes_gcm(encrypted_data, raw_key)
+            encrypted_data = base64.b64decode(encrypted_package["encrypted_data"].encode())
+            if isinstance(cipher, AESGCM):
+                decrypted_data = self._aes_gcm_decrypt_with(cipher, encrypted_data)
             else:
-                # Use Fernet
-                fernet = Fernet(raw_key)
-                decrypted_data = fernet.decrypt(encrypted_data)
+                decrypted_data = cipher.decrypt(encrypted_data)
 
             # Log decryption
             self.key_manager._log_key_usage(key_id, "decrypt", "phi_data", user_id)
@@ -845,62 +1121,66 @@ class HealthcareEncryptionManager:
             # Try to parse as JSON, otherwise return as string
             try:
                 parsed_result: dict[str, Any] = json.loads(decrypted_data.decode())
-                return parsed_result
+                results.append(parsed_result)
             except json.JSONDecodeError:
                 decoded_data: str = decrypted_data.decode()
-                return decoded_data
+                results.append(decoded_data)
 
-        except Exception as e:
-            self.logger.exception(f"Decryption failed: {e}")
-            raise
+        return results
 
-    def _encrypt_aes_gcm(self, data: bytes, key: bytes) -> bytes:
-        """Encrypt using AES-256-GCM"""
-        # Generate random IV
-        iv = secrets.token_bytes(12)  # 96-bit IV for GCM
+    def _get_cipher(self, key_id: str, algorithm: str, operation: str) -> Fernet | AESGCM:
+        """Cipher object for a key, reused while the key manager returns the same key"""
+        raw_key = self.key_manager.get_key(key_id)
+        if not raw_key:
+            msg = f"{operation} key not found: {key_id}"
+            raise ValueError(msg)
 
-        # Create cipher
-        cipher = Cipher(
-            algorithms.AES(key[:32]),  # Use first 32 bytes for AES-256
-            modes.GCM(iv),
-            backend=default_backend(),
-        )
+        cached = self._ciphers.get((key_id, algorithm))
+        if cached is not None and cached[0] == raw_key:
+            return cached[1]
 
-        encryptor = cipher.encryptor()
-        ciphertext_bytes = encryptor.update(data) + encryptor.finalize()
+        # Use first 32 bytes for AES-256; Fernet for basic and healthcare levels
+        cipher = AESGCM(raw_key[:32]) if algorithm == "AES-256-GCM" else Fernet(raw_key)
+        self._ciphers[key_id, algorithm] = (raw_key, cipher)
+        return cipher
 
-        # Ensure we return bytes
-        if isinstance(ciphertext_bytes, bytes) and isinstance(encryptor.tag, bytes):
-            # Return IV + tag + ciphertext
-            return iv + encryptor.tag + ciphertext_bytes
-        raise ValueError("Encryption operation did not return expected bytes")
+    @staticmethod
+    def _aes_gcm_encrypt_with(cipher: AESGCM, data: bytes) -> bytes:
+        """Encrypt with a prepared AES-GCM cipher; returns IV + tag + ciphertext"""
+        iv = secrets.token_bytes(12)  # 96-bit IV for GCM
+        sealed = cipher.encrypt(iv, data, None)  # ciphertext + 16-byte tag
+        return iv + sealed[-16:] + sealed[:-16]
 
-    def _decrypt_aes_gcm(self, encrypted_data: bytes, key: bytes) -> bytes:
-        """Decrypt using AES-256-GCM"""
-        # Extract IV, tag, and ciphertext
+    @staticmethod
+    def _aes_gcm_decrypt_with(cipher: AESGCM, encrypted_data: bytes) -> bytes:
+        """Decrypt IV + tag + ciphertext with a prepared AES-GCM cipher"""
         iv = encrypted_data[:12]
         tag = encrypted_data[12:28]
         ciphertext = encrypted_data[28:]
+        return cipher.decrypt(iv, ciphertext + tag, None)
 
-        # Create cipher
-        cipher = Cipher(
-            algorithms.AES(key[:32]),  # Use first 32 bytes for AES-256
-            modes.GCM(iv, tag),
-            backend=default_backend(),
-        )
+    def _encrypt_aes_gcm(self, data: bytes, key: bytes) -> bytes:
+        """Encrypt using AES-256-GCM"""
+        return self._aes_gcm_encrypt_with(AESGCM(key[:32]), data)
+
+    def _decrypt_aes_gcm(self, encrypted_data: bytes, key: bytes) -> bytes:
+        """Decrypt using AES-256-GCM"""
+        return self._aes_gcm_decrypt_with(AESGCM(key[:32]), encrypted_data)
 
-        decryptor = cipher.decryptor()
-        decrypted_bytes = decryptor.update(ciphertext) + decryptor.finalize()
+    def flush_key_usage_log(self) -> int:
+        """Write any buffered key usage rows now"""
+        return self.key_manager.flush_key_usage_log()
 
-        # Ensure we return bytes
-        if isinstance(decrypted_bytes, bytes):
-            return decrypted_bytes
-        raise ValueError("Decryption operation did not return expected bytes")
+    def close(self) -> None:
+        """Flush buffered key usage rows and stop the background flush; call on shutdown"""
+        self.key_manager.close()
 
     def get_encryption_status(self) -> dict[str, Any]:
         """Get encryption system status"""
+        # Include buffered usage rows in the daily stats
+        self.flush_key_usage_log()
         try:
-            with self.postgres_conn.cursor() as cursor:
+            with self.key_manager.connection_lock, self.postgres_conn.cursor() as cursor:
                 # Count active keys by level
                 cursor.execute(
                     """
@@ -932,6 +1212,7 @@ class HealthcareEncryptionManager:
 
         except Exception as e:
             self.logger.exception(f"Failed to get encryption status: {e}")
+            self.key_manager._rollback()
             return {"status": "error", "error": str(e)}
 
 
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Compare batched INSERT ... ON CONFLICT against COPY + staging merge
+
+Creates a scratch table, loads the same synthetic rows both ways (fresh
+inserts, then a second pass that updates every row) and prints rows/second.
+Needs a reachable database (DATABASE_URL, as used by the service).
+"""
+
+import argparse
+import sys
+import time
+
+# Add the src directory to Python path
+sys.path.insert(0, "/app/src")
+
+from sqlalchemy import text
+
+from bulk_loader import bulk_copy_upsert
+from database import get_db_session
+
+SCRATCH_TABLE = "bulk_load_benchmark"
+COLUMNS = ["code", "description", "category", "synonyms", "children_codes", "search_count"]
+UPDATE_SET = """
+    description = EXCLUDED.description,
+    synonyms = EXCLUDED.synonyms,
+    children_codes = EXCLUDED.children_codes,
+    search_count = EXCLUDED.search_count
+"""
+
+INSERT_SQL = text(f"""
+    INSERT INTO {SCRATCH_TABLE} ({", ".join(COLUMNS)})
+    VALUES (:code, :description, :category, CAST(:synonyms AS jsonb), :children_codes, :search_count)
+    ON CONFLICT (code) DO UPDATE SET {UPDATE_SET}
+""")
+
+
+def make_rows(count: int, generation: int) -> list[dict]:
+    return [
+        {
+            "code": f"X{i:07d}",
+            "description": f"Synthetic condition {i} (gen {generation})\twith\ttabs",
+            "category": f"Category {i % 50}",
+            "synonyms": f'["syn {i}", "alt {generation}"]',
+            "children_codes": [f"X{i:07d}.{c}" for c in range(3)],
+            "search_count": generation,
+        }
+        for i in range(count)
+    ]
+
+
+def reset_table(session) -> None:
+    session.execute(text(f"DROP TABLE IF EXISTS {SCRATCH_TABLE}"))
+    session.execute(text(f"""
+        CREATE TABLE {SCRATCH_TABLE} (
+            code VARCHAR(20) PRIMARY KEY,
+            description TEXT,
+            category TEXT,
+            synonyms JSONB,
+            children_codes TEXT[],
+            search_count INTEGER
+        )
+    """))
+    session.commit()
+
+
+def run_executemany(session, rows: list[dict], batch_size: int) -> float:
+    start = time.perf_counter()
+    for i in range(0, len(rows), batch_size):
+        session.execute(INSERT_SQL, rows[i:i + batch_size])
+        session.commit()
+    return time.perf_counter() - start
+
+
+def run_copy(session, rows: list[dict], batch_size: int) -> float:
+    start = time.perf_counter()
+    for i in range(0, len(rows), batch_size):
+        bulk_copy_upsert(
+            session, SCRATCH_TABLE, COLUMNS, rows[i:i + batch_size],
+            conflict_columns=["code"], update_set=UPDATE_SET, json_columns=["synonyms"],
+        )
+        session.commit()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="COPY vs INSERT bulk load benchmark")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    session = get_db_session()
+    try:
+        for name, loader in (("executemany", run_executemany), ("copy+merge", run_copy)):
+            reset_table(session)
+            insert_time = loader(session, make_rows(args.rows, 1), args.batch_size)
+            update_time = loader(session, make_rows(args.rows, 2), args.batch_size)
+            print(f"{name:12s} insert: {args.rows / insert_time:10.0f} rows/s   "
+                  f"update: {args.rows / update_time:10.0f} rows/s")
+    finally:
+        session.execute(text(f"DROP TABLE IF EXISTS {SCRATCH_TABLE}"))
+        session.commit()
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark drug name search and autocomplete latency on the live dataset
+
+Samples generic names from drug_information and times:
+- DrugAPI.search_consolidated_drugs with the sampled names
+- autocomplete with 3-6 character prefixes
+- autocomplete with one-typo variants (transposed, dropped or changed letter)
+
+Prints p50/p95/p99 latency per query kind, how often the intended drug is
+among the suggestions for typo queries, and the query plans, so index use
+can be checked after migration 009. Needs a reachable database (DATABASE_URL).
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from sqlalchemy import text
+
+from database import get_db_session
+from drugs.api import DrugAPI
+from drugs.name_search import autocomplete_drug_names, trigram_indexes_available
+
+
+def with_typo(rng: random.Random, name: str) -> str:
+    position = rng.randrange(1, len(name) - 1)
+    kind = rng.choice(["swap", "drop", "change"])
+    if kind == "swap":
+        return name[:position] + name[position + 1] + name[position] + name[position + 2:]
+    if kind == "drop":
+        return name[:position] + name[position + 1:]
+    return name[:position] + rng.choice("aeiourstn") + name[position + 1:]
+
+
+def percentiles(samples: list[float]) -> str:
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return (f"p50 {cuts[49] * 1000:7.2f} ms  p95 {cuts[94] * 1000:7.2f} ms  "
+            f"p99 {cuts[98] * 1000:7.2f} ms  (n={len(samples)})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Drug search / autocomplete latency benchmark")
+    parser.add_argument("--samples", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    with get_db_session() as session:
+        print(f"Trigram indexes available: {trigram_indexes_available(session)}")
+        names = [
+            row[0] for row in session.execute(text("""
+                SELECT lower(generic_name) FROM drug_information
+                WHERE length(generic_name) >= 6
+                ORDER BY random() LIMIT :n
+            """), {"n": args.samples})
+        ]
+        total = session.execute(text("SELECT COUNT(*) FROM drug_information")).scalar()
+        print(f"Drugs: {total}, sampled names: {len(names)}")
+
+        timings: dict[str, list[float]] = {"autocomplete prefix": [], "autocomplete typo": []}
+        typo_hits = 0
+        for name in names:
+            start = time.perf_counter()
+            autocomplete_drug_names(session, name[:rng.randint(3, 6)])
+            timings["autocomplete prefix"].append(time.perf_counter() - start)
+            session.rollback()
+
+            start = time.perf_counter()
+            suggestions = autocomplete_drug_names(session, with_typo(rng, name))
+            timings["autocomplete typo"].append(time.perf_counter() - start)
+            session.rollback()
+            typo_hits += any(s["generic_name"].lower() == name for s in suggestions)
+
+        for query in ("metf", "atorvastatn"):
+            autocomplete_plan = session.execute(text(
+                "EXPLAIN SELECT 1 FROM drug_information WHERE :q <% lower(generic_name) "
+                "OR lower(generic_name) LIKE :prefix",
+            ), {"q": query, "prefix": f"{query}%"}).fetchall()
+            print(f"\nPlan for autocomplete on {query!r}:")
+            for row in autocomplete_plan:
+                print(f"  {row[0]}")
+
+    drug_api = DrugAPI(get_db_session, enable_downloader=False)
+    timings["search"] = []
+    for name in names:
+        start = time.perf_counter()
+        asyncio.run(drug_api.search_consolidated_drugs(name))
+        timings["search"].append(time.perf_counter() - start)
+
+    print()
+    for kind, samples in timings.items():
+        print(f"{kind:22s} {percentiles(samples)}")
+    print(f"Typo queries with the intended drug suggested: {typo_hits}/{len(names)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark FileProcessingTracker change detection on a directory of data files
+
+Times three ways of deciding that every file under --data-dir is unchanged:
+- legacy: SHA-256 with 4 KB reads, one file at a time
+- hash pass: 1 MiB reads on the tracker's thread pool (first scan after upgrade)
+- stat pass: (size, mtime, inode) comparison only (every later scan)
+
+Processed-file rows are built in memory, so no database is needed. Point
+--data-dir at e.g. the PubMed baseline directory for realistic numbers; the
+legacy pass reads everything once more, so --legacy-limit caps it.
+"""
+
+import argparse
+import hashlib
+import sys
+import time
+from pathlib import Path
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from database import ProcessedFile
+from file_processing_tracker import FileProcessingTracker
+
+
+class _NoDatabase:
+    """Stands in for the session; change detection itself does not query"""
+
+
+def legacy_hash(path: str) -> str:
+    sha256_hash = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(4096), b""):
+            sha256_hash.update(chunk)
+    return sha256_hash.hexdigest()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="File change detection benchmark")
+    parser.add_argument("--data-dir", type=Path, required=True)
+    parser.add_argument("--pattern", default="*.gz")
+    parser.add_argument("--legacy-limit", type=int, default=50)
+    args = parser.parse_args()
+
+    paths = sorted(str(path) for path in args.data_dir.rglob(args.pattern))
+    total_bytes = sum(Path(path).stat().st_size for path in paths)
+    print(f"Files: {len(paths)} ({total_bytes / 1024**3:.1f} GB)")
+
+    tracker = FileProcessingTracker(_NoDatabase())
+    legacy_sample = paths[: args.legacy_limit]
+    start = time.perf_counter()
+    records = [
+        (path, ProcessedFile(file_name=Path(path).name, file_hash=legacy_hash(path),
+                             file_size=Path(path).stat().st_size))
+        for path in legacy_sample
+    ]
+    legacy_time = time.perf_counter() - start
+    sample_bytes = sum(Path(path).stat().st_size for path in legacy_sample) or 1
+    print(f"Legacy 4 KB hashing ({len(legacy_sample)} files): {legacy_time:8.2f}s "
+          f"(~{legacy_time * total_bytes / sample_bytes:.0f}s estimated for all)")
+
+    # Reuse the legacy hashes for the sample; hash the rest with the new code path
+    known = {path for path, _ in records}
+    records += [
+        (path, ProcessedFile(file_name=Path(path).name, file_hash=tracker.calculate_file_hash(path),
+                             file_size=Path(path).stat().st_size))
+        for path in paths if path not in known
+    ]
+
+    start = time.perf_counter()
+    unchanged = tracker._files_unchanged(records)
+    print(f"Hash pass ({tracker.hash_workers} threads):       {time.perf_counter() - start:8.2f}s "
+          f"({sum(unchanged.values())}/{len(paths)} unchanged)")
+
+    start = time.perf_counter()
+    unchanged = tracker._files_unchanged(records)
+    print(f"Stat pass:                       {time.perf_counter() - start:8.2f}s "
+          f"({sum(unchanged.values())}/{len(paths)} unchanged)")
+
+
+if __name__ == "__main__":
+    main()
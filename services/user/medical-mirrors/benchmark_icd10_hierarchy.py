@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark ICD-10 hierarchy building: prefix index vs. the old pairwise scan
+
+Loads the full CMS ICD-10-CM code set from --codes-file, which can be:
+- the CMS tabular order file (icd10cm_order_YYYY.txt)
+- the CMS codes file (icd10cm_codes_YYYY.txt)
+- a JSON list of code dicts as saved by the ICD-10 downloaders
+
+Without a file, a synthetic CMS-shaped set is generated. The old
+code-vs-every-code scan is quadratic, so it runs on --legacy-sample codes
+and is extrapolated to the full set.
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from icd10.hierarchy_index import ICD10HierarchyIndex
+
+
+def load_codes(path: Path) -> list[str]:
+    if path.suffix == ".json":
+        return [item["code"] for item in json.loads(path.read_text()) if item.get("code")]
+
+    codes = []
+    for line in path.read_text(encoding="latin-1").splitlines():
+        if not line.strip():
+            continue
+        if line[:5].strip().isdigit():
+            # Order file: 5-digit order number, code in columns 6-13
+            codes.append(line[6:13].strip())
+        else:
+            # Codes file: code, whitespace, description
+            codes.append(line.split(None, 1)[0])
+    return codes
+
+
+def synthetic_codes(categories: int) -> list[str]:
+    """CMS-shaped set: categories, subcategories, and 7th-character extensions"""
+    rng = random.Random(42)
+    codes = []
+    for i in range(categories):
+        category = f"{chr(ord('A') + i % 26)}{i // 26 % 100:02d}"
+        codes.append(category)
+        for sub in range(rng.randint(0, 9)):
+            subcategory = f"{category}.{sub}"
+            codes.append(subcategory)
+            for detail in range(rng.randint(0, 9)):
+                detailed = f"{subcategory}{detail}"
+                codes.append(detailed)
+                if rng.random() < 0.3:
+                    codes.extend(f"{detailed}{ext}" for ext in "ADS")
+    return codes
+
+
+# Previous ICD10HierarchyBuilder logic, kept here for comparison
+def legacy_is_child_of(potential_child: str, parent_code: str) -> bool:
+    clean_child = re.sub(r"[A-Z]$", "", potential_child)
+    if not clean_child.startswith(parent_code):
+        return False
+    suffix = clean_child[len(parent_code):]
+    if not suffix:
+        return False
+    if "." in parent_code:
+        return len(suffix) == 1 and suffix.isdigit()
+    return suffix.startswith(".") and len(suffix) == 2 and suffix[1].isdigit()
+
+
+def legacy_children(code: str, code_lookup: dict) -> list[str]:
+    clean_parent = re.sub(r"[A-Z]$", "", code)
+    return [
+        other for other in code_lookup
+        if other != code and legacy_is_child_of(other, clean_parent)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ICD-10 hierarchy index benchmark")
+    parser.add_argument("--codes-file", type=Path)
+    parser.add_argument("--synthetic-categories", type=int, default=1200)
+    parser.add_argument("--legacy-sample", type=int, default=200)
+    args = parser.parse_args()
+
+    codes = load_codes(args.codes_file) if args.codes_file else synthetic_codes(args.synthetic_categories)
+    print(f"Codes: {len(codes)} ({args.codes_file or 'synthetic'})")
+
+    start = time.perf_counter()
+    index = ICD10HierarchyIndex(codes)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for code in codes:
+        index.parent_of(code)
+        index.children_of(code)
+    lookup_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    descendant_total = sum(len(index.descendants_of(code)) for code in codes)
+    descendants_time = time.perf_counter() - start
+
+    print(f"Index build:            {build_time:8.3f}s ({index.relationship_count} relationships)")
+    print(f"Parent+children, all:   {lookup_time:8.3f}s")
+    print(f"Descendants, all:       {descendants_time:8.3f}s ({descendant_total} total)")
+
+    code_lookup = dict.fromkeys(codes)
+    sample = codes[:: max(1, len(codes) // args.legacy_sample)][: args.legacy_sample]
+    start = time.perf_counter()
+    for code in sample:
+        legacy_children(code, code_lookup)
+    legacy_time = time.perf_counter() - start
+    estimated = legacy_time / len(sample) * len(codes)
+    print(f"Legacy scan, {len(sample)} codes: {legacy_time:8.3f}s "
+          f"(~{estimated:.0f}s estimated for all {len(codes)})")
+    total_time = build_time + lookup_time
+    print(f"Speedup (children for all codes): ~{estimated / total_time:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark MinHash/LSH near-duplicate detection on a synthetic trial batch
+
+Generates --records clinical-trial-shaped records, then appends --duplicates
+copies of existing ones with cosmetic changes (case, punctuation, spacing,
+list order) that the md5 content hash does not catch. Prints detection time
+and how many of the planted near-duplicates were found.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from near_duplicate import NearDuplicateDetector, lsh_parameters
+
+FIELDS = ["title", "status", "phase", "conditions", "interventions"]
+
+
+def synthetic_trials(count: int, duplicates: int) -> tuple[list[dict], set[tuple[int, int]]]:
+    rng = random.Random(11)
+    words = [f"term{i}" for i in range(20_000)]
+    trials = [
+        {
+            "nct_id": f"NCT{i:08d}",
+            "title": " ".join(rng.choices(words, k=rng.randint(8, 20))),
+            "status": rng.choice(["RECRUITING", "COMPLETED", "TERMINATED"]),
+            "phase": rng.choice(["PHASE1", "PHASE2", "PHASE3"]),
+            "conditions": rng.choices(words, k=rng.randint(1, 4)),
+            "interventions": rng.choices(words, k=rng.randint(1, 3)),
+        }
+        for i in range(count)
+    ]
+    planted = set()
+    for j in range(duplicates):
+        source = rng.randrange(count)
+        original = trials[source]
+        trials.append({
+            "nct_id": f"NCT9{j:07d}",
+            "title": "  " + original["title"].upper().replace(" ", ",  ") + ".",
+            "status": original["status"].lower(),
+            "phase": original["phase"],
+            "conditions": list(reversed(original["conditions"])),
+            "interventions": original["interventions"],
+        })
+        planted.add((source, len(trials) - 1))
+    return trials, planted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Near-duplicate detection benchmark")
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--duplicates", type=int, default=1000)
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--num-perm", type=int, default=128)
+    args = parser.parse_args()
+
+    trials, planted = synthetic_trials(args.records, args.duplicates)
+    detector = NearDuplicateDetector(num_perm=args.num_perm)
+    bands, rows = lsh_parameters(args.threshold, args.num_perm)
+    print(f"Records: {len(trials)}, threshold {args.threshold} ({bands} bands x {rows} rows)")
+
+    start = time.perf_counter()
+    clusters = detector.find_clusters(trials, FIELDS, args.threshold)
+    elapsed = time.perf_counter() - start
+
+    found_pairs = {
+        (cluster.members[0], member) for cluster in clusters for member in cluster.members[1:]
+    }
+    print(f"Detection:  {elapsed:8.2f}s ({len(trials) / elapsed:,.0f} records/s)")
+    print(f"Clusters:   {len(clusters):8d}")
+    print(f"Planted near-duplicates found: {len(planted & found_pairs)}/{len(planted)}")
+
+
+if __name__ == "__main__":
+    main()
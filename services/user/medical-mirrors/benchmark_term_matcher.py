@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Benchmark health topic term validation: LIKE queries vs. the in-memory matcher
+
+Runs entity extraction over every MedlinePlus topic in health_topics twice:
+once with the previous per-term ``LIKE '%term%'`` queries and once with
+MedicalTermMatcher. Prints wall time and checks that both find the same
+ICD-10 / drug matches. Needs a reachable database (DATABASE_URL).
+
+--synthetic skips the database and times the matcher against a linear
+substring scan over a generated, CMS-sized description set.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from health_info.medical_entity_extractor import MedicalEntityExtractor
+from health_info.term_matcher import ICD10Entry, MedicalTermMatcher
+
+
+def legacy_icd10(session, term: str):
+    from sqlalchemy import text
+    return session.execute(text("""
+        SELECT code, description FROM icd10_codes
+        WHERE LOWER(description) LIKE :pattern
+        LIMIT 1
+    """), {"pattern": f"%{term.lower()}%"}).first()
+
+
+def legacy_drug(session, term: str):
+    from sqlalchemy import text
+    return session.execute(text("""
+        SELECT id, generic_name FROM drug_information
+        WHERE LOWER(generic_name) LIKE :pattern
+        LIMIT 1
+    """), {"pattern": f"%{term.lower()}%"}).first()
+
+
+def bench_database() -> None:
+    from sqlalchemy import text
+
+    from database import get_db_session
+
+    with get_db_session() as session:
+        topics = [
+            dict(row._mapping) for row in session.execute(text("""
+                SELECT title, category, summary, keywords FROM health_topics
+                WHERE source = 'medlineplus'
+            """))
+        ]
+        for topic in topics:
+            if isinstance(topic["keywords"], str):
+                topic["keywords"] = json.loads(topic["keywords"])
+        print(f"Topics: {len(topics)}")
+
+        # Candidate terms exactly as the extractor produces them
+        extractor = MedicalEntityExtractor()
+        terms = []
+        for topic in topics:
+            entities = extractor.extract_entities(topic)
+            terms.append((
+                [c["name"] for c in entities["conditions"]],
+                [m["name"] for m in entities["medications"]],
+            ))
+        condition_count = sum(len(c) for c, _ in terms)
+        medication_count = sum(len(m) for _, m in terms)
+        print(f"Terms: {condition_count} conditions, {medication_count} medications")
+
+        start = time.perf_counter()
+        legacy = [
+            ([getattr(legacy_icd10(session, c), "code", None) for c in conditions],
+             [getattr(legacy_drug(session, m), "id", None) for m in medications])
+            for conditions, medications in terms
+        ]
+        legacy_time = time.perf_counter() - start
+        print(f"LIKE queries:  {legacy_time:8.2f}s "
+              f"({(condition_count + medication_count) / legacy_time:.0f} terms/s)")
+
+        start = time.perf_counter()
+        matcher = MedicalTermMatcher.from_session(session)
+        load_time = time.perf_counter() - start
+        start = time.perf_counter()
+        fast = []
+        for conditions, medications in terms:
+            icd10 = matcher.match_icd10_terms(conditions)
+            drugs = matcher.match_drug_terms(medications)
+            fast.append((
+                [getattr(icd10[c], "code", None) for c in conditions],
+                [getattr(drugs[m], "id", None) for m in medications],
+            ))
+        match_time = time.perf_counter() - start
+        print(f"Matcher:       {match_time:8.2f}s (+{load_time:.2f}s load) "
+              f"speedup {legacy_time / (match_time + load_time):.0f}x")
+
+        # LIMIT 1 without ORDER BY may pick a different row; compare hit/miss
+        mismatches = sum(
+            (a is None) != (b is None)
+            for (lc, lm), (fc, fm) in zip(legacy, fast, strict=True)
+            for a, b in zip(lc + lm, fc + fm, strict=True)
+        )
+        print(f"Hit/miss disagreements: {mismatches}")
+
+
+def bench_synthetic(codes: int, terms: int) -> None:
+    rng = random.Random(7)
+    words = ["acute", "chronic", "diabetes", "mellitus", "fracture", "femur", "infection",
+             "kidney", "disease", "pain", "syndrome", "hypertension", "left", "right",
+             "unspecified", "with", "without", "complication", "neoplasm", "malignant",
+             "asthma", "pneumonia", "arthritis", "bronchitis", "migraine", "anemia"]
+    entries = [
+        ICD10Entry(f"X{i:06d}", " ".join(rng.choices(words, k=rng.randint(3, 9))),
+                   None, None, True, 7)
+        for i in range(codes)
+    ]
+    # Extracted terms that are not in any description cost a full scan each
+    unmatched = ["gastroenteritis", "tendonitis", "myopathy", "dermatitis", "nephropathy"]
+    queries = [
+        " ".join(rng.choices(words, k=rng.randint(1, 2))) if rng.random() < 0.7
+        else f"{rng.choice(unmatched)} {i}"
+        for i in range(terms)
+    ]
+
+    start = time.perf_counter()
+    matcher = MedicalTermMatcher(entries, [])
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fast = [getattr(match, "code", None) for match in matcher.match_icd10_terms(queries).values()]
+    match_time = time.perf_counter() - start
+
+    descriptions = [(e.code, e.description.lower()) for e in matcher.icd10_entries]
+    start = time.perf_counter()
+    slow = {q: next((code for code, d in descriptions if q in d), None) for q in queries}
+    scan_time = time.perf_counter() - start
+
+    assert fast == list(slow.values()), "matcher disagrees with linear scan"
+    print(f"Codes: {codes}, terms: {terms}")
+    print(f"Index build:  {load_time:8.3f}s")
+    print(f"Matcher:      {match_time:8.3f}s ({match_time / terms * 1e6:.1f} us/term)")
+    print(f"Linear scan:  {scan_time:8.3f}s ({scan_time / terms * 1e6:.1f} us/term)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Health topic term matcher benchmark")
+    parser.add_argument("--synthetic", action="store_true")
+    parser.add_argument("--codes", type=int, default=74_000)
+    parser.add_argument("--terms", type=int, default=5000)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        bench_synthetic(args.codes, args.terms)
+    else:
+        bench_database()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark health topic LLM enrichment: nine per-field prompts vs one structured call
+
+Samples topics from health_topics and, for each one, sends:
+- the nine per-field prompts the enricher used before (ICD-10, relevance,
+  classification, risk factors, medications, keywords, related topics,
+  patient summary, provider summary), one request each
+- the single JSON-schema prompt used by the structured mode
+
+Prints mean prompt tokens, completion tokens and wall seconds per topic for
+both, using Ollama's prompt_eval_count / eval_count. A second structured pass
+goes through the persistent result cache to show the re-run cost. Needs a
+reachable database (DATABASE_URL) and Ollama.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the src directory to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+import requests
+from sqlalchemy import text
+
+from database import get_db_session
+from health_info.health_topics_enrichment import HealthTopicsEnricher
+
+
+def ollama_generate(base_url: str, model: str, prompt: str, **extra) -> tuple[int, int, float]:
+    start = time.perf_counter()
+    response = requests.post(
+        f"{base_url}/api/generate",
+        json={"model": model, "prompt": prompt, "stream": False, **extra},
+        timeout=300,
+    )
+    response.raise_for_status()
+    data = response.json()
+    return data.get("prompt_eval_count", 0), data.get("eval_count", 0), time.perf_counter() - start
+
+
+def report(label: str, rows: list[tuple[int, int, float]]) -> None:
+    print(f"{label:<22} prompt tok {statistics.mean(r[0] for r in rows):8.1f}  "
+          f"completion tok {statistics.mean(r[1] for r in rows):8.1f}  "
+          f"seconds {statistics.mean(r[2] for r in rows):7.2f}  (n={len(rows)})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Health topic enrichment cost benchmark")
+    parser.add_argument("--samples", type=int, default=20)
+    args = parser.parse_args()
+
+    with get_db_session() as session:
+        topics = [
+            dict(row._mapping) for row in session.execute(text("""
+                SELECT topic_id, title, summary, sections, keywords FROM health_topics
+                WHERE summary IS NOT NULL ORDER BY topic_id LIMIT :limit
+            """), {"limit": args.samples})
+        ]
+    for topic in topics:
+        topic["keywords"] = topic["keywords"] or []
+        topic["sections"] = topic["sections"] or []
+
+    enricher = HealthTopicsEnricher({
+        "structured_single_call": True,
+        "result_cache_path": str(Path(tempfile.mkdtemp()) / "topic_enrichment_cache.sqlite"),
+    })
+    base_url = enricher.ollama_client.client.config.base_url
+    model = enricher.structured_model
+    print(f"Model {model} at {base_url}, {len(topics)} topics")
+
+    per_field, structured = [], []
+    for topic in topics:
+        content = enricher._extract_content_text(topic)
+        entities = enricher._extract_entities_patterns(content)
+        prompts = [
+            enricher._build_icd10_mapping_prompt(content, entities),
+            enricher._build_clinical_relevance_prompt(content, entities),
+            enricher._build_classification_prompt(content, entities),
+            enricher._build_risk_factors_prompt(content, entities),
+            enricher._build_medications_prompt(content, entities),
+            enricher._build_keywords_prompt(topic["keywords"], content, entities),
+            enricher._build_related_topics_prompt(content, entities),
+            enricher._build_patient_summary_prompt(content, entities),
+            enricher._build_provider_summary_prompt(content, entities),
+        ]
+        calls = [ollama_generate(base_url, model, prompt) for prompt in prompts]
+        per_field.append((sum(c[0] for c in calls), sum(c[1] for c in calls), sum(c[2] for c in calls)))
+
+        before = dict(enricher.stats)
+        start = time.perf_counter()
+        asyncio.run(enricher._enrich_structured(topic, content, entities))
+        structured.append((
+            enricher.stats["llm_prompt_tokens"] - before["llm_prompt_tokens"],
+            enricher.stats["llm_completion_tokens"] - before["llm_completion_tokens"],
+            time.perf_counter() - start,
+        ))
+
+    cached = []
+    for topic in topics:
+        content = enricher._extract_content_text(topic)
+        entities = enricher._extract_entities_patterns(content)
+        start = time.perf_counter()
+        asyncio.run(enricher._enrich_structured(topic, content, entities))
+        cached.append((0, 0, time.perf_counter() - start))
+
+    report("per-field (9 calls)", per_field)
+    report("structured (1 call)", structured)
+    report("structured re-run", cached)
+    print(f"Result cache: {enricher.result_cache.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Migration 009: Trigram indexes for drug name search and autocomplete
+
+Drug search matched names with LOWER(generic_name) LIKE '%term%' and an
+EXISTS over unnest(brand_names), which no btree index can serve, so every
+lookup scanned drug_information. This migration adds pg_trgm GIN indexes:
+
+- lower(generic_name): serves LIKE '%term%' and the similarity operators
+- drug_brand_names_text(brand_names): all brand names of a drug as one
+  lowercase, newline-separated string (array_to_string is not IMMUTABLE,
+  so it is wrapped in a function that can be indexed)
+- a text_pattern_ops btree on lower(generic_name) for short prefixes, which
+  have no complete trigram to look up
+
+Queries must use the same expressions to hit the indexes; see
+src/drugs/name_search.py.
+"""
+
+import sys
+from pathlib import Path
+
+# Add the src directory to Python path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from sqlalchemy import text
+
+from database import engine
+
+
+def upgrade():
+    """Create pg_trgm indexes on drug generic and brand names"""
+    print("Adding trigram indexes for drug name search...")
+
+    with engine.connect() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        print("  ✅ pg_trgm extension available")
+
+        conn.execute(text("""
+            CREATE OR REPLACE FUNCTION drug_brand_names_text(brand_names TEXT[]) RETURNS TEXT AS $$
+                SELECT lower(array_to_string(brand_names, E'\\n'))
+            $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+        """))
+        print("  ✅ Created drug_brand_names_text() function")
+
+        indexes = [
+            "CREATE INDEX IF NOT EXISTS idx_drug_information_generic_name_trgm "
+            "ON drug_information USING GIN (lower(generic_name) gin_trgm_ops);",
+            "CREATE INDEX IF NOT EXISTS idx_drug_information_brand_names_trgm "
+            "ON drug_information USING GIN (drug_brand_names_text(brand_names) gin_trgm_ops);",
+            "CREATE INDEX IF NOT EXISTS idx_drug_information_generic_name_prefix "
+            "ON drug_information (lower(generic_name) text_pattern_ops);",
+        ]
+
+        for index_sql in indexes:
+            conn.execute(text(index_sql))
+            index_name = index_sql.split()[5]  # Extract index name
+            print(f"  ✅ Created index: {index_name}")
+
+        conn.execute(text("ANALYZE drug_information"))
+        conn.commit()
+        print("✅ Drug name trigram indexes created successfully!")
+
+
+def downgrade():
+    """Remove drug name trigram indexes"""
+    print("Dropping drug name trigram indexes...")
+
+    with engine.connect() as conn:
+        conn.execute(text("DROP INDEX IF EXISTS idx_drug_information_generic_name_prefix;"))
+        conn.execute(text("DROP INDEX IF EXISTS idx_drug_information_brand_names_trgm;"))
+        conn.execute(text("DROP INDEX IF EXISTS idx_drug_information_generic_name_trgm;"))
+        conn.execute(text("DROP FUNCTION IF EXISTS drug_brand_names_text(TEXT[]);"))
+        conn.commit()
+        print("✅ Drug name trigram indexes dropped!")
+
+
+if __name__ == "__main__":
+    print("Drug Name Trigram Index Migration 009")
+    print("=====================================")
+    upgrade()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Migration 010: Stat columns for the file change-detection fast path
+
+FileProcessingTracker treats a file as unchanged without hashing it when its
+size, mtime and inode match the processed_files row. This migration adds the
+two columns that hold those values:
+
+- file_mtime_ns: st_mtime_ns when the file was last hashed
+- file_inode: st_ino when the file was last hashed (stored as signed BIGINT)
+
+Existing rows start out NULL and are filled in the next time the tracker
+hashes the file. The service also adds the columns at startup
+(file_processing_tracker.ensure_stat_columns), so running this ahead of a
+deploy is optional.
+"""
+
+import sys
+from pathlib import Path
+
+# Add the src directory to Python path
+src_path = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(src_path))
+
+from sqlalchemy import text
+
+from database import engine
+
+
+def upgrade():
+    """Add file_mtime_ns and file_inode to processed_files"""
+    print("Adding stat columns to processed_files...")
+
+    with engine.connect() as conn:
+        conn.execute(text("""
+            ALTER TABLE processed_files
+                ADD COLUMN IF NOT EXISTS file_mtime_ns BIGINT,
+                ADD COLUMN IF NOT EXISTS file_inode BIGINT
+        """))
+        conn.commit()
+        print("✅ processed_files stat columns added!")
+
+
+def downgrade():
+    """Remove the stat columns from processed_files"""
+    print("Dropping stat columns from processed_files...")
+
+    with engine.connect() as conn:
+        conn.execute(text("""
+            ALTER TABLE processed_files
+                DROP COLUMN IF EXISTS file_inode,
+                DROP COLUMN IF EXISTS file_mtime_ns
+        """))
+        conn.commit()
+        print("✅ processed_files stat columns dropped!")
+
+
+if __name__ == "__main__":
+    print("Processed Files Stat Columns Migration 010")
+    print("==========================================")
+    upgrade()
@@ -0,0 +1,217 @@
+"""
+COPY-based bulk loading for medical-mirrors tables
+
+Rows are streamed with ``COPY ... FROM STDIN`` (text format) into a session
+temp table shaped like the target, then merged with one
+``INSERT ... SELECT ... ON CONFLICT`` statement. Temp tables are not
+WAL-logged, so the staging write costs little more than the COPY itself, and
+the merge runs as a single set operation instead of one statement per row
+group.
+
+Callers keep their existing conflict rules: pass the ``DO UPDATE SET`` body
+as SQL (referring to ``EXCLUDED`` and the target table), or build the merge
+with SQLAlchemy on top of ``staging_select``.
+
+Enabled per loader; ``ENABLE_COPY_BULK_LOAD=true`` switches all loaders over.
+"""
+
+import io
+import json
+import logging
+import os
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import Select, column, select, table, text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Row-order column added to staging tables; the last occurrence of a key wins
+ORDINAL_COLUMN = "_bulk_ord"
+
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def copy_load_enabled(override: bool | None = None) -> bool:
+    """Resolve a loader's COPY flag: explicit override, else ENABLE_COPY_BULK_LOAD"""
+    if override is not None:
+        return override
+    return os.getenv("ENABLE_COPY_BULK_LOAD", "false").lower() == "true"
+
+
+def _array_literal(values: Sequence[Any]) -> str:
+    items = []
+    for value in values:
+        if value is None:
+            items.append("NULL")
+        elif isinstance(value, list | tuple):
+            items.append(_array_literal(value))
+        else:
+            if isinstance(value, bool):
+                value = "t" if value else "f"
+            escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+            items.append(f'"{escaped}"')
+    return "{" + ",".join(items) + "}"
+
+
+def encode_copy_value(value: Any, is_json: bool = False) -> str:
+    """Render one value as a COPY text-format field"""
+    if value is None:
+        return "\\N"
+    if is_json:
+        if not isinstance(value, str):
+            value = json.dumps(value)
+    elif isinstance(value, bool):
+        return "t" if value else "f"
+    elif isinstance(value, datetime | date):
+        value = value.isoformat()
+    elif isinstance(value, list | tuple):
+        value = _array_literal(value)
+    elif isinstance(value, dict):
+        value = json.dumps(value)
+    else:
+        value = str(value)
+    return value.translate(_COPY_ESCAPES)
+
+
+class _CopyStream(io.TextIOBase):
+    """File-like view over encoded rows so COPY streams instead of buffering the batch"""
+
+    def __init__(self, lines: Iterator[str]) -> None:
+        self._lines = lines
+        self._buffer = ""
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int | None = -1) -> str:
+        if size is None or size < 0:
+            data = self._buffer + "".join(self._lines)
+            self._buffer = ""
+            return data
+        while len(self._buffer) < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._buffer += line
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def readline(self, size: int | None = -1) -> str:
+        return self.read(size)
+
+
+def copy_to_staging(
+    session: Session,
+    table_name: str,
+    columns: Sequence[str],
+    rows: Iterable[Mapping[str, Any]],
+    json_columns: Iterable[str] = (),
+) -> tuple[str, int]:
+    """Create a temp table shaped like ``columns`` of ``table_name`` and COPY ``rows`` into it.
+
+    The staging table lives until the end of the current transaction. Returns
+    (staging table name, rows copied).
+    """
+    staging = f"_stg_{table_name}"
+    column_list = ", ".join(columns)
+    json_set = set(json_columns)
+
+    session.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+    session.execute(
+        text(
+            f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+            f"SELECT {column_list} FROM {table_name} WITH NO DATA",
+        ),
+    )
+    session.execute(text(f"ALTER TABLE {staging} ADD COLUMN {ORDINAL_COLUMN} bigint"))
+
+    row_count = 0
+
+    def lines() -> Iterator[str]:
+        nonlocal row_count
+        for row in rows:
+            fields = [encode_copy_value(row.get(name), name in json_set) for name in columns]
+            fields.append(str(row_count))
+            row_count += 1
+            yield "\t".join(fields) + "\n"
+
+    # Raw DBAPI (psycopg2) cursor on the session's connection, so COPY joins its transaction
+    dbapi_connection = session.connection().connection
+    with dbapi_connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {staging} ({column_list}, {ORDINAL_COLUMN}) FROM STDIN",
+            _CopyStream(lines()),
+        )
+    return staging, row_count
+
+
+def staging_select(
+    staging: str,
+    columns: Sequence[str],
+    key_columns: Sequence[str],
+) -> Select[Any]:
+    """SELECT of ``columns`` from ``staging`` with one row per key (last copied wins)"""
+    stg = table(staging, *(column(name) for name in [*columns, ORDINAL_COLUMN]))
+    return (
+        select(*(stg.c[name] for name in columns))
+        .distinct(*(stg.c[name] for name in key_columns))
+        .order_by(*(stg.c[name] for name in key_columns), stg.c[ORDINAL_COLUMN].desc())
+    )
+
+
+def merge_from_staging(
+    session: Session,
+    table_name: str,
+    staging: str,
+    columns: Sequence[str],
+    conflict_columns: Sequence[str],
+    update_set: str | None = None,
+    insert_values: Mapping[str, str] | None = None,
+) -> int:
+    """Merge staged rows into ``table_name`` with one INSERT ... SELECT ... ON CONFLICT.
+
+    ``update_set`` is the body of ``DO UPDATE SET`` (``None`` means DO NOTHING).
+    ``insert_values`` adds target columns computed in SQL from the staged
+    columns, e.g. ``{"last_updated": "NOW()"}``. Returns rows inserted or updated.
+    """
+    insert_values = dict(insert_values or {})
+    target_columns = ", ".join([*columns, *insert_values])
+    select_list = ", ".join([*columns, *insert_values.values()])
+    key_list = ", ".join(conflict_columns)
+    conflict_action = f"DO UPDATE SET {update_set}" if update_set else "DO NOTHING"
+
+    result = session.execute(
+        text(
+            f"INSERT INTO {table_name} ({target_columns}) "
+            f"SELECT {select_list} FROM ("
+            f"  SELECT DISTINCT ON ({key_list}) * FROM {staging}"
+            f"  ORDER BY {key_list}, {ORDINAL_COLUMN} DESC"
+            f") AS staged "
+            f"ON CONFLICT ({key_list}) {conflict_action}",
+        ),
+    )
+    return result.rowcount or 0
+
+
+def bulk_copy_upsert(
+    session: Session,
+    table_name: str,
+    columns: Sequence[str],
+    rows: Iterable[Mapping[str, Any]],
+    conflict_columns: Sequence[str],
+    update_set: str | None = None,
+    insert_values: Mapping[str, str] | None = None,
+    json_columns: Iterable[str] = (),
+) -> int:
+    """COPY ``rows`` into staging and merge them into ``table_name``; does not commit"""
+    staging, copied = copy_to_staging(session, table_name, columns, rows, json_columns)
+    if not copied:
+        return 0
+    merged = merge_from_staging(
+        session, table_name, staging, columns, conflict_columns, update_set, insert_values,
+    )
+    logger.debug(f"COPY bulk load into {table_name}: {copied} staged, {merged} merged")
+    return merged
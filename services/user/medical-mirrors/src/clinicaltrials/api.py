@@ -305,6 +305,8 @@ class ClinicalTrialsAPI:
         logger.info(f"   Updated records: {results.get('updated_records', 0)}")
         logger.info(f"   Duplicates removed: {results.get('duplicates_removed', 0)}")
         logger.info(f"   Content duplicates removed: {results.get('content_duplicates_removed', 0)}")
+        logger.info(f"   Near duplicates merged: {results.get('near_duplicates_removed', 0)} "
+                    f"in {len(results.get('near_duplicate_clusters', []))} clusters")
         logger.info(f"   Deduplication rate: {results.get('deduplication_rate', 0):.1f}%")
 
         return total_processed
@@ -103,6 +103,17 @@ class Config:
     MAX_PARSER_WORKERS: int = int(
         os.getenv("MAX_PARSER_WORKERS", "8"),
     )  # Default to 8 cores (half of typical 16-core system)
+    PUBMED_DB_WRITERS: int = int(
+        os.getenv("PUBMED_DB_WRITERS", "4"),
+    )  # Concurrent upsert connections in the PubMed ingest pipeline
+    PUBMED_PIPELINE_QUEUE_SIZE: int = int(
+        os.getenv("PUBMED_PIPELINE_QUEUE_SIZE", "16"),
+    )  # Article chunks buffered between pipeline stages (backpressure bound)
+    ENABLE_COPY_BULK_LOAD: bool = os.getenv("ENABLE_COPY_BULK_LOAD", "false").lower() == "true"
+    ENABLE_NEAR_DUPLICATE_DEDUP: bool = os.getenv("ENABLE_NEAR_DUPLICATE_DEDUP", "false").lower() == "true"
+    FILE_TRACKER_TRUST_STAT: bool = os.getenv(
+        "FILE_TRACKER_TRUST_STAT", "true",
+    ).lower() == "true"  # Skip hashing files whose size, mtime and inode are unchanged
 
     # Service-specific worker settings
     FDA_MAX_WORKERS: int = int(
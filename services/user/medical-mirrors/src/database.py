@@ -5,7 +5,7 @@ Database configuration and models for medical mirrors
 import os
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, Float, Integer, String, Text, create_engine
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, Float, Integer, String, Text, create_engine
 from sqlalchemy.dialects.postgresql import ARRAY, JSON, TSVECTOR
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
@@ -182,6 +182,8 @@ class ProcessedFile(Base):  # type: ignore[misc,valid-type]
     file_name = Column(String(500), nullable=False)  # Just filename for faster queries
     file_hash = Column(String(64), nullable=False)  # SHA256 hash for change detection
     file_size = Column(Integer, nullable=False)  # File size in bytes
+    file_mtime_ns = Column(BigInteger)  # st_mtime_ns when hashed (stat fast path)
+    file_inode = Column(BigInteger)  # st_ino when hashed (stat fast path)
     source_type = Column(String(50), nullable=False)  # clinical_trials, pubmed, fda
     records_found = Column(Integer, default=0)  # Number of records in file
     records_processed = Column(Integer, default=0)  # Number actually inserted/updated
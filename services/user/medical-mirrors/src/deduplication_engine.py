@@ -12,6 +12,7 @@ Key Features:
 - Configurable deduplication strategies per data source
 """
 
+import asyncio
 import builtins
 import contextlib
 import hashlib
@@ -24,7 +25,10 @@ from typing import Any
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from bulk_loader import bulk_copy_upsert, copy_load_enabled
 from database import ClinicalTrial, get_connection_pool_status, get_thread_safe_session
+from near_duplicate import NearDuplicateDetector, near_duplicate_enabled
+from record_key_index import RecordKeyIndex
 
 logger = logging.getLogger(__name__)
 
@@ -32,9 +36,15 @@ logger = logging.getLogger(__name__)
 class CrossBatchDeduplicator:
     """Cross-batch deduplication engine for medical data processing"""
 
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: Session, use_copy_load: bool | None = None,
+                 detect_near_duplicates: bool | None = None):
         self.db_session = db_session
         self.logger = logging.getLogger(__name__)
+        # COPY + set-based merge for bulk inserts (ENABLE_COPY_BULK_LOAD)
+        self.use_copy_load = copy_load_enabled(use_copy_load)
+        # MinHash/LSH stage after exact content hashing (ENABLE_NEAR_DUPLICATE_DEDUP)
+        self.detect_near_duplicates = near_duplicate_enabled(detect_near_duplicates)
+        self.near_duplicate_detector = NearDuplicateDetector()
 
         # Deduplication strategies per data source
         self.deduplication_strategies = {
@@ -43,34 +53,42 @@ class CrossBatchDeduplicator:
                 "batch_size": 10000,
                 "enable_content_hashing": True,
                 "hash_fields": ["title", "status", "phase", "conditions", "interventions"],
+                "near_duplicate_threshold": 0.9,
             },
             "pubmed_articles": {
                 "primary_key": "pmid",
                 "batch_size": 5000,
                 "enable_content_hashing": True,
                 "hash_fields": ["title", "abstract", "authors", "journal"],
+                "near_duplicate_threshold": 0.9,
             },
             "drug_information": {
                 "primary_key": "generic_name",
                 "batch_size": 5000,
                 "enable_content_hashing": True,
                 "hash_fields": ["generic_name", "therapeutic_class", "indications_and_usage"],
+                "near_duplicate_threshold": 0.85,
             },
         }
 
-    async def get_existing_record_keys(self, table_name: str, key_field: str) -> set[str]:
-        """Get all existing primary keys from database for deduplication"""
+    async def get_existing_record_keys(self, table_name: str, key_field: str) -> RecordKeyIndex:
+        """Get all existing primary keys from database for deduplication.
+
+        Keys are streamed into a compact sorted-array index instead of a set
+        of strings, so memory stays near 8 bytes per numeric key.
+        """
         try:
-            query = text(f"SELECT {key_field} FROM {table_name}")
-            result = self.db_session.execute(query)
-            existing_keys = {str(row[0]) for row in result.fetchall()}
+            existing_keys = RecordKeyIndex.from_table(self.db_session, table_name, key_field)
 
-            self.logger.info(f"Found {len(existing_keys)} existing records in {table_name}")
+            stats = existing_keys.get_stats()
+            self.logger.info(f"Found {len(existing_keys)} existing records in {table_name} "
+                           f"({stats['memory_mb']} MB key index, loaded in {stats['load_seconds']}s)")
             return existing_keys
 
         except Exception as e:
             self.logger.exception(f"Failed to get existing keys from {table_name}: {e}")
-            return set()
+            self.db_session.rollback()
+            return RecordKeyIndex.for_key_field(key_field)
 
     async def deduplicate_within_batch(self, records: list[dict[str, Any]],
                                      strategy: dict[str, Any]) -> tuple[list[dict[str, Any]], int]:
@@ -111,20 +129,23 @@ class CrossBatchDeduplicator:
         return deduplicated_records, duplicate_count
 
     async def filter_existing_records(self, records: list[dict[str, Any]],
-                                    existing_keys: set[str],
+                                    existing_keys: RecordKeyIndex | set[str],
                                     strategy: dict[str, Any]) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
         """Separate new records from existing ones for cross-batch deduplication"""
         primary_key = strategy["primary_key"]
         new_records = []
         existing_records = []
 
-        for record in records:
-            key_value = record.get(primary_key)
-            if not key_value:
-                continue
+        keyed_records = [record for record in records if record.get(primary_key)]
+        key_strs = [str(record[primary_key]) for record in keyed_records]
+        if isinstance(existing_keys, RecordKeyIndex):
+            # One vectorized lookup for the whole batch
+            found = existing_keys.contains_many(key_strs)
+        else:
+            found = [key_str in existing_keys for key_str in key_strs]
 
-            key_str = str(key_value)
-            if key_str in existing_keys:
+        for record, exists in zip(keyed_records, found, strict=True):
+            if exists:
                 existing_records.append(record)
             else:
                 new_records.append(record)
@@ -192,8 +213,56 @@ class CrossBatchDeduplicator:
 
         return deduplicated_records, content_duplicates
 
+    async def deduplicate_near_duplicates(
+        self, records: list[dict[str, Any]], strategy: dict[str, Any],
+    ) -> tuple[list[dict[str, Any]], int, list[dict[str, Any]]]:
+        """Merge records whose hash_fields are nearly identical (MinHash/LSH).
+
+        Catches what the exact content hash misses: differences in whitespace,
+        punctuation, list order or small wording changes. Each cluster keeps
+        its most complete record. Returns the kept records, the number merged
+        away, and one report entry per merged cluster.
+        """
+        threshold = strategy.get("near_duplicate_threshold")
+        hash_fields = strategy.get("hash_fields", [])
+        if not self.detect_near_duplicates or not threshold or not hash_fields or len(records) < 2:
+            return records, 0, []
+
+        start = time.perf_counter()
+        # Signature computation is CPU-bound; keep the event loop responsive
+        clusters = await asyncio.to_thread(
+            self.near_duplicate_detector.find_clusters, records, hash_fields, threshold,
+        )
+
+        primary_key = strategy["primary_key"]
+        merged_positions = set()
+        cluster_reports = []
+        for cluster in clusters:
+            # Prefer record with more non-empty fields, then the earliest one
+            kept = max(cluster.members, key=lambda i: (sum(1 for v in records[i].values() if v), -i))
+            merged = [i for i in cluster.members if i != kept]
+            merged_positions.update(merged)
+            cluster_reports.append({
+                "kept": records[kept].get(primary_key),
+                "merged": [records[i].get(primary_key) for i in merged],
+                "min_similarity": cluster.min_similarity,
+            })
+
+        deduplicated_records = [record for i, record in enumerate(records) if i not in merged_positions]
+        near_duplicates = len(merged_positions)
+
+        if near_duplicates > 0:
+            self.logger.info(f"Near-duplicate detection merged {near_duplicates} records in "
+                           f"{len(clusters)} clusters (threshold {threshold}), keeping "
+                           f"{len(deduplicated_records)} unique in {time.perf_counter() - start:.2f}s")
+            for report in cluster_reports:
+                self.logger.debug(f"Near-duplicate cluster: kept {report['kept']}, merged "
+                                f"{report['merged']} (similarity >= {report['min_similarity']})")
+
+        return deduplicated_records, near_duplicates, cluster_reports
+
     async def process_clinical_trials_batch(self, trials: list[dict[str, Any]],
-                                          existing_keys: set[str] | None = None) -> dict[str, Any]:
+                                          existing_keys: RecordKeyIndex | set[str] | None = None) -> dict[str, Any]:
         """Process clinical trials batch with comprehensive deduplication"""
         if not trials:
             return {
@@ -202,6 +271,8 @@ class CrossBatchDeduplicator:
                 "updated_records": 0,
                 "duplicates_removed": 0,
                 "content_duplicates_removed": 0,
+                "near_duplicates_removed": 0,
+                "near_duplicate_clusters": [],
             }
 
         strategy = self.deduplication_strategies["clinical_trials"]
@@ -214,6 +285,11 @@ class CrossBatchDeduplicator:
         # Step 2: Content-based deduplication (detect identical trials with different NCT IDs)
         content_deduped_trials, content_dupes = await self.deduplicate_by_content(deduplicated_trials, strategy)
 
+        # Step 2b: Near-duplicate detection (same trial with cosmetic differences)
+        content_deduped_trials, near_dupes, near_duplicate_clusters = await self.deduplicate_near_duplicates(
+            content_deduped_trials, strategy,
+        )
+
         # Step 3: Cross-batch deduplication (filter out already processed records)
         if existing_keys is None:
             existing_keys = await self.get_existing_record_keys("clinical_trials", "nct_id")
@@ -242,11 +318,15 @@ class CrossBatchDeduplicator:
             "updated_records": updated_records,
             "duplicates_removed": within_batch_dupes,
             "content_duplicates_removed": content_dupes,
+            "near_duplicates_removed": near_dupes,
+            "near_duplicate_clusters": near_duplicate_clusters,
             "total_input_records": len(trials),
-            "deduplication_rate": (within_batch_dupes + content_dupes) / len(trials) * 100 if trials else 0,
+            "deduplication_rate": (within_batch_dupes + content_dupes + near_dupes) / len(trials) * 100 if trials else 0,
         }
 
-        self.logger.info(f"✅ Clinical trials batch processed: {results}")
+        # Cluster details are reported separately; keep this line short
+        summary = {k: v for k, v in results.items() if k != "near_duplicate_clusters"}
+        self.logger.info(f"✅ Clinical trials batch processed: {summary}")
         return results
 
     async def _bulk_insert_clinical_trials(self, trials: list[dict[str, Any]]) -> int:
@@ -289,7 +369,17 @@ class CrossBatchDeduplicator:
                     }
                     trial_mappings.append(mapping)
 
-                self.db_session.bulk_insert_mappings(ClinicalTrial, trial_mappings)
+                if self.use_copy_load:
+                    # Rows are new by construction; DO NOTHING covers a concurrent insert
+                    bulk_copy_upsert(
+                        self.db_session,
+                        ClinicalTrial.__tablename__,
+                        list(trial_mappings[0].keys()),
+                        trial_mappings,
+                        conflict_columns=["nct_id"],
+                    )
+                else:
+                    self.db_session.bulk_insert_mappings(ClinicalTrial, trial_mappings)
                 self.db_session.commit()
 
                 # Release advisory lock
@@ -821,11 +911,15 @@ class DeduplicationProgressTracker:
             "total_updated_records": 0,
             "total_duplicates_removed": 0,
             "total_content_duplicates_removed": 0,
+            "total_near_duplicates_removed": 0,
+            "total_near_duplicate_clusters": 0,
             "current_batch_size": 0,
             "average_deduplication_rate": 0.0,
             "estimated_remaining_time": 0,
             "processing_rate_per_minute": 0.0,
         }
+        # Latest RecordKeyIndex.get_stats() of the cross-batch key index
+        self.key_index_stats: dict[str, Any] = {}
 
     def start_processing(self, total_files: int) -> None:
         """Initialize progress tracking"""
@@ -833,6 +927,10 @@ class DeduplicationProgressTracker:
         self.processing_stats["total_files"] = total_files
         self.logger.info(f"📊 Starting progress tracking for {total_files} files")
 
+    def update_key_index_stats(self, key_index: RecordKeyIndex) -> None:
+        """Record memory use and lookup time of the cross-batch key index"""
+        self.key_index_stats = key_index.get_stats()
+
     def update_batch_progress(self, batch_results: dict[str, Any]) -> None:
         """Update progress with batch processing results"""
         stats = self.processing_stats
@@ -845,10 +943,13 @@ class DeduplicationProgressTracker:
         stats["total_updated_records"] += batch_results.get("updated_records", 0)
         stats["total_duplicates_removed"] += batch_results.get("duplicates_removed", 0)
         stats["total_content_duplicates_removed"] += batch_results.get("content_duplicates_removed", 0)
+        stats["total_near_duplicates_removed"] += batch_results.get("near_duplicates_removed", 0)
+        stats["total_near_duplicate_clusters"] += len(batch_results.get("near_duplicate_clusters", []))
 
         # Calculate rates
         if stats["total_raw_records"] > 0:
-            total_dupes = stats["total_duplicates_removed"] + stats["total_content_duplicates_removed"]
+            total_dupes = (stats["total_duplicates_removed"] + stats["total_content_duplicates_removed"]
+                           + stats["total_near_duplicates_removed"])
             stats["average_deduplication_rate"] = (total_dupes / stats["total_raw_records"]) * 100
 
         # Calculate processing rate
@@ -878,6 +979,9 @@ class DeduplicationProgressTracker:
         self.logger.info(f"   Existing Records Updated: {stats['total_updated_records']:,}")
         self.logger.info(f"   Duplicates Removed: {stats['total_duplicates_removed']:,}")
         self.logger.info(f"   Content Duplicates Removed: {stats['total_content_duplicates_removed']:,}")
+        if stats["total_near_duplicates_removed"]:
+            self.logger.info(f"   Near Duplicates Merged: {stats['total_near_duplicates_removed']:,} "
+                           f"in {stats['total_near_duplicate_clusters']:,} clusters")
         self.logger.info(f"   Average Deduplication Rate: {stats['average_deduplication_rate']:.1f}%")
 
         if stats["estimated_remaining_time"] > 0:
@@ -886,6 +990,11 @@ class DeduplicationProgressTracker:
 
         self.logger.info(f"   Processing Rate: {stats['processing_rate_per_minute']:.2f} files/minute")
 
+        if self.key_index_stats:
+            key_stats = self.key_index_stats
+            self.logger.info(f"   Key Index: {key_stats['keys']:,} keys, {key_stats['memory_mb']} MB, "
+                           f"{key_stats['avg_lookup_us']} µs/lookup")
+
     def get_progress_summary(self) -> dict[str, Any]:
         """Get comprehensive progress summary for API endpoints"""
         stats = self.processing_stats.copy()
@@ -901,6 +1010,9 @@ class DeduplicationProgressTracker:
             stats["efficiency_ratio"] = stats["total_deduplicated_records"] / stats["total_raw_records"]
             stats["new_record_ratio"] = stats["total_new_records"] / stats["total_deduplicated_records"] if stats["total_deduplicated_records"] > 0 else 0
 
+        if self.key_index_stats:
+            stats["key_index"] = self.key_index_stats
+
         return {
             "timestamp": datetime.utcnow().isoformat(),
             "progress": stats,
@@ -967,7 +1079,7 @@ class SmartBatchProcessor:
         if not force_reprocess:
             existing_keys = await self.deduplicator.get_existing_record_keys("clinical_trials", "nct_id")
         else:
-            existing_keys = set()
+            existing_keys = RecordKeyIndex.for_key_field("nct_id")
 
         total_results = {
             "files_processed": 0,
@@ -976,6 +1088,8 @@ class SmartBatchProcessor:
             "total_updated_records": 0,
             "total_duplicates_removed": 0,
             "total_content_duplicates_removed": 0,
+            "total_near_duplicates_removed": 0,
+            "near_duplicate_clusters": [],
             "processing_errors": [],
         }
 
@@ -1023,6 +1137,7 @@ class SmartBatchProcessor:
                     new_nct_ids = {trial["nct_id"] for trial in all_raw_trials
                                  if trial.get("nct_id")}
                     existing_keys.update(new_nct_ids)
+                self.progress_tracker.update_key_index_stats(existing_keys)
 
                 # Track each file as processed (estimate records per file)
                 batch_processing_time = (datetime.utcnow() - batch_start_time).total_seconds()
@@ -1049,6 +1164,8 @@ class SmartBatchProcessor:
                 total_results["total_updated_records"] += batch_results.get("updated_records", 0)
                 total_results["total_duplicates_removed"] += batch_results.get("duplicates_removed", 0)
                 total_results["total_content_duplicates_removed"] += batch_results.get("content_duplicates_removed", 0)
+                total_results["total_near_duplicates_removed"] += batch_results.get("near_duplicates_removed", 0)
+                total_results["near_duplicate_clusters"].extend(batch_results.get("near_duplicate_clusters", []))
 
                 # Update progress tracking
                 self.progress_tracker.update_batch_progress(batch_results)
@@ -1077,6 +1194,8 @@ class SmartBatchProcessor:
         self.logger.info(f"   Existing records updated: {total_results['total_updated_records']:,}")
         self.logger.info(f"   Duplicates removed: {total_results['total_duplicates_removed']:,}")
         self.logger.info(f"   Content duplicates removed: {total_results['total_content_duplicates_removed']:,}")
+        self.logger.info(f"   Near duplicates merged: {total_results['total_near_duplicates_removed']:,} "
+                       f"in {len(total_results['near_duplicate_clusters']):,} clusters")
 
         if len(skipped_files) > 0:
             time_saved_estimate = len(skipped_files) * 2.0  # Estimate 2 seconds per file saved
@@ -3,31 +3,80 @@ Drug Information Consolidator
 
 Consolidates the 141K duplicate drug records into ~20K unique generic drugs
 with comprehensive data merging and conflict resolution.
+
+Two modes:
+- per-generic (consolidate_all_drugs): one lookup query per generic name
+- streaming (consolidate_all_drugs_streaming): one server-side cursor over
+  all rows ordered by normalized generic name, grouped in a single pass;
+  groups are merged in a process pool and written back with bulk inserts
 """
 
 import logging
+import multiprocessing as mp
 import re
-from collections import Counter
+import time
+from collections import Counter, deque
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from itertools import groupby, islice
 from typing import Any
 
 from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
 
+from bulk_loader import bulk_copy_upsert, copy_load_enabled
 from database import DrugInformation, get_db_session
 
 logger = logging.getLogger(__name__)
 
+# JSON columns of consolidated rows (for the COPY write path)
+CONSOLIDATED_JSON_COLUMNS = ("formulations", "drug_interactions")
 
-class DrugConsolidationEngine:
-    """Engine for consolidating duplicate drug information records"""
+# Columns read when rescoring existing drugs
+SCORE_COLUMNS = (
+    "id", "generic_name", "formulations", "therapeutic_class", "indications_and_usage",
+    "mechanism_of_action", "contraindications", "warnings", "adverse_reactions",
+    "drug_interactions", "data_sources", "confidence_score",
+)
 
-    def __init__(self):
-        self.session = get_db_session()
+SCORE_BUCKETS = ("0.0-0.2", "0.2-0.4", "0.4-0.6", "0.6-0.8", "0.8-1.0")
 
-    def __enter__(self):
-        return self
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.session.close()
+def score_bucket(score: float) -> str:
+    """Distribution bucket label for a confidence score"""
+    if score <= 0.2:
+        return "0.0-0.2"
+    if score <= 0.4:
+        return "0.2-0.4"
+    if score <= 0.6:
+        return "0.4-0.6"
+    if score <= 0.8:
+        return "0.6-0.8"
+    return "0.8-1.0"
+
+
+class SourceDrugRecord:
+    """Attribute view over a streamed drug_information row.
+
+    The merge helpers read product-level columns (ndc, strength, ...) by
+    attribute; columns the row does not have read as None.
+    """
+
+    __slots__ = ("_values",)
+
+    def __init__(self, values: Mapping[str, Any]):
+        self._values = values
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return self._values.get(name)
+
+
+class DrugRecordMerger:
+    """Merge rules for one generic's records; holds no database state"""
 
     def normalize_generic_name(self, generic_name: str | None) -> str | None:
         """Normalize generic drug names for consistent grouping"""
@@ -47,49 +96,6 @@ class DrugConsolidationEngine:
 
         return normalized if normalized else None
 
-    def get_duplicates_analysis(self) -> dict[str, Any]:
-        """Analyze the current duplication situation"""
-        result = self.session.execute(text("""
-            SELECT
-                COUNT(*) as total_records,
-                COUNT(DISTINCT LOWER(TRIM(generic_name))) as unique_generics,
-                COUNT(*) - COUNT(DISTINCT LOWER(TRIM(generic_name))) as duplicates
-            FROM drug_information
-            WHERE generic_name IS NOT NULL
-        """)).fetchone()
-
-        return {
-            "total_records": result[0],
-            "unique_generics": result[1],
-            "duplicates": result[2],
-            "duplication_ratio": result[0] / result[1] if result[1] > 0 else 0,
-        }
-
-    def get_generic_drug_groups(self, limit: int | None = None) -> list[tuple[str, int]]:
-        """Get list of generic drugs and their record counts"""
-        query = """
-            SELECT
-                LOWER(TRIM(generic_name)) as normalized_generic,
-                COUNT(*) as record_count
-            FROM drug_information
-            WHERE generic_name IS NOT NULL
-              AND TRIM(generic_name) != ''
-            GROUP BY LOWER(TRIM(generic_name))
-            ORDER BY record_count DESC
-        """
-
-        if limit:
-            query += f" LIMIT {limit}"
-
-        result = self.session.execute(text(query))
-        return [(row[0], row[1]) for row in result.fetchall()]
-
-    def get_records_for_generic(self, normalized_generic: str) -> list[DrugInformation]:
-        """Get all records for a specific normalized generic name"""
-        return self.session.query(DrugInformation).filter(
-            text("LOWER(TRIM(generic_name)) = :generic"),
-        ).params(generic=normalized_generic).all()
-
     def consolidate_clinical_text_field(self, records: list[DrugInformation], field_name: str) -> str | None:
         """Consolidate clinical text fields by selecting the longest non-empty value"""
         values = []
@@ -224,8 +230,8 @@ class DrugConsolidationEngine:
 
         return min(score / max_score, 1.0)
 
-    def consolidate_drug_group(self, normalized_generic: str, records: list[DrugInformation]) -> DrugInformation:
-        """Consolidate all records for a single generic drug"""
+    def consolidate_drug_group_data(self, normalized_generic: str, records: list[Any]) -> dict[str, Any]:
+        """Column values of the consolidated record for a single generic drug"""
         if not records:
             raise ValueError("No records provided for consolidation")
 
@@ -309,7 +315,121 @@ class DrugConsolidationEngine:
                 drug_interactions.update(record.drug_interactions)
         consolidated_data["drug_interactions"] = drug_interactions
 
-        return DrugInformation(**consolidated_data)
+        return consolidated_data
+
+    def score_existing_drug(self, drug: Mapping[str, Any]) -> float:
+        """Confidence score of an already consolidated drug row"""
+        # Only data_sources is read from the source records
+        return self.calculate_confidence_score(
+            [SourceDrugRecord({"data_sources": drug.get("data_sources")})], drug,
+        )
+
+
+def _consolidate_groups(groups: list[tuple[str, list[dict[str, Any]]]]) -> tuple[list[dict[str, Any]], list[str]]:
+    """Process pool worker: consolidated rows for a chunk of groups, plus failed generic names"""
+    merger = DrugRecordMerger()
+    rows = []
+    failed = []
+    for normalized_generic, records in groups:
+        try:
+            rows.append(merger.consolidate_drug_group_data(
+                normalized_generic, [SourceDrugRecord(record) for record in records],
+            ))
+        except Exception as e:
+            logger.exception(f"Error consolidating {normalized_generic}: {e}")
+            failed.append(normalized_generic)
+    return rows, failed
+
+
+def _score_drugs(drugs: list[dict[str, Any]]) -> list[tuple[int, float, float]]:
+    """Process pool worker: (id, old score, new score) per drug row"""
+    merger = DrugRecordMerger()
+    return [
+        (drug["id"], drug.get("confidence_score") or 0.0, merger.score_existing_drug(drug))
+        for drug in drugs
+    ]
+
+
+def _chunked(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _map_bounded(executor: ProcessPoolExecutor, worker: Callable[[Any], Any],
+                 chunks: Iterable[Any], max_pending: int) -> Iterator[Any]:
+    """Like executor.map, in order, but reads ``chunks`` lazily (at most max_pending in flight)"""
+    pending: deque[Future[Any]] = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(worker, chunk))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+class DrugConsolidationEngine(DrugRecordMerger):
+    """Engine for consolidating duplicate drug information records"""
+
+    def __init__(self, max_workers: int | None = None, use_copy_load: bool | None = None):
+        self.session = get_db_session()
+        # Process pool size for streaming mode
+        self.max_workers = max_workers or max(1, mp.cpu_count() // 2)
+        # COPY + set-based merge for streaming writes (ENABLE_COPY_BULK_LOAD)
+        self.use_copy_load = copy_load_enabled(use_copy_load)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.session.close()
+
+    def get_duplicates_analysis(self) -> dict[str, Any]:
+        """Analyze the current duplication situation"""
+        result = self.session.execute(text("""
+            SELECT
+                COUNT(*) as total_records,
+                COUNT(DISTINCT LOWER(TRIM(generic_name))) as unique_generics,
+                COUNT(*) - COUNT(DISTINCT LOWER(TRIM(generic_name))) as duplicates
+            FROM drug_information
+            WHERE generic_name IS NOT NULL
+        """)).fetchone()
+
+        return {
+            "total_records": result[0],
+            "unique_generics": result[1],
+            "duplicates": result[2],
+            "duplication_ratio": result[0] / result[1] if result[1] > 0 else 0,
+        }
+
+    def get_generic_drug_groups(self, limit: int | None = None) -> list[tuple[str, int]]:
+        """Get list of generic drugs and their record counts"""
+        query = """
+            SELECT
+                LOWER(TRIM(generic_name)) as normalized_generic,
+                COUNT(*) as record_count
+            FROM drug_information
+            WHERE generic_name IS NOT NULL
+              AND TRIM(generic_name) != ''
+            GROUP BY LOWER(TRIM(generic_name))
+            ORDER BY record_count DESC
+        """
+
+        if limit:
+            query += f" LIMIT {limit}"
+
+        result = self.session.execute(text(query))
+        return [(row[0], row[1]) for row in result.fetchall()]
+
+    def get_records_for_generic(self, normalized_generic: str) -> list[DrugInformation]:
+        """Get all records for a specific normalized generic name"""
+        return self.session.query(DrugInformation).filter(
+            text("LOWER(TRIM(generic_name)) = :generic"),
+        ).params(generic=normalized_generic).all()
+
+    def consolidate_drug_group(self, normalized_generic: str, records: list[DrugInformation]) -> DrugInformation:
+        """Consolidate all records for a single generic drug"""
+        return DrugInformation(**self.consolidate_drug_group_data(normalized_generic, records))
 
     def consolidate_all_drugs(self, batch_size: int = 1000, start_offset: int = 0) -> dict[str, Any]:
         """Consolidate all duplicate drug records into consolidated table"""
@@ -370,6 +490,102 @@ class DrugConsolidationEngine:
         logger.info(f"Consolidation complete: {result_stats}")
         return result_stats
 
+    def _stream_rows(self, query: str, chunk_size: int) -> Iterator[dict[str, Any]]:
+        """Rows of ``query`` as dicts, fetched through one server-side cursor"""
+        stmt = text(query).execution_options(stream_results=True, yield_per=chunk_size)
+        result = self.session.execute(stmt)
+        for partition in result.partitions(chunk_size):
+            for row in partition:
+                yield dict(row._mapping)
+
+    def stream_drug_groups(self, chunk_size: int = 5000) -> Iterator[tuple[str, list[dict[str, Any]]]]:
+        """(normalized generic, rows) for every group, reading the table once in group order"""
+        rows = self._stream_rows("""
+            SELECT LOWER(TRIM(generic_name)) AS normalized_generic, *
+            FROM drug_information
+            WHERE generic_name IS NOT NULL
+              AND TRIM(generic_name) != ''
+            ORDER BY LOWER(TRIM(generic_name)), id
+        """, chunk_size)
+        for normalized_generic, group in groupby(rows, key=lambda row: row.pop("normalized_generic")):
+            yield normalized_generic, list(group)
+
+    def _write_consolidated(self, session: Session, rows: list[dict[str, Any]]) -> None:
+        """Insert consolidated rows in one statement; generics that already exist are left alone"""
+        now = datetime.utcnow()
+        for row in rows:
+            row["created_at"] = row["last_updated"] = now
+        if self.use_copy_load:
+            bulk_copy_upsert(
+                session, DrugInformation.__tablename__, list(rows[0]), rows, ["generic_name"],
+                json_columns=CONSOLIDATED_JSON_COLUMNS,
+            )
+        else:
+            stmt = insert(DrugInformation).on_conflict_do_nothing(index_elements=["generic_name"])
+            session.execute(stmt, rows)
+
+    def consolidate_all_drugs_streaming(self, batch_size: int = 1000) -> dict[str, Any]:
+        """Consolidate all drugs from one ordered scan instead of one lookup per generic.
+
+        Groups that already have a row named exactly after the normalized
+        generic are skipped, as in consolidate_all_drugs. ``batch_size``
+        groups go to a worker process at a time and are written back (and
+        committed) together.
+        """
+        start = time.perf_counter()
+        stats = self.get_duplicates_analysis()
+        total_groups = stats["unique_generics"]
+        logger.info(f"Starting streaming consolidation: {stats['total_records']} records -> "
+                    f"{total_groups} drugs ({self.max_workers} workers)")
+
+        processed = 0
+        skipped = 0
+        errors = 0
+
+        def pending_groups() -> Iterator[tuple[str, list[dict[str, Any]]]]:
+            nonlocal processed, skipped
+            for normalized_generic, records in self.stream_drug_groups():
+                # The per-generic mode's filter_by(generic_name=...) check, answered from the group itself
+                if any(record["generic_name"] == normalized_generic for record in records):
+                    skipped += 1
+                    processed += 1
+                    continue
+                yield normalized_generic, records
+
+        writer = get_db_session()
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                results = _map_bounded(executor, _consolidate_groups,
+                                       _chunked(pending_groups(), batch_size), self.max_workers * 2)
+                for rows, failed in results:
+                    errors += len(failed)
+                    if rows:
+                        try:
+                            self._write_consolidated(writer, rows)
+                            writer.commit()
+                            processed += len(rows)
+                        except Exception as e:
+                            writer.rollback()
+                            logger.exception(f"Failed to write {len(rows)} consolidated drugs: {e}")
+                            errors += len(rows)
+                    logger.info(f"Processed {processed}/{total_groups} drugs "
+                                f"({processed / total_groups * 100 if total_groups else 0:.1f}%)")
+        finally:
+            writer.close()
+
+        result_stats = {
+            "original_records": stats["total_records"],
+            "unique_generics": stats["unique_generics"],
+            "processed": processed,
+            "skipped_existing": skipped,
+            "errors": errors,
+            "consolidation_ratio": stats["total_records"] / processed if processed > 0 else 0,
+            "elapsed_seconds": round(time.perf_counter() - start, 1),
+        }
+
+        logger.info(f"Streaming consolidation complete: {result_stats}")
+        return result_stats
+
     def recalculate_confidence_scores(self, batch_size: int = 1000, dry_run: bool = False) -> dict[str, Any]:
         """
         Recalculate confidence scores for all existing drug records.
@@ -386,13 +602,7 @@ class DrugConsolidationEngine:
         
         processed = 0
         updated = 0
-        score_distribution = {
-            '0.0-0.2': 0,
-            '0.2-0.4': 0,
-            '0.4-0.6': 0,
-            '0.6-0.8': 0,
-            '0.8-1.0': 0
-        }
+        score_distribution = dict.fromkeys(SCORE_BUCKETS, 0)
         
         # Process in batches
         for offset in range(0, total_drugs, batch_size):
@@ -412,29 +622,13 @@ class DrugConsolidationEngine:
                     "drug_interactions": drug.drug_interactions,
                     "data_sources": drug.data_sources,
                 }
-                
-                # Create a fake records list with the drug's data sources
-                fake_records = []
-                if drug.data_sources:
-                    for source in drug.data_sources:
-                        fake_record = type('obj', (object,), {'data_sources': [source]})()
-                        fake_records.append(fake_record)
-                
+
                 old_score = drug.confidence_score or 0.0
-                new_score = self.calculate_confidence_score(fake_records or [drug], drug_dict)
-                
+                new_score = self.score_existing_drug(drug_dict)
+
                 # Track distribution
-                if new_score <= 0.2:
-                    score_distribution['0.0-0.2'] += 1
-                elif new_score <= 0.4:
-                    score_distribution['0.2-0.4'] += 1
-                elif new_score <= 0.6:
-                    score_distribution['0.4-0.6'] += 1
-                elif new_score <= 0.8:
-                    score_distribution['0.6-0.8'] += 1
-                else:
-                    score_distribution['0.8-1.0'] += 1
-                
+                score_distribution[score_bucket(new_score)] += 1
+
                 if abs(new_score - old_score) > 0.001:  # Only update if changed
                     if not dry_run:
                         drug.confidence_score = new_score
@@ -464,16 +658,87 @@ class DrugConsolidationEngine:
         logger.info(f"Confidence score update complete: {result_stats}")
         return result_stats
 
+    def recalculate_confidence_scores_streaming(self, batch_size: int = 1000,
+                                                dry_run: bool = False) -> dict[str, Any]:
+        """Recalculate confidence scores from one scan, scoring in worker processes.
+
+        Replaces OFFSET paging and per-object flushes: rows are read through
+        a server-side cursor, and changed scores are written with one UPDATE
+        per batch.
+        """
+        start = time.perf_counter()
+        total_drugs = self.session.execute(text("SELECT COUNT(*) FROM drug_information")).scalar()
+        logger.info(f"Recalculating confidence scores for {total_drugs} drugs "
+                    f"(streaming, {self.max_workers} workers)")
+
+        processed = 0
+        updated = 0
+        score_distribution = dict.fromkeys(SCORE_BUCKETS, 0)
+
+        rows = self._stream_rows(
+            f"SELECT {', '.join(SCORE_COLUMNS)} FROM drug_information ORDER BY id", batch_size,
+        )
+        writer = get_db_session()
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                results = _map_bounded(executor, _score_drugs, _chunked(rows, batch_size),
+                                       self.max_workers * 2)
+                for scores in results:
+                    changed_ids = []
+                    changed_scores = []
+                    for drug_id, old_score, new_score in scores:
+                        score_distribution[score_bucket(new_score)] += 1
+                        if abs(new_score - old_score) > 0.001:  # Only update if changed
+                            changed_ids.append(drug_id)
+                            changed_scores.append(new_score)
+                    processed += len(scores)
+                    updated += len(changed_ids)
+
+                    if dry_run:
+                        logger.info(f"[DRY RUN] Processed {processed}/{total_drugs} drugs, "
+                                    f"would update {updated} scores")
+                        continue
+                    if changed_ids:
+                        writer.execute(text("""
+                            UPDATE drug_information AS d
+                            SET confidence_score = v.score
+                            FROM unnest(CAST(:ids AS integer[]), CAST(:scores AS double precision[]))
+                                AS v(id, score)
+                            WHERE d.id = v.id
+                        """), {"ids": changed_ids, "scores": changed_scores})
+                        writer.commit()
+                    logger.info(f"Processed {processed}/{total_drugs} drugs, updated {updated} scores")
+        finally:
+            writer.close()
+
+        result_stats = {
+            "total_drugs": total_drugs,
+            "processed": processed,
+            "updated": updated,
+            "score_distribution": score_distribution,
+            "dry_run": dry_run,
+            "elapsed_seconds": round(time.perf_counter() - start, 1),
+        }
+
+        logger.info(f"Confidence score update complete: {result_stats}")
+        return result_stats
+
 
-def run_consolidation(batch_size: int = 1000, start_offset: int = 0) -> dict[str, Any]:
+def run_consolidation(batch_size: int = 1000, start_offset: int = 0, streaming: bool = False,
+                      max_workers: int | None = None) -> dict[str, Any]:
     """Run the drug consolidation process"""
-    with DrugConsolidationEngine() as consolidator:
+    with DrugConsolidationEngine(max_workers=max_workers) as consolidator:
+        if streaming:
+            return consolidator.consolidate_all_drugs_streaming(batch_size)
         return consolidator.consolidate_all_drugs(batch_size, start_offset)
 
 
-def recalculate_confidence_scores(batch_size: int = 1000, dry_run: bool = False) -> dict[str, Any]:
+def recalculate_confidence_scores(batch_size: int = 1000, dry_run: bool = False, streaming: bool = False,
+                                  max_workers: int | None = None) -> dict[str, Any]:
     """Recalculate confidence scores for existing records"""
-    with DrugConsolidationEngine() as consolidator:
+    with DrugConsolidationEngine(max_workers=max_workers) as consolidator:
+        if streaming:
+            return consolidator.recalculate_confidence_scores_streaming(batch_size, dry_run)
         return consolidator.recalculate_confidence_scores(batch_size, dry_run)
 
 
@@ -490,17 +755,23 @@ if __name__ == "__main__":
                        help='Number of records to process at once (default: 1000)')
     parser.add_argument('--dry-run', action='store_true',
                        help='For recalculate-scores: calculate but do not save')
+    parser.add_argument('--streaming', action='store_true',
+                       help='Read all rows in one ordered scan and process groups in a worker pool')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Worker processes for --streaming (default: half the CPU cores)')
     
     args = parser.parse_args()
     
     if args.action == 'consolidate':
-        results = run_consolidation(batch_size=args.batch_size)
+        results = run_consolidation(batch_size=args.batch_size, streaming=args.streaming,
+                                    max_workers=args.workers)
         print("\n=== Drug Consolidation Results ===")
         for key, value in results.items():
             print(f"{key}: {value}")
     
     elif args.action == 'recalculate-scores':
-        results = recalculate_confidence_scores(batch_size=args.batch_size, dry_run=args.dry_run)
+        results = recalculate_confidence_scores(batch_size=args.batch_size, dry_run=args.dry_run,
+                                                streaming=args.streaming, max_workers=args.workers)
         print("\n=== Confidence Score Update Results ===")
         print(f"Total drugs: {results['total_drugs']}")
         print(f"Processed: {results['processed']}")
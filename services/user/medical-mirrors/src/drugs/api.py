@@ -15,6 +15,7 @@ import os
 from datetime import datetime
 from typing import Any
 
+from bulk_loader import copy_load_enabled, copy_to_staging, staging_select
 from enhanced_drug_sources.dailymed_parser import DailyMedParser
 from enhanced_drug_sources.ddinter_parser import DDInterParser
 from enhanced_drug_sources.drug_name_matcher import DrugNameMatcher
@@ -31,6 +32,7 @@ from sqlalchemy.types import String, Text
 from database import DrugInformation, UpdateLog
 
 from .downloader import DrugDownloader
+from .name_search import autocomplete_drug_names, name_match_clause
 from .parser import DrugParser
 from .parser_optimized import OptimizedDrugParser
 
@@ -56,6 +58,9 @@ class DrugAPI:
 
         self.parser = DrugParser()
 
+        # COPY + set-based merge for batch upserts (ENABLE_COPY_BULK_LOAD)
+        self.use_copy_load = copy_load_enabled(getattr(config, "ENABLE_COPY_BULK_LOAD", None))
+
         # Use optimized parser if multicore parsing is enabled
         if config and getattr(config, "ENABLE_MULTICORE_PARSING", False):
             max_workers = getattr(config, "FDA_MAX_WORKERS", None)
@@ -103,7 +108,8 @@ class DrugAPI:
         db = self.session_factory()
         try:
             # Use full-text search and fuzzy matching for consolidated drugs
-            search_query = """
+            # Name matching uses the trigram indexes from migration 009 when present
+            search_query = f"""
                 SELECT
                     generic_name,
                     brand_names,
@@ -122,19 +128,14 @@ class DrugAPI:
                     has_clinical_data,
                     ts_rank_cd(search_vector, plainto_tsquery('english', :search_term)) as relevance
                 FROM drug_information
-                WHERE search_vector @@ plainto_tsquery('english', :search_term)
-                   OR LOWER(generic_name) LIKE LOWER(:fuzzy_search)
-                   OR EXISTS (
-                       SELECT 1 FROM unnest(brand_names) brand
-                       WHERE LOWER(brand) LIKE LOWER(:fuzzy_search)
-                   )
+                WHERE {name_match_clause(db)}
                 ORDER BY relevance DESC, confidence_score DESC
                 LIMIT :limit
             """
 
             params = {
                 "search_term": generic_name,
-                "fuzzy_search": f"%{generic_name}%",
+                "fuzzy_search": f"%{generic_name.lower()}%",
                 "limit": max_results,
             }
 
@@ -172,6 +173,19 @@ class DrugAPI:
         finally:
             db.close()
 
+    async def autocomplete_drugs(self, query: str, max_results: int = 10) -> list[dict[str, Any]]:
+        """
+        Ranked, typo-tolerant generic and brand name suggestions for a partial name
+        """
+        db = self.session_factory()
+        try:
+            return autocomplete_drug_names(db, query, max_results)
+        except Exception as e:
+            logger.exception(f"Drug autocomplete failed: {e}")
+            return []
+        finally:
+            db.close()
+
     async def search_by_ndc(
         self,
         ndc: str,
@@ -831,147 +845,170 @@ class DrugAPI:
         if not insert_data_list:
             return
 
+        if self.use_copy_load:
+            # Stream rows with COPY into staging, then merge them in one statement
+            columns = list(insert_data_list[0].keys())
+            staging, _ = copy_to_staging(
+                db,
+                DrugInformation.__tablename__,
+                columns,
+                insert_data_list,
+                json_columns=("formulations", "drug_interactions"),
+            )
+            stmt = insert(DrugInformation).from_select(
+                columns, staging_select(staging, columns, ["generic_name"]),
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["generic_name"], set_=self._drug_upsert_set(stmt),
+            )
+            db.execute(stmt)
+            return
+
         # Use PostgreSQL's powerful ON CONFLICT DO UPDATE for batch operations
         stmt = insert(DrugInformation)
 
         # Configure UPSERT with intelligent field merging (using generic_name as unique key)
         stmt = stmt.on_conflict_do_update(
             index_elements=["generic_name"],
-            set_={
-                # Always update timestamps
-                "last_updated": stmt.excluded.last_updated,
-
-                # Merge arrays intelligently - combine unique values
-                "brand_names": func.array_cat(
-                    func.coalesce(DrugInformation.brand_names, cast([], ARRAY(String))),
-                    stmt.excluded.brand_names,
-                ),
-                "manufacturers": func.array_cat(
-                    func.coalesce(DrugInformation.manufacturers, cast([], ARRAY(String))),
-                    stmt.excluded.manufacturers,
-                ),
-                "formulations": func.coalesce(
-                    stmt.excluded.formulations,
-                    DrugInformation.formulations,
-                ),
-                "approval_dates": func.array_cat(
-                    func.coalesce(DrugInformation.approval_dates, cast([], ARRAY(String))),
-                    stmt.excluded.approval_dates,
-                ),
-                "orange_book_codes": func.array_cat(
-                    func.coalesce(DrugInformation.orange_book_codes, cast([], ARRAY(String))),
-                    stmt.excluded.orange_book_codes,
-                ),
-                "application_numbers": func.array_cat(
-                    func.coalesce(DrugInformation.application_numbers, cast([], ARRAY(String))),
-                    stmt.excluded.application_numbers,
-                ),
-                "data_sources": func.array_cat(
-                    func.coalesce(DrugInformation.data_sources, cast([], ARRAY(String))),
-                    stmt.excluded.data_sources,
-                ),
-
-                # Clinical text fields - use new data if better (longer/non-empty)
-                "therapeutic_class": func.coalesce(
-                    func.nullif(stmt.excluded.therapeutic_class, ""),
-                    DrugInformation.therapeutic_class,
-                ),
-                "indications_and_usage": func.coalesce(
-                    func.nullif(stmt.excluded.indications_and_usage, ""),
-                    DrugInformation.indications_and_usage,
-                ),
-                "mechanism_of_action": func.coalesce(
-                    func.nullif(stmt.excluded.mechanism_of_action, ""),
-                    DrugInformation.mechanism_of_action,
-                ),
-                "dosage_and_administration": func.coalesce(
-                    func.nullif(stmt.excluded.dosage_and_administration, ""),
-                    DrugInformation.dosage_and_administration,
-                ),
-                "pharmacokinetics": func.coalesce(
-                    func.nullif(stmt.excluded.pharmacokinetics, ""),
-                    DrugInformation.pharmacokinetics,
-                ),
-                "pharmacodynamics": func.coalesce(
-                    func.nullif(stmt.excluded.pharmacodynamics, ""),
-                    DrugInformation.pharmacodynamics,
-                ),
-                "boxed_warning": func.coalesce(
-                    func.nullif(stmt.excluded.boxed_warning, ""),
-                    DrugInformation.boxed_warning,
-                ),
-                "clinical_studies": func.coalesce(
-                    func.nullif(stmt.excluded.clinical_studies, ""),
-                    DrugInformation.clinical_studies,
-                ),
-                "pediatric_use": func.coalesce(
-                    func.nullif(stmt.excluded.pediatric_use, ""),
-                    DrugInformation.pediatric_use,
-                ),
-                "geriatric_use": func.coalesce(
-                    func.nullif(stmt.excluded.geriatric_use, ""),
-                    DrugInformation.geriatric_use,
-                ),
-                "pregnancy": func.coalesce(
-                    func.nullif(stmt.excluded.pregnancy, ""),
-                    DrugInformation.pregnancy,
-                ),
-                "nursing_mothers": func.coalesce(
-                    func.nullif(stmt.excluded.nursing_mothers, ""),
-                    DrugInformation.nursing_mothers,
-                ),
-                "overdosage": func.coalesce(
-                    func.nullif(stmt.excluded.overdosage, ""),
-                    DrugInformation.overdosage,
-                ),
-                "nonclinical_toxicology": func.coalesce(
-                    func.nullif(stmt.excluded.nonclinical_toxicology, ""),
-                    DrugInformation.nonclinical_toxicology,
-                ),
-
-                # Clinical arrays - merge unique values
-                "contraindications": func.array_cat(
-                    func.coalesce(DrugInformation.contraindications, cast([], ARRAY(String))),
-                    stmt.excluded.contraindications,
-                ),
-                "warnings": func.array_cat(
-                    func.coalesce(DrugInformation.warnings, cast([], ARRAY(String))),
-                    stmt.excluded.warnings,
-                ),
-                "precautions": func.array_cat(
-                    func.coalesce(DrugInformation.precautions, cast([], ARRAY(String))),
-                    stmt.excluded.precautions,
-                ),
-                "adverse_reactions": func.array_cat(
-                    func.coalesce(DrugInformation.adverse_reactions, cast([], ARRAY(String))),
-                    stmt.excluded.adverse_reactions,
-                ),
-
-                # JSON field - merge intelligently
-                "drug_interactions": func.coalesce(
-                    stmt.excluded.drug_interactions,
-                    DrugInformation.drug_interactions,
-                ),
-
-                # Computed fields
-                "total_formulations": func.coalesce(
-                    stmt.excluded.total_formulations,
-                    DrugInformation.total_formulations,
-                ),
-                "confidence_score": func.greatest(
-                    stmt.excluded.confidence_score,
-                    DrugInformation.confidence_score,
-                ),
-                "has_clinical_data": func.coalesce(
-                    stmt.excluded.has_clinical_data,
-                    DrugInformation.has_clinical_data,
-                ),
-            },
+            set_=self._drug_upsert_set(stmt),
         )
 
         # Execute batch insert
         db.execute(stmt, insert_data_list)
 
+    def _drug_upsert_set(self, stmt: Any) -> dict[str, Any]:
+        """ON CONFLICT update rules shared by the executemany and COPY upsert paths"""
+        return {
+            # Always update timestamps
+            "last_updated": stmt.excluded.last_updated,
+
+            # Merge arrays intelligently - combine unique values
+            "brand_names": func.array_cat(
+                func.coalesce(DrugInformation.brand_names, cast([], ARRAY(String))),
+                stmt.excluded.brand_names,
+            ),
+            "manufacturers": func.array_cat(
+                func.coalesce(DrugInformation.manufacturers, cast([], ARRAY(String))),
+                stmt.excluded.manufacturers,
+            ),
+            "formulations": func.coalesce(
+                stmt.excluded.formulations,
+                DrugInformation.formulations,
+            ),
+            "approval_dates": func.array_cat(
+                func.coalesce(DrugInformation.approval_dates, cast([], ARRAY(String))),
+                stmt.excluded.approval_dates,
+            ),
+            "orange_book_codes": func.array_cat(
+                func.coalesce(DrugInformation.orange_book_codes, cast([], ARRAY(String))),
+                stmt.excluded.orange_book_codes,
+            ),
+            "application_numbers": func.array_cat(
+                func.coalesce(DrugInformation.application_numbers, cast([], ARRAY(String))),
+                stmt.excluded.application_numbers,
+            ),
+            "data_sources": func.array_cat(
+                func.coalesce(DrugInformation.data_sources, cast([], ARRAY(String))),
+                stmt.excluded.data_sources,
+            ),
+
+            # Clinical text fields - use new data if better (longer/non-empty)
+            "therapeutic_class": func.coalesce(
+                func.nullif(stmt.excluded.therapeutic_class, ""),
+                DrugInformation.therapeutic_class,
+            ),
+            "indications_and_usage": func.coalesce(
+                func.nullif(stmt.excluded.indications_and_usage, ""),
+                DrugInformation.indications_and_usage,
+            ),
+            "mechanism_of_action": func.coalesce(
+                func.nullif(stmt.excluded.mechanism_of_action, ""),
+                DrugInformation.mechanism_of_action,
+            ),
+            "dosage_and_administration": func.coalesce(
+                func.nullif(stmt.excluded.dosage_and_administration, ""),
+                DrugInformation.dosage_and_administration,
+            ),
+            "pharmacokinetics": func.coalesce(
+                func.nullif(stmt.excluded.pharmacokinetics, ""),
+                DrugInformation.pharmacokinetics,
+            ),
+            "pharmacodynamics": func.coalesce(
+                func.nullif(stmt.excluded.pharmacodynamics, ""),
+                DrugInformation.pharmacodynamics,
+            ),
+            "boxed_warning": func.coalesce(
+                func.nullif(stmt.excluded.boxed_warning, ""),
+                DrugInformation.boxed_warning,
+            ),
+            "clinical_studies": func.coalesce(
+                func.nullif(stmt.excluded.clinical_studies, ""),
+                DrugInformation.clinical_studies,
+            ),
+            "pediatric_use": func.coalesce(
+                func.nullif(stmt.excluded.pediatric_use, ""),
+                DrugInformation.pediatric_use,
+            ),
+            "geriatric_use": func.coalesce(
+                func.nullif(stmt.excluded.geriatric_use, ""),
+                DrugInformation.geriatric_use,
+            ),
+            "pregnancy": func.coalesce(
+                func.nullif(stmt.excluded.pregnancy, ""),
+                DrugInformation.pregnancy,
+            ),
+            "nursing_mothers": func.coalesce(
+                func.nullif(stmt.excluded.nursing_mothers, ""),
+                DrugInformation.nursing_mothers,
+            ),
+            "overdosage": func.coalesce(
+                func.nullif(stmt.excluded.overdosage, ""),
+                DrugInformation.overdosage,
+            ),
+            "nonclinical_toxicology": func.coalesce(
+                func.nullif(stmt.excluded.nonclinical_toxicology, ""),
+                DrugInformation.nonclinical_toxicology,
+            ),
+
+            # Clinical arrays - merge unique values
+            "contraindications": func.array_cat(
+                func.coalesce(DrugInformation.contraindications, cast([], ARRAY(String))),
+                stmt.excluded.contraindications,
+            ),
+            "warnings": func.array_cat(
+                func.coalesce(DrugInformation.warnings, cast([], ARRAY(String))),
+                stmt.excluded.warnings,
+            ),
+            "precautions": func.array_cat(
+                func.coalesce(DrugInformation.precautions, cast([], ARRAY(String))),
+                stmt.excluded.precautions,
+            ),
+            "adverse_reactions": func.array_cat(
+                func.coalesce(DrugInformation.adverse_reactions, cast([], ARRAY(String))),
+                stmt.excluded.adverse_reactions,
+            ),
+
+            # JSON field - merge intelligently
+            "drug_interactions": func.coalesce(
+                stmt.excluded.drug_interactions,
+                DrugInformation.drug_interactions,
+            ),
+
+            # Computed fields
+            "total_formulations": func.coalesce(
+                stmt.excluded.total_formulations,
+                DrugInformation.total_formulations,
+            ),
+            "confidence_score": func.greatest(
+                stmt.excluded.confidence_score,
+                DrugInformation.confidence_score,
+            ),
+            "has_clinical_data": func.coalesce(
+                stmt.excluded.has_clinical_data,
+                DrugInformation.has_clinical_data,
+            ),
+        }
+
     def upsert_enhanced_drug(self, drug_data: dict, db: Session):
         """Insert or update a drug record using PostgreSQL UPSERT with all enhanced fields"""
         from sqlalchemy.dialects.postgresql import insert
@@ -0,0 +1,184 @@
+"""
+Index-backed drug name matching for search and autocomplete
+
+Migration 009 adds pg_trgm GIN indexes on ``lower(generic_name)`` and
+``drug_brand_names_text(brand_names)``. The queries here use exactly those
+expressions, so ``LIKE '%term%'`` and the trigram similarity operators are
+answered from the indexes instead of a sequential scan of drug_information.
+
+Autocomplete ranks suggestions:
+1. names that start with the query
+2. word similarity to the query (typo tolerant: "metfromin" → metformin)
+3. the drug's confidence_score
+
+Without the migration the functions fall back to unindexed LIKE matching,
+so the API keeps working on an un-migrated database.
+"""
+
+import logging
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Minimum pg_trgm word similarity for a fuzzy autocomplete match
+AUTOCOMPLETE_SIMILARITY_THRESHOLD = 0.4
+
+# Shortest query autocomplete answers (shorter prefixes match almost everything)
+AUTOCOMPLETE_MIN_QUERY_LENGTH = 2
+
+# How long a "migration not applied" answer is trusted before checking again
+INDEX_RECHECK_SECONDS = 300
+
+_INDEX_CHECK_SQL = text("""
+    SELECT to_regprocedure('drug_brand_names_text(text[])') IS NOT NULL
+       AND to_regclass('idx_drug_information_generic_name_trgm') IS NOT NULL
+""")
+
+# WHERE clause for search_consolidated_drugs, indexed and legacy forms
+NAME_MATCH_INDEXED = """
+    search_vector @@ plainto_tsquery('english', :search_term)
+    OR lower(generic_name) LIKE :fuzzy_search
+    OR drug_brand_names_text(brand_names) LIKE :fuzzy_search
+"""
+
+NAME_MATCH_LEGACY = """
+    search_vector @@ plainto_tsquery('english', :search_term)
+    OR LOWER(generic_name) LIKE :fuzzy_search
+    OR EXISTS (
+        SELECT 1 FROM unnest(brand_names) brand
+        WHERE LOWER(brand) LIKE :fuzzy_search
+    )
+"""
+
+_AUTOCOMPLETE_INDEXED_SQL = text("""
+    WITH generic_hits AS (
+        SELECT
+            generic_name AS suggestion,
+            generic_name,
+            'generic' AS match_type,
+            lower(generic_name) LIKE :prefix AS is_prefix,
+            word_similarity(:query, lower(generic_name)) AS score,
+            confidence_score
+        FROM drug_information
+        WHERE :query <% lower(generic_name)
+           OR lower(generic_name) LIKE :prefix
+    ),
+    brand_hits AS (
+        SELECT
+            brand AS suggestion,
+            d.generic_name,
+            'brand' AS match_type,
+            lower(brand) LIKE :prefix AS is_prefix,
+            word_similarity(:query, lower(brand)) AS score,
+            d.confidence_score
+        FROM drug_information d, unnest(d.brand_names) AS brand
+        WHERE (:query <% drug_brand_names_text(d.brand_names)
+               OR drug_brand_names_text(d.brand_names) LIKE :infix)
+    ),
+    ranked AS (
+        SELECT DISTINCT ON (lower(suggestion)) *
+        FROM (
+            SELECT * FROM generic_hits
+            UNION ALL
+            SELECT * FROM brand_hits
+            WHERE is_prefix OR score >= :threshold
+        ) hits
+        ORDER BY lower(suggestion), is_prefix DESC, score DESC, match_type DESC
+    )
+    SELECT suggestion, generic_name, match_type, is_prefix, score
+    FROM ranked
+    ORDER BY is_prefix DESC, score DESC, confidence_score DESC NULLS LAST, suggestion
+    LIMIT :limit
+""")
+
+_AUTOCOMPLETE_LEGACY_SQL = text("""
+    SELECT suggestion, generic_name, match_type, TRUE AS is_prefix, 1.0 AS score
+    FROM (
+        SELECT DISTINCT ON (lower(suggestion)) *
+        FROM (
+            SELECT generic_name AS suggestion, generic_name, 'generic' AS match_type, confidence_score
+            FROM drug_information
+            WHERE LOWER(generic_name) LIKE :prefix
+            UNION ALL
+            SELECT brand, d.generic_name, 'brand', d.confidence_score
+            FROM drug_information d, unnest(d.brand_names) AS brand
+            WHERE LOWER(brand) LIKE :prefix
+        ) hits
+        ORDER BY lower(suggestion), match_type DESC
+    ) ranked
+    ORDER BY confidence_score DESC NULLS LAST, suggestion
+    LIMIT :limit
+""")
+
+_trigram_indexes_available: bool | None = None
+_last_index_check = 0.0
+_index_check_lock = threading.Lock()
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def trigram_indexes_available(db: Session) -> bool:
+    """Whether migration 009 has been applied (cached; a miss is rechecked periodically)"""
+    global _trigram_indexes_available, _last_index_check
+    with _index_check_lock:
+        now = time.monotonic()
+        if _trigram_indexes_available or (
+            _trigram_indexes_available is False and now - _last_index_check < INDEX_RECHECK_SECONDS
+        ):
+            return _trigram_indexes_available
+        _last_index_check = now
+        try:
+            _trigram_indexes_available = bool(db.execute(_INDEX_CHECK_SQL).scalar())
+        except Exception as e:
+            logger.warning(f"Could not check for drug name trigram indexes: {e}")
+            db.rollback()
+            _trigram_indexes_available = False
+        if not _trigram_indexes_available:
+            logger.warning("Drug name trigram indexes missing (run migration 009); "
+                           "drug name matching falls back to sequential scans")
+        return _trigram_indexes_available
+
+
+def name_match_clause(db: Session) -> str:
+    """WHERE clause matching :search_term / :fuzzy_search against drug names"""
+    return NAME_MATCH_INDEXED if trigram_indexes_available(db) else NAME_MATCH_LEGACY
+
+
+def autocomplete_drug_names(db: Session, query: str, limit: int = 10) -> list[dict[str, Any]]:
+    """Ranked generic and brand name suggestions for a (possibly misspelled) partial name"""
+    query = " ".join(query.lower().split())
+    if len(query) < AUTOCOMPLETE_MIN_QUERY_LENGTH:
+        return []
+
+    params = {
+        "query": query,
+        "prefix": f"{_escape_like(query)}%",
+        "infix": f"%{_escape_like(query)}%",
+        "threshold": AUTOCOMPLETE_SIMILARITY_THRESHOLD,
+        "limit": limit,
+    }
+    if trigram_indexes_available(db):
+        # The <% operator compares against this setting (default 0.6); scope it to the transaction
+        db.execute(text("SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"),
+                   {"threshold": str(AUTOCOMPLETE_SIMILARITY_THRESHOLD)})
+        rows = db.execute(_AUTOCOMPLETE_INDEXED_SQL, params).fetchall()
+    else:
+        rows = db.execute(_AUTOCOMPLETE_LEGACY_SQL, params).fetchall()
+
+    return [
+        {
+            "suggestion": row.suggestion,
+            "generic_name": row.generic_name,
+            "match_type": row.match_type,
+            "prefix_match": bool(row.is_prefix),
+            "score": round(float(row.score), 3),
+        }
+        for row in rows
+    ]
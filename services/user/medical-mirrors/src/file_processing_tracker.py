@@ -1,28 +1,72 @@
 """
 File Processing Tracker - Avoid parsing files that have already been processed
+
+Change detection, cheapest check first:
+- a file with no processed_files row, or a different size, needs processing
+- with FILE_TRACKER_TRUST_STAT (default on), a file whose size, mtime and
+  inode all match the row is unchanged without reading it
+- otherwise the file is hashed (SHA-256, 1 MiB reads, several files at a
+  time on a thread pool) and compared; matching rows get their stat values
+  filled in so the next scan takes the fast path
 """
 
 import hashlib
 import logging
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
-from sqlalchemy import and_, func
+from sqlalchemy import Engine, and_, func, text
 from sqlalchemy.orm import Session
 
 from database import ProcessedFile
 
 logger = logging.getLogger(__name__)
 
+# Read size for hashing; large reads let hashlib run without the GIL
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Files hashed concurrently when a scan needs hashes
+DEFAULT_HASH_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def file_stat_trust_enabled(override: bool | None = None) -> bool:
+    """Resolve the stat fast-path flag: explicit override, else FILE_TRACKER_TRUST_STAT"""
+    if override is not None:
+        return override
+    return os.getenv("FILE_TRACKER_TRUST_STAT", "true").lower() == "true"
+
+
+def _signed64(value: int) -> int:
+    """Fit an unsigned 64-bit inode number into a BIGINT column"""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def ensure_stat_columns(engine: Engine) -> None:
+    """Add the stat fast-path columns to processed_files if an older schema lacks them.
+
+    Run once at service startup (see main.lifespan) or through migration 010;
+    trackers assume the columns exist.
+    """
+    with engine.begin() as conn:
+        conn.execute(text("""
+            ALTER TABLE processed_files
+                ADD COLUMN IF NOT EXISTS file_mtime_ns BIGINT,
+                ADD COLUMN IF NOT EXISTS file_inode BIGINT
+        """))
+
 
 class FileProcessingTracker:
     """Track processed files to avoid redundant parsing operations"""
 
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: Session, trust_file_stat: bool | None = None,
+                 hash_workers: int | None = None):
         self.db_session = db_session
         self.logger = logging.getLogger(__name__)
+        self.trust_file_stat = file_stat_trust_enabled(trust_file_stat)
+        self.hash_workers = hash_workers or DEFAULT_HASH_WORKERS
 
     def calculate_file_hash(self, file_path: str) -> str:
         """Calculate SHA256 hash of file for change detection"""
@@ -31,11 +75,13 @@ class FileProcessingTracker:
 
         try:
             self.logger.debug(f"📊 Starting hash calculation for: {file_path}")
-            with open(file_path, "rb") as f:
-                # Read file in chunks for memory efficiency
-                for chunk in iter(lambda: f.read(4096), b""):
-                    sha256_hash.update(chunk)
-                    bytes_read += len(chunk)
+            buffer = bytearray(HASH_CHUNK_SIZE)
+            view = memoryview(buffer)
+            with open(file_path, "rb", buffering=0) as f:
+                # Read file in large chunks into one reused buffer
+                while size := f.readinto(buffer):
+                    sha256_hash.update(view[:size])
+                    bytes_read += size
 
             result_hash = sha256_hash.hexdigest()
             self.logger.debug(f"📊 Hash calculated for {Path(file_path).name}: {result_hash[:8]}... ({bytes_read} bytes read)")
@@ -75,18 +121,10 @@ class FileProcessingTracker:
                 self.logger.debug(f"No existing record found for: {file_name}")
                 return None
 
-            # Check if file has changed (hash comparison)
-            self.logger.debug(f"Calculating hash for: {file_name}")
-            current_hash, current_size = self.get_file_info(file_path)
-
-            if not current_hash:
-                self.logger.warning(f"Failed to calculate hash for: {file_name}")
-                return None  # Error getting hash, assume needs processing
-
-            self.logger.debug(f"Hash comparison for {file_name}: existing={existing.file_hash[:8]}..., current={current_hash[:8]}..., size_existing={existing.file_size}, size_current={current_size}")
-
-            if existing.file_hash == current_hash and existing.file_size == current_size:
+            unchanged = self._files_unchanged([(file_path, existing)])
+            if unchanged.get(file_path):
                 self.logger.debug(f"✅ File already processed (unchanged): {file_name}")
+                self.db_session.commit()  # Stat values filled in after a hash match
                 return existing
             self.logger.info(f"📝 File changed, will reprocess: {file_name} (hash or size mismatch)")
             return None
@@ -107,6 +145,7 @@ class FileProcessingTracker:
         try:
             file_name = Path(file_path).name
             file_hash, file_size = self.get_file_info(file_path)
+            file_stat = Path(file_path).stat()
 
             # Check if record exists (for updates)
             existing = (
@@ -125,6 +164,8 @@ class FileProcessingTracker:
                 existing.file_path = file_path
                 existing.file_hash = file_hash
                 existing.file_size = file_size
+                existing.file_mtime_ns = file_stat.st_mtime_ns
+                existing.file_inode = _signed64(file_stat.st_ino)
                 existing.records_found = records_found
                 existing.records_processed = records_processed
                 existing.processing_time_seconds = processing_time
@@ -137,6 +178,8 @@ class FileProcessingTracker:
                     file_name=file_name,
                     file_hash=file_hash,
                     file_size=file_size,
+                    file_mtime_ns=file_stat.st_mtime_ns,
+                    file_inode=_signed64(file_stat.st_ino),
                     source_type=source_type,
                     records_found=records_found,
                     records_processed=records_processed,
@@ -160,25 +203,86 @@ class FileProcessingTracker:
             self.db_session.rollback()
             raise
 
+    def _files_unchanged(self, candidates: list[tuple[str, ProcessedFile]]) -> dict[str, bool]:
+        """Whether each file still matches its processed_files row.
+
+        Trusts matching (size, mtime, inode) when enabled; hashes the rest on
+        a thread pool. Rows confirmed by hash get their stat values updated
+        (uncommitted).
+        """
+        unchanged: dict[str, bool] = {}
+        to_hash: list[tuple[str, ProcessedFile, os.stat_result]] = []
+
+        for file_path, record in candidates:
+            try:
+                file_stat = Path(file_path).stat()
+            except OSError as e:
+                self.logger.warning(f"Cannot stat {file_path}: {e}")
+                unchanged[file_path] = False
+                continue
+
+            if record.file_size != file_stat.st_size:
+                unchanged[file_path] = False
+            elif (self.trust_file_stat
+                  and record.file_mtime_ns == file_stat.st_mtime_ns
+                  and record.file_inode == _signed64(file_stat.st_ino)):
+                unchanged[file_path] = True
+            else:
+                to_hash.append((file_path, record, file_stat))
+
+        if to_hash:
+            self.logger.info(f"🔐 Hashing {len(to_hash)} files with {self.hash_workers} threads...")
+            with ThreadPoolExecutor(max_workers=self.hash_workers) as executor:
+                hashes = executor.map(self.calculate_file_hash, [path for path, _, _ in to_hash])
+                for (file_path, record, file_stat), current_hash in zip(to_hash, hashes, strict=True):
+                    matches = bool(current_hash) and current_hash == record.file_hash
+                    unchanged[file_path] = matches
+                    if matches:
+                        record.file_mtime_ns = file_stat.st_mtime_ns
+                        record.file_inode = _signed64(file_stat.st_ino)
+
+        return unchanged
+
     def filter_unprocessed_files(self, file_paths: list[str], source_type: str) -> tuple[list[str], list[str]]:
         """Separate files into unprocessed and already processed lists"""
-        unprocessed = []
-        skipped = []
-
+        start_time = time.time()
         self.logger.info(f"🔍 Checking {len(file_paths)} files for processing status...")
 
-        for i, file_path in enumerate(file_paths):
-            if i % 1000 == 0:
-                self.logger.info(f"🔍 Progress: Checked {i}/{len(file_paths)} files...")
+        try:
+            # One query for every processed file of this source (first row per name wins)
+            records: dict[str, ProcessedFile] = {}
+            for record in (
+                self.db_session.query(ProcessedFile)
+                .filter(ProcessedFile.source_type == source_type)
+                .order_by(ProcessedFile.id)
+            ):
+                records.setdefault(record.file_name, record)
+
+            candidates = [
+                (file_path, records[Path(file_path).name])
+                for file_path in file_paths
+                if Path(file_path).name in records
+            ]
+            unchanged = self._files_unchanged(candidates)
+            # Persist stat values learned from hashing for the next scan
+            self.db_session.commit()
+        except Exception:
+            self.logger.exception(f"Error checking processed files for {source_type}")
+            self.db_session.rollback()
+            unchanged = {}
 
-            if self.is_file_already_processed(file_path, source_type):
+        unprocessed = []
+        skipped = []
+        for file_path in file_paths:
+            if unchanged.get(file_path):
                 skipped.append(file_path)
             else:
                 unprocessed.append(file_path)
 
         self.logger.info(
             f"📋 File processing filter results: "
-            f"{len(unprocessed)} need processing, {len(skipped)} already processed",
+            f"{len(unprocessed)} need processing, {len(skipped)} already processed "
+            f"({time.time() - start_time:.2f}s)",
         )
 
         return unprocessed, skipped
@@ -13,7 +13,6 @@ import logging
 from typing import Any, Dict, List, Optional, Set
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor
-import time
 import json
 
 from sqlalchemy import text
@@ -22,6 +21,7 @@ from database import get_db_session, get_thread_safe_session
 from .scispacy_client import SciSpacyClient, SciSpacyClientSync
 from .llm_client import OllamaClient, OllamaClientSync, LLMConfig
 from .llm_client_optimized import OptimizedOllamaClient
+from llm_scheduler import LLMPriority
 
 logger = logging.getLogger(__name__)
 
@@ -54,8 +54,8 @@ class FoodAIEnhancer:
             self.scispacy_client = None
         
         # Use optimized client for faster processing
-        from .llm_client_optimized import OptimizedOllamaClient
-        self.ollama_client = OptimizedOllamaClient()
+        # LLM requests are paced by the shared per-endpoint scheduler
+        self.ollama_client = OptimizedOllamaClient(priority=LLMPriority.BATCH)
         
         # Statistics tracking
         self.stats = {
@@ -69,10 +69,6 @@ class FoodAIEnhancer:
             'ai_failures': 0
         }
         
-        # Rate limiting for AI services
-        self.last_ai_call = 0
-        self.min_ai_interval = 0.1  # Minimum seconds between AI calls
-        
         # Comprehensive food seed words for search
         self.food_seed_words = self._get_comprehensive_food_seed_words()
         
@@ -162,6 +158,9 @@ class FoodAIEnhancer:
     def _process_batch(self, session, batch):
         """Process a batch of food items with AI enhancement"""
         
+        # Run SciSpacy over the whole batch in one nlp.pipe pass
+        concepts_by_id = self._extract_food_concepts_batch(batch)
+        
         for row in batch:
             try:
                 fdc_id = row.fdc_id
@@ -173,11 +172,10 @@ class FoodAIEnhancer:
                     
                 self.stats['processed'] += 1
                 
-                # Rate limiting
-                self._rate_limit()
-                
-                # Extract food entities using SciSpacy
-                food_concepts = self._extract_food_concepts(description)
+                # Extract food entities using SciSpacy (batch result if available)
+                food_concepts = concepts_by_id.get(fdc_id)
+                if food_concepts is None:
+                    food_concepts = self._extract_food_concepts(description)
                 
                 # Generate enhancements using Ollama
                 enhancements = self._generate_food_enhancements(
@@ -195,13 +193,29 @@ class FoodAIEnhancer:
                 self.stats['ai_failures'] += 1
                 continue
                 
-    def _rate_limit(self):
-        """Apply rate limiting for AI service calls"""
-        elapsed = time.time() - self.last_ai_call
-        if elapsed < self.min_ai_interval:
-            time.sleep(self.min_ai_interval - elapsed)
-        self.last_ai_call = time.time()
-        
+    def _extract_food_concepts_batch(self, batch) -> Dict[Any, Optional[Dict[str, Any]]]:
+        """Extract food concepts for all described items in a batch with one SciSpacy call
+
+        Items SciSpacy could not analyze map to None and are retried one by one.
+        """
+        if not (self.use_scispacy and self.scispacy_client):
+            return {}
+        rows = [row for row in batch if row.description]
+        if not rows:
+            return {}
+        try:
+            self.stats['ai_calls'] += 1
+            concepts = self.scispacy_client.extract_food_concepts_batch(
+                [row.description for row in rows]
+            )
+            return {
+                row.fdc_id: row_concepts for row, row_concepts in zip(rows, concepts, strict=True)
+            }
+        except Exception as e:
+            logger.error(f"SciSpacy batch extraction failed: {e}")
+            self.stats['ai_failures'] += 1
+            return {}
+            
     def _extract_food_concepts(self, description: str) -> Dict[str, Any]:
         """Extract food concepts using SciSpacy (if available) or basic extraction"""
         if self.use_scispacy and self.scispacy_client:
@@ -428,7 +442,7 @@ class FoodAIEnhancerAsync:
         
     async def __aenter__(self):
         self.scispacy_client = await SciSpacyClient().__aenter__()
-        self.ollama_client = await OllamaClient().__aenter__()
+        self.ollama_client = await OllamaClient(priority=LLMPriority.BATCH).__aenter__()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -29,22 +29,89 @@ from pathlib import Path
 # Add parent directory to path for imports  
 sys.path.append(str(Path(__file__).parent.parent))
 
+from config import Config
 from config_loader import get_config
+from health_info.topic_enrichment_cache import TopicEnrichmentCache, topic_cache_key
+from llm_scheduler import LLMPriority, get_llm_scheduler
 
 logger = logging.getLogger(__name__)
 
 # Try to import AI clients - may not be available if services are down
 try:
-    from icd10.scispacy_client import SciSpacyClientSync
+    from icd10.scispacy_client import SciSpacyClient, SciSpacyClientSync
     from icd10.llm_client import OllamaClientSync
     AI_CLIENTS_AVAILABLE = True
 except ImportError as e:
     logger.warning(f"AI clients not available: {e}")
+    SciSpacyClient = None
     SciSpacyClientSync = None
     OllamaClientSync = None
     AI_CLIENTS_AVAILABLE = False
 
 
+# Bump when the structured prompt or schema changes so cached results are redone
+STRUCTURED_PROMPT_VERSION = "health_topic_structured_v1"
+
+TOPIC_CLASSIFICATIONS = ['prevention', 'treatment', 'diagnosis', 'management', 'general']
+
+# JSON schema passed to Ollama's ``format`` so one call returns every field
+STRUCTURED_ENRICHMENT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "icd10_mappings": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "code": {"type": "string"},
+                    "description": {"type": "string"},
+                    "confidence": {"type": "number"},
+                    "reasoning": {"type": "string"},
+                },
+                "required": ["code", "description", "confidence"],
+            },
+        },
+        "clinical_relevance_score": {"type": "number"},
+        "classification": {"type": "string", "enum": TOPIC_CLASSIFICATIONS},
+        "risk_factors": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "factor": {"type": "string"},
+                    "type": {"type": "string"},
+                    "severity": {"type": "string"},
+                    "description": {"type": "string"},
+                },
+                "required": ["factor", "type"],
+            },
+        },
+        "medications": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "type": {"type": "string"},
+                    "purpose": {"type": "string"},
+                    "class": {"type": "string"},
+                },
+                "required": ["name", "type"],
+            },
+        },
+        "enhanced_keywords": {"type": "array", "items": {"type": "string"}},
+        "related_topics": {"type": "array", "items": {"type": "string"}},
+        "patient_summary": {"type": "string"},
+        "provider_summary": {"type": "string"},
+    },
+    "required": [
+        "icd10_mappings", "clinical_relevance_score", "classification", "risk_factors",
+        "medications", "enhanced_keywords", "related_topics", "patient_summary",
+        "provider_summary",
+    ],
+}
+
+
 @dataclass
 class HealthTopicEnhancement:
     """Enhanced health topic data structure"""
@@ -106,7 +173,7 @@ class HealthTopicsEnricher:
         if self.ai_enabled and AI_CLIENTS_AVAILABLE:
             try:
                 self.scispacy_client = SciSpacyClientSync()
-                self.ollama_client = OllamaClientSync()
+                self.ollama_client = OllamaClientSync(priority=LLMPriority.BATCH)
             except Exception as e:
                 logger.warning(f"Failed to initialize AI clients: {e}")
                 self.scispacy_client = None
@@ -134,15 +201,29 @@ class HealthTopicsEnricher:
             'keywords_enhanced': 0,
             'ai_calls': 0,
             'ai_failures': 0,
-            'fallback_to_pattern': 0
+            'fallback_to_pattern': 0,
+            'structured_calls': 0,
+            'structured_cache_hits': 0,
+            'llm_prompt_tokens': 0,
+            'llm_completion_tokens': 0,
+            'llm_seconds': 0.0
         }
         
         # Pattern-based fallback data
         self._load_pattern_data()
         
-        # Rate limiting
-        self.last_ai_call = 0
-        self.min_ai_interval = 0.2  # 200ms between AI calls
+        # Structured single-call mode and its persistent result cache
+        topic_settings = self.config.get_llm_settings().get('llm', {}).get('health_topics', {})
+        self.structured_single_call = self.user_config.get(
+            'structured_single_call', topic_settings.get('structured_single_call', True))
+        self.structured_max_tokens = topic_settings.get('structured_max_tokens', 1500)
+        self.structured_model = self.config.get_llm_model('health_topics')
+        self.result_cache: Optional[TopicEnrichmentCache] = None
+        if self.ai_enabled and self.structured_single_call:
+            cache_path = (self.user_config.get('result_cache_path')
+                          or topic_settings.get('result_cache_path')
+                          or f"{Config.DATA_DIR}/health_info/topic_enrichment_cache.sqlite")
+            self.result_cache = TopicEnrichmentCache(cache_path)
         
     def _load_pattern_data(self):
         """Load pattern-based enhancement data for fallback mode"""
@@ -233,8 +314,11 @@ class HealthTopicsEnricher:
         semaphore = asyncio.Semaphore(max_concurrent)
         tasks = []
         
-        for topic_data in batch:
-            task = self._enhance_single_topic_ai(topic_data, semaphore)
+        # Run SciSpacy over the whole batch in one nlp.pipe pass
+        batch_entities = await self._extract_medical_entities_batch(batch)
+        
+        for topic_data, entities in zip(batch, batch_entities, strict=True):
+            task = self._enhance_single_topic_ai(topic_data, semaphore, entities)
             tasks.append(task)
             
         results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -265,8 +349,14 @@ class HealthTopicsEnricher:
         return enhanced_topics
         
     async def _enhance_single_topic_ai(self, topic_data: Dict[str, Any], 
-                                     semaphore: asyncio.Semaphore) -> HealthTopicEnhancement:
-        """Enhance a single topic using AI services"""
+                                     semaphore: asyncio.Semaphore,
+                                     prefetched_entities: Optional[Dict[str, List[str]]] = None
+                                     ) -> HealthTopicEnhancement:
+        """Enhance a single topic using AI services
+        
+        ``prefetched_entities`` comes from the batched SciSpacy pass; when it is
+        None the entities are extracted for this topic alone.
+        """
         async with semaphore:
             self.stats['processed'] += 1
             
@@ -289,16 +379,25 @@ class HealthTopicsEnricher:
                 logger.warning(f"No content found for topic {topic_id}")
                 return enhancement
                 
-            # Apply rate limiting
-            await self._rate_limit()
-            
             try:
                 # 1. Medical entity extraction using SciSpacy
-                entities = await self._extract_medical_entities(content_text)
+                entities = prefetched_entities
+                if entities is None:
+                    entities = await self._extract_medical_entities(content_text)
                 enhancement.medical_entities = entities
                 if entities:
                     self.stats['medical_entities_extracted'] += len(sum(entities.values(), []))
                     
+                # 2-7. One structured call for every LLM field, served from the
+                # result cache when this topic's content has been seen before
+                if self.structured_single_call:
+                    result = await self._enrich_structured(topic_data, content_text, entities)
+                    if result is not None:
+                        self._apply_structured_result(enhancement, result, topic_data)
+                        enhancement.ai_confidence = self._calculate_ai_confidence(enhancement)
+                        self.stats['enhanced'] += 1
+                        return enhancement
+                        
                 # 2. ICD-10 mapping
                 icd10_mappings = await self._map_to_icd10(content_text, entities)
                 enhancement.icd10_mappings = icd10_mappings
@@ -417,13 +516,6 @@ class HealthTopicsEnricher:
                     
         return ' '.join(content_parts)
         
-    async def _rate_limit(self):
-        """Apply rate limiting for AI service calls"""
-        elapsed = time.time() - self.last_ai_call
-        if elapsed < self.min_ai_interval:
-            await asyncio.sleep(self.min_ai_interval - elapsed)
-        self.last_ai_call = time.time()
-        
     def _check_ai_services(self) -> bool:
         """Check if AI services are available"""
         if not self.scispacy_client or not self.ollama_client:
@@ -445,25 +537,57 @@ class HealthTopicsEnricher:
         try:
             self.stats['ai_calls'] += 1
             entities = self.scispacy_client.extract_medical_concepts(content)
-            
-            # Organize entities by type
-            organized_entities = {
-                'diseases': entities.get('diseases', []),
-                'chemicals': entities.get('chemicals', []),
-                'genes': entities.get('genes', []),
-                'organisms': entities.get('organisms', []),
-                'anatomy': entities.get('anatomy', []),
-                'medical_procedures': entities.get('procedures', []),
-                'all_entities': entities.get('all_entities', [])
-            }
-            
-            return organized_entities
+            return self._organize_medical_entities(entities)
             
         except Exception as e:
             logger.error(f"SciSpacy entity extraction failed: {e}")
             self.stats['ai_failures'] += 1
             return {}
             
+    async def _extract_medical_entities_batch(self, batch: List[Dict[str, Any]]
+                                              ) -> List[Optional[Dict[str, List[str]]]]:
+        """Extract medical entities for a whole batch with one SciSpacy /analyze/batch call
+        
+        Returns one entry per topic in batch order; entries are None for topics
+        without content or that SciSpacy could not analyze, so callers fall back
+        to per-topic extraction.
+        """
+        results: List[Optional[Dict[str, List[str]]]] = [None] * len(batch)
+        if not self.scispacy_client or SciSpacyClient is None:
+            return results
+            
+        contents = [self._extract_content_text(topic_data) for topic_data in batch]
+        indexed = [(i, content) for i, content in enumerate(contents) if content]
+        if not indexed:
+            return results
+            
+        try:
+            self.stats['ai_calls'] += 1
+            async with SciSpacyClient(self.scispacy_client.client.base_url) as client:
+                concepts = await client.extract_medical_concepts_batch(
+                    [content for _, content in indexed]
+                )
+            for (i, _), topic_concepts in zip(indexed, concepts, strict=True):
+                if topic_concepts is not None:
+                    results[i] = self._organize_medical_entities(topic_concepts)
+        except Exception as e:
+            logger.error(f"SciSpacy batch entity extraction failed: {e}")
+            self.stats['ai_failures'] += 1
+            
+        return results
+        
+    def _organize_medical_entities(self, entities: Dict[str, Any]) -> Dict[str, List[str]]:
+        """Organize SciSpacy concepts into the health topic entity groups"""
+        return {
+            'diseases': entities.get('diseases', []),
+            'chemicals': entities.get('chemicals', []),
+            'genes': entities.get('genes', []),
+            'organisms': entities.get('organisms', []),
+            'anatomy': entities.get('anatomy', []),
+            'medical_procedures': entities.get('procedures', []),
+            'all_entities': entities.get('all_entities', [])
+        }
+            
     async def _map_to_icd10(self, content: str, entities: Dict[str, List[str]]) -> List[Dict[str, Any]]:
         """Map health topic content to ICD-10 codes"""
         try:
@@ -530,9 +654,8 @@ class HealthTopicsEnricher:
             
             if response and 'classification' in response:
                 classification = response['classification'].lower()
-                valid_classifications = ['prevention', 'treatment', 'diagnosis', 'management', 'general']
-                
-                if classification in valid_classifications:
+
+                if classification in TOPIC_CLASSIFICATIONS:
                     return classification
                     
         except Exception as e:
@@ -689,6 +812,138 @@ class HealthTopicsEnricher:
             
         return ""
         
+    async def _enrich_structured(self, topic_data: Dict[str, Any], content: str,
+                                 entities: Dict[str, List[str]]) -> Optional[Dict[str, Any]]:
+        """Get every LLM-derived field for a topic, from the result cache or one Ollama call
+        
+        Returns None when the call fails or the reply is not valid JSON, so the
+        caller can fall back to the per-field prompts. Only cache misses take a
+        scheduler slot.
+        """
+        topic_id = topic_data.get('topic_id', '')
+        keywords = topic_data.get('keywords', [])
+        cache_key = topic_cache_key(
+            STRUCTURED_PROMPT_VERSION,
+            self.structured_model,
+            json.dumps([content, keywords], ensure_ascii=False),
+        )
+        if self.result_cache is not None:
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                self.stats['structured_cache_hits'] += 1
+                return cached
+                
+        prompt = self._build_structured_enrichment_prompt(keywords, content, entities)
+        result = await self._call_ollama_structured(prompt)
+        if result is None:
+            return None
+            
+        if self.result_cache is not None:
+            self.result_cache.put(cache_key, result, topic_id)
+        return result
+        
+    async def _call_ollama_structured(self, prompt: str) -> Optional[Dict[str, Any]]:
+        """Run one schema-constrained Ollama generation and record its token usage"""
+        self.stats['ai_calls'] += 1
+        self.stats['structured_calls'] += 1
+        base_url = self.ollama_client.client.config.base_url
+        timeout = float(self.ollama_config.get('timeout', 60))
+        
+        start = time.perf_counter()
+        try:
+            async with get_llm_scheduler().aslot(base_url, LLMPriority.BATCH) as slot:
+                async with aiohttp.ClientSession() as session:
+                    async with session.post(
+                        f"{base_url}/api/generate",
+                        json={
+                            "model": self.structured_model,
+                            "prompt": prompt,
+                            "format": STRUCTURED_ENRICHMENT_SCHEMA,
+                            "stream": False,
+                            "options": {
+                                "temperature": 0.2,
+                                "num_predict": self.structured_max_tokens,
+                            },
+                        },
+                        timeout=aiohttp.ClientTimeout(total=timeout),
+                    ) as response:
+                        if response.status != 200:
+                            slot.mark_failed()
+                            logger.error(f"Structured enrichment call failed: HTTP {response.status}")
+                            self.stats['ai_failures'] += 1
+                            return None
+                        data = await response.json()
+                        slot.record_tokens(data.get('eval_count'))
+        except Exception as e:
+            logger.error(f"Structured enrichment call failed: {e}")
+            self.stats['ai_failures'] += 1
+            return None
+        finally:
+            self.stats['llm_seconds'] += time.perf_counter() - start
+            
+        self.stats['llm_prompt_tokens'] += data.get('prompt_eval_count', 0)
+        self.stats['llm_completion_tokens'] += data.get('eval_count', 0)
+        
+        try:
+            result = json.loads(data.get('response', ''))
+        except json.JSONDecodeError as e:
+            logger.error(f"Structured enrichment returned invalid JSON: {e}")
+            self.stats['ai_failures'] += 1
+            return None
+        if not isinstance(result, dict):
+            self.stats['ai_failures'] += 1
+            return None
+        return result
+        
+    def _apply_structured_result(self, enhancement: HealthTopicEnhancement,
+                                 result: Dict[str, Any], topic_data: Dict[str, Any]):
+        """Validate a structured result the same way the per-field methods do"""
+        def dict_items(key: str) -> List[Dict[str, Any]]:
+            value = result.get(key)
+            return [item for item in value if isinstance(item, dict)] if isinstance(value, list) else []
+            
+        def str_items(key: str) -> List[str]:
+            value = result.get(key)
+            return [item for item in value if isinstance(item, str)] if isinstance(value, list) else []
+            
+        enhancement.icd10_mappings = [
+            m for m in dict_items('icd10_mappings') if self._validate_icd10_mapping(m)
+        ]
+        if enhancement.icd10_mappings:
+            self.stats['icd10_mappings_found'] += len(enhancement.icd10_mappings)
+            
+        try:
+            score = float(result.get('clinical_relevance_score', 0.5))
+        except (TypeError, ValueError):
+            score = 0.5
+        enhancement.clinical_relevance_score = max(0.0, min(1.0, score))
+        
+        classification = str(result.get('classification', 'general')).lower()
+        enhancement.topic_classification = (
+            classification if classification in TOPIC_CLASSIFICATIONS else 'general'
+        )
+        
+        enhancement.risk_factors = [
+            f for f in dict_items('risk_factors') if self._validate_risk_factor(f)
+        ]
+        if enhancement.risk_factors:
+            self.stats['risk_factors_identified'] += len(enhancement.risk_factors)
+            
+        enhancement.related_medications = [
+            m for m in dict_items('medications') if self._validate_medication(m)
+        ]
+        if enhancement.related_medications:
+            self.stats['medications_extracted'] += len(enhancement.related_medications)
+            
+        original_keywords = topic_data.get('keywords', [])
+        enhancement.enhanced_keywords = sorted(set(original_keywords + str_items('enhanced_keywords')))
+        if enhancement.enhanced_keywords:
+            self.stats['keywords_enhanced'] += len(enhancement.enhanced_keywords)
+            
+        enhancement.related_topics_suggestions = str_items('related_topics')
+        enhancement.patient_summary = str(result.get('patient_summary') or '').strip()
+        enhancement.provider_summary = str(result.get('provider_summary') or '').strip()
+        
     # Pattern-based enhancement methods (fallback)
     def _extract_entities_patterns(self, content: str) -> Dict[str, List[str]]:
         """Extract entities using pattern matching"""
@@ -1041,6 +1296,38 @@ class HealthTopicsEnricher:
         Generate a summary paragraph only, no JSON format.
         """
         
+    def _build_structured_enrichment_prompt(self, original_keywords: List[str], content: str,
+                                            entities: Dict[str, List[str]]) -> str:
+        """Build the single prompt that covers every per-field prompt above"""
+        return f"""
+        Analyze this health topic and return one JSON object with every field below.
+        
+        Content: {content[:1500]}
+        Original keywords: {original_keywords}
+        Medical entities: {entities.get('all_entities', [])}
+        Diseases: {entities.get('diseases', [])}
+        Chemicals: {entities.get('chemicals', [])}
+        
+        Fields:
+        - icd10_mappings: relevant ICD-10 codes for primary and related conditions, each with
+          code, description, confidence (0.0-1.0) and reasoning
+        - clinical_relevance_score: 0.0-1.0 value of this topic for healthcare providers
+          (clinical decision making, patient care impact, medical detail)
+        - classification: one of prevention, treatment, diagnosis, management, general
+        - risk_factors: each with factor, type (lifestyle, medical, genetic, environmental,
+          age-related), severity (low, moderate, high) and description
+        - medications: each with name, type (prescription, over-the-counter, supplement),
+          purpose and class
+        - enhanced_keywords: medical synonyms, related terms and patient-friendly language
+        - related_topics: 3-5 related health topics patients or providers might find useful
+        - patient_summary: 100-150 words in simple, clear language without medical jargon,
+          with an encouraging and informative tone
+        - provider_summary: 100-200 words for clinicians, with key diagnostic and treatment
+          considerations in a professional tone
+        
+        Use empty lists when the content does not mention a field.
+        """
+        
     # Validation methods
     def _validate_icd10_mapping(self, mapping: Dict[str, Any]) -> bool:
         """Validate ICD-10 mapping structure"""
@@ -1069,7 +1356,8 @@ class HealthTopicsEnricher:
             'fallback_rate': (
                 (self.stats['fallback_to_pattern'] / self.stats['processed'] * 100)
                 if self.stats['processed'] > 0 else 0
-            )
+            ),
+            'result_cache': self.result_cache.get_stats() if self.result_cache else None
         }
 
 
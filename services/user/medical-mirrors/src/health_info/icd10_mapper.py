@@ -10,26 +10,38 @@ from typing import Dict, List, Any, Optional
 from sqlalchemy import text
 import json
 
+from .term_matcher import ICD10Entry, MedicalTermMatcher, get_shared_term_matcher
+
 logger = logging.getLogger(__name__)
 
 
 class ICD10Mapper:
     """Map health topics to ICD-10 codes and calculate clinical relevance"""
     
-    def __init__(self, db_session):
+    def __init__(self, db_session, term_matcher: Optional[MedicalTermMatcher] = None):
         """
         Initialize the ICD-10 mapper.
         
         Args:
             db_session: SQLAlchemy database session
+            term_matcher: Optional preloaded matcher; defaults to the shared
+                one loaded from db_session
         """
         self.session = db_session
+        self._term_matcher = term_matcher
         self.stats = {
             "topics_mapped": 0,
             "codes_assigned": 0,
             "billing_codes_linked": 0
         }
     
+    @property
+    def term_matcher(self) -> MedicalTermMatcher:
+        """In-memory ICD-10 matcher (replaces per-term LIKE queries)"""
+        if self._term_matcher is not None:
+            return self._term_matcher
+        return get_shared_term_matcher(self.session)
+    
     def map_topic_to_icd10(self, topic: Dict[str, Any], medical_entities: Dict[str, Any]) -> Dict[str, Any]:
         """
         Map a health topic to relevant ICD-10 codes.
@@ -86,41 +98,14 @@ class ICD10Mapper:
         icd10_codes = []
         seen_codes = set()
         
+        matcher = self.term_matcher
+        
         # First, search by exact title match
-        if title:
-            query = text("""
-                SELECT code, description, category, chapter, is_billable
-                FROM icd10_codes
-                WHERE LOWER(description) LIKE :pattern
-                   OR LOWER(category) LIKE :pattern
-                ORDER BY 
-                    CASE 
-                        WHEN LOWER(description) = :exact THEN 1
-                        WHEN LOWER(description) LIKE :start_pattern THEN 2
-                        ELSE 3
-                    END,
-                    code_length ASC
-                LIMIT 5
-            """)
-            
-            result = self.session.execute(query, {
-                "pattern": f"%{title.lower()}%",
-                "exact": title.lower(),
-                "start_pattern": f"{title.lower()}%"
-            })
-            
-            for row in result:
-                if row.code not in seen_codes:
-                    icd10_codes.append({
-                        "code": row.code,
-                        "description": row.description,
-                        "category": row.category,
-                        "chapter": row.chapter,
-                        "is_billable": row.is_billable,
-                        "match_type": "title",
-                        "confidence": 0.9
-                    })
-                    seen_codes.add(row.code)
+        matches = matcher.find_icd10_for_title(title, limit=5) if title else []
+        for entry in matches:
+            if entry.code not in seen_codes:
+                icd10_codes.append(self._code_match(entry, "title", 0.9))
+                seen_codes.add(entry.code)
         
         # Then search by extracted conditions
         for condition in conditions[:3]:  # Limit to top 3 conditions
@@ -129,33 +114,27 @@ class ICD10Mapper:
             if not condition_name:
                 continue
             
-            query = text("""
-                SELECT code, description, category, chapter, is_billable
-                FROM icd10_codes
-                WHERE LOWER(description) LIKE :pattern
-                LIMIT 3
-            """)
-            
-            result = self.session.execute(
-                query,
-                {"pattern": f"%{condition_name.lower()}%"}
-            )
-            
-            for row in result:
-                if row.code not in seen_codes:
-                    icd10_codes.append({
-                        "code": row.code,
-                        "description": row.description,
-                        "category": row.category,
-                        "chapter": row.chapter,
-                        "is_billable": row.is_billable,
-                        "match_type": "condition",
-                        "confidence": condition.get("confidence", 0.7)
-                    })
-                    seen_codes.add(row.code)
+            for entry in matcher.find_icd10(condition_name, limit=3):
+                if entry.code not in seen_codes:
+                    icd10_codes.append(
+                        self._code_match(entry, "condition", condition.get("confidence", 0.7)),
+                    )
+                    seen_codes.add(entry.code)
         
         return icd10_codes[:10]  # Limit to top 10 codes
     
+    @staticmethod
+    def _code_match(entry: ICD10Entry, match_type: str, confidence: float) -> Dict[str, Any]:
+        return {
+            "code": entry.code,
+            "description": entry.description,
+            "category": entry.category,
+            "chapter": entry.chapter,
+            "is_billable": entry.is_billable,
+            "match_type": match_type,
+            "confidence": confidence
+        }
+    
     def _find_related_billing_codes(self, icd10_codes: List[Dict]) -> List[Dict[str, Any]]:
         """Find billing codes related to the ICD-10 codes"""
         billing_codes = []
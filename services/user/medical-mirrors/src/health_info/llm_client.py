@@ -16,6 +16,7 @@ from dataclasses import dataclass
 # Add parent directory to path for config imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from config_loader import get_config
+from llm_scheduler import LLMPriority, get_llm_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -41,14 +42,17 @@ class OllamaClient:
     All processing is local and PHI-safe.
     """
     
-    def __init__(self, config: Optional[LLMConfig] = None):
+    def __init__(self, config: Optional[LLMConfig] = None,
+                 priority: LLMPriority = LLMPriority.INTERACTIVE):
         """
         Initialize Ollama client.
         
         Args:
             config: LLM configuration (uses defaults from config files if not provided)
+            priority: Scheduling class for this client's requests
         """
         self.config = config if config else LLMConfig()
+        self.priority = priority
         self.session: Optional[aiohttp.ClientSession] = None
         
     async def __aenter__(self):
@@ -82,23 +86,26 @@ class OllamaClient:
             full_prompt = prompt
             
         try:
-            async with self.session.post(
-                f"{self.config.base_url}/api/generate",
-                json={
-                    "model": self.config.model,
-                    "prompt": full_prompt,
-                    "temperature": self.config.temperature,
-                    "stream": False
-                },
-                timeout=aiohttp.ClientTimeout(total=self.config.timeout)
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    return result.get("response", "")
-                else:
-                    error_text = await response.text()
-                    logger.error(f"Ollama generation failed: {error_text}")
-                    return ""
+            async with get_llm_scheduler().aslot(self.config.base_url, self.priority) as slot:
+                async with self.session.post(
+                    f"{self.config.base_url}/api/generate",
+                    json={
+                        "model": self.config.model,
+                        "prompt": full_prompt,
+                        "temperature": self.config.temperature,
+                        "stream": False
+                    },
+                    timeout=aiohttp.ClientTimeout(total=self.config.timeout)
+                ) as response:
+                    if response.status == 200:
+                        result = await response.json()
+                        slot.record_tokens(result.get("eval_count"))
+                        return result.get("response", "")
+                    else:
+                        slot.mark_failed()
+                        error_text = await response.text()
+                        logger.error(f"Ollama generation failed: {error_text}")
+                        return ""
                     
         except asyncio.TimeoutError:
             logger.error("Ollama request timed out")
@@ -318,8 +325,10 @@ Use USDA standard serving sizes when available."""
 class OllamaClientSync:
     """Synchronous client for Ollama using requests library"""
     
-    def __init__(self, config: Optional[LLMConfig] = None):
+    def __init__(self, config: Optional[LLMConfig] = None,
+                 priority: LLMPriority = LLMPriority.INTERACTIVE):
         self.config = config or LLMConfig()
+        self.priority = priority
         self.timeout = 60  # Longer timeout for LLM generation
         
     def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
@@ -331,23 +340,26 @@ class OllamaClientSync:
             else:
                 full_prompt = prompt
             
-            response = requests.post(
-                f"{self.config.base_url}/api/generate",
-                json={
-                    "model": self.config.model,
-                    "prompt": full_prompt,
-                    "temperature": self.config.temperature,
-                    "stream": False
-                },
-                timeout=self.timeout
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                return data.get("response", "")
-            else:
-                logger.error(f"Ollama generate failed: {response.status_code}")
-                return ""
+            with get_llm_scheduler().slot(self.config.base_url, self.priority) as slot:
+                response = requests.post(
+                    f"{self.config.base_url}/api/generate",
+                    json={
+                        "model": self.config.model,
+                        "prompt": full_prompt,
+                        "temperature": self.config.temperature,
+                        "stream": False
+                    },
+                    timeout=self.timeout
+                )
+                
+                if response.status_code == 200:
+                    data = response.json()
+                    slot.record_tokens(data.get("eval_count"))
+                    return data.get("response", "")
+                else:
+                    slot.mark_failed()
+                    logger.error(f"Ollama generate failed: {response.status_code}")
+                    return ""
         except Exception as e:
             logger.error(f"Ollama generate error: {e}")
             return ""
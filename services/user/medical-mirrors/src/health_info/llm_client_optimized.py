@@ -14,6 +14,7 @@ import json
 # Add parent directory to path for config imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from config_loader import get_config
+from llm_scheduler import LLMPriority, get_llm_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -37,8 +38,10 @@ class OptimizedOllamaClient:
     Optimized client for Ollama that makes a single call per food item.
     """
     
-    def __init__(self, config: Optional[LLMConfig] = None):
+    def __init__(self, config: Optional[LLMConfig] = None,
+                 priority: LLMPriority = LLMPriority.INTERACTIVE):
         self.config = config if config else LLMConfig()
+        self.priority = priority
         self.timeout = 60  # Longer timeout for comprehensive generation
         
     def generate_all_food_enhancements(self, description: str, category: str = None,
@@ -85,19 +88,24 @@ Use USDA standard serving sizes. Return only valid JSON, no explanations."""
         full_prompt = f"{system_prompt}\n\n{prompt}"
         
         try:
-            response = requests.post(
-                f"{self.config.base_url}/api/generate",
-                json={
-                    "model": self.config.model,
-                    "prompt": full_prompt,
-                    "temperature": self.config.temperature,
-                    "stream": False
-                },
-                timeout=self.timeout
-            )
+            with get_llm_scheduler().slot(self.config.base_url, self.priority) as slot:
+                response = requests.post(
+                    f"{self.config.base_url}/api/generate",
+                    json={
+                        "model": self.config.model,
+                        "prompt": full_prompt,
+                        "temperature": self.config.temperature,
+                        "stream": False
+                    },
+                    timeout=self.timeout
+                )
+                if response.status_code == 200:
+                    data = response.json()
+                    slot.record_tokens(data.get("eval_count"))
+                else:
+                    slot.mark_failed()
             
             if response.status_code == 200:
-                data = response.json()
                 response_text = data.get("response", "")
                 
                 # Try to parse JSON from response
@@ -7,8 +7,8 @@ to enable better cross-referencing with other medical databases.
 
 import re
 import logging
-from typing import Dict, List, Set, Any
-from sqlalchemy import text
+from typing import Dict, List, Set, Any, Optional
+from .term_matcher import MedicalTermMatcher, get_shared_term_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -16,14 +16,17 @@ logger = logging.getLogger(__name__)
 class MedicalEntityExtractor:
     """Extract medical entities from health topic text"""
     
-    def __init__(self, db_session=None):
+    def __init__(self, db_session=None, term_matcher: Optional[MedicalTermMatcher] = None):
         """
         Initialize the medical entity extractor.
         
         Args:
             db_session: Optional SQLAlchemy session for database lookups
+            term_matcher: Optional preloaded matcher; defaults to the shared
+                one loaded from db_session
         """
         self.session = db_session
+        self._term_matcher = term_matcher
         self.stats = {
             "topics_processed": 0,
             "entities_extracted": 0,
@@ -189,25 +192,20 @@ class MedicalEntityExtractor:
         
         return conditions[:10]  # Limit to top 10
     
+    @property
+    def term_matcher(self) -> MedicalTermMatcher:
+        """In-memory ICD-10 / drug matcher (replaces per-term LIKE queries)"""
+        if self._term_matcher is not None:
+            return self._term_matcher
+        return get_shared_term_matcher(self.session)
+    
     def _validate_conditions_with_icd10(self, conditions: List[Dict]) -> List[Dict]:
         """Validate conditions against ICD-10 database"""
         validated = []
+        matches = self.term_matcher.match_icd10_terms(c["name"] for c in conditions)
         
         for condition in conditions:
-            condition_name = condition["name"]
-            
-            # Search for matching ICD-10 codes
-            query = text("""
-                SELECT code, description
-                FROM icd10_codes
-                WHERE LOWER(description) LIKE :pattern
-                LIMIT 1
-            """)
-            
-            result = self.session.execute(
-                query, 
-                {"pattern": f"%{condition_name.lower()}%"}
-            ).first()
+            result = matches[condition["name"]]
             
             if result:
                 condition["icd10_code"] = result.code
@@ -244,23 +242,10 @@ class MedicalEntityExtractor:
     def _validate_medications(self, medications: List[Dict]) -> List[Dict]:
         """Validate medications against drug database"""
         validated = []
+        matches = self.term_matcher.match_drug_terms(m["name"] for m in medications)
         
         for med in medications:
-            drug_name = med["name"]
-            
-            # Search for matching drugs
-            query = text("""
-                SELECT id, generic_name, brand_names
-                FROM drug_information
-                WHERE LOWER(generic_name) LIKE :pattern
-                   OR :pattern = ANY(LOWER(brand_names::text)::text[])
-                LIMIT 1
-            """)
-            
-            result = self.session.execute(
-                query,
-                {"pattern": f"%{drug_name.lower()}%"}
-            ).first()
+            result = matches[med["name"]]
             
             if result:
                 med["drug_id"] = result.id
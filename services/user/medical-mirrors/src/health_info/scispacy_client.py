@@ -6,7 +6,6 @@ Connects to the SciSpacy service for food and nutrition NLP analysis
 import logging
 import asyncio
 import aiohttp
-import json
 import requests
 import os
 import sys
@@ -16,6 +15,12 @@ from dataclasses import dataclass
 # Add parent directory to path for config imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from config_loader import get_config
+from scispacy_batch import (
+    DEFAULT_BATCH_REQUEST_SIZE,
+    batch_error,
+    collect_batch_lines,
+    is_batch_error,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +37,59 @@ class FoodEntity:
     priority: Optional[str] = None
 
 
+def _empty_food_concepts() -> Dict[str, List[str]]:
+    return {"chemicals": [], "organisms": [], "foods": [], "compounds": [], "all_entities": []}
+
+
+def _food_concepts_from_analysis(data: Dict[str, Any]) -> Dict[str, List[str]]:
+    """
+    Build food concepts from one /analyze response, falling back to noun
+    tokens when the model found no entities.
+    """
+    entities = data.get("entities", [])
+    tokens = data.get("tokens", [])
+    
+    # Extract relevant food-related entities
+    concepts = _empty_food_concepts()
+    
+    # First try to get entities
+    for entity in entities:
+        entity_type = entity.get("label", "")
+        entity_text = entity.get("text", "")
+        
+        if entity_type == "CHEMICAL":
+            concepts["chemicals"].append(entity_text)
+            concepts["all_entities"].append(entity_text)
+        elif entity_type == "ORGANISM":
+            concepts["organisms"].append(entity_text)
+            concepts["all_entities"].append(entity_text)
+        elif entity_type in ["FOOD", "PRODUCT"]:
+            concepts["foods"].append(entity_text)
+            concepts["all_entities"].append(entity_text)
+        elif entity_type == "COMPOUND":
+            concepts["compounds"].append(entity_text)
+            concepts["all_entities"].append(entity_text)
+    
+    # Fallback: If no entities found, extract nouns as potential food items
+    if not concepts["all_entities"] and tokens:
+        # Extract nouns and proper nouns as potential food/ingredient names
+        for token in tokens:
+            if token.get("pos") in ["NOUN", "PROPN"] and token.get("is_alpha"):
+                text = token.get("text", "")
+                # Skip common stop words and very short words
+                if len(text) > 2 and text.lower() not in ["the", "and", "with", "for", "from"]:
+                    concepts["all_entities"].append(text)
+                    # Heuristically categorize based on common patterns
+                    if any(suffix in text.lower() for suffix in ["berry", "fruit", "nut", "seed", "bean"]):
+                        concepts["organisms"].append(text)
+                    elif any(word in text.lower() for word in ["vitamin", "acid", "protein", "sugar"]):
+                        concepts["chemicals"].append(text)
+                    else:
+                        concepts["foods"].append(text)
+    
+    return concepts
+
+
 class SciSpacyClient:
     """
     Client for communicating with the SciSpacy biomedical NLP service for food analysis.
@@ -91,14 +149,60 @@ class SciSpacyClient:
                 else:
                     error_text = await response.text()
                     logger.error(f"SciSpacy analysis failed: {error_text}")
-                    return {"entities": [], "error": error_text}
+                    return batch_error(error_text)
                     
         except asyncio.TimeoutError:
             logger.error("SciSpacy request timed out")
-            return {"entities": [], "error": "timeout"}
+            return batch_error("timeout")
         except Exception as e:
             logger.error(f"SciSpacy request failed: {e}")
-            return {"entities": [], "error": str(e)}
+            return batch_error(str(e))
+
+    async def analyze_batch(self, texts: List[str], enrich: bool = True,
+                            batch_size: Optional[int] = None,
+                            request_size: int = DEFAULT_BATCH_REQUEST_SIZE) -> List[Dict[str, Any]]:
+        """
+        Analyze many texts via the /analyze/batch endpoint (spaCy ``nlp.pipe``).
+        
+        Args:
+            texts: Texts to analyze
+            enrich: Whether to include enriched metadata and relationships
+            batch_size: Server-side ``nlp.pipe`` batch size (server default if None)
+            request_size: Maximum number of texts sent per HTTP request
+            
+        Returns:
+            One analysis dictionary per input text, in input order
+        """
+        if not self.session:
+            self.session = aiohttp.ClientSession()
+            
+        results: List[Dict[str, Any]] = []
+        for offset in range(0, len(texts), request_size):
+            chunk = texts[offset:offset + request_size]
+            payload: Dict[str, Any] = {"texts": chunk, "enrich": enrich}
+            if batch_size is not None:
+                payload["batch_size"] = batch_size
+            try:
+                async with self.session.post(
+                    f"{self.base_url}/analyze/batch",
+                    json=payload,
+                    timeout=aiohttp.ClientTimeout(total=30 + len(chunk))
+                ) as response:
+                    if response.status == 200:
+                        lines = [raw async for raw in response.content]
+                        results.extend(collect_batch_lines(lines, len(chunk)))
+                    elif response.status == 404:
+                        logger.warning("SciSpacy /analyze/batch not available, falling back to /analyze")
+                        results.extend([await self.analyze_text(t, enrich) for t in chunk])
+                    else:
+                        error_text = await response.text()
+                        logger.error(f"SciSpacy batch analysis failed: {error_text}")
+                        results.extend(batch_error(error_text) for _ in chunk)
+            except Exception as e:
+                logger.error(f"SciSpacy batch request failed: {e}")
+                results.extend(batch_error(str(e)) for _ in chunk)
+                
+        return results
             
     async def extract_food_entities(self, text: str) -> List[FoodEntity]:
         """
@@ -215,10 +319,10 @@ class SciSpacyClientSync:
                 return response.json()
             else:
                 logger.error(f"SciSpacy analyze failed: {response.status_code}")
-                return {}
+                return batch_error(f"HTTP {response.status_code}")
         except Exception as e:
             logger.error(f"SciSpacy analyze error: {e}")
-            return {}
+            return batch_error(str(e))
         
     def extract_food_entities(self, text: str) -> List[FoodEntity]:
         """Extract food entities synchronously"""
@@ -247,6 +351,48 @@ class SciSpacyClientSync:
             entity_types[label].append(entity.get("text", ""))
         return entity_types
         
+    def analyze_batch(self, texts: List[str], enrich: bool = True,
+                      batch_size: Optional[int] = None,
+                      request_size: int = DEFAULT_BATCH_REQUEST_SIZE) -> List[Dict[str, Any]]:
+        """Analyze many texts synchronously via /analyze/batch, results in input order"""
+        results: List[Dict[str, Any]] = []
+        for offset in range(0, len(texts), request_size):
+            chunk = texts[offset:offset + request_size]
+            payload: Dict[str, Any] = {"texts": chunk, "enrich": enrich}
+            if batch_size is not None:
+                payload["batch_size"] = batch_size
+            try:
+                with requests.post(
+                    f"{self.base_url}/analyze/batch",
+                    json=payload,
+                    timeout=self.timeout + len(chunk),
+                    stream=True
+                ) as response:
+                    if response.status_code == 200:
+                        results.extend(collect_batch_lines(response.iter_lines(), len(chunk)))
+                    elif response.status_code == 404:
+                        logger.warning("SciSpacy /analyze/batch not available, falling back to /analyze")
+                        results.extend(self.analyze_text(t, enrich) for t in chunk)
+                    else:
+                        logger.error(f"SciSpacy batch analyze failed: {response.status_code}")
+                        results.extend(batch_error(f"HTTP {response.status_code}") for _ in chunk)
+            except Exception as e:
+                logger.error(f"SciSpacy batch analyze error: {e}")
+                results.extend(batch_error(str(e)) for _ in chunk)
+        return results
+        
+    def extract_food_concepts_batch(self, descriptions: List[str],
+                                    batch_size: Optional[int] = None
+                                    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Extract food concepts for many descriptions in one batched pipeline pass;
+        None where a description could not be analyzed, so callers can fall back
+        """
+        return [
+            None if is_batch_error(data) else _food_concepts_from_analysis(data)
+            for data in self.analyze_batch(descriptions, enrich=True, batch_size=batch_size)
+        ]
+        
     def extract_food_concepts(self, description: str) -> Dict[str, Any]:
         """Extract food concepts synchronously using requests with fallback to token analysis"""
         try:
@@ -256,61 +402,13 @@ class SciSpacyClientSync:
                 timeout=self.timeout
             )
             if response.status_code == 200:
-                data = response.json()
-                entities = data.get("entities", [])
-                tokens = data.get("tokens", [])
-                
-                # Extract relevant food-related entities
-                concepts = {
-                    "chemicals": [],
-                    "organisms": [],
-                    "foods": [],
-                    "compounds": [],
-                    "all_entities": []  # For Ollama context
-                }
-                
-                # First try to get entities
-                for entity in entities:
-                    entity_type = entity.get("label", "")
-                    entity_text = entity.get("text", "")
-                    
-                    if entity_type == "CHEMICAL":
-                        concepts["chemicals"].append(entity_text)
-                        concepts["all_entities"].append(entity_text)
-                    elif entity_type == "ORGANISM":
-                        concepts["organisms"].append(entity_text)
-                        concepts["all_entities"].append(entity_text)
-                    elif entity_type in ["FOOD", "PRODUCT"]:
-                        concepts["foods"].append(entity_text)
-                        concepts["all_entities"].append(entity_text)
-                    elif entity_type == "COMPOUND":
-                        concepts["compounds"].append(entity_text)
-                        concepts["all_entities"].append(entity_text)
-                
-                # Fallback: If no entities found, extract nouns as potential food items
-                if not concepts["all_entities"] and tokens:
-                    # Extract nouns and proper nouns as potential food/ingredient names
-                    for token in tokens:
-                        if token.get("pos") in ["NOUN", "PROPN"] and token.get("is_alpha"):
-                            text = token.get("text", "")
-                            # Skip common stop words and very short words
-                            if len(text) > 2 and text.lower() not in ["the", "and", "with", "for", "from"]:
-                                concepts["all_entities"].append(text)
-                                # Heuristically categorize based on common patterns
-                                if any(suffix in text.lower() for suffix in ["berry", "fruit", "nut", "seed", "bean"]):
-                                    concepts["organisms"].append(text)
-                                elif any(word in text.lower() for word in ["vitamin", "acid", "protein", "sugar"]):
-                                    concepts["chemicals"].append(text)
-                                else:
-                                    concepts["foods"].append(text)
-                
-                return concepts
+                return _food_concepts_from_analysis(response.json())
             else:
                 logger.error(f"SciSpacy extract failed: {response.status_code}")
-                return {"chemicals": [], "organisms": [], "foods": [], "compounds": [], "all_entities": []}
+                return _empty_food_concepts()
         except Exception as e:
             logger.error(f"SciSpacy extract error: {e}")
-            return {"chemicals": [], "organisms": [], "foods": [], "compounds": [], "all_entities": []}
+            return _empty_food_concepts()
         
     def check_health(self) -> bool:
         """Check if SciSpacy service is healthy"""
@@ -0,0 +1,241 @@
+"""
+In-memory term matcher for ICD-10 and drug name validation
+
+Topic enrichment validates every extracted condition and medication name
+against icd10_codes and drug_information. Doing that with
+``LIKE '%term%'`` costs one sequential scan per term, because a leading
+wildcard cannot use a btree index. This module loads the few columns it
+needs once and answers the same substring questions from trigram posting
+lists:
+
+- ICD-10 descriptions are searched first, then synonyms
+- every indexed string is lowercased and split into its distinct trigrams
+- a term is looked up by its rarest trigram, and only those candidates are
+  checked with a real substring test, so results match ``LIKE`` exactly
+
+Terms shorter than three characters fall back to a linear scan.
+
+The shared matcher remembers a fingerprint of both tables (row count and
+latest ``last_updated``) and rebuilds itself when that changes.
+"""
+
+import logging
+import threading
+import time
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between table fingerprint checks for the shared matcher
+REFRESH_CHECK_SECONDS = 60
+
+_FINGERPRINT_SQL = text("""
+    SELECT
+        (SELECT COUNT(*) FROM icd10_codes) AS icd10_count,
+        (SELECT MAX(last_updated) FROM icd10_codes) AS icd10_updated,
+        (SELECT COUNT(*) FROM drug_information) AS drug_count,
+        (SELECT MAX(last_updated) FROM drug_information) AS drug_updated
+""")
+
+
+@dataclass(frozen=True)
+class ICD10Entry:
+    """The icd10_codes columns used by topic enrichment"""
+
+    code: str
+    description: str
+    category: str | None
+    chapter: str | None
+    is_billable: bool | None
+    code_length: int | None
+    synonyms: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class DrugEntry:
+    """The drug_information columns used by topic enrichment"""
+
+    id: int
+    generic_name: str
+    brand_names: tuple[str, ...]
+
+
+def _trigrams(value: str) -> set[str]:
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+class SubstringIndex:
+    """Trigram posting lists over lowercase strings: ``LIKE '%term%'`` without a table scan"""
+
+    def __init__(self, values: Iterable[str]):
+        self._values = [value.lower() for value in values]
+        self._postings: dict[str, array] = {}
+        for position, value in enumerate(self._values):
+            for trigram in _trigrams(value):
+                postings = self._postings.get(trigram)
+                if postings is None:
+                    postings = self._postings[trigram] = array("I")
+                postings.append(position)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def search(self, term: str, limit: int | None = None) -> list[int]:
+        """Positions whose value contains ``term`` (case-insensitive), in ascending order"""
+        term = term.lower()
+        if not term:
+            return []
+        if len(term) < 3:
+            candidates: Iterable[int] = range(len(self._values))
+        else:
+            postings = [self._postings.get(trigram) for trigram in _trigrams(term)]
+            if not all(postings):
+                return []
+            candidates = min(postings, key=len)
+
+        matches = []
+        for position in candidates:
+            if term in self._values[position]:
+                matches.append(position)
+                if limit is not None and len(matches) >= limit:
+                    break
+        return matches
+
+
+class MedicalTermMatcher:
+    """ICD-10 descriptions and drug names held in memory for substring validation"""
+
+    def __init__(self, icd10_entries: list[ICD10Entry], drug_entries: list[DrugEntry]):
+        # Code order keeps "first match" deterministic
+        self.icd10_entries = sorted(icd10_entries, key=lambda entry: entry.code)
+        self.drug_entries = sorted(drug_entries, key=lambda entry: entry.generic_name)
+
+        self._descriptions = SubstringIndex(entry.description for entry in self.icd10_entries)
+        # One indexed value per synonym, mapped back to its code's position
+        self._synonym_owners = array("I")
+        synonym_values = []
+        for position, entry in enumerate(self.icd10_entries):
+            for synonym in entry.synonyms:
+                if isinstance(synonym, str) and synonym:
+                    synonym_values.append(synonym)
+                    self._synonym_owners.append(position)
+        self._synonyms = SubstringIndex(synonym_values)
+        # Few distinct categories: map each to its codes instead of indexing per row
+        self._category_positions: dict[str, list[int]] = {}
+        for position, entry in enumerate(self.icd10_entries):
+            if entry.category:
+                self._category_positions.setdefault(entry.category.lower(), []).append(position)
+
+        self._generic_names = SubstringIndex(entry.generic_name for entry in self.drug_entries)
+        self._brand_positions: dict[str, int] = {}
+        for position, entry in enumerate(self.drug_entries):
+            for brand in entry.brand_names:
+                self._brand_positions.setdefault(brand.lower(), position)
+
+    @classmethod
+    def from_session(cls, session) -> "MedicalTermMatcher":
+        """Load icd10_codes and drug_information into a new matcher"""
+        start = time.perf_counter()
+        icd10_entries = [
+            ICD10Entry(row.code, row.description or "", row.category, row.chapter,
+                       row.is_billable, row.code_length, tuple(row.synonyms or ()))
+            for row in session.execute(text("""
+                SELECT code, description, category, chapter, is_billable, code_length, synonyms
+                FROM icd10_codes
+            """))
+        ]
+        drug_entries = [
+            DrugEntry(row.id, row.generic_name, tuple(row.brand_names or ()))
+            for row in session.execute(text("""
+                SELECT id, generic_name, brand_names
+                FROM drug_information
+            """))
+        ]
+        matcher = cls(icd10_entries, drug_entries)
+        logger.info(f"Loaded medical term matcher: {len(icd10_entries)} ICD-10 codes, "
+                    f"{len(drug_entries)} drugs in {time.perf_counter() - start:.2f}s")
+        return matcher
+
+    def find_icd10(self, term: str, limit: int | None = None) -> list[ICD10Entry]:
+        """Codes whose description contains ``term`` in code order, then synonym-only matches"""
+        positions = self._descriptions.search(term, limit)
+        if limit is None or len(positions) < limit:
+            seen = set(positions)
+            for synonym_position in self._synonyms.search(term):
+                position = self._synonym_owners[synonym_position]
+                if position not in seen:
+                    seen.add(position)
+                    positions.append(position)
+                    if limit is not None and len(positions) >= limit:
+                        break
+        return [self.icd10_entries[p] for p in positions]
+
+    def find_icd10_for_title(self, title: str, limit: int = 5) -> list[ICD10Entry]:
+        """Codes whose description or category contains ``title``.
+
+        Ranked exact description match first, then descriptions starting with
+        the title, then by code length.
+        """
+        title = title.lower()
+        positions = set(self._descriptions.search(title))
+        for category, category_positions in self._category_positions.items():
+            if title in category:
+                positions.update(category_positions)
+
+        def rank(position: int) -> tuple[int, int, str]:
+            entry = self.icd10_entries[position]
+            description = entry.description.lower()
+            if description == title:
+                tier = 1
+            elif description.startswith(title):
+                tier = 2
+            else:
+                tier = 3
+            return tier, entry.code_length or len(entry.code), entry.code
+
+        return [self.icd10_entries[p] for p in sorted(positions, key=rank)[:limit]]
+
+    def find_drug(self, name: str) -> DrugEntry | None:
+        """First drug whose generic name contains ``name``, else an exact brand name match"""
+        positions = self._generic_names.search(name, limit=1)
+        if positions:
+            return self.drug_entries[positions[0]]
+        position = self._brand_positions.get(name.lower())
+        return self.drug_entries[position] if position is not None else None
+
+    def match_icd10_terms(self, terms: Iterable[str]) -> dict[str, ICD10Entry | None]:
+        """Resolve many condition names in one pass; first match per term"""
+        return {term: next(iter(self.find_icd10(term, limit=1)), None) for term in terms}
+
+    def match_drug_terms(self, names: Iterable[str]) -> dict[str, DrugEntry | None]:
+        """Resolve many medication names in one pass"""
+        return {name: self.find_drug(name) for name in names}
+
+
+_shared_matcher: MedicalTermMatcher | None = None
+_shared_fingerprint: tuple[Any, ...] | None = None
+_last_refresh_check = 0.0
+_shared_lock = threading.Lock()
+
+
+def get_shared_term_matcher(session) -> MedicalTermMatcher:
+    """Process-wide matcher, rebuilt when icd10_codes or drug_information change"""
+    global _shared_matcher, _shared_fingerprint, _last_refresh_check
+    with _shared_lock:
+        now = time.monotonic()
+        if _shared_matcher is not None and now - _last_refresh_check < REFRESH_CHECK_SECONDS:
+            return _shared_matcher
+        _last_refresh_check = now
+
+        fingerprint = tuple(session.execute(_FINGERPRINT_SQL).one())
+        if _shared_matcher is None or fingerprint != _shared_fingerprint:
+            if _shared_matcher is not None:
+                logger.info("ICD-10 or drug tables changed, reloading medical term matcher")
+            _shared_matcher = MedicalTermMatcher.from_session(session)
+            _shared_fingerprint = fingerprint
+        return _shared_matcher
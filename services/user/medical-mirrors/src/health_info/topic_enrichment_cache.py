@@ -0,0 +1,118 @@
+"""
+Persistent result cache for structured health topic enrichment
+
+Entries are keyed by a SHA-256 of (prompt template version, model, topic
+content), so a re-run only pays for the LLM on topics whose text changed, or
+after the prompt or model changes. Stored in a local SQLite file; a cache that
+cannot be opened is disabled and enrichment proceeds uncached.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def topic_cache_key(template_version: str, model: str, content: str) -> str:
+    """Content-addressed key for one topic's structured enrichment result"""
+    digest = hashlib.sha256()
+    for part in (template_version, model, content):
+        encoded = part.encode("utf-8")
+        # Length-prefix each part so ("ab", "c") and ("a", "bc") never collide
+        digest.update(len(encoded).to_bytes(8, "big"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+class TopicEnrichmentCache:
+    """SQLite-backed store of structured enrichment results"""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+        if path:
+            self._open(path)
+
+    @property
+    def enabled(self) -> bool:
+        return self._conn is not None
+
+    def _open(self, path: str) -> None:
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS topic_enrichment_cache ("
+                " key TEXT PRIMARY KEY,"
+                " topic_id TEXT,"
+                " created_at REAL NOT NULL,"
+                " value TEXT NOT NULL)"
+            )
+            self._conn = conn
+            logger.info(f"Health topic enrichment cache enabled at {path}")
+        except Exception as e:
+            logger.warning(f"Could not open health topic enrichment cache at {path}: {e}")
+            self._conn = None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for key, or None"""
+        if self._conn is None:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value FROM topic_enrichment_cache WHERE key = ?", (key,)
+                ).fetchone()
+        except Exception as e:
+            self.errors += 1
+            logger.debug(f"Topic enrichment cache read failed: {e}")
+            return None
+
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Dict[str, Any], topic_id: str = "") -> None:
+        """Store a result; failures are logged and otherwise ignored"""
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO topic_enrichment_cache (key, topic_id, created_at, value) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, topic_id, time.time(), json.dumps(value)),
+                )
+        except Exception as e:
+            self.errors += 1
+            logger.debug(f"Topic enrichment cache write failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+        }
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
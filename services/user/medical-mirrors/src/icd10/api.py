@@ -11,6 +11,8 @@ from sqlalchemy.orm import Session
 
 from database import get_db_session
 
+from .hierarchy_index import get_shared_hierarchy_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -170,48 +172,34 @@ class ICD10API:
         }
 
         try:
-            # Get parent details
-            if parent_code:
-                parent_result = db.execute(text("""
-                    SELECT code, description FROM icd10_codes
-                    WHERE code = :parent_code
-                """), {"parent_code": parent_code})
-
-                parent_row = parent_result.fetchone()
-                if parent_row:
-                    related["parent"] = {
-                        "code": parent_row.code,
-                        "description": parent_row.description,
-                    }
-
-            # Get children details
-            if children_codes:
-                for child_code in children_codes[:10]:  # Limit to 10 children
-                    child_result = db.execute(text("""
-                        SELECT code, description FROM icd10_codes
-                        WHERE code = :child_code
-                    """), {"child_code": child_code})
-
-                    child_row = child_result.fetchone()
-                    if child_row:
-                        related["children"].append({
-                            "code": child_row.code,
-                            "description": child_row.description,
-                        })
-
-            # Get siblings (other codes with same parent)
-            if parent_code:
-                sibling_result = db.execute(text("""
+            index = get_shared_hierarchy_index(db)
+            parent_code = index.parent_of(code) or parent_code
+            children = index.children_of(code) or list(children_codes or [])
+            wanted = {
+                "parent": [parent_code] if parent_code else [],
+                "children": children[:10],  # Limit to 10 children
+                "siblings": index.siblings_of(code)[:5],
+            }
+
+            # One round trip for every related code's description
+            lookup_codes = [c for codes in wanted.values() for c in codes]
+            descriptions = {}
+            if lookup_codes:
+                result = db.execute(text("""
                     SELECT code, description FROM icd10_codes
-                    WHERE parent_code = :parent_code AND code != :code
-                    LIMIT 5
-                """), {"parent_code": parent_code, "code": code})
-
-                for sibling_row in sibling_result.fetchall():
-                    related["siblings"].append({
-                        "code": sibling_row.code,
-                        "description": sibling_row.description,
-                    })
+                    WHERE code = ANY(:codes)
+                """), {"codes": lookup_codes})
+                descriptions = {row.code: row.description for row in result}
+
+            for relation, codes in wanted.items():
+                found = [
+                    {"code": c, "description": descriptions[c]}
+                    for c in codes if c in descriptions
+                ]
+                if relation == "parent":
+                    related["parent"] = found[0] if found else None
+                else:
+                    related[relation] = found
 
         except Exception as e:
             logger.exception(f"Error getting related codes: {e}")
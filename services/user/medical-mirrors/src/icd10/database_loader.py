@@ -9,20 +9,98 @@ import os
 from pathlib import Path
 from typing import Any, Dict, List
 
+from bulk_loader import bulk_copy_upsert, copy_load_enabled
 from database import ICD10Code, get_db_session
 from sqlalchemy import text
 
+from .hierarchy_index import invalidate_shared_hierarchy_index
 # Import enhancer for post-load enhancement
 from .icd10_enrichment import ICD10DatabaseEnhancer
 
 logger = logging.getLogger(__name__)
 
+ICD10_UPSERT_COLUMNS = [
+    "code", "description", "category", "chapter", "synonyms",
+    "inclusion_notes", "exclusion_notes", "is_billable",
+    "code_length", "parent_code", "children_codes",
+    "source", "search_text",
+]
+
+# ON CONFLICT (code) update rules, shared by the VALUES and COPY upsert paths
+ICD10_UPSERT_SET = """
+    -- Only update if we have better/more complete information
+    description = COALESCE(
+        CASE WHEN LENGTH(COALESCE(EXCLUDED.description, '')) > LENGTH(COALESCE(icd10_codes.description, ''))
+             THEN EXCLUDED.description
+             ELSE icd10_codes.description
+        END, 
+        EXCLUDED.description, 
+        icd10_codes.description
+    ),
+    category = COALESCE(
+        CASE WHEN EXCLUDED.category IS NOT NULL AND EXCLUDED.category != '' 
+             THEN EXCLUDED.category
+             ELSE icd10_codes.category
+        END,
+        EXCLUDED.category, 
+        icd10_codes.category
+    ),
+    chapter = COALESCE(NULLIF(EXCLUDED.chapter, ''), icd10_codes.chapter),
+    synonyms = COALESCE(
+        CASE WHEN EXCLUDED.synonyms != '[]'::jsonb 
+             THEN EXCLUDED.synonyms
+             ELSE icd10_codes.synonyms
+        END,
+        EXCLUDED.synonyms, 
+        icd10_codes.synonyms
+    ),
+    inclusion_notes = COALESCE(
+        CASE WHEN EXCLUDED.inclusion_notes != '[]'::jsonb 
+             THEN EXCLUDED.inclusion_notes
+             ELSE icd10_codes.inclusion_notes
+        END,
+        EXCLUDED.inclusion_notes, 
+        icd10_codes.inclusion_notes
+    ),
+    exclusion_notes = COALESCE(
+        CASE WHEN EXCLUDED.exclusion_notes != '[]'::jsonb 
+             THEN EXCLUDED.exclusion_notes
+             ELSE icd10_codes.exclusion_notes
+        END,
+        EXCLUDED.exclusion_notes, 
+        icd10_codes.exclusion_notes
+    ),
+    is_billable = COALESCE(EXCLUDED.is_billable, icd10_codes.is_billable),
+    code_length = COALESCE(EXCLUDED.code_length, icd10_codes.code_length),
+    parent_code = COALESCE(NULLIF(EXCLUDED.parent_code, ''), icd10_codes.parent_code),
+    children_codes = COALESCE(
+        CASE WHEN EXCLUDED.children_codes != '[]'::jsonb 
+             THEN EXCLUDED.children_codes
+             ELSE icd10_codes.children_codes
+        END,
+        EXCLUDED.children_codes, 
+        icd10_codes.children_codes
+    ),
+    source = COALESCE(NULLIF(EXCLUDED.source, ''), icd10_codes.source),
+    search_text = COALESCE(
+        CASE WHEN LENGTH(COALESCE(EXCLUDED.search_text, '')) > LENGTH(COALESCE(icd10_codes.search_text, ''))
+             THEN EXCLUDED.search_text
+             ELSE icd10_codes.search_text
+        END,
+        EXCLUDED.search_text, 
+        icd10_codes.search_text
+    ),
+    last_updated = NOW()
+"""
+
 
 class ICD10DatabaseLoader:
     """Loads ICD-10 codes data into the medical-mirrors database with enhanced field population"""
 
-    def __init__(self):
+    def __init__(self, use_copy_load: bool | None = None):
         self.batch_size = 1000
+        # COPY + set-based merge instead of executemany (ENABLE_COPY_BULK_LOAD)
+        self.use_copy_load = copy_load_enabled(use_copy_load)
         self.processed_count = 0
         self.inserted_count = 0
         self.updated_count = 0
@@ -169,6 +247,8 @@ class ICD10DatabaseLoader:
                 """))
                 
                 session.commit()
+                # Codes changed; API lookups rebuild their hierarchy index on next use
+                invalidate_shared_hierarchy_index()
                 
                 # Get final count and comprehensive field coverage stats
                 stats_result = session.execute(text("""
@@ -359,90 +439,35 @@ class ICD10DatabaseLoader:
 
     def _upsert_batch(self, session, batch: List[Dict[str, Any]]) -> None:
         """Upsert a batch of ICD-10 codes using enhanced UPSERT logic"""
-        upsert_sql = text("""
-            INSERT INTO icd10_codes (
-                code, description, category, chapter, synonyms,
-                inclusion_notes, exclusion_notes, is_billable,
-                code_length, parent_code, children_codes,
-                source, search_text, last_updated
-            ) VALUES (
-                :code, :description, :category, :chapter, :synonyms,
-                :inclusion_notes, :exclusion_notes, :is_billable,
-                :code_length, :parent_code, :children_codes,
-                :source, :search_text, NOW()
-            )
-            ON CONFLICT (code) DO UPDATE SET
-                -- Only update if we have better/more complete information
-                description = COALESCE(
-                    CASE WHEN LENGTH(COALESCE(EXCLUDED.description, '')) > LENGTH(COALESCE(icd10_codes.description, ''))
-                         THEN EXCLUDED.description
-                         ELSE icd10_codes.description
-                    END, 
-                    EXCLUDED.description, 
-                    icd10_codes.description
-                ),
-                category = COALESCE(
-                    CASE WHEN EXCLUDED.category IS NOT NULL AND EXCLUDED.category != '' 
-                         THEN EXCLUDED.category
-                         ELSE icd10_codes.category
-                    END,
-                    EXCLUDED.category, 
-                    icd10_codes.category
-                ),
-                chapter = COALESCE(NULLIF(EXCLUDED.chapter, ''), icd10_codes.chapter),
-                synonyms = COALESCE(
-                    CASE WHEN EXCLUDED.synonyms != '[]'::jsonb 
-                         THEN EXCLUDED.synonyms
-                         ELSE icd10_codes.synonyms
-                    END,
-                    EXCLUDED.synonyms, 
-                    icd10_codes.synonyms
-                ),
-                inclusion_notes = COALESCE(
-                    CASE WHEN EXCLUDED.inclusion_notes != '[]'::jsonb 
-                         THEN EXCLUDED.inclusion_notes
-                         ELSE icd10_codes.inclusion_notes
-                    END,
-                    EXCLUDED.inclusion_notes, 
-                    icd10_codes.inclusion_notes
-                ),
-                exclusion_notes = COALESCE(
-                    CASE WHEN EXCLUDED.exclusion_notes != '[]'::jsonb 
-                         THEN EXCLUDED.exclusion_notes
-                         ELSE icd10_codes.exclusion_notes
-                    END,
-                    EXCLUDED.exclusion_notes, 
-                    icd10_codes.exclusion_notes
-                ),
-                is_billable = COALESCE(EXCLUDED.is_billable, icd10_codes.is_billable),
-                code_length = COALESCE(EXCLUDED.code_length, icd10_codes.code_length),
-                parent_code = COALESCE(NULLIF(EXCLUDED.parent_code, ''), icd10_codes.parent_code),
-                children_codes = COALESCE(
-                    CASE WHEN EXCLUDED.children_codes != '[]'::jsonb 
-                         THEN EXCLUDED.children_codes
-                         ELSE icd10_codes.children_codes
-                    END,
-                    EXCLUDED.children_codes, 
-                    icd10_codes.children_codes
-                ),
-                source = COALESCE(NULLIF(EXCLUDED.source, ''), icd10_codes.source),
-                search_text = COALESCE(
-                    CASE WHEN LENGTH(COALESCE(EXCLUDED.search_text, '')) > LENGTH(COALESCE(icd10_codes.search_text, ''))
-                         THEN EXCLUDED.search_text
-                         ELSE icd10_codes.search_text
-                    END,
-                    EXCLUDED.search_text, 
-                    icd10_codes.search_text
-                ),
-                last_updated = NOW()
-        """)
-        
         # Prepare batch data
         prepared_batch = []
         for code_data in batch:
             prepared_data = self._prepare_code_data(code_data)
             prepared_batch.append(prepared_data)
-        
+
+        if self.use_copy_load:
+            # COPY into staging, then one set-based merge with the same update rules
+            bulk_copy_upsert(
+                session,
+                "icd10_codes",
+                ICD10_UPSERT_COLUMNS,
+                prepared_batch,
+                conflict_columns=["code"],
+                update_set=ICD10_UPSERT_SET,
+                insert_values={"last_updated": "NOW()"},
+                json_columns=("synonyms", "inclusion_notes", "exclusion_notes", "children_codes"),
+            )
+            return
+
+        upsert_sql = text(f"""
+            INSERT INTO icd10_codes (
+                {", ".join(ICD10_UPSERT_COLUMNS)}, last_updated
+            ) VALUES (
+                {", ".join(f":{name}" for name in ICD10_UPSERT_COLUMNS)}, NOW()
+            )
+            ON CONFLICT (code) DO UPDATE SET {ICD10_UPSERT_SET}
+        """)
+
         session.execute(upsert_sql, prepared_batch)
 
     def _prepare_code_data(self, code_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -0,0 +1,146 @@
+"""
+Prefix index over ICD-10 codes for parent / children / descendant lookups
+
+ICD-10 codes are hierarchical by prefix once the dot is removed:
+E11 → E11.2 → E11.21, S72 → S72.0 → S72.00 → S72.001 → S72.001A. The index
+keys every code by that compact form, so:
+
+- parent: the longest proper prefix (3+ characters) that is itself a code,
+  found with at most a handful of dict lookups per code
+- children: inverse of the parent map, built in one pass
+- descendants: a contiguous range of the sorted compact keys, found by bisect
+
+Building is O(N log N) for the sort plus O(N) lookups, instead of comparing
+every code against every other code. Missing intermediate codes are skipped
+(a code attaches to its nearest existing ancestor).
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Category codes (E11, S72) are the roots of the hierarchy
+ROOT_CODE_LENGTH = 3
+
+# How long a process-wide index loaded from the database is reused
+SHARED_INDEX_MAX_AGE_SECONDS = 3600
+
+
+def compact_code(code: str) -> str:
+    """Normalize a code for prefix comparison: E11.21 / e1121 → E1121"""
+    return code.replace(".", "").strip().upper()
+
+
+class ICD10HierarchyIndex:
+    """Parent, children and descendant lookups for a fixed set of ICD-10 codes"""
+
+    def __init__(self, codes: Iterable[str]):
+        # compact key → code as given (dotted or not, whichever the source used)
+        self._codes: dict[str, str] = {}
+        for code in codes:
+            if code:
+                self._codes.setdefault(compact_code(code), code)
+
+        self._sorted_keys = sorted(self._codes)
+        self._parents: dict[str, str] = {}
+        self._children: dict[str, list[str]] = {}
+
+        # Sorted iteration keeps each children list in code order
+        for key in self._sorted_keys:
+            parent_key = self._nearest_ancestor_key(key)
+            if parent_key is not None:
+                self._parents[key] = parent_key
+                self._children.setdefault(parent_key, []).append(key)
+
+    def _nearest_ancestor_key(self, key: str) -> str | None:
+        for length in range(len(key) - 1, ROOT_CODE_LENGTH - 1, -1):
+            if key[:length] in self._codes:
+                return key[:length]
+        return None
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __contains__(self, code: object) -> bool:
+        return isinstance(code, str) and compact_code(code) in self._codes
+
+    @property
+    def relationship_count(self) -> int:
+        """Number of parent → child edges"""
+        return len(self._parents)
+
+    def parent_of(self, code: str) -> str | None:
+        """Nearest existing ancestor of ``code`` (which need not be in the index)"""
+        key = compact_code(code)
+        if key in self._codes:
+            parent_key = self._parents.get(key)
+        else:
+            parent_key = self._nearest_ancestor_key(key)
+        return self._codes[parent_key] if parent_key is not None else None
+
+    def ancestors_of(self, code: str) -> list[str]:
+        """Ancestors from nearest to the category root"""
+        ancestors = []
+        parent = self.parent_of(code)
+        while parent is not None:
+            ancestors.append(parent)
+            parent = self.parent_of(parent)
+        return ancestors
+
+    def children_of(self, code: str) -> list[str]:
+        """Direct children of ``code``, in code order"""
+        return [self._codes[key] for key in self._children.get(compact_code(code), [])]
+
+    def siblings_of(self, code: str) -> list[str]:
+        """Other children of ``code``'s parent, in code order"""
+        parent = self.parent_of(code)
+        if parent is None:
+            return []
+        key = compact_code(code)
+        return [self._codes[k] for k in self._children.get(compact_code(parent), []) if k != key]
+
+    def descendants_of(self, code: str) -> list[str]:
+        """All codes below ``code`` at any depth, in code order"""
+        key = compact_code(code)
+        # Every key that starts with ``key`` sorts between key and key + U+FFFF
+        start = bisect_right(self._sorted_keys, key)
+        end = bisect_left(self._sorted_keys, key + "\uffff", lo=start)
+        return [self._codes[k] for k in self._sorted_keys[start:end]]
+
+    @classmethod
+    def from_session(cls, session) -> "ICD10HierarchyIndex":
+        """Build an index over every code in icd10_codes"""
+        start = time.perf_counter()
+        index = cls(row.code for row in session.execute(text("SELECT code FROM icd10_codes")))
+        logger.info(f"Built ICD-10 hierarchy index: {len(index)} codes, "
+                    f"{index.relationship_count} relationships in {time.perf_counter() - start:.2f}s")
+        return index
+
+
+_shared_index: ICD10HierarchyIndex | None = None
+_shared_index_built_at = 0.0
+_shared_index_lock = threading.Lock()
+
+
+def get_shared_hierarchy_index(session) -> ICD10HierarchyIndex:
+    """Process-wide index for request handlers, rebuilt after SHARED_INDEX_MAX_AGE_SECONDS"""
+    global _shared_index, _shared_index_built_at
+    with _shared_index_lock:
+        if (_shared_index is None
+                or time.monotonic() - _shared_index_built_at > SHARED_INDEX_MAX_AGE_SECONDS):
+            _shared_index = ICD10HierarchyIndex.from_session(session)
+            _shared_index_built_at = time.monotonic()
+        return _shared_index
+
+
+def invalidate_shared_hierarchy_index() -> None:
+    """Drop the process-wide index, e.g. after codes were (re)loaded"""
+    global _shared_index
+    with _shared_index_lock:
+        _shared_index = None
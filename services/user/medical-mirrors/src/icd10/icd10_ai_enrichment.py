@@ -14,13 +14,14 @@ import logging
 from typing import Any, Dict, List, Optional, Set
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor
-import time
 
 from sqlalchemy import text
 from database import get_db_session, get_thread_safe_session
 
+from .hierarchy_index import ICD10HierarchyIndex
 from .scispacy_client import SciSpacyClient, SciSpacyClientSync
 from .llm_client import OllamaClient, OllamaClientSync, LLMConfig
+from llm_scheduler import LLMPriority
 
 logger = logging.getLogger(__name__)
 
@@ -46,7 +47,7 @@ class ICD10AIEnhancer:
         
         # Initialize AI clients
         self.scispacy_client = SciSpacyClientSync()
-        self.ollama_client = OllamaClientSync()
+        self.ollama_client = OllamaClientSync(priority=LLMPriority.BATCH)
         
         # Statistics tracking
         self.stats = {
@@ -60,9 +61,8 @@ class ICD10AIEnhancer:
             'ai_failures': 0
         }
         
-        # Rate limiting for AI services
-        self.last_ai_call = 0
-        self.min_ai_interval = 0.1  # Minimum seconds between AI calls
+        # Built once per enhancement run from all codes in the table
+        self.hierarchy_index: Optional[ICD10HierarchyIndex] = None
         
     def enhance_icd10_database(self, limit: Optional[int] = None) -> Dict[str, Any]:
         """
@@ -101,6 +101,9 @@ class ICD10AIEnhancer:
             result = session.execute(text(query))
             codes_to_enhance = result.fetchall()
             
+            # Parent/children lookups for every code come from one index
+            self.hierarchy_index = ICD10HierarchyIndex.from_session(session)
+            
             total_codes = len(codes_to_enhance)
             logger.info(f"Found {total_codes} codes needing AI enhancement")
             
@@ -146,6 +149,12 @@ class ICD10AIEnhancer:
     def _process_batch(self, session, batch):
         """Process a batch of ICD10 codes with AI enhancement"""
         
+        # Run SciSpacy over the whole batch in one nlp.pipe pass
+        concepts_by_code = self._extract_medical_concepts_batch(batch)
+        
+        # Written back together after the loop, one UPDATE per batch
+        updates = []
+        
         for row in batch:
             try:
                 code = row.code
@@ -157,11 +166,10 @@ class ICD10AIEnhancer:
                     
                 self.stats['processed'] += 1
                 
-                # Rate limiting
-                self._rate_limit()
-                
-                # Extract medical entities using SciSpacy
-                medical_concepts = self._extract_medical_concepts(description)
+                # Extract medical entities using SciSpacy (batch result if available)
+                medical_concepts = concepts_by_code.get(code)
+                if medical_concepts is None:
+                    medical_concepts = self._extract_medical_concepts(description)
                 
                 # Generate enhancements using Ollama
                 enhancements = self._generate_enhancements(
@@ -174,21 +182,24 @@ class ICD10AIEnhancer:
                 
                 # Update database if we got enhancements
                 if self._has_enhancements(enhancements):
-                    self._update_code(session, code, enhancements)
-                    self.stats['enhanced'] += 1
+                    updates.append((code, enhancements))
                     
             except Exception as e:
                 logger.error(f"Error processing code {row.code}: {e}")
                 self.stats['ai_failures'] += 1
                 continue
-                
-    def _rate_limit(self):
-        """Apply rate limiting for AI service calls"""
-        elapsed = time.time() - self.last_ai_call
-        if elapsed < self.min_ai_interval:
-            time.sleep(self.min_ai_interval - elapsed)
-        self.last_ai_call = time.time()
         
+        if updates:
+            try:
+                self._update_codes(session, updates)
+                # Commit per batch so a later failure cannot roll back earlier work
+                session.commit()
+                self.stats['enhanced'] += len(updates)
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Error writing {len(updates)} enhanced codes: {e}")
+                self.stats['ai_failures'] += len(updates)
+                
     def _extract_medical_concepts(self, description: str) -> Dict[str, Any]:
         """Extract medical concepts using SciSpacy"""
         try:
@@ -200,6 +211,27 @@ class ICD10AIEnhancer:
             self.stats['ai_failures'] += 1
             return {}
             
+    def _extract_medical_concepts_batch(self, batch) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Extract medical concepts for all described codes in a batch with one SciSpacy call
+
+        Codes SciSpacy could not analyze map to None and are retried one by one.
+        """
+        rows = [row for row in batch if row.description]
+        if not rows:
+            return {}
+        try:
+            self.stats['ai_calls'] += 1
+            concepts = self.scispacy_client.extract_medical_concepts_batch(
+                [row.description for row in rows]
+            )
+            return {
+                row.code: row_concepts for row, row_concepts in zip(rows, concepts, strict=True)
+            }
+        except Exception as e:
+            logger.error(f"SciSpacy batch extraction failed: {e}")
+            self.stats['ai_failures'] += 1
+            return {}
+            
     def _generate_enhancements(self, code: str, description: str, 
                               medical_concepts: Dict[str, Any]) -> Dict[str, Any]:
         """Generate enhancements using Ollama LLM"""
@@ -251,56 +283,21 @@ class ICD10AIEnhancer:
         """Build hierarchical relationships for the code"""
         hierarchy = {}
         
-        # Find parent code (existing logic, not AI-driven)
-        parent_code = self._find_parent_code(code)
+        if self.hierarchy_index is None:
+            self.hierarchy_index = ICD10HierarchyIndex.from_session(session)
+        
+        # Parent and children come from code structure, not AI
+        parent_code = self.hierarchy_index.parent_of(code)
         if parent_code:
             hierarchy['parent_code'] = parent_code
             
-        # Find children codes
-        children_query = text("""
-            SELECT code FROM icd10_codes 
-            WHERE code LIKE :pattern AND code != :code
-            ORDER BY code
-        """)
-        
-        # Pattern for finding children (codes that start with this code)
-        if '.' in code:
-            pattern = f"{code}%"
-        else:
-            pattern = f"{code}.%"
-            
-        result = session.execute(children_query, {'pattern': pattern, 'code': code})
-        children = [row.code for row in result.fetchall()]
-        
+        children = self.hierarchy_index.children_of(code)
         if children:
             hierarchy['children_codes'] = children
             self.stats['relationships_added'] += len(children)
             
         return hierarchy
         
-    def _find_parent_code(self, code: str) -> Optional[str]:
-        """Find parent code based on ICD10 structure"""
-        if not code or len(code) <= 3:
-            return None
-            
-        if '.' in code:
-            parts = code.split('.')
-            base = parts[0]
-            decimal = parts[1] if len(parts) > 1 else ''
-            
-            if len(decimal) > 1:
-                # E11.21 → E11.2
-                return f"{base}.{decimal[:-1]}"
-            elif len(decimal) == 1:
-                # E11.9 → E11
-                return base
-        else:
-            # Handle non-decimal codes
-            if len(code) > 3:
-                return code[:-1]
-                
-        return None
-        
     def _has_enhancements(self, enhancements: Dict[str, Any]) -> bool:
         """Check if we have any enhancements to apply"""
         return (
@@ -311,41 +308,33 @@ class ICD10AIEnhancer:
             len(enhancements.get('children_codes', [])) > 0
         )
         
-    def _update_code(self, session, code: str, enhancements: Dict[str, Any]):
-        """Update ICD10 code with AI-generated enhancements"""
+    def _update_codes(self, session, updates: List[tuple]):
+        """Update ICD10 codes with AI-generated enhancements in one statement.
         
-        update_parts = []
-        params = {'code': code}
-        
-        if enhancements.get('synonyms'):
-            update_parts.append("synonyms = :synonyms")
-            params['synonyms'] = json.dumps(enhancements['synonyms'])
-            
-        if enhancements.get('inclusion_notes'):
-            update_parts.append("inclusion_notes = :inclusion_notes")
-            params['inclusion_notes'] = json.dumps(enhancements['inclusion_notes'])
-            
-        if enhancements.get('exclusion_notes'):
-            update_parts.append("exclusion_notes = :exclusion_notes")
-            params['exclusion_notes'] = json.dumps(enhancements['exclusion_notes'])
-            
-        if enhancements.get('parent_code'):
-            update_parts.append("parent_code = :parent_code")
-            params['parent_code'] = enhancements['parent_code']
-            
-        if enhancements.get('children_codes'):
-            update_parts.append("children_codes = :children_codes")
-            params['children_codes'] = json.dumps(enhancements['children_codes'])
-            
-        if update_parts:
-            update_query = text(f"""
-                UPDATE icd10_codes 
-                SET {', '.join(update_parts)},
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE code = :code
-            """)
+        Fields an enhancement did not produce arrive as NULL and keep their
+        current value.
+        """
+        rows = []
+        for code, enhancements in updates:
+            row = {'code': code, 'parent_code': enhancements.get('parent_code') or None}
+            for field in ('synonyms', 'inclusion_notes', 'exclusion_notes', 'children_codes'):
+                row[field] = enhancements.get(field) or None
+            rows.append(row)
             
-            session.execute(update_query, params)
+        session.execute(text("""
+            UPDATE icd10_codes AS t
+            SET synonyms = COALESCE(s.synonyms, t.synonyms),
+                inclusion_notes = COALESCE(s.inclusion_notes, t.inclusion_notes),
+                exclusion_notes = COALESCE(s.exclusion_notes, t.exclusion_notes),
+                parent_code = COALESCE(s.parent_code, t.parent_code),
+                children_codes = COALESCE(s.children_codes, t.children_codes),
+                updated_at = CURRENT_TIMESTAMP
+            FROM json_to_recordset(CAST(:rows AS json)) AS s(
+                code text, synonyms jsonb, inclusion_notes jsonb, exclusion_notes jsonb,
+                parent_code text, children_codes jsonb
+            )
+            WHERE t.code = s.code
+        """), {'rows': json.dumps(rows)})
 
 
 # Async version for use in async contexts
@@ -369,7 +358,7 @@ class ICD10AIEnhancerAsync:
         
     async def __aenter__(self):
         self.scispacy_client = await SciSpacyClient().__aenter__()
-        self.ollama_client = await OllamaClient().__aenter__()
+        self.ollama_client = await OllamaClient(priority=LLMPriority.BATCH).__aenter__()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
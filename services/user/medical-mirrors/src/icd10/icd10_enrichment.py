@@ -16,15 +16,17 @@ Architecture follows medical-mirrors service patterns with:
 - UPSERT operations for data integrity
 """
 
-import json
 import logging
 import re
 from typing import Any, Dict, List, Optional, Set, Tuple
 from datetime import datetime
 
 from sqlalchemy import text
+from bulk_loader import bulk_copy_upsert
 from database import get_db_session, get_thread_safe_session
 
+from .hierarchy_index import ICD10HierarchyIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -408,6 +410,9 @@ class ICD10HierarchyBuilder:
     - Handles complex hierarchies (E11.21 → E11.2 → E11)
     - Generates bidirectional relationships
     
+    Relationships come from an ICD10HierarchyIndex (prefix index), so the
+    whole code set is linked in near-linear time.
+    
     Target: Build 40,000+ parent-child relationships from code structure
     """
     
@@ -416,20 +421,23 @@ class ICD10HierarchyBuilder:
         self.relationships_built = 0
         self.hierarchy_levels_created = 0
 
-    def build_hierarchy(self, codes_data: List[Dict]) -> List[Dict]:
+    def build_hierarchy(self, codes_data: List[Dict],
+                        index: Optional[ICD10HierarchyIndex] = None) -> List[Dict]:
         """
         Build parent-child relationships for ICD-10 codes.
         
         Args:
             codes_data: List of ICD-10 code dictionaries
+            index: Hierarchy index over the full code set; built from
+                codes_data if omitted (relationships then stay within it)
             
         Returns:
             Enhanced codes with parent-child relationships
         """
         logger.info(f"Building ICD-10 hierarchy for {len(codes_data)} codes")
         
-        # Create code lookup for efficient parent finding
-        code_lookup = {code_data['code']: code_data for code_data in codes_data}
+        if index is None:
+            index = ICD10HierarchyIndex(code_data.get('code', '') for code_data in codes_data)
         
         # Build relationships
         enhanced_codes = []
@@ -437,14 +445,13 @@ class ICD10HierarchyBuilder:
             code = code_data.get('code', '')
             
             # Find parent and children
-            parent_code = self._find_parent_code(code)
-            children_codes = self._find_children_codes(code, code_lookup)
+            parent_code = index.parent_of(code) if code else None
+            children_codes = index.children_of(code) if code else []
             
             # Update code data
             enhanced_code = code_data.copy()
             
-            # Set parent if exists and is in our dataset
-            if parent_code and parent_code in code_lookup:
+            if parent_code:
                 enhanced_code['parent_code'] = parent_code
             
             # Set children if any exist
@@ -456,7 +463,7 @@ class ICD10HierarchyBuilder:
             enhanced_codes.append(enhanced_code)
             
             # Track statistics
-            if parent_code and parent_code in code_lookup:
+            if parent_code:
                 self.relationships_built += 1
             if children_codes:
                 self.relationships_built += len(children_codes)
@@ -468,98 +475,6 @@ class ICD10HierarchyBuilder:
                    
         return enhanced_codes
 
-    def _find_parent_code(self, code: str) -> Optional[str]:
-        """
-        Find parent code for given ICD-10 code.
-        
-        Examples:
-        - E11.9 → E11 (remove decimal and following)
-        - E11.21 → E11.2 (remove last character)
-        - S72.001A → S72.001 → S72.00 → S72.0 → S72
-        """
-        if not code or len(code) <= 3:
-            return None  # No parent for 3-character codes
-            
-        # Remove encounter/laterality indicators (A, D, S, etc.) from end
-        clean_code = re.sub(r'[A-Z]$', '', code)
-        
-        if '.' in clean_code:
-            # Handle decimal codes
-            parts = clean_code.split('.')
-            base = parts[0]
-            decimal = parts[1] if len(parts) > 1 else ''
-            
-            if len(decimal) > 1:
-                # E11.21 → E11.2
-                return f"{base}.{decimal[:-1]}"
-            elif len(decimal) == 1:
-                # E11.9 → E11
-                return base
-        else:
-            # Handle non-decimal codes (rare)
-            if len(clean_code) > 3:
-                return clean_code[:-1]
-                
-        return None
-
-    def _find_children_codes(self, code: str, code_lookup: Dict[str, Dict]) -> List[str]:
-        """
-        Find all child codes for given ICD-10 code.
-        
-        Args:
-            code: Parent code to find children for
-            code_lookup: Dictionary of all available codes
-            
-        Returns:
-            List of child codes
-        """
-        children = []
-        
-        # Clean the parent code
-        clean_parent = re.sub(r'[A-Z]$', '', code)
-        
-        for other_code in code_lookup.keys():
-            if other_code == code:
-                continue
-                
-            # Check if other_code is a child of this code
-            if self._is_child_of(other_code, clean_parent):
-                children.append(other_code)
-                
-        return children
-
-    def _is_child_of(self, potential_child: str, parent_code: str) -> bool:
-        """
-        Check if potential_child is a direct child of parent_code.
-        
-        Examples:
-        - E11.9 is child of E11 ✓
-        - E11.21 is child of E11.2 ✓
-        - E11.21 is NOT direct child of E11 ✗ (E11.2 is intermediate)
-        """
-        # Clean potential child code
-        clean_child = re.sub(r'[A-Z]$', '', potential_child)
-        
-        # Must start with parent code
-        if not clean_child.startswith(parent_code):
-            return False
-            
-        # Extract the part after parent
-        suffix = clean_child[len(parent_code):]
-        
-        if not suffix:
-            return False  # Same code
-            
-        # Check for direct child relationship
-        if '.' in parent_code:
-            # Parent has decimal (e.g., E11.2)
-            # Child should add exactly one character (E11.21, not E11.212)
-            return len(suffix) == 1 and suffix.isdigit()
-        else:
-            # Parent is base code (e.g., E11)
-            # Child should be E11.X (single decimal digit)
-            return suffix.startswith('.') and len(suffix) == 2 and suffix[1].isdigit()
-
     def get_hierarchy_statistics(self, codes_data: List[Dict]) -> Dict[str, int]:
         """Get statistics about the hierarchy structure"""
         stats = {
@@ -584,6 +499,49 @@ class ICD10HierarchyBuilder:
         return stats
 
 
+ENHANCEMENT_COLUMNS = [
+    "code", "description", "category", "chapter",
+    "synonyms", "inclusion_notes", "exclusion_notes",
+    "parent_code", "children_codes", "is_billable", "source",
+    "search_text",
+]
+
+ENHANCEMENT_JSON_COLUMNS = ("synonyms", "inclusion_notes", "exclusion_notes", "children_codes")
+
+# Preserve existing data while adding enhancements: jsonb arrays keep
+# whichever side is longer
+ENHANCEMENT_MERGE_SET = """
+    synonyms = CASE 
+        WHEN COALESCE(jsonb_array_length(EXCLUDED.synonyms), 0) > 
+             COALESCE(jsonb_array_length(icd10_codes.synonyms), 0)
+        THEN EXCLUDED.synonyms 
+        ELSE icd10_codes.synonyms 
+    END,
+    inclusion_notes = CASE 
+        WHEN COALESCE(jsonb_array_length(EXCLUDED.inclusion_notes), 0) > 
+             COALESCE(jsonb_array_length(icd10_codes.inclusion_notes), 0)
+        THEN EXCLUDED.inclusion_notes 
+        ELSE icd10_codes.inclusion_notes 
+    END,
+    exclusion_notes = CASE 
+        WHEN COALESCE(jsonb_array_length(EXCLUDED.exclusion_notes), 0) > 
+             COALESCE(jsonb_array_length(icd10_codes.exclusion_notes), 0)
+        THEN EXCLUDED.exclusion_notes 
+        ELSE icd10_codes.exclusion_notes 
+    END,
+    children_codes = CASE 
+        WHEN COALESCE(jsonb_array_length(EXCLUDED.children_codes), 0) > 
+             COALESCE(jsonb_array_length(icd10_codes.children_codes), 0)
+        THEN EXCLUDED.children_codes 
+        ELSE icd10_codes.children_codes 
+    END,
+    parent_code = COALESCE(EXCLUDED.parent_code, icd10_codes.parent_code),
+    category = COALESCE(EXCLUDED.category, icd10_codes.category),
+    search_text = EXCLUDED.search_text,
+    last_updated = NOW()
+"""
+
+
 class ICD10DatabaseEnhancer:
     """
     Orchestrates the complete ICD-10 database enhancement process:
@@ -671,6 +629,9 @@ class ICD10DatabaseEnhancer:
                 logger.warning("No codes found for enhancement")
                 return self._generate_results_summary(start_time)
             
+            # One index over all codes so relationships cross batch boundaries
+            hierarchy_index = ICD10HierarchyIndex(code_data['code'] for code_data in codes_data)
+            
             # Process in batches for memory efficiency
             enhanced_batches = []
             for i in range(0, len(codes_data), self.batch_size):
@@ -678,7 +639,7 @@ class ICD10DatabaseEnhancer:
                 logger.info(f"Processing batch {i//self.batch_size + 1} "
                            f"({len(batch)} codes)")
                 
-                enhanced_batch = self._process_batch(batch)
+                enhanced_batch = self._process_batch(batch, hierarchy_index)
                 enhanced_batches.append(enhanced_batch)
                 
             # Combine all enhanced batches
@@ -742,7 +703,8 @@ class ICD10DatabaseEnhancer:
                 
         return codes_data
 
-    def _process_batch(self, batch: List[Dict]) -> List[Dict]:
+    def _process_batch(self, batch: List[Dict],
+                       hierarchy_index: Optional[ICD10HierarchyIndex] = None) -> List[Dict]:
         """Process a batch of codes through all enhancement steps"""
         
         # Step 1: Extract clinical notes
@@ -755,103 +717,46 @@ class ICD10DatabaseEnhancer:
         
         # Step 3: Build hierarchy
         logger.info(f"Building hierarchy for batch of {len(batch)} codes")
-        batch = self.hierarchy_builder.build_hierarchy(batch)
+        batch = self.hierarchy_builder.build_hierarchy(batch, hierarchy_index)
         
         return batch
 
     def _update_database_with_enhancements(self, enhanced_codes: List[Dict]) -> None:
-        """Update database with enhanced code data using UPSERT operations"""
+        """Update database with enhanced code data, one staged merge per batch"""
         logger.info(f"Updating database with {len(enhanced_codes)} enhanced codes")
         
         with get_db_session() as db:
             try:
-                for i, code_data in enumerate(enhanced_codes):
-                    if i > 0 and i % 100 == 0:
-                        logger.info(f"Updated {i} codes to database")
-                        
-                    # Use UPSERT to preserve existing data while adding enhancements
-                    upsert_query = """
-                        INSERT INTO icd10_codes (
-                            code, description, category, chapter,
-                            synonyms, inclusion_notes, exclusion_notes,
-                            parent_code, children_codes, is_billable, source,
-                            search_text, last_updated
-                        ) VALUES (
-                            :code, :description, :category, :chapter,
-                            :synonyms, :inclusion_notes, :exclusion_notes,
-                            :parent_code, :children_codes, :is_billable, :source,
-                            :search_text, NOW()
-                        )
-                        ON CONFLICT (code) DO UPDATE SET
-                            synonyms = CASE 
-                                WHEN COALESCE(jsonb_array_length(EXCLUDED.synonyms), 0) > 
-                                     COALESCE(jsonb_array_length(icd10_codes.synonyms), 0)
-                                THEN EXCLUDED.synonyms 
-                                ELSE icd10_codes.synonyms 
-                            END,
-                            inclusion_notes = CASE 
-                                WHEN COALESCE(jsonb_array_length(EXCLUDED.inclusion_notes), 0) > 
-                                     COALESCE(jsonb_array_length(icd10_codes.inclusion_notes), 0)
-                                THEN EXCLUDED.inclusion_notes 
-                                ELSE icd10_codes.inclusion_notes 
-                            END,
-                            exclusion_notes = CASE 
-                                WHEN COALESCE(jsonb_array_length(EXCLUDED.exclusion_notes), 0) > 
-                                     COALESCE(jsonb_array_length(icd10_codes.exclusion_notes), 0)
-                                THEN EXCLUDED.exclusion_notes 
-                                ELSE icd10_codes.exclusion_notes 
-                            END,
-                            children_codes = CASE 
-                                WHEN COALESCE(jsonb_array_length(EXCLUDED.children_codes), 0) > 
-                                     COALESCE(jsonb_array_length(icd10_codes.children_codes), 0)
-                                THEN EXCLUDED.children_codes 
-                                ELSE icd10_codes.children_codes 
-                            END,
-                            parent_code = COALESCE(EXCLUDED.parent_code, icd10_codes.parent_code),
-                            category = COALESCE(EXCLUDED.category, icd10_codes.category),
-                            search_text = EXCLUDED.search_text,
-                            last_updated = NOW()
-                    """
+                for i in range(0, len(enhanced_codes), self.batch_size):
+                    batch = enhanced_codes[i:i + self.batch_size]
+                    rows = [self._enhancement_row(code_data) for code_data in batch]
                     
-                    # Prepare search text
-                    search_components = [
-                        code_data['code'],
-                        code_data['description'],
-                        code_data.get('category', '') or '',
-                    ]
+                    # COPY the batch into staging and merge it with one UPSERT
+                    bulk_copy_upsert(
+                        db,
+                        "icd10_codes",
+                        ENHANCEMENT_COLUMNS,
+                        rows,
+                        conflict_columns=["code"],
+                        update_set=ENHANCEMENT_MERGE_SET,
+                        insert_values={"last_updated": "NOW()"},
+                        json_columns=ENHANCEMENT_JSON_COLUMNS,
+                    )
                     
-                    if code_data.get('synonyms'):
-                        search_components.extend(code_data['synonyms'])
+                    for code_data in batch:
+                        self.total_processed += 1
                         
-                    search_text = ' '.join(filter(None, search_components))
-                    
-                    # Execute upsert
-                    db.execute(text(upsert_query), {
-                        'code': code_data['code'],
-                        'description': code_data['description'],
-                        'category': code_data.get('category'),
-                        'chapter': code_data.get('chapter'),
-                        'synonyms': json.dumps(code_data.get('synonyms', [])),
-                        'inclusion_notes': json.dumps(code_data.get('inclusion_notes', [])),
-                        'exclusion_notes': json.dumps(code_data.get('exclusion_notes', [])),
-                        'parent_code': code_data.get('parent_code'),
-                        'children_codes': json.dumps(code_data.get('children_codes', [])),
-                        'is_billable': code_data.get('is_billable'),
-                        'source': code_data.get('source', 'enrichment'),
-                        'search_text': search_text
-                    })
+                        # Track enhancement statistics
+                        if code_data.get('inclusion_notes'):
+                            self.enhancement_stats['inclusion_notes_added'] += 1
+                        if code_data.get('exclusion_notes'):
+                            self.enhancement_stats['exclusion_notes_added'] += 1
+                        if code_data.get('synonyms'):
+                            self.enhancement_stats['synonyms_added'] += 1
+                        if code_data.get('children_codes') or code_data.get('parent_code'):
+                            self.enhancement_stats['relationships_added'] += 1
                     
-                    self.total_processed += 1
-                    
-                    # Track enhancement statistics
-                    if code_data.get('inclusion_notes'):
-                        self.enhancement_stats['inclusion_notes_added'] += 1
-                    if code_data.get('exclusion_notes'):
-                        self.enhancement_stats['exclusion_notes_added'] += 1
-                    if code_data.get('synonyms'):
-                        self.enhancement_stats['synonyms_added'] += 1
-                    if code_data.get('children_codes') or code_data.get('parent_code'):
-                        self.enhancement_stats['relationships_added'] += 1
+                    logger.info(f"Updated {i + len(batch)} codes to database")
                         
                 db.commit()
                 logger.info(f"Successfully updated {len(enhanced_codes)} codes in database")
@@ -861,6 +766,34 @@ class ICD10DatabaseEnhancer:
                 logger.error(f"Database update failed: {str(e)}")
                 raise
 
+    @staticmethod
+    def _enhancement_row(code_data: Dict) -> Dict[str, Any]:
+        """Staging row for one enhanced code"""
+        # Prepare search text
+        search_components = [
+            code_data['code'],
+            code_data['description'],
+            code_data.get('category', '') or '',
+        ]
+        
+        if code_data.get('synonyms'):
+            search_components.extend(code_data['synonyms'])
+            
+        return {
+            'code': code_data['code'],
+            'description': code_data['description'],
+            'category': code_data.get('category'),
+            'chapter': code_data.get('chapter'),
+            'synonyms': code_data.get('synonyms', []),
+            'inclusion_notes': code_data.get('inclusion_notes', []),
+            'exclusion_notes': code_data.get('exclusion_notes', []),
+            'parent_code': code_data.get('parent_code'),
+            'children_codes': code_data.get('children_codes', []),
+            'is_billable': code_data.get('is_billable'),
+            'source': code_data.get('source', 'enrichment'),
+            'search_text': ' '.join(filter(None, search_components)),
+        }
+
     def _generate_results_summary(self, start_time: datetime) -> Dict[str, Any]:
         """Generate comprehensive results summary"""
         end_time = datetime.now()
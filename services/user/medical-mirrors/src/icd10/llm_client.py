@@ -10,6 +10,8 @@ from dataclasses import dataclass
 
 import aiohttp
 
+from llm_scheduler import LLMPriority, get_llm_scheduler
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,14 +32,17 @@ class OllamaClient:
     All processing is local and PHI-safe.
     """
 
-    def __init__(self, config: LLMConfig | None = None):
+    def __init__(self, config: LLMConfig | None = None,
+                 priority: LLMPriority = LLMPriority.INTERACTIVE):
         """
         Initialize Ollama client.
         
         Args:
             config: LLM configuration (uses defaults if not provided)
+            priority: Scheduling class for this client's requests
         """
         self.config = config or LLMConfig()
+        self.priority = priority
         self.session: aiohttp.ClientSession | None = None
 
     async def __aenter__(self):
@@ -71,22 +76,25 @@ class OllamaClient:
             full_prompt = prompt
 
         try:
-            async with self.session.post(
-                f"{self.config.base_url}/api/generate",
-                json={
-                    "model": self.config.model,
-                    "prompt": full_prompt,
-                    "temperature": self.config.temperature,
-                    "stream": False,
-                },
-                timeout=aiohttp.ClientTimeout(total=self.config.timeout),
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    return result.get("response", "")
-                error_text = await response.text()
-                logger.error(f"Ollama generation failed: {error_text}")
-                return ""
+            async with get_llm_scheduler().aslot(self.config.base_url, self.priority) as slot:
+                async with self.session.post(
+                    f"{self.config.base_url}/api/generate",
+                    json={
+                        "model": self.config.model,
+                        "prompt": full_prompt,
+                        "temperature": self.config.temperature,
+                        "stream": False,
+                    },
+                    timeout=aiohttp.ClientTimeout(total=self.config.timeout),
+                ) as response:
+                    if response.status == 200:
+                        result = await response.json()
+                        slot.record_tokens(result.get("eval_count"))
+                        return result.get("response", "")
+                    slot.mark_failed()
+                    error_text = await response.text()
+                    logger.error(f"Ollama generation failed: {error_text}")
+                    return ""
 
         except TimeoutError:
             logger.error("Ollama request timed out")
@@ -266,8 +274,9 @@ Focus on codes that would likely be used together or are medically related."""
 class OllamaClientSync:
     """Synchronous wrapper for Ollama client"""
 
-    def __init__(self, config: LLMConfig | None = None):
-        self.client = OllamaClient(config)
+    def __init__(self, config: LLMConfig | None = None,
+                 priority: LLMPriority = LLMPriority.INTERACTIVE):
+        self.client = OllamaClient(config, priority)
 
     def generate(self, prompt: str, system_prompt: str | None = None) -> str:
         """Synchronous wrapper for generate"""
@@ -6,6 +6,8 @@ import logging
 from datetime import datetime
 from typing import Any
 
+from .hierarchy_index import ICD10HierarchyIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -441,17 +443,15 @@ class ICD10Parser:
         """Build hierarchical relationships between codes"""
         logger.info("Building ICD-10 code hierarchy")
 
-        # Create lookup by code
-        code_lookup = {code["code"]: code for code in codes}
+        # Link each code to its nearest existing ancestor (E11.21 → E11.2 → E11)
+        index = ICD10HierarchyIndex(code["code"] for code in codes)
 
-        # Build parent-child relationships
         for code in codes:
-            parent_code = code.get("parent_code")
-            if parent_code and parent_code in code_lookup:
-                parent = code_lookup[parent_code]
-                if "children_codes" not in parent:
-                    parent["children_codes"] = []
-                parent["children_codes"].append(code["code"])
+            parent_code = index.parent_of(code["code"])
+            if parent_code:
+                code["parent_code"] = parent_code
+                self.hierarchy_built += 1
+            code["children_codes"] = index.children_of(code["code"])
 
         logger.info("ICD-10 hierarchy building completed")
         return codes
@@ -6,10 +6,16 @@ Connects to the SciSpacy service for biomedical NLP analysis
 import logging
 import asyncio
 import aiohttp
-import json
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 
+from scispacy_batch import (
+    DEFAULT_BATCH_REQUEST_SIZE,
+    batch_error,
+    collect_batch_lines,
+    is_batch_error,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,6 +31,37 @@ class MedicalEntity:
     priority: Optional[str] = None
 
 
+def _entity_types_from_result(result: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Group entity texts by label from a single /analyze response."""
+    entity_types: Dict[str, List[str]] = {}
+    for entity_data in result.get("entities", []):
+        label = entity_data.get("label", "")
+        entity_text = entity_data.get("text", "")
+        bucket = entity_types.setdefault(label, [])
+        if entity_text not in bucket:
+            bucket.append(entity_text)
+    return entity_types
+
+
+def _concepts_from_entity_types(entity_types: Dict[str, List[str]]) -> Dict[str, Any]:
+    """Map SciSpacy entity types to the medical concept groups used for ICD10 enhancement."""
+    return {
+        "diseases": entity_types.get("CANCER", []) + 
+                   entity_types.get("PATHOLOGICAL_FORMATION", []),
+        "anatomy": entity_types.get("ANATOMICAL_SYSTEM", []) + 
+                  entity_types.get("ORGAN", []) + 
+                  entity_types.get("TISSUE", []) +
+                  entity_types.get("MULTI-TISSUE_STRUCTURE", []),
+        "chemicals": entity_types.get("SIMPLE_CHEMICAL", []) + 
+                    entity_types.get("AMINO_ACID", []),
+        "organisms": entity_types.get("ORGANISM", []),
+        "cells": entity_types.get("CELL", []) + 
+                entity_types.get("CELLULAR_COMPONENT", []),
+        "substances": entity_types.get("ORGANISM_SUBSTANCE", []),
+        "all_entities": [e for entities in entity_types.values() for e in entities]
+    }
+
+
 class SciSpacyClient:
     """
     Client for communicating with the SciSpacy biomedical NLP service.
@@ -80,14 +117,78 @@ class SciSpacyClient:
                 else:
                     error_text = await response.text()
                     logger.error(f"SciSpacy analysis failed: {error_text}")
-                    return {"entities": [], "error": error_text}
+                    return batch_error(error_text)
                     
         except asyncio.TimeoutError:
             logger.error("SciSpacy request timed out")
-            return {"entities": [], "error": "timeout"}
+            return batch_error("timeout")
         except Exception as e:
             logger.error(f"SciSpacy request failed: {e}")
-            return {"entities": [], "error": str(e)}
+            return batch_error(str(e))
+
+    async def analyze_batch(self, texts: List[str], enrich: bool = True,
+                            batch_size: Optional[int] = None,
+                            n_process: Optional[int] = None,
+                            request_size: int = DEFAULT_BATCH_REQUEST_SIZE) -> List[Dict[str, Any]]:
+        """
+        Analyze many texts via the /analyze/batch endpoint (spaCy ``nlp.pipe``).
+        
+        Args:
+            texts: Texts to analyze
+            enrich: Whether to include enriched metadata and relationships
+            batch_size: Server-side ``nlp.pipe`` batch size (server default if None)
+            n_process: Server-side ``nlp.pipe`` worker processes (server default if None)
+            request_size: Maximum number of texts sent per HTTP request
+            
+        Returns:
+            One analysis dictionary per input text, in input order. Entries that
+            failed carry an ``error`` key and an empty ``entities`` list.
+        """
+        if not self.session:
+            self.session = aiohttp.ClientSession()
+            
+        results: List[Dict[str, Any]] = []
+        for offset in range(0, len(texts), request_size):
+            chunk = texts[offset:offset + request_size]
+            results.extend(
+                await self._analyze_batch_request(chunk, enrich, batch_size, n_process)
+            )
+        return results
+        
+    async def _analyze_batch_request(self, texts: List[str], enrich: bool,
+                                     batch_size: Optional[int],
+                                     n_process: Optional[int]) -> List[Dict[str, Any]]:
+        """Send one /analyze/batch request and collect the NDJSON stream in input order"""
+        payload: Dict[str, Any] = {"texts": texts, "enrich": enrich}
+        if batch_size is not None:
+            payload["batch_size"] = batch_size
+        if n_process is not None:
+            payload["n_process"] = n_process
+            
+        try:
+            async with self.session.post(
+                f"{self.base_url}/analyze/batch",
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=30 + len(texts))
+            ) as response:
+                if response.status == 404:
+                    # Older SciSpacy server without the batch endpoint
+                    logger.warning("SciSpacy /analyze/batch not available, falling back to /analyze")
+                    return [await self.analyze_text(t, enrich) for t in texts]
+                if response.status != 200:
+                    error_text = await response.text()
+                    logger.error(f"SciSpacy batch analysis failed: {error_text}")
+                    return [batch_error(error_text) for _ in texts]
+                    
+                lines = [raw_line async for raw_line in response.content]
+                return collect_batch_lines(lines, len(texts))
+                        
+        except asyncio.TimeoutError:
+            logger.error("SciSpacy batch request timed out")
+            return [batch_error("timeout") for _ in texts]
+        except Exception as e:
+            logger.error(f"SciSpacy batch request failed: {e}")
+            return [batch_error(str(e)) for _ in texts]
             
     async def extract_medical_entities(self, text: str) -> List[MedicalEntity]:
         """
@@ -148,25 +249,28 @@ class SciSpacyClient:
             Dictionary with diseases, anatomy, symptoms, procedures, etc.
         """
         entity_types = await self.get_entity_types(description)
+        return _concepts_from_entity_types(entity_types)
         
-        # Map SciSpacy entity types to medical concepts
-        concepts = {
-            "diseases": entity_types.get("CANCER", []) + 
-                       entity_types.get("PATHOLOGICAL_FORMATION", []),
-            "anatomy": entity_types.get("ANATOMICAL_SYSTEM", []) + 
-                      entity_types.get("ORGAN", []) + 
-                      entity_types.get("TISSUE", []) +
-                      entity_types.get("MULTI-TISSUE_STRUCTURE", []),
-            "chemicals": entity_types.get("SIMPLE_CHEMICAL", []) + 
-                        entity_types.get("AMINO_ACID", []),
-            "organisms": entity_types.get("ORGANISM", []),
-            "cells": entity_types.get("CELL", []) + 
-                    entity_types.get("CELLULAR_COMPONENT", []),
-            "substances": entity_types.get("ORGANISM_SUBSTANCE", []),
-            "all_entities": [e for entities in entity_types.values() for e in entities]
-        }
-        
-        return concepts
+    async def extract_medical_concepts_batch(self, descriptions: List[str],
+                                             batch_size: Optional[int] = None
+                                             ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Extract medical concepts for many descriptions with a single batched pipeline.
+        
+        Args:
+            descriptions: ICD10 description texts
+            batch_size: Server-side ``nlp.pipe`` batch size
+            
+        Returns:
+            One concept dictionary per description, in input order; None where
+            the description could not be analyzed, so callers can fall back
+        """
+        results = await self.analyze_batch(descriptions, enrich=True, batch_size=batch_size)
+        return [
+            None if is_batch_error(result)
+            else _concepts_from_entity_types(_entity_types_from_result(result))
+            for result in results
+        ]
         
     def check_health(self) -> bool:
         """
@@ -204,4 +308,22 @@ class SciSpacyClientSync:
         
     def extract_medical_concepts(self, description: str) -> Dict[str, Any]:
         """Synchronous wrapper for extract_medical_concepts"""
-        return asyncio.run(self.client.extract_medical_concepts(description))
\ No newline at end of file
+        return asyncio.run(self.client.extract_medical_concepts(description))
+        
+    def analyze_batch(self, texts: List[str], enrich: bool = True,
+                      batch_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Synchronous wrapper for analyze_batch"""
+        return asyncio.run(self._run_batch("analyze_batch", texts, enrich=enrich,
+                                           batch_size=batch_size))
+        
+    def extract_medical_concepts_batch(self, descriptions: List[str],
+                                       batch_size: Optional[int] = None
+                                       ) -> List[Optional[Dict[str, Any]]]:
+        """Synchronous wrapper for extract_medical_concepts_batch"""
+        return asyncio.run(self._run_batch("extract_medical_concepts_batch", descriptions,
+                                           batch_size=batch_size))
+        
+    async def _run_batch(self, method: str, texts: List[str], **kwargs) -> List[Dict[str, Any]]:
+        """Run a batch call on a session scoped to the current event loop"""
+        async with SciSpacyClient(self.client.base_url) as client:
+            return await getattr(client, method)(texts, **kwargs)
\ No newline at end of file
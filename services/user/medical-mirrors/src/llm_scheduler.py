@@ -0,0 +1,358 @@
+"""
+Shared request scheduler for Ollama endpoints
+
+Every LLM client in medical-mirrors (health_info.llm_client,
+health_info.llm_client_optimized, icd10.llm_client and the health topic
+enricher) acquires a slot here before sending a request, so one Ollama
+instance sees a single, coordinated stream of work instead of several
+independent fixed-interval sleeps.
+
+- One slot pool per endpoint (base URL)
+- Concurrency adapts per endpoint (AIMD): the limit grows by about one per
+  round of completions while requests are queued and latency stays within
+  ``latency_tolerance`` x the observed baseline, and shrinks multiplicatively
+  when latency climbs past that or requests fail
+- Waiters are served by priority class, then arrival order, so interactive
+  requests overtake queued batch enrichment
+- The pools are thread-safe and not tied to an event loop: the sync clients
+  block on a ``threading.Event``, async clients await a future on their own
+  loop (icd10's sync wrapper runs a fresh loop per call)
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from enum import IntEnum
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class LLMPriority(IntEnum):
+    """Priority classes; lower values are served first"""
+
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+class LLMSlot:
+    """A granted request slot; callers report generated tokens through it"""
+
+    __slots__ = ("endpoint", "priority", "started", "tokens", "failed")
+
+    def __init__(self, endpoint: str, priority: LLMPriority):
+        self.endpoint = endpoint
+        self.priority = priority
+        self.started = time.monotonic()
+        self.tokens = 0
+        self.failed = False
+
+    def record_tokens(self, count: int | None) -> None:
+        """Add generated (completion) tokens, e.g. Ollama's ``eval_count``"""
+        if count:
+            self.tokens += int(count)
+
+    def mark_failed(self) -> None:
+        """Count this request as failed even though no exception escaped"""
+        self.failed = True
+
+
+class _Waiter:
+    __slots__ = ("priority", "wake", "granted", "cancelled")
+
+    def __init__(self, priority: LLMPriority, wake: Callable[[], None]):
+        self.priority = priority
+        self.wake = wake
+        self.granted = False
+        self.cancelled = False
+
+
+class EndpointScheduler:
+    """Priority-ordered, latency-adaptive slot pool for one endpoint"""
+
+    def __init__(
+        self,
+        endpoint: str,
+        min_concurrency: int = 1,
+        max_concurrency: int = 5,
+        initial_concurrency: int = 2,
+        latency_tolerance: float = 2.0,
+        metrics_window: float = 60.0,
+    ):
+        self.endpoint = endpoint
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.latency_tolerance = latency_tolerance
+        self.metrics_window = metrics_window
+
+        self._lock = threading.Lock()
+        self._limit = float(min(max(initial_concurrency, self.min_concurrency), self.max_concurrency))
+        self._in_flight = 0
+        self._waiters: list[tuple[int, int, _Waiter]] = []
+        self._seq = itertools.count()
+
+        self._latency_ewma: float | None = None
+        self._latency_baseline: float | None = None
+        self._recent: deque[tuple[float, int]] = deque()  # (finished_at, tokens)
+
+        self.completed = 0
+        self.failed = 0
+        self.total_tokens = 0
+        self.total_wait_seconds = 0.0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    # ------------------------------------------------------------
+    # Acquire / release
+    # ------------------------------------------------------------
+    def _try_acquire_locked(self, priority: LLMPriority) -> bool:
+        if self._in_flight >= self.limit:
+            return False
+        # Do not jump ahead of queued requests of the same or higher priority
+        self._drop_cancelled_locked()
+        if self._waiters and self._waiters[0][0] <= priority:
+            return False
+        self._in_flight += 1
+        return True
+
+    def _enqueue_locked(self, waiter: _Waiter) -> None:
+        heapq.heappush(self._waiters, (int(waiter.priority), next(self._seq), waiter))
+
+    def _drop_cancelled_locked(self) -> None:
+        while self._waiters and self._waiters[0][2].cancelled:
+            heapq.heappop(self._waiters)
+
+    def _grant_locked(self) -> list[_Waiter]:
+        granted = []
+        while self._in_flight < self.limit and self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if waiter.cancelled:
+                continue
+            waiter.granted = True
+            self._in_flight += 1
+            granted.append(waiter)
+        return granted
+
+    def acquire(self, priority: LLMPriority = LLMPriority.INTERACTIVE) -> LLMSlot:
+        """Block the calling thread until a slot is free"""
+        queued_at = time.monotonic()
+        with self._lock:
+            if self._try_acquire_locked(priority):
+                return LLMSlot(self.endpoint, priority)
+            event = threading.Event()
+            self._enqueue_locked(_Waiter(priority, event.set))
+        event.wait()
+        self._record_wait(queued_at)
+        return LLMSlot(self.endpoint, priority)
+
+    async def acquire_async(self, priority: LLMPriority = LLMPriority.INTERACTIVE) -> LLMSlot:
+        """Wait on the running event loop until a slot is free"""
+        queued_at = time.monotonic()
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+
+        def resolve() -> None:
+            if not future.done():
+                future.set_result(None)
+
+        with self._lock:
+            if self._try_acquire_locked(priority):
+                return LLMSlot(self.endpoint, priority)
+            waiter = _Waiter(priority, lambda: loop.call_soon_threadsafe(resolve))
+            self._enqueue_locked(waiter)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                granted = waiter.granted
+                waiter.cancelled = True
+            if granted:
+                # The slot was handed over while we were being cancelled
+                self._release_slot(None)
+            raise
+        self._record_wait(queued_at)
+        return LLMSlot(self.endpoint, priority)
+
+    def _record_wait(self, queued_at: float) -> None:
+        with self._lock:
+            self.total_wait_seconds += time.monotonic() - queued_at
+
+    def release(self, slot: LLMSlot) -> None:
+        """Return a slot and feed its latency and outcome into the limit"""
+        self._release_slot(slot)
+
+    def _release_slot(self, slot: LLMSlot | None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if slot is not None:
+                self._record_locked(slot)
+            woken = self._grant_locked()
+        for waiter in woken:
+            waiter.wake()
+
+    # ------------------------------------------------------------
+    # Adaptation and metrics
+    # ------------------------------------------------------------
+    def _record_locked(self, slot: LLMSlot) -> None:
+        now = time.monotonic()
+        latency = now - slot.started
+
+        if slot.failed:
+            self.failed += 1
+            self._limit = max(float(self.min_concurrency), self._limit * 0.75)
+            return
+
+        self.completed += 1
+        self.total_tokens += slot.tokens
+        self._recent.append((now, slot.tokens))
+        self._trim_recent_locked(now)
+
+        if self._latency_ewma is None:
+            self._latency_ewma = latency
+            self._latency_baseline = latency
+        else:
+            self._latency_ewma = 0.8 * self._latency_ewma + 0.2 * latency
+            if self._latency_ewma < self._latency_baseline:
+                self._latency_baseline = self._latency_ewma
+            else:
+                # Let the baseline drift up slowly so a model or prompt change
+                # does not pin the limit at the minimum forever
+                self._latency_baseline += 0.01 * (self._latency_ewma - self._latency_baseline)
+
+        if self._latency_ewma > self._latency_baseline * self.latency_tolerance:
+            self._limit = max(float(self.min_concurrency), self._limit * 0.9)
+        elif self._waiters and self._in_flight + 1 >= self.limit:
+            self._limit = min(float(self.max_concurrency), self._limit + 1.0 / self._limit)
+
+    def _trim_recent_locked(self, now: float) -> None:
+        cutoff = now - self.metrics_window
+        while self._recent and self._recent[0][0] < cutoff:
+            self._recent.popleft()
+
+    def get_metrics(self) -> dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            self._trim_recent_locked(now)
+            window_tokens = sum(tokens for _, tokens in self._recent)
+            queued = {priority.name.lower(): 0 for priority in LLMPriority}
+            for _, _, waiter in self._waiters:
+                if not waiter.cancelled:
+                    queued[waiter.priority.name.lower()] += 1
+            return {
+                "endpoint": self.endpoint,
+                "in_flight": self._in_flight,
+                "concurrency_limit": self.limit,
+                "min_concurrency": self.min_concurrency,
+                "max_concurrency": self.max_concurrency,
+                "queued": queued,
+                "completed": self.completed,
+                "failed": self.failed,
+                "total_tokens": self.total_tokens,
+                "tokens_per_second": round(window_tokens / self.metrics_window, 2),
+                "requests_per_second": round(len(self._recent) / self.metrics_window, 3),
+                "latency_ewma_seconds": (
+                    round(self._latency_ewma, 3) if self._latency_ewma is not None else None
+                ),
+                "latency_baseline_seconds": (
+                    round(self._latency_baseline, 3) if self._latency_baseline is not None else None
+                ),
+                "total_wait_seconds": round(self.total_wait_seconds, 3),
+            }
+
+
+class LLMScheduler:
+    """Registry of per-endpoint slot pools shared by every LLM client"""
+
+    def __init__(self, settings: dict[str, Any] | None = None):
+        self.settings = settings or {}
+        self._endpoints: dict[str, EndpointScheduler] = {}
+        self._lock = threading.Lock()
+
+    def endpoint(self, base_url: str) -> EndpointScheduler:
+        key = base_url.rstrip("/")
+        scheduler = self._endpoints.get(key)
+        if scheduler is None:
+            with self._lock:
+                scheduler = self._endpoints.get(key)
+                if scheduler is None:
+                    scheduler = EndpointScheduler(key, **self.settings)
+                    self._endpoints[key] = scheduler
+        return scheduler
+
+    @contextmanager
+    def slot(self, base_url: str,
+             priority: LLMPriority = LLMPriority.INTERACTIVE) -> Iterator[LLMSlot]:
+        """Hold a slot for one blocking request"""
+        scheduler = self.endpoint(base_url)
+        slot = scheduler.acquire(priority)
+        try:
+            yield slot
+        except BaseException:
+            slot.failed = True
+            raise
+        finally:
+            scheduler.release(slot)
+
+    @asynccontextmanager
+    async def aslot(self, base_url: str,
+                    priority: LLMPriority = LLMPriority.INTERACTIVE) -> AsyncIterator[LLMSlot]:
+        """Hold a slot for one async request"""
+        scheduler = self.endpoint(base_url)
+        slot = await scheduler.acquire_async(priority)
+        try:
+            yield slot
+        except BaseException:
+            slot.failed = True
+            raise
+        finally:
+            scheduler.release(slot)
+
+    def get_metrics(self) -> dict[str, Any]:
+        endpoints = [scheduler.get_metrics() for scheduler in list(self._endpoints.values())]
+        return {
+            "endpoints": endpoints,
+            "in_flight": sum(e["in_flight"] for e in endpoints),
+            "tokens_per_second": round(sum(e["tokens_per_second"] for e in endpoints), 2),
+        }
+
+
+_scheduler: LLMScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def _load_settings() -> dict[str, Any]:
+    """Scheduler settings from llm_settings.yaml (llm.request)"""
+    try:
+        from config_loader import get_config
+
+        request = get_config().get_llm_settings().get("llm", {}).get("request", {})
+    except Exception as e:
+        logger.warning(f"Could not load LLM scheduler settings, using defaults: {e}")
+        request = {}
+    scheduler = request.get("scheduler", {})
+    return {
+        "max_concurrency": int(request.get("concurrent_requests", 5)),
+        "min_concurrency": int(scheduler.get("min_concurrency", 1)),
+        "initial_concurrency": int(scheduler.get("initial_concurrency", 2)),
+        "latency_tolerance": float(scheduler.get("latency_tolerance", 2.0)),
+        "metrics_window": float(scheduler.get("metrics_window", 60.0)),
+    }
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Process-wide scheduler shared by all Ollama clients"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = LLMScheduler(_load_settings())
+    return _scheduler
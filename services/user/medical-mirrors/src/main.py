@@ -50,6 +50,8 @@ from sqlalchemy.orm import sessionmaker
 
 from config import Config
 from database import Base, get_database_url
+from file_processing_tracker import ensure_stat_columns
+from llm_scheduler import get_llm_scheduler
 
 # Configure logging
 logging.basicConfig(
@@ -72,6 +74,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Create database tables
     try:
         Base.metadata.create_all(bind=engine)
+        ensure_stat_columns(engine)
         logger.info("Database tables created/verified")
     except Exception as e:
         logger.exception(f"Database initialization failed: {e}")
@@ -106,7 +109,10 @@ config = Config()
 if hasattr(config, "ENABLE_MULTICORE_PARSING") and config.ENABLE_MULTICORE_PARSING:
     max_workers = config.MAX_PARSER_WORKERS if config.MAX_PARSER_WORKERS > 0 else None
     pubmed_api: PubMedAPI | OptimizedPubMedAPI = OptimizedPubMedAPI(
-        SessionLocal, max_workers=max_workers,
+        SessionLocal,
+        max_workers=max_workers,
+        db_writers=config.PUBMED_DB_WRITERS,
+        pipeline_queue_size=config.PUBMED_PIPELINE_QUEUE_SIZE,
     )
     logger.info(
         f"Using optimized multi-core PubMed parser (workers: {max_workers or 'auto-detect'})",
@@ -240,6 +246,20 @@ async def search_fda(
         raise HTTPException(status_code=500, detail=f"FDA search failed: {str(e)}")
 
 
+@app.get("/drugs/autocomplete")
+async def autocomplete_drugs(q: str, max_results: int = 10) -> dict[str, Any]:
+    """
+    Drug name autocomplete over generic and brand names
+    Prefix matches rank first, then typo-tolerant trigram matches
+    """
+    try:
+        suggestions = await drug_api.autocomplete_drugs(q, min(max_results, 50))
+        return {"query": q, "suggestions": suggestions}
+    except Exception as e:
+        logger.exception(f"Drug autocomplete failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Drug autocomplete failed: {str(e)}")
+
+
 @app.get("/drugs/drug/{ndc}")
 async def get_drug_info(ndc: str) -> dict[str, Any]:
     """Get specific drug information by NDC"""
@@ -1331,6 +1351,15 @@ async def get_system_resources() -> dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"System resources failed: {str(e)}")
 
 
+@app.get("/monitor/llm-scheduler")
+async def get_llm_scheduler_metrics() -> dict[str, Any]:
+    """Get in-flight requests, queue depth, concurrency limit and tokens/sec per Ollama endpoint"""
+    return {
+        **get_llm_scheduler().get_metrics(),
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+
+
 @app.get("/monitor/error-summary")
 async def get_error_summary() -> dict[str, Any]:
     """Get summary of recent errors from logs and database"""
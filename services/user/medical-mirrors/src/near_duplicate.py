@@ -0,0 +1,240 @@
+"""
+Near-duplicate detection with MinHash signatures and LSH banding
+
+The content hash in CrossBatchDeduplicator only catches byte-identical
+records. Drug labels and trial records that differ in whitespace,
+punctuation, list order or a reworded sentence still hash differently. This
+module estimates Jaccard similarity between records instead:
+
+- each field is lowercased, stripped of punctuation and split into words;
+  list items are sorted first, so list order does not matter
+- a record is the set of word ``shingle_size``-grams over all its fields
+- the record's MinHash signature is the minimum of ``num_perm`` hash
+  permutations over its shingles, computed with numpy for a whole batch
+- signatures are cut into bands; records sharing any band become candidates,
+  and a candidate is kept only if its estimated similarity to the bucket's
+  first record reaches the threshold
+- verified pairs are joined with union-find (single linkage), so a cluster
+  may contain records that are similar through an intermediate record
+
+Band and row counts are chosen per threshold so that a pair at exactly the
+threshold becomes a candidate with at least ``LSH_TARGET_RECALL``
+probability.
+"""
+
+import logging
+import os
+import re
+import zlib
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NUM_PERM = 128
+DEFAULT_SHINGLE_SIZE = 3
+
+# Probability that a pair exactly at the threshold lands in a shared bucket
+LSH_TARGET_RECALL = 0.99
+
+# Shingle columns hashed per block when computing signatures (bounds memory)
+SIGNATURE_BLOCK_SHINGLES = 250_000
+
+_NON_WORD = re.compile(r"[\W_]+")
+_MASK32 = np.uint64(0xFFFFFFFF)
+
+
+def near_duplicate_enabled(override: bool | None = None) -> bool:
+    """Resolve the near-duplicate flag: explicit override, else ENABLE_NEAR_DUPLICATE_DEDUP"""
+    if override is not None:
+        return override
+    return os.getenv("ENABLE_NEAR_DUPLICATE_DEDUP", "false").lower() == "true"
+
+
+def normalize_tokens(value: Any) -> list[str]:
+    """Lowercase words of a field value, ignoring punctuation, spacing and list order"""
+    if value is None:
+        return []
+    if isinstance(value, dict):
+        value = [f"{key} {item}" for key, item in value.items()]
+    if isinstance(value, list | tuple | set):
+        items = sorted(" ".join(normalize_tokens(item)) for item in value)
+        return " ".join(items).split()
+    return _NON_WORD.sub(" ", str(value).lower()).split()
+
+
+def lsh_parameters(threshold: float, num_perm: int) -> tuple[int, int]:
+    """(bands, rows) with the most rows per band that still meets LSH_TARGET_RECALL"""
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if bands < 1:
+            break
+        recall = 1 - (1 - threshold ** rows) ** bands
+        if recall >= LSH_TARGET_RECALL:
+            best = (bands, rows)
+    return best
+
+
+class _TokenHashes(dict):
+    """Memoized crc32 of each word; vocabularies are small compared to token counts"""
+
+    def __missing__(self, token: str) -> int:
+        token_hash = self[token] = zlib.crc32(token.encode("utf-8"))
+        return token_hash
+
+
+@dataclass
+class NearDuplicateCluster:
+    """Records (by batch position) judged near-identical; ``members[0]`` is the lowest position"""
+
+    members: list[int]
+    min_similarity: float
+
+
+class NearDuplicateDetector:
+    """MinHash + LSH clustering of records over a fixed list of fields"""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, shingle_size: int = DEFAULT_SHINGLE_SIZE,
+                 seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        # Odd multipliers make each permutation a bijection on uint32
+        self._perm_a = (rng.integers(0, 2**32, num_perm, dtype=np.uint64) | np.uint64(1)).astype(np.uint32)
+        self._perm_b = rng.integers(0, 2**32, num_perm, dtype=np.uint64).astype(np.uint32)
+        self._window_mult = rng.integers(1, 2**63, shingle_size, dtype=np.uint64) | np.uint64(1)
+        self._band_mult = rng.integers(1, 2**63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self._token_hashes = _TokenHashes()
+
+    def shingles(self, records: Sequence[dict[str, Any]],
+                 fields: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Shingle hashes of every record, concatenated, plus per-record start offsets.
+
+        Offsets has ``len(records) + 1`` entries; an empty record has
+        ``offsets[i] == offsets[i + 1]``.
+        """
+        k = self.shingle_size
+        token_ids: list[int] = []
+        segment_ends: list[int] = []
+        record_segments = [0]
+        for record in records:
+            for field in fields:
+                tokens = normalize_tokens(record.get(field))
+                if tokens:
+                    if len(tokens) < k:
+                        # Short fields (status, phase) become one shingle of all their words
+                        tokens = [" ".join(tokens)]
+                    token_ids.extend(map(self._token_hashes.__getitem__, tokens))
+                    segment_ends.append(len(token_ids))
+            record_segments.append(len(segment_ends))
+
+        tokens_arr = np.asarray(token_ids, dtype=np.uint64)
+        ends = np.asarray(segment_ends, dtype=np.int64)
+        starts = np.concatenate(([0], ends)).astype(np.int64)[:-1]
+        lengths = ends - starts
+        # A one-token segment yields one window: the token itself
+        windows = np.where(lengths >= k, lengths - k + 1, 1)
+
+        window_starts = np.repeat(starts, windows) + (
+            np.arange(windows.sum()) - np.repeat(np.cumsum(windows) - windows, windows)
+        )
+        window_width = np.repeat(np.where(lengths >= k, k, 1), windows)
+
+        padded = np.concatenate((tokens_arr, np.zeros(k, dtype=np.uint64)))
+        mixed = np.zeros(len(window_starts), dtype=np.uint64)
+        for offset in range(k):
+            part = padded[window_starts + offset] * self._window_mult[offset]
+            mixed ^= np.where(offset < window_width, part, np.uint64(0))
+        shingles = ((mixed >> np.uint64(32)) ^ (mixed & _MASK32)).astype(np.uint32)
+
+        segment_windows = np.concatenate(([0], np.cumsum(windows)))
+        offsets = segment_windows[np.asarray(record_segments, dtype=np.int64)]
+        return shingles, offsets
+
+    def signatures(self, records: Sequence[dict[str, Any]],
+                   fields: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+        """MinHash signatures, shape (len(records), num_perm), and a mask of non-empty records"""
+        shingles, offsets = self.shingles(records, fields)
+        counts = np.diff(offsets)
+        non_empty = counts > 0
+        signatures = np.full((len(records), self.num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+
+        positions = np.flatnonzero(non_empty)
+        a = self._perm_a[:, None]
+        b = self._perm_b[:, None]
+        block_start = 0
+        while block_start < len(positions):
+            # Whole records per block, up to SIGNATURE_BLOCK_SHINGLES shingle columns
+            first = positions[block_start]
+            limit = offsets[first] + SIGNATURE_BLOCK_SHINGLES
+            block_end = max(block_start + 1,
+                            int(np.searchsorted(offsets[positions + 1], limit, side="right")))
+            block = positions[block_start:block_end]
+            lo, hi = offsets[block[0]], offsets[block[-1] + 1]
+
+            hashed = (shingles[None, lo:hi] ^ b) * a
+            hashed ^= hashed >> np.uint32(15)
+            # Empty records were excluded, so block offsets are strictly increasing
+            signatures[block] = np.minimum.reduceat(hashed, offsets[block] - lo, axis=1).T
+            block_start = block_end
+
+        return signatures, non_empty
+
+    def find_clusters(self, records: Sequence[dict[str, Any]], fields: Sequence[str],
+                      threshold: float) -> list[NearDuplicateCluster]:
+        """Groups of two or more records whose estimated Jaccard similarity reaches ``threshold``"""
+        if len(records) < 2:
+            return []
+        signatures, non_empty = self.signatures(records, fields)
+        candidates = np.flatnonzero(non_empty)
+        if len(candidates) < 2:
+            return []
+        sig = signatures[candidates]
+
+        bands, rows = lsh_parameters(threshold, self.num_perm)
+        parent = list(range(len(candidates)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for band in range(bands):
+            columns = slice(band * rows, (band + 1) * rows)
+            keys = (sig[:, columns].astype(np.uint64) * self._band_mult[columns]).sum(axis=1)
+            order = np.argsort(keys, kind="stable")
+            sorted_keys = keys[order]
+            is_start = np.ones(len(order), dtype=bool)
+            is_start[1:] = sorted_keys[1:] != sorted_keys[:-1]
+            # Each record is checked against the first (lowest position) record of its bucket
+            leaders = order[np.flatnonzero(is_start)[np.cumsum(is_start) - 1]]
+            paired = leaders != order
+            if not paired.any():
+                continue
+            members, leaders = order[paired], leaders[paired]
+            similarity = (sig[members] == sig[leaders]).mean(axis=1)
+            for member, leader in zip(members[similarity >= threshold].tolist(),
+                                      leaders[similarity >= threshold].tolist(), strict=True):
+                root_member, root_leader = find(member), find(leader)
+                if root_member != root_leader:
+                    parent[max(root_member, root_leader)] = min(root_member, root_leader)
+
+        groups: dict[int, list[int]] = {}
+        for i in range(len(candidates)):
+            groups.setdefault(find(i), []).append(i)
+
+        clusters = []
+        for group in groups.values():
+            if len(group) < 2:
+                continue
+            similarity = (sig[group[1:]] == sig[group[0]]).mean(axis=1)
+            clusters.append(NearDuplicateCluster(
+                members=candidates[group].tolist(),
+                min_similarity=round(float(similarity.min()), 3),
+            ))
+        return clusters
@@ -6,6 +6,7 @@ Provides search functionality matching Healthcare MCP interface
 import builtins
 import contextlib
 import logging
+from collections.abc import Iterator
 from datetime import datetime
 from typing import Any
 
@@ -152,9 +153,8 @@ class PubMedAPI:
             total_processed = 0
 
             for xml_file in update_files:
-                articles = self.parser.parse_xml_file(xml_file)
-                processed = await self.store_articles(articles, db)
-                total_processed += processed
+                for articles in self._iter_file_chunks(xml_file):
+                    total_processed += await self.store_articles(articles, db)
 
             # Update log
             update_log.status = "success"  # type: ignore[assignment]
@@ -179,6 +179,13 @@ class PubMedAPI:
         finally:
             db.close()
 
+    def _iter_file_chunks(self, xml_file: str) -> Iterator[list[dict]]:
+        """Stream article chunks from one file; a malformed file is logged and skipped"""
+        try:
+            yield from self.parser.iter_xml_file_chunks(xml_file)
+        except Exception as e:
+            logger.exception(f"Failed to parse {xml_file}: {e}")
+
     async def store_articles(self, articles: list[dict], db: Session) -> int:
         """Store articles in database using proper UPSERT"""
         stored_count = 0
@@ -321,8 +328,9 @@ class PubMedAPI:
             total_processed = 0
 
             for xml_file in baseline_files:
-                articles = self.parser.parse_xml_file(xml_file)
-                processed = await self.store_articles(articles, db)
+                processed = 0
+                for articles in self._iter_file_chunks(xml_file):
+                    processed += await self.store_articles(articles, db)
                 total_processed += processed
                 logger.info(f"Processed {processed} articles from {xml_file}")
 
@@ -3,14 +3,16 @@ Optimized PubMed API with multi-core processing and bulk database operations
 Provides significant performance improvements for large medical datasets
 """
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import Any
 
+from bulk_loader import copy_load_enabled
 from pubmed.downloader import PubMedDownloader
+from pubmed.ingest_pipeline import PubMedIngestPipeline, upsert_articles
 from pubmed.parser_optimized import OptimizedPubMedParser
 from sqlalchemy import func, text
-from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from database import PubMedArticle, UpdateLog
@@ -21,10 +23,20 @@ logger = logging.getLogger(__name__)
 class OptimizedPubMedAPI:
     """Multi-core optimized PubMed API for high-performance medical data processing"""
 
-    def __init__(self, session_factory: Any, max_workers: int | None = None) -> None:
+    def __init__(
+        self,
+        session_factory: Any,
+        max_workers: int | None = None,
+        db_writers: int = 4,
+        pipeline_queue_size: int = 16,
+    ) -> None:
         self.session_factory = session_factory
         self.downloader = PubMedDownloader()
         self.parser = OptimizedPubMedParser(max_workers=max_workers)
+        self.db_writers = db_writers
+        self.pipeline_queue_size = pipeline_queue_size
+        # COPY + set-based merge for article upserts (ENABLE_COPY_BULK_LOAD)
+        self.use_copy_load = copy_load_enabled()
 
     async def search_articles(self, query: str, max_results: int = 10) -> list[dict]:
         """
@@ -106,45 +118,18 @@ class OptimizedPubMedAPI:
                 logger.info("No update files to process")
                 return {"status": "success", "records_processed": 0, "files_processed": 0}
 
-            # PARALLEL XML PARSING - This is where the magic happens!
-            logger.info(f"Starting parallel parsing of {len(update_files)} files...")
-            parsed_files = await self.parser.parse_xml_files_parallel(update_files)
-
-            # BULK DATABASE OPERATIONS
-            total_processed = 0
-            all_articles = []
-
-            # Collect all articles from all files
-            for xml_file, articles in parsed_files.items():
-                all_articles.extend(articles)
-                logger.info(f"Collected {len(articles)} articles from {xml_file}")
-
-            # CRITICAL: Remove duplicates by PMID to prevent database constraint violations
-            if all_articles:
-                logger.info(f"Deduplicating {len(all_articles)} articles by PMID...")
-                unique_articles = {}
-                for article in all_articles:
-                    pmid = article.get("pmid")
-                    if pmid:
-                        # Keep the most recent version if we see the same PMID multiple times
-                        unique_articles[pmid] = article
-
-                deduplicated_articles = list(unique_articles.values())
-                duplicate_count = len(all_articles) - len(deduplicated_articles)
-
-                if duplicate_count > 0:
-                    logger.info(
-                        f"Removed {duplicate_count} duplicate PMIDs, processing {len(deduplicated_articles)} unique articles",
-                    )
-
-                # Bulk store deduplicated articles
-                logger.info(f"Bulk storing {len(deduplicated_articles)} unique articles...")
-                processed = await self.bulk_store_articles(deduplicated_articles, db)
-                total_processed = processed
-
-                # Single bulk search vector update
-                logger.info("Updating search vectors in bulk...")
-                await self.bulk_update_search_vectors(db)
+            # Parse and upsert concurrently: parser processes feed bounded queues
+            # drained by DB writers, so parsed articles never pile up in memory
+            logger.info(f"Starting pipelined ingest of {len(update_files)} files...")
+            pipeline = PubMedIngestPipeline(
+                self.session_factory,
+                parser_workers=self.parser.max_workers,
+                db_writers=self.db_writers,
+                queue_size=self.pipeline_queue_size,
+                use_copy=self.use_copy_load,
+            )
+            stats = await asyncio.to_thread(pipeline.run, update_files)
+            total_processed = stats.articles_written
 
             # Update log
             update_log.status = "success"
@@ -158,7 +143,8 @@ class OptimizedPubMedAPI:
                 "status": "success",
                 "records_processed": total_processed,
                 "files_processed": len(update_files),
-                "optimization": "multi-core parallel processing",
+                "optimization": "pipelined multi-core parsing and concurrent upserts",
+                "pipeline": stats.as_dict(),
             }
         except Exception as e:
             logger.exception(f"Optimized PubMed update failed: {e}")
@@ -168,7 +154,6 @@ class OptimizedPubMedAPI:
             db.merge(update_log)
             db.commit()
             raise
-            raise
         finally:
             db.close()
 
@@ -183,22 +168,6 @@ class OptimizedPubMedAPI:
             return 0
 
         try:
-            # Prepare bulk UPSERT statement
-            stmt = insert(PubMedArticle)
-            stmt = stmt.on_conflict_do_update(
-                index_elements=["pmid"],
-                set_={
-                    "title": stmt.excluded.title,
-                    "abstract": stmt.excluded.abstract,
-                    "authors": stmt.excluded.authors,
-                    "journal": stmt.excluded.journal,
-                    "pub_date": stmt.excluded.pub_date,
-                    "doi": stmt.excluded.doi,
-                    "mesh_terms": stmt.excluded.mesh_terms,
-                    "updated_at": stmt.excluded.updated_at,
-                },
-            )
-
             # Process in batches for memory efficiency
             batch_size = 1000
             stored_count = 0
@@ -206,9 +175,8 @@ class OptimizedPubMedAPI:
             for i in range(0, len(articles), batch_size):
                 batch = articles[i : i + batch_size]
 
-                # Execute bulk insert for this batch
-                db.execute(stmt, batch)
-                stored_count += len(batch)
+                # Upsert this batch; search_vector is computed in the same statement
+                stored_count += upsert_articles(db, batch, use_copy=self.use_copy_load)
 
                 # Commit batch
                 db.commit()
@@ -226,8 +194,10 @@ class OptimizedPubMedAPI:
 
     async def bulk_update_search_vectors(self, db: Session) -> None:
         """
-        Bulk update search vectors for all new articles
-        Much more efficient than updating after each file
+        Bulk update search vectors for articles that were stored without one
+
+        Not needed after bulk_store_articles or the ingest pipeline, which set
+        search_vector in the upsert itself; kept for rows written by other paths.
         """
         logger.info("Starting bulk search vector update...")
 
@@ -0,0 +1,366 @@
+"""
+Pipelined PubMed ingestion: parser processes -> bounded queues -> DB writer threads
+
+Parser processes stream each XML file with iterparse and put fixed-size
+article chunks on a bounded multiprocessing queue. A dispatcher routes
+articles to writer threads by PMID hash, so a given PMID is always written by
+the same connection and concurrent upserts never contend for the same rows.
+Each writer owns its own session and computes search_vector inside the
+upsert, so no follow-up full-table pass is needed.
+
+A full queue blocks the stage feeding it, so memory is bounded by the queue
+sizes instead of by the number of files being ingested.
+"""
+
+import json
+import logging
+import multiprocessing as mp
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from bulk_loader import bulk_copy_upsert
+from pubmed.parser_optimized import DEFAULT_CHUNK_SIZE, iter_article_chunks
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+_ARTICLE_FIELDS = ("pmid", "title", "abstract", "authors", "journal", "pub_date", "doi", "mesh_terms")
+
+# Same expression as the old bulk_update_search_vectors pass, over the incoming row's columns
+_SEARCH_VECTOR_SQL = """to_tsvector('english',
+    COALESCE(title, '') || ' ' ||
+    COALESCE(abstract, '') || ' ' ||
+    COALESCE(array_to_string(authors, ' '), '') || ' ' ||
+    COALESCE(array_to_string(mesh_terms, ' '), '')
+)"""
+
+_ARTICLE_UPSERT_SET = """
+    title = EXCLUDED.title,
+    abstract = EXCLUDED.abstract,
+    authors = EXCLUDED.authors,
+    journal = EXCLUDED.journal,
+    pub_date = EXCLUDED.pub_date,
+    doi = EXCLUDED.doi,
+    mesh_terms = EXCLUDED.mesh_terms,
+    search_vector = EXCLUDED.search_vector,
+    updated_at = EXCLUDED.updated_at
+"""
+
+_ARTICLE_INSERT_VALUES = {
+    "search_vector": _SEARCH_VECTOR_SQL,
+    "created_at": "timezone('utc', now())",
+    "updated_at": "timezone('utc', now())",
+}
+
+# One statement per chunk: rows travel as a single JSON parameter and the
+# search vector is built from the same values
+UPSERT_ARTICLES_SQL = text(f"""
+    INSERT INTO pubmed_articles (
+        {", ".join(_ARTICLE_FIELDS)}, {", ".join(_ARTICLE_INSERT_VALUES)}
+    )
+    SELECT
+        {", ".join(_ARTICLE_FIELDS)}, {", ".join(_ARTICLE_INSERT_VALUES.values())}
+    FROM json_to_recordset(CAST(:rows AS json)) AS r(
+        pmid text, title text, abstract text, authors text[], journal text,
+        pub_date text, doi text, mesh_terms text[]
+    )
+    ON CONFLICT (pmid) DO UPDATE SET {_ARTICLE_UPSERT_SET}
+""")
+
+# Messages on the parser -> dispatcher queue
+_CHUNK = "chunk"
+_FILE_DONE = "file_done"
+
+
+def upsert_articles(db: Session, articles: list[dict[str, Any]], use_copy: bool = False) -> int:
+    """Upsert a chunk of parsed articles, including search_vector, in one statement.
+
+    Duplicate PMIDs within the chunk keep the last occurrence (Postgres rejects
+    an ON CONFLICT statement that touches the same row twice). With
+    ``use_copy`` rows are streamed via COPY into staging and merged from
+    there. Does not commit.
+    """
+    unique: dict[str, dict[str, Any]] = {}
+    for article in articles:
+        pmid = article.get("pmid")
+        if pmid:
+            unique[pmid] = {name: article.get(name) for name in _ARTICLE_FIELDS}
+    if not unique:
+        return 0
+    if use_copy:
+        bulk_copy_upsert(
+            db,
+            "pubmed_articles",
+            _ARTICLE_FIELDS,
+            unique.values(),
+            conflict_columns=["pmid"],
+            update_set=_ARTICLE_UPSERT_SET,
+            insert_values=_ARTICLE_INSERT_VALUES,
+        )
+    else:
+        db.execute(UPSERT_ARTICLES_SQL, {"rows": json.dumps(list(unique.values()))})
+    return len(unique)
+
+
+# Set in each parser process by the pool initializer
+_chunk_queue: Any = None
+
+
+def _init_parser_process(chunk_queue: Any) -> None:
+    global _chunk_queue
+    _chunk_queue = chunk_queue
+
+
+def _parse_file_to_queue(file_index: int, xml_file_path: str, chunk_size: int) -> None:
+    """Parser process body: stream one file onto the shared queue, then report completion"""
+    start = time.perf_counter()
+    count = 0
+    error = None
+    try:
+        for chunk in iter_article_chunks(xml_file_path, chunk_size):
+            _chunk_queue.put((_CHUNK, file_index, chunk))  # blocks while the queue is full
+            count += len(chunk)
+    except Exception as e:
+        logger.exception(f"Pipeline parser failed on {xml_file_path}: {e}")
+        error = str(e)
+    # Sent on the same queue, so it always arrives after this file's chunks
+    _chunk_queue.put((_FILE_DONE, file_index, count, time.perf_counter() - start, error))
+
+
+@dataclass
+class PipelineStats:
+    """Per-stage counters and timings for one pipeline run"""
+
+    files_total: int = 0
+    files_parsed: int = 0
+    files_failed: int = 0
+    articles_parsed: int = 0
+    parse_seconds: float = 0.0  # summed across parser processes
+    articles_written: int = 0
+    write_statements: int = 0
+    write_seconds: float = 0.0  # summed across writer threads
+    dispatch_blocked_seconds: float = 0.0  # time spent waiting on full writer queues
+    max_writer_queue_depth: int = 0
+    elapsed_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record_write(self, articles: int, seconds: float) -> None:
+        with self._lock:
+            self.articles_written += articles
+            self.write_statements += 1
+            self.write_seconds += seconds
+
+    def as_dict(self) -> dict[str, Any]:
+        def rate(count: int, seconds: float) -> float:
+            return round(count / seconds, 1) if seconds > 0 else 0.0
+
+        return {
+            "files_total": self.files_total,
+            "files_parsed": self.files_parsed,
+            "files_failed": self.files_failed,
+            "parse": {
+                "articles": self.articles_parsed,
+                "worker_seconds": round(self.parse_seconds, 2),
+                "articles_per_worker_second": rate(self.articles_parsed, self.parse_seconds),
+            },
+            "write": {
+                "articles": self.articles_written,
+                "statements": self.write_statements,
+                "writer_seconds": round(self.write_seconds, 2),
+                "articles_per_writer_second": rate(self.articles_written, self.write_seconds),
+            },
+            "backpressure": {
+                "dispatch_blocked_seconds": round(self.dispatch_blocked_seconds, 2),
+                "max_writer_queue_depth": self.max_writer_queue_depth,
+            },
+            "elapsed_seconds": round(self.elapsed_seconds, 2),
+            "articles_per_second": rate(self.articles_written, self.elapsed_seconds),
+        }
+
+
+class PubMedIngestPipeline:
+    """Parse PubMed XML files in a process pool and upsert them concurrently as they are parsed.
+
+    Ordering note: articles for one PMID are written in the order their chunks
+    reach the dispatcher. If the same PMID is revised in several files of one
+    run, the file that finishes parsing last wins, which is normally the
+    newest because files are submitted in order.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        parser_workers: int,
+        db_writers: int = 4,
+        queue_size: int = 16,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        use_copy: bool = False,
+    ) -> None:
+        self.session_factory = session_factory
+        self.use_copy = use_copy
+        self.parser_workers = max(1, parser_workers)
+        self.db_writers = max(1, db_writers)
+        self.queue_size = max(1, queue_size)
+        self.chunk_size = max(1, chunk_size)
+
+    def run(self, xml_files: list[str]) -> PipelineStats:
+        """Ingest ``xml_files``; blocks until every file is parsed and written.
+
+        Raises the first writer error after the pipeline has drained.
+        """
+        stats = PipelineStats(files_total=len(xml_files))
+        if not xml_files:
+            return stats
+
+        start = time.perf_counter()
+        ctx = mp.get_context()
+        chunk_queue = ctx.Queue(maxsize=self.queue_size)
+        writer_queues: list[queue.Queue[list[dict[str, Any]] | None]] = [
+            queue.Queue(maxsize=self.queue_size) for _ in range(self.db_writers)
+        ]
+        errors: list[Exception] = []
+        writers = [
+            threading.Thread(
+                target=self._writer_loop,
+                args=(writer_queue, stats, errors),
+                name=f"pubmed-writer-{i}",
+                daemon=True,
+            )
+            for i, writer_queue in enumerate(writer_queues)
+        ]
+        for writer in writers:
+            writer.start()
+
+        logger.info(
+            f"Starting PubMed ingest pipeline: {len(xml_files)} files, "
+            f"{self.parser_workers} parsers, {self.db_writers} writers, queue={self.queue_size} chunks",
+        )
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.parser_workers,
+                mp_context=ctx,
+                initializer=_init_parser_process,
+                initargs=(chunk_queue,),
+            ) as executor:
+                futures = {
+                    executor.submit(_parse_file_to_queue, i, path, self.chunk_size): i
+                    for i, path in enumerate(xml_files)
+                }
+                self._dispatch(chunk_queue, writer_queues, futures, stats, errors)
+        finally:
+            for writer_queue in writer_queues:
+                writer_queue.put(None)
+            for writer in writers:
+                writer.join()
+            stats.elapsed_seconds = time.perf_counter() - start
+
+        logger.info(f"PubMed ingest pipeline finished: {stats.as_dict()}")
+        if errors:
+            raise errors[0]
+        return stats
+
+    def _dispatch(
+        self,
+        chunk_queue: Any,
+        writer_queues: list["queue.Queue[list[dict[str, Any]] | None]"],
+        futures: dict[Future[None], int],
+        stats: PipelineStats,
+        errors: list[Exception],
+    ) -> None:
+        pending = set(futures.values())
+        cancelled = False
+
+        while pending:
+            if errors and not cancelled:
+                # A writer failed: stop scheduling new files and drain what is in flight
+                cancelled = True
+                for future, index in futures.items():
+                    if future.cancel():
+                        pending.discard(index)
+                        stats.files_failed += 1
+                continue
+
+            try:
+                message = chunk_queue.get(timeout=1.0)
+            except queue.Empty:
+                # A parser process that died never sends its completion message
+                for future, index in futures.items():
+                    if index in pending and future.done() and future.exception() is not None:
+                        logger.error(f"Parser for file #{index} crashed: {future.exception()}")
+                        pending.discard(index)
+                        stats.files_failed += 1
+                continue
+
+            if message[0] == _FILE_DONE:
+                _, index, count, seconds, error = message
+                pending.discard(index)
+                stats.parse_seconds += seconds
+                if error:
+                    stats.files_failed += 1
+                else:
+                    stats.files_parsed += 1
+                continue
+
+            _, _, articles = message
+            stats.articles_parsed += len(articles)
+            if errors:
+                continue
+
+            partitions: list[list[dict[str, Any]]] = [[] for _ in writer_queues]
+            for article in articles:
+                partitions[hash(article.get("pmid")) % len(writer_queues)].append(article)
+            for writer_queue, partition in zip(writer_queues, partitions, strict=True):
+                if not partition:
+                    continue
+                blocked_since = time.perf_counter()
+                writer_queue.put(partition)
+                stats.dispatch_blocked_seconds += time.perf_counter() - blocked_since
+                stats.max_writer_queue_depth = max(
+                    stats.max_writer_queue_depth, writer_queue.qsize(),
+                )
+
+    def _writer_loop(
+        self,
+        writer_queue: "queue.Queue[list[dict[str, Any]] | None]",
+        stats: PipelineStats,
+        errors: list[Exception],
+    ) -> None:
+        db = self.session_factory()
+        try:
+            stop = False
+            while not stop:
+                batch = writer_queue.get()
+                if batch is None:
+                    return
+                # Coalesce already-queued partitions into one statement
+                while len(batch) < self.chunk_size:
+                    try:
+                        more = writer_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if more is None:
+                        stop = True
+                        break
+                    batch.extend(more)
+
+                if errors:
+                    continue  # pipeline is failing; drain without writing
+
+                started = time.perf_counter()
+                try:
+                    written = upsert_articles(db, batch, use_copy=self.use_copy)
+                    db.commit()
+                except Exception as e:
+                    db.rollback()
+                    logger.exception(f"PubMed pipeline writer failed: {e}")
+                    errors.append(e)
+                    continue
+                stats.record_write(written, time.perf_counter() - started)
+        finally:
+            db.close()
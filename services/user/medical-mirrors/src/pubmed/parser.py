@@ -3,11 +3,12 @@ PubMed XML parser
 Parses PubMed XML files and extracts article information
 """
 
-import gzip
 import logging
 import xml.etree.ElementTree as ET
+from collections.abc import Iterator
 from typing import Any
 
+from pubmed.parser_optimized import DEFAULT_CHUNK_SIZE, iter_article_elements
 from validation_utils import validate_record
 
 logger = logging.getLogger(__name__)
@@ -25,20 +26,8 @@ class PubMedParser:
         articles = []
 
         try:
-            # Handle gzipped files
-            if xml_file_path.endswith(".gz"):
-                with gzip.open(xml_file_path, "rt", encoding="utf-8") as f:
-                    tree = ET.parse(f)
-            else:
-                tree = ET.parse(xml_file_path)
-
-            root = tree.getroot()
-
-            # Find all PubmedArticle elements
-            for article_elem in root.findall(".//PubmedArticle"):
-                article_data = self.parse_article(article_elem)
-                if article_data:
-                    articles.append(article_data)
+            for chunk in self.iter_xml_file_chunks(xml_file_path):
+                articles.extend(chunk)
 
             logger.info(f"Parsed {len(articles)} articles from {xml_file_path}")
             return articles
@@ -47,6 +36,25 @@ class PubMedParser:
             logger.exception(f"Failed to parse {xml_file_path}: {e}")
             return []
 
+    def iter_xml_file_chunks(
+        self, xml_file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[list[dict]]:
+        """Stream a PubMed XML file as lists of at most ``chunk_size`` validated articles
+
+        The file is read with iterparse, so memory does not grow with file size.
+        Parse errors propagate to the caller; chunks already yielded stay valid.
+        """
+        chunk: list[dict] = []
+        for article_elem in iter_article_elements(xml_file_path):
+            article_data = self.parse_article(article_elem)
+            if article_data:
+                chunk.append(article_data)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+
     def parse_article(self, article_elem: ET.Element) -> dict[str, Any] | None:
         """Parse a single PubmedArticle element"""
         try:
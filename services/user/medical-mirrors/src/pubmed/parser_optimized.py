@@ -7,12 +7,51 @@ import asyncio
 import gzip
 import logging
 import multiprocessing as mp
+from collections.abc import Iterator
 from concurrent.futures import ProcessPoolExecutor
 from typing import Any
 from xml.etree import ElementTree as ET
 
 logger = logging.getLogger(__name__)
 
+# Articles handed to the upsert stage at a time when streaming a file
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def iter_article_elements(xml_file_path: str) -> Iterator[ET.Element]:
+    """Stream PubmedArticle elements from a (gzipped) baseline/update file.
+
+    Uses iterparse and clears each article, and the root's finished children,
+    once the caller has consumed it, so memory stays flat regardless of file
+    size. The yielded element is only valid until the next iteration.
+    """
+    opener = gzip.open if xml_file_path.endswith(".gz") else open
+    with opener(xml_file_path, "rb") as f:
+        context = ET.iterparse(f, events=("start", "end"))
+        _, root = next(context)
+        for event, elem in context:
+            if event == "end" and elem.tag == "PubmedArticle":
+                yield elem
+                elem.clear()
+                # Drop finished siblings (articles, DeleteCitation blocks) from the root
+                root.clear()
+
+
+def iter_article_chunks(
+    xml_file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[list[dict[str, Any]]]:
+    """Yield parsed article dicts from one file in lists of at most ``chunk_size``."""
+    chunk: list[dict[str, Any]] = []
+    for article_elem in iter_article_elements(xml_file_path):
+        article_data = parse_article_element(article_elem)
+        if article_data:
+            chunk.append(article_data)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
 
 def parse_xml_file_worker(xml_file_path: str) -> "tuple[str, list[dict]]":
     """Worker function for multiprocessing XML parsing"""
@@ -20,19 +59,9 @@ def parse_xml_file_worker(xml_file_path: str) -> "tuple[str, list[dict]]":
         logger.info(f"Worker parsing: {xml_file_path}")
         articles = []
 
-        if xml_file_path.endswith(".gz"):
-            with gzip.open(xml_file_path, "rt", encoding="utf-8") as f:
-                tree = ET.parse(f)
-        else:
-            tree = ET.parse(xml_file_path)
-
-        root = tree.getroot()
-
-        # Find all PubmedArticle elements
-        for article_elem in root.findall(".//PubmedArticle"):
-            article_data = parse_article_element(article_elem)
-            if article_data:
-                articles.append(article_data)
+        # Streamed, so only the article dicts (not the whole XML tree) are held
+        for chunk in iter_article_chunks(xml_file_path):
+            articles.extend(chunk)
 
         logger.info(f"Worker parsed {len(articles)} articles from {xml_file_path}")
         return xml_file_path, articles
@@ -229,3 +258,9 @@ class OptimizedPubMedParser:
         """Single file parsing (backward compatibility)"""
         _, articles = parse_xml_file_worker(xml_file_path)
         return articles
+
+    def iter_xml_file_chunks(
+        self, xml_file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Stream one file as fixed-size article chunks (flat memory per file)"""
+        return iter_article_chunks(xml_file_path, chunk_size)
@@ -0,0 +1,174 @@
+"""
+Compact primary-key membership index for cross-batch deduplication
+
+Keeping every existing primary key as a Python ``str`` in a ``set`` costs
+roughly 100 bytes per key (string object plus hash-table slot), which is
+several GB for tens of millions of PubMed articles. Most mirrored keys are
+numeric underneath: PMIDs are plain integers and NCT IDs are ``NCT`` plus an
+8-digit number. This index stores those as a sorted ``int64`` numpy array
+(8 bytes per key) and answers membership with a binary search.
+
+- Keys are loaded from the table with a server-side (streaming) cursor, in
+  chunks, so the full key list never exists as Python objects
+- Keys added after loading go into a small pending set and are merged into
+  the sorted array once it grows past ``merge_threshold``
+- Keys that are not in the numeric form for the table (different prefix,
+  unexpected zero padding, or simply non-numeric like drug generic names)
+  are kept in an ordinary ``set`` so membership stays exact
+"""
+
+import logging
+import time
+from collections.abc import Iterable
+from typing import Any
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Known key shapes: (prefix, digit width); width None means no zero padding
+KEY_FORMATS = {
+    "pmid": ("", None),
+    "nct_id": ("NCT", 8),
+}
+
+
+class RecordKeyIndex:
+    """Set-like membership over primary keys, stored as a sorted int64 array"""
+
+    def __init__(self, prefix: str = "", width: int | None = None, merge_threshold: int = 100_000):
+        self.prefix = prefix
+        self.width = width
+        self.merge_threshold = merge_threshold
+        self._sorted = np.empty(0, dtype=np.int64)
+        self._pending: set[int] = set()
+        self._other: set[str] = set()  # keys that do not fit the numeric form
+
+        self.lookups = 0
+        self.lookup_seconds = 0.0
+        self.load_seconds = 0.0
+
+    @classmethod
+    def for_key_field(cls, key_field: str, **kwargs: Any) -> "RecordKeyIndex":
+        prefix, width = KEY_FORMATS.get(key_field, ("", None))
+        return cls(prefix, width, **kwargs)
+
+    @classmethod
+    def from_table(cls, session: Session, table_name: str, key_field: str,
+                   chunk_size: int = 100_000) -> "RecordKeyIndex":
+        """Stream ``key_field`` from ``table_name`` into a new index"""
+        index = cls.for_key_field(key_field)
+        start = time.perf_counter()
+        chunks = []
+        stmt = text(f"SELECT {key_field} FROM {table_name}").execution_options(
+            stream_results=True, yield_per=chunk_size,
+        )
+        result = session.execute(stmt)
+        for partition in result.partitions(chunk_size):
+            numbers, other = index._encode(str(row[0]) for row in partition)
+            chunks.append(numbers)
+            index._other.update(other)
+        if chunks:
+            index._sorted = np.unique(np.concatenate(chunks))
+        index.load_seconds = time.perf_counter() - start
+        return index
+
+    def _encode_one(self, key: str) -> int | None:
+        if not key.startswith(self.prefix):
+            return None
+        digits = key[len(self.prefix):]
+        if not (digits.isascii() and digits.isdigit()) or len(digits) > 18:
+            return None
+        if self.width is None:
+            canonical = digits[0] != "0" or digits == "0"
+        else:
+            canonical = len(digits) == self.width
+        return int(digits) if canonical else None
+
+    def _encode(self, keys: Iterable[str]) -> tuple[np.ndarray, list[str]]:
+        numbers = []
+        other = []
+        for key in keys:
+            number = self._encode_one(key)
+            if number is None:
+                other.append(key)
+            else:
+                numbers.append(number)
+        return np.fromiter(numbers, dtype=np.int64, count=len(numbers)), other
+
+    def _merge_pending(self) -> None:
+        if self._pending:
+            pending = np.fromiter(self._pending, dtype=np.int64, count=len(self._pending))
+            self._sorted = np.union1d(self._sorted, pending)
+            self._pending.clear()
+
+    def add(self, key: Any) -> None:
+        self.update((key,))
+
+    def update(self, keys: Iterable[Any]) -> None:
+        """Add keys, e.g. the primary keys of a batch that was just inserted"""
+        for key in keys:
+            key = str(key)
+            number = self._encode_one(key)
+            if number is None:
+                self._other.add(key)
+            else:
+                self._pending.add(number)
+        if len(self._pending) >= self.merge_threshold:
+            self._merge_pending()
+
+    def contains_many(self, keys: list[Any]) -> list[bool]:
+        """Membership for a whole batch with one vectorized search"""
+        start = time.perf_counter()
+        keys = [str(key) for key in keys]
+        numbers = [self._encode_one(key) for key in keys]
+        numeric_positions = [i for i, number in enumerate(numbers) if number is not None]
+
+        found = [key in self._other for key in keys]
+        if numeric_positions:
+            values = np.fromiter((numbers[i] for i in numeric_positions), dtype=np.int64,
+                                 count=len(numeric_positions))
+            slots = np.searchsorted(self._sorted, values)
+            in_sorted = slots < len(self._sorted)
+            in_sorted[in_sorted] = self._sorted[slots[in_sorted]] == values[in_sorted]
+            hits = zip(numeric_positions, values.tolist(), in_sorted.tolist(), strict=True)
+            for position, value, hit in hits:
+                found[position] = hit or value in self._pending
+
+        self.lookups += len(keys)
+        self.lookup_seconds += time.perf_counter() - start
+        return found
+
+    def __contains__(self, key: object) -> bool:
+        return self.contains_many([key])[0]
+
+    def _numeric_count(self) -> int:
+        # Re-added keys can sit in the pending set and the sorted array at once
+        if not self._pending:
+            return len(self._sorted)
+        pending = np.fromiter(self._pending, dtype=np.int64, count=len(self._pending))
+        merged = int(np.isin(pending, self._sorted, assume_unique=True).sum())
+        return len(self._sorted) + len(self._pending) - merged
+
+    def __len__(self) -> int:
+        return self._numeric_count() + len(self._other)
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the index"""
+        # set entries: ~8 byte slot overhead per key plus the key object
+        pending = len(self._pending) * (8 + 28)
+        other = sum(50 + len(key) for key in self._other) + len(self._other) * 8
+        return int(self._sorted.nbytes) + pending + other
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "keys": len(self),
+            "numeric_keys": self._numeric_count(),
+            "other_keys": len(self._other),
+            "memory_mb": round(self.memory_bytes() / 1024 / 1024, 2),
+            "load_seconds": round(self.load_seconds, 2),
+            "lookups": self.lookups,
+            "avg_lookup_us": round(self.lookup_seconds / self.lookups * 1e6, 3) if self.lookups else 0.0,
+        }
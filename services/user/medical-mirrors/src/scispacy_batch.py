@@ -0,0 +1,44 @@
+"""
+Shared helpers for the SciSpacy /analyze/batch endpoint
+
+The endpoint streams one NDJSON line per input text, each tagged with its
+input ``index``. Both SciSpacy clients (icd10 and health_info) collect the
+stream here so they order results and report failures the same way.
+"""
+
+import json
+from collections.abc import Iterable
+from typing import Any, Dict, List, Optional
+
+# Texts sent per /analyze/batch request; the server rejects requests above
+# SCISPACY_BATCH_MAX_TEXTS (default 5000) so stay well below that.
+DEFAULT_BATCH_REQUEST_SIZE = 500
+
+
+def batch_error(error: str) -> Dict[str, Any]:
+    """Analysis result for a text that could not be analyzed"""
+    return {"entities": [], "error": error}
+
+
+def is_batch_error(result: Dict[str, Any]) -> bool:
+    return "error" in result
+
+
+def collect_batch_lines(lines: Iterable[Any], size: int) -> List[Dict[str, Any]]:
+    """Order parsed NDJSON lines from /analyze/batch by their ``index`` field.
+
+    Texts missing from the stream come back as ``batch_error`` results.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * size
+    for raw_line in lines:
+        line = raw_line.strip() if raw_line else raw_line
+        if not line:
+            continue
+        item = json.loads(line)
+        index = item.pop("index", None)
+        if isinstance(index, int) and 0 <= index < size:
+            results[index] = item
+    return [
+        r if r is not None else batch_error("missing from batch response")
+        for r in results
+    ]
@@ -0,0 +1,225 @@
+"""
+Response cache for the SciSpacy server.
+
+Two tiers:
+  - memory: bounded LRU with per-entry TTL (O(1) get/put/evict via OrderedDict)
+  - disk (optional): SQLite file so repeated texts (e.g. ICD-10 descriptions)
+    skip the model after a restart
+
+Callers must include everything that affects the output (model name, metadata
+hash, enrichment flag) in the key; the cache itself is content-agnostic.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Thread-safe LRU+TTL cache with an optional persistent SQLite tier."""
+
+    # Prune the disk tier once every N writes rather than on every insert
+    DISK_PRUNE_INTERVAL = 1000
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        ttl: float = 300,
+        enabled: bool = True,
+        disk_path: str | None = None,
+        disk_ttl: float = 0,
+        disk_maxsize: int = 500_000,
+    ) -> None:
+        self.enabled = enabled
+        self.maxsize = max(0, maxsize)
+        self.ttl = ttl
+        self.disk_path = disk_path
+        self.disk_ttl = disk_ttl
+        self.disk_maxsize = disk_maxsize
+
+        self._store: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk: sqlite3.Connection | None = None
+        self._disk_writes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.disk_hits = 0
+        self.disk_errors = 0
+
+        if enabled and disk_path:
+            self._open_disk(disk_path)
+
+    # ------------------------------------------------------------
+    # Disk tier
+    # ------------------------------------------------------------
+    def _open_disk(self, path: str) -> None:
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                " key TEXT PRIMARY KEY,"
+                " created_at REAL NOT NULL,"
+                " value TEXT NOT NULL)",
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_response_cache_created"
+                " ON response_cache(created_at)",
+            )
+            self._disk = conn
+            logger.info("SciSpacy persistent cache enabled at %s", path)
+        except Exception as exc:
+            logger.warning("Could not open persistent cache at %s: %s", path, exc)
+            self._disk = None
+
+    def _disk_get(self, key: str, now: float) -> dict[str, Any] | None:
+        if self._disk is None:
+            return None
+        try:
+            row = self._disk.execute(
+                "SELECT created_at, value FROM response_cache WHERE key = ?", (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            created_at, raw = row
+            if self.disk_ttl > 0 and (now - created_at) > self.disk_ttl:
+                self._disk.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+                return None
+            return json.loads(raw)
+        except Exception as exc:
+            self.disk_errors += 1
+            logger.debug("Persistent cache read failed: %s", exc)
+            return None
+
+    def _disk_put(self, key: str, value: dict[str, Any], now: float) -> None:
+        if self._disk is None:
+            return
+        try:
+            self._disk.execute(
+                "INSERT OR REPLACE INTO response_cache (key, created_at, value) VALUES (?, ?, ?)",
+                (key, now, json.dumps(value)),
+            )
+            self._disk_writes += 1
+            if self._disk_writes % self.DISK_PRUNE_INTERVAL == 0:
+                self._disk_prune()
+        except Exception as exc:
+            self.disk_errors += 1
+            logger.debug("Persistent cache write failed: %s", exc)
+
+    def _disk_prune(self) -> None:
+        assert self._disk is not None
+        if self.disk_ttl > 0:
+            self._disk.execute(
+                "DELETE FROM response_cache WHERE created_at < ?", (time.time() - self.disk_ttl,),
+            )
+        (count,) = self._disk.execute("SELECT COUNT(*) FROM response_cache").fetchone()
+        overflow = count - self.disk_maxsize
+        if overflow > 0:
+            self._disk.execute(
+                "DELETE FROM response_cache WHERE key IN ("
+                " SELECT key FROM response_cache ORDER BY created_at ASC LIMIT ?)",
+                (overflow,),
+            )
+
+    def _disk_size(self) -> int:
+        if self._disk is None:
+            return 0
+        try:
+            return int(self._disk.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0])
+        except Exception:
+            return 0
+
+    # ------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------
+    def _memory_put(self, key: str, value: dict[str, Any], now: float) -> None:
+        if self.maxsize == 0:
+            return
+        self._store[key] = (now, value)
+        self._store.move_to_end(key)
+        while len(self._store) > self.maxsize:
+            self._store.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return the cached response or None; promotes disk hits into memory."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is not None:
+                ts, value = entry
+                if self.ttl > 0 and (now - ts) > self.ttl:
+                    del self._store[key]
+                    self.expirations += 1
+                else:
+                    self._store.move_to_end(key)
+                    self.hits += 1
+                    return value
+            value = self._disk_get(key, now)
+            if value is not None:
+                self._memory_put(key, value, now)
+                self.hits += 1
+                self.disk_hits += 1
+                return value
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock:
+            self._memory_put(key, value, now)
+            self._disk_put(key, value, now)
+
+    def clear(self, include_disk: bool = False) -> None:
+        with self._lock:
+            self._store.clear()
+            if include_disk and self._disk is not None:
+                try:
+                    self._disk.execute("DELETE FROM response_cache")
+                except Exception as exc:
+                    logger.warning("Failed clearing persistent cache: %s", exc)
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._store),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "persistent": {
+                    "enabled": self._disk is not None,
+                    "path": self.disk_path if self._disk is not None else None,
+                    "size": self._disk_size(),
+                    "maxsize": self.disk_maxsize,
+                    "ttl": self.disk_ttl,
+                    "hits": self.disk_hits,
+                    "errors": self.disk_errors,
+                },
+            }
@@ -8,12 +8,12 @@ import json
 import logging
 import os
 import sys
-import time
 from typing import Any
 
 import spacy
 import yaml  # type: ignore
-from flask import Flask, request
+from flask import Flask, Response, request, stream_with_context
+from response_cache import ResponseCache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -64,8 +64,26 @@ _METADATA_HASH: str | None = None
 CACHE_ENABLED = os.environ.get("SCISPACY_CACHE", "true").lower() == "true"
 CACHE_MAXSIZE = int(os.environ.get("SCISPACY_CACHE_SIZE", 256))
 CACHE_TTL = int(os.environ.get("SCISPACY_CACHE_TTL", 300))  # seconds
+# Optional persistent tier (SQLite); unset disables it
+CACHE_DISK_PATH = os.environ.get("SCISPACY_CACHE_PATH") or None
+CACHE_DISK_TTL = int(os.environ.get("SCISPACY_CACHE_DISK_TTL", 0))  # seconds, 0 = no expiry
+CACHE_DISK_MAXSIZE = int(os.environ.get("SCISPACY_CACHE_DISK_SIZE", 500000))
+
+_response_cache = ResponseCache(
+    maxsize=CACHE_MAXSIZE,
+    ttl=CACHE_TTL,
+    enabled=CACHE_ENABLED,
+    disk_path=CACHE_DISK_PATH,
+    disk_ttl=CACHE_DISK_TTL,
+    disk_maxsize=CACHE_DISK_MAXSIZE,
+)
 
-_cache_store: dict[str, tuple[float, dict[str, Any]]] = {}
+# ------------------------------------------------------------
+# Batch Controls (nlp.pipe)
+# ------------------------------------------------------------
+BATCH_SIZE = int(os.environ.get("SCISPACY_BATCH_SIZE", 64))
+BATCH_N_PROCESS = int(os.environ.get("SCISPACY_N_PROCESS", 1))
+BATCH_MAX_TEXTS = int(os.environ.get("SCISPACY_BATCH_MAX_TEXTS", 5000))
 
 
 def _metadata_hash() -> str:
@@ -80,39 +98,22 @@ def _metadata_hash() -> str:
 
 
 def _cache_key(text: str, enrich: bool) -> str:
-    return hashlib.md5(f"{_metadata_hash()}|{int(enrich)}|{text}".encode()).hexdigest()
+    # Model name is part of the key because the persistent tier outlives the process
+    return hashlib.md5(
+        f"{MODEL_NAME}|{_metadata_hash()}|{int(enrich)}|{text}".encode(),
+    ).hexdigest()
 
 
 def _cache_get(key: str) -> dict[str, Any] | None:
-    if not CACHE_ENABLED:
-        return None
-    entry = _cache_store.get(key)
-    if not entry:
-        return None
-    ts, value = entry
-    if CACHE_TTL > 0 and (time.time() - ts) > CACHE_TTL:
-        _cache_store.pop(key, None)
-        return None
-    return value
+    return _response_cache.get(key)
 
 
 def _cache_put(key: str, value: dict[str, Any]) -> None:
-    if not CACHE_ENABLED:
-        return
-    if len(_cache_store) >= CACHE_MAXSIZE:
-        # Simple FIFO eviction: pop oldest timestamp
-        oldest_key = min(_cache_store.items(), key=lambda kv: kv[1][0])[0]
-        _cache_store.pop(oldest_key, None)
-    _cache_store[key] = (time.time(), value)
+    _response_cache.put(key, value)
 
 
 def _cache_stats() -> dict[str, Any]:
-    return {
-        "enabled": CACHE_ENABLED,
-        "size": len(_cache_store),
-        "maxsize": CACHE_MAXSIZE,
-        "ttl": CACHE_TTL,
-    }
+    return _response_cache.stats()
 
 
 def _load_external_metadata() -> None:
@@ -140,7 +141,7 @@ def _load_external_metadata() -> None:
             # Invalidate metadata hash & cache when metadata changes
             global _METADATA_HASH
             _METADATA_HASH = None
-            _cache_store.clear()
+            _response_cache.clear()
             logger.info(
                 "Loaded external metadata: %d entity types, %d relationship groups",
                 len(ENTITY_METADATA),
@@ -245,6 +246,79 @@ def filter_entities(
     return [e for e in enriched_entities if e["type"] in requested]
 
 
+def build_doc_response(doc, text: str, enrich: bool) -> dict[str, Any]:  # type: ignore[no-untyped-def]
+    """Serialize a parsed spaCy ``Doc`` into the /analyze response schema.
+
+    ``enrich`` must already account for whether metadata is loaded; schema
+    version 2 is only produced when it is true.
+    """
+    sentences = [sent.text.strip() for sent in doc.sents]
+    tokens = [
+        {
+            "text": token.text,
+            "lemma": token.lemma_,
+            "pos": token.pos_,
+            "tag": token.tag_,
+            "is_alpha": token.is_alpha,
+            "is_stop": token.is_stop,
+        }
+        for token in doc
+        if not token.is_space
+    ]
+    if enrich:
+        enriched_entities = [enrich_entity(ent) for ent in doc.ents]
+        entities_by_type = group_entities_by_type(enriched_entities)
+        high_priority_entities = [e for e in enriched_entities if e.get("priority") == "high"]
+        clinical_summary = build_clinical_summary(enriched_entities)
+        return {
+            "text": text,
+            "entities": enriched_entities,
+            "entities_by_type": entities_by_type,
+            "high_priority_entities": high_priority_entities,
+            **({"clinical_summary": clinical_summary} if clinical_summary else {}),
+            "sentences": sentences,
+            "tokens": tokens,
+            "entity_count": len(enriched_entities),
+            "sentence_count": len(sentences),
+            "token_count": len(tokens),
+            "schema_version": 2,
+            "enriched": True,
+        }
+    simple_entities = [
+        {
+            "text": ent.text,
+            "label": ent.label_,
+            "start": ent.start_char,
+            "end": ent.end_char,
+            "description": spacy.explain(ent.label_) or ent.label_,
+        }
+        for ent in doc.ents
+    ]
+    return {
+        "text": text,
+        "entities": simple_entities,
+        "entity_count": len(simple_entities),
+        "sentences": sentences,
+        "sentence_count": len(sentences),
+        "tokens": tokens,
+        "token_count": len(tokens),
+        "schema_version": 1,
+        "enriched": False,
+    }
+
+
+def _resolve_enrich(data: dict[str, Any]) -> bool:
+    """Resolve the enrichment flag from body, query string or DEFAULT_ENRICH."""
+    default_enrich = os.environ.get("DEFAULT_ENRICH", "false").lower() == "true"
+    enrich_param = request.args.get("enrich")
+    enrich = (
+        data.get("enrich")
+        if "enrich" in data
+        else (enrich_param.lower() == "true" if enrich_param else default_enrich)
+    )
+    return bool(enrich)
+
+
 def load_model() -> bool:
     global nlp
     try:
@@ -274,6 +348,7 @@ def root() -> dict[str, Any]:
         "endpoints": [
             "GET /health - Health check",
             "POST /analyze - Analyze text for biomedical entities",
+            "POST /analyze/batch - Analyze many texts via nlp.pipe (NDJSON stream)",
             "GET /info - Model information",
         ],
     }
@@ -317,77 +392,17 @@ def analyze() -> tuple[dict[str, Any], int]:
             return {"error": "Empty text provided"}, 400
 
         # Determine enrichment preference
-        req_json = data if isinstance(data, dict) else {}
-        default_enrich = os.environ.get("DEFAULT_ENRICH", "false").lower() == "true"
-        enrich_param = request.args.get("enrich")
-        enrich = (
-            req_json.get("enrich")
-            if "enrich" in req_json
-            else (enrich_param.lower() == "true" if enrich_param else default_enrich)
-        )
-
-        doc = nlp(text)
+        enrich = _resolve_enrich(data if isinstance(data, dict) else {})
 
-        # Caching
-        ck = _cache_key(text, bool(enrich and (ENTITY_METADATA or ENTITY_RELATIONSHIPS)))
+        # Check the cache before paying for a model pass
+        use_enrichment = bool(enrich and (ENTITY_METADATA or ENTITY_RELATIONSHIPS))
+        ck = _cache_key(text, use_enrichment)
         cached = _cache_get(ck)
-        if cached:
+        if cached is not None:
             return cached, 200
-        sentences = [sent.text.strip() for sent in doc.sents]
-        tokens = [
-            {
-                "text": token.text,
-                "lemma": token.lemma_,
-                "pos": token.pos_,
-                "tag": token.tag_,
-                "is_alpha": token.is_alpha,
-                "is_stop": token.is_stop,
-            }
-            for token in doc
-            if not token.is_space
-        ]
-        if enrich and (ENTITY_METADATA or ENTITY_RELATIONSHIPS):
-            enriched_entities = [enrich_entity(ent) for ent in doc.ents]
-            entities_by_type = group_entities_by_type(enriched_entities)
-            high_priority_entities = [e for e in enriched_entities if e.get("priority") == "high"]
-            clinical_summary = build_clinical_summary(enriched_entities)
-            response: dict[str, Any] = {
-                "text": text,
-                "entities": enriched_entities,
-                "entities_by_type": entities_by_type,
-                "high_priority_entities": high_priority_entities,
-                **({"clinical_summary": clinical_summary} if clinical_summary else {}),
-                "sentences": sentences,
-                "tokens": tokens,
-                "entity_count": len(enriched_entities),
-                "sentence_count": len(sentences),
-                "token_count": len(tokens),
-                "schema_version": 2,
-                "enriched": True,
-            }
-            _cache_put(ck, response)
-            return response, 200
-        simple_entities = [
-            {
-                "text": ent.text,
-                "label": ent.label_,
-                "start": ent.start_char,
-                "end": ent.end_char,
-                "description": spacy.explain(ent.label_) or ent.label_,
-            }
-            for ent in doc.ents
-        ]
-        response = {
-            "text": text,
-            "entities": simple_entities,
-            "entity_count": len(simple_entities),
-            "sentences": sentences,
-            "sentence_count": len(sentences),
-            "tokens": tokens,
-            "token_count": len(tokens),
-            "schema_version": 1,
-            "enriched": False,
-        }
+
+        doc = nlp(text)
+        response = build_doc_response(doc, text, use_enrichment)
         _cache_put(ck, response)
         return response, 200
 
@@ -396,6 +411,85 @@ def analyze() -> tuple[dict[str, Any], int]:
         return {"error": f"Processing failed: {str(e)}"}, 500
 
 
+@app.route("/analyze/batch", methods=["POST"])
+def analyze_batch() -> Response | tuple[dict[str, Any], int]:
+    """Analyze many texts in one request using ``nlp.pipe``.
+
+    Body: ``{"texts": [...], "enrich": bool, "batch_size": int, "n_process": int}``.
+    ``batch_size``/``n_process`` default to SCISPACY_BATCH_SIZE / SCISPACY_N_PROCESS.
+
+    Results are streamed as newline-delimited JSON, one line per input text and
+    in input order. Each line is the /analyze response for that text plus an
+    ``index`` field; empty or non-string inputs produce an ``error`` line
+    instead so callers can keep positional alignment. Cached texts are served
+    without entering the pipeline.
+    """
+    if nlp is None:
+        return {"error": "Model not loaded"}, 500
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get("texts"), list):
+        return {"error": "Missing 'texts' list in request"}, 400
+
+    texts: list[Any] = data["texts"]
+    if len(texts) > BATCH_MAX_TEXTS:
+        return {"error": f"Too many texts: {len(texts)} > {BATCH_MAX_TEXTS}"}, 413
+
+    try:
+        batch_size = max(1, int(data.get("batch_size", BATCH_SIZE)))
+        n_process = max(1, int(data.get("n_process", BATCH_N_PROCESS)))
+    except (TypeError, ValueError):
+        return {"error": "batch_size and n_process must be integers"}, 400
+
+    use_enrichment = bool(_resolve_enrich(data) and (ENTITY_METADATA or ENTITY_RELATIONSHIPS))
+    # Resolve cache hits up front so only misses are sent through nlp.pipe
+    cached: dict[int, dict[str, Any]] = {}
+    pending: list[tuple[int, str, str]] = []
+    for i, t in enumerate(texts):
+        if not (isinstance(t, str) and t.strip()):
+            continue
+        ck = _cache_key(t, use_enrichment)
+        hit = _cache_get(ck)
+        if hit is not None:
+            cached[i] = hit
+        else:
+            pending.append((i, t, ck))
+
+    def generate():  # type: ignore[no-untyped-def]
+        next_index = 0
+
+        def flush_until(stop: int):  # type: ignore[no-untyped-def]
+            # Emit cached results and error lines for inputs before ``stop``
+            nonlocal next_index
+            while next_index < stop:
+                if next_index in cached:
+                    yield json.dumps({"index": next_index, **cached[next_index]}) + "\n"
+                else:
+                    yield json.dumps({"index": next_index, "error": "Empty text provided"}) + "\n"
+                next_index += 1
+
+        docs = nlp.pipe(  # type: ignore[union-attr]
+            (t for _, t, _ in pending), batch_size=batch_size, n_process=n_process,
+        )
+        try:
+            for (index, text, ck), doc in zip(pending, docs, strict=True):
+                yield from flush_until(index)
+                response = build_doc_response(doc, text, use_enrichment)
+                _cache_put(ck, response)
+                yield json.dumps({"index": index, **response}) + "\n"
+                next_index = index + 1
+            yield from flush_until(len(texts))
+        except Exception as exc:
+            logger.exception(f"Batch processing failed at index {next_index}: {exc}")
+            yield json.dumps({"index": next_index, "error": f"Processing failed: {exc}"}) + "\n"
+
+    logger.info(
+        "Batch analyze: %d texts (%d cached, %d to parse), batch_size=%d, n_process=%d",
+        len(texts), len(cached), len(pending), batch_size, n_process,
+    )
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
 @app.route("/extract-by-type", methods=["POST", "GET"])
 def extract_by_type() -> tuple[dict[str, Any], int]:
     """Filtered extraction endpoint (requires enrichment metadata).
@@ -0,0 +1,184 @@
+"""
+Tests for HealthcareCacheManager against fakeredis: the hash-per-entry
+layout in Redis and the in-process L1 tier in front of it
+"""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")  # fakeredis needs it for the hit script
+
+# Add healthcare-api service module to path
+SERVICE_DIR = Path(__file__).resolve().parents[3] / "services" / "user" / "healthcare-api"
+sys.path.insert(0, str(SERVICE_DIR))
+os.environ.setdefault("ENVIRONMENT", "testing")
+
+from core.infrastructure.healthcare_cache import (  # type: ignore
+    CacheSecurityLevel,
+    HealthcareCacheManager,
+)
+
+GUIDELINE = {"condition": "hypertension", "guidelines": [{"title": "JNC 8", "year": 2014}]}
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def make_manager(server, l1_enabled=True):
+    manager = HealthcareCacheManager(l1_enabled=l1_enabled)
+    manager.redis_client = fakeredis.FakeAsyncRedis(server=server)
+    return manager
+
+
+@pytest.fixture
+async def manager(server):
+    manager = make_manager(server, l1_enabled=False)
+    yield manager
+    await manager.cleanup()
+
+
+async def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+class TestHashLayout:
+    async def test_entry_is_stored_as_hash_with_ttl(self, manager):
+        assert await manager.set("clin_guide:1", GUIDELINE, CacheSecurityLevel.HEALTHCARE_SENSITIVE)
+
+        fields = await manager.redis_client.hgetall("clin_guide:1")
+        assert {key.decode() for key in fields} == {
+            "payload", "fmt", "security_level", "ttl_seconds", "created_at", "last_accessed",
+            "access_count", "healthcare_context", "phi_detected", "encrypted",
+        }
+        assert fields[b"security_level"] == b"healthcare"
+        assert 0 < await manager.redis_client.ttl("clin_guide:1") <= 3600 * 4
+
+    async def test_round_trip_bumps_access_metadata_only(self, manager):
+        await manager.set("clin_guide:1", GUIDELINE, CacheSecurityLevel.HEALTHCARE_SENSITIVE)
+        payload = await manager.redis_client.hget("clin_guide:1", "payload")
+
+        for _ in range(3):
+            assert await manager.get("clin_guide:1", CacheSecurityLevel.HEALTHCARE_SENSITIVE) == GUIDELINE
+
+        entry = await manager.get_entry_metadata("clin_guide:1")
+        assert entry.access_count == 3
+        assert entry.security_level == CacheSecurityLevel.HEALTHCARE_SENSITIVE
+        assert await manager.redis_client.hget("clin_guide:1", "payload") == payload
+
+    async def test_set_replaces_every_field(self, manager):
+        await manager.set("med_lit:1", [{"pmid": "1"}], healthcare_context={"query": "asthma"})
+        await manager.get("med_lit:1")
+        await manager.set("med_lit:1", [{"pmid": "2"}])
+
+        entry = await manager.get_entry_metadata("med_lit:1")
+        assert entry.access_count == 0
+        assert entry.healthcare_context == {}
+        assert await manager.get("med_lit:1") == [{"pmid": "2"}]
+
+    async def test_other_security_level_is_not_served(self, manager):
+        await manager.set("med_lit:1", [{"pmid": "1"}], CacheSecurityLevel.PUBLIC)
+
+        assert await manager.get("med_lit:1", CacheSecurityLevel.HEALTHCARE_SENSITIVE) is None
+
+    async def test_missing_key_creates_no_hash(self, manager):
+        assert await manager.get("med_lit:missing") is None
+        assert not await manager.redis_client.exists("med_lit:missing")
+
+    async def test_old_string_entry_is_dropped(self, manager):
+        await manager.redis_client.set("med_lit:1", '{"data": []}')
+
+        assert await manager.get("med_lit:1") is None
+        assert not await manager.redis_client.exists("med_lit:1")
+
+    async def test_delete_removes_entry(self, manager):
+        await manager.set("med_lit:1", [{"pmid": "1"}])
+
+        assert await manager.delete("med_lit:1")
+        assert await manager.get("med_lit:1") is None
+        assert not await manager.delete("med_lit:1")
+
+
+class TestL1:
+    async def test_repeat_reads_are_served_locally(self, server):
+        manager = make_manager(server)
+        await manager.set("med_lit:1", [{"pmid": "1"}])
+
+        first = await manager.get("med_lit:1")
+        first.append({"pmid": "mutated"})
+        assert await manager.get("med_lit:1") == [{"pmid": "1"}]
+
+        stats = manager._get_l1_stats()
+        assert stats["hits"] == 2
+        assert (await manager.get_entry_metadata("med_lit:1")).access_count == 0
+        await manager.cleanup()
+
+    async def test_phi_entries_stay_out_of_process_memory(self, server):
+        manager = make_manager(server)
+        await manager.set("patient:1", {"note": "follow-up"}, CacheSecurityLevel.PHI_PROTECTED)
+        await manager.get("patient:1", CacheSecurityLevel.PHI_PROTECTED)
+
+        assert all(len(l1) == 0 for l1 in manager._l1.values())
+        await manager.cleanup()
+
+    async def test_local_copy_expires_with_short_redis_ttl(self, server):
+        manager = make_manager(server)
+        await manager.set("session:1", {"step": 1}, CacheSecurityLevel.HEALTHCARE_SENSITIVE,
+                          ttl_override=1)
+        l1 = manager._l1[CacheSecurityLevel.HEALTHCARE_SENSITIVE]
+        assert l1["session:1"][2] - time.monotonic() <= 1
+
+        await asyncio.sleep(1.1)
+
+        assert await manager.get("session:1", CacheSecurityLevel.HEALTHCARE_SENSITIVE) is None
+        await manager.cleanup()
+
+    async def test_fill_from_redis_is_capped_by_remaining_ttl(self, server):
+        writer = make_manager(server, l1_enabled=False)
+        reader = make_manager(server)
+        await writer.set("session:1", {"step": 1}, CacheSecurityLevel.HEALTHCARE_SENSITIVE)
+        await writer.redis_client.pexpire("session:1", 100)
+
+        assert await reader.get("session:1", CacheSecurityLevel.HEALTHCARE_SENSITIVE) == {"step": 1}
+        l1 = reader._l1[CacheSecurityLevel.HEALTHCARE_SENSITIVE]
+        assert l1["session:1"][2] - time.monotonic() <= 0.1  # not the 60 s L1 TTL
+
+        await asyncio.sleep(0.15)
+        assert await reader.get("session:1", CacheSecurityLevel.HEALTHCARE_SENSITIVE) is None
+        await writer.cleanup()
+        await reader.cleanup()
+
+    async def test_delete_evicts_local_copy(self, server):
+        manager = make_manager(server)
+        await manager.set("med_lit:1", [{"pmid": "1"}])
+        await manager.get("med_lit:1")
+
+        await manager.delete("med_lit:1")
+
+        assert await manager.get("med_lit:1") is None
+        await manager.cleanup()
+
+    async def test_writes_in_one_worker_evict_other_workers(self, server):
+        writer = make_manager(server)
+        reader = make_manager(server)
+        await reader._start_l1_invalidation_listener()
+        await writer.set("med_lit:1", [{"pmid": "1"}])
+        await wait_for(lambda: reader._l1_stats["invalidations_received"] == 1)
+        assert await reader.get("med_lit:1") == [{"pmid": "1"}]
+
+        await writer.set("med_lit:1", [{"pmid": "2"}])
+        await wait_for(lambda: reader._l1_stats["invalidations_received"] == 2)
+
+        assert await reader.get("med_lit:1") == [{"pmid": "2"}]
+        await writer.cleanup()
+        await reader.cleanup()
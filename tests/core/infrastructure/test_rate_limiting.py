@@ -0,0 +1,224 @@
+"""
+Tests for the in-process rate limit store, for the limiter's degraded mode,
+where limits are enforced locally while Redis is down and handed back to Redis
+once it answers again, and for all-or-nothing consumption across limit types.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add healthcare-api service module to path
+SERVICE_DIR = Path(__file__).resolve().parents[3] / "services" / "user" / "healthcare-api"
+sys.path.insert(0, str(SERVICE_DIR))
+os.environ.setdefault("ENVIRONMENT", "testing")
+
+from core.infrastructure.authentication import AuthenticatedUser, HealthcareRole  # type: ignore
+from core.infrastructure.rate_limiting import (  # type: ignore
+    HealthcareRateLimiter,
+    InMemoryRateLimitStore,
+    RateLimitType,
+)
+
+NOW = 6000.0  # start of a minute and of an hour window
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def hset(self, key, mapping):
+        self.commands.append(("hset", key, mapping))
+
+    def expire(self, key, seconds):
+        self.commands.append(("expire", key, seconds))
+
+    def incrby(self, key, amount):
+        self.commands.append(("incrby", key, amount))
+
+    async def execute(self):
+        if self.redis.down:
+            msg = "redis down"
+            raise ConnectionError(msg)
+        self.redis.synced.extend(self.commands)
+
+
+class FlakyRedis:
+    """redis.asyncio stand-in that is either down or allows every request"""
+
+    def __init__(self):
+        self.down = True
+        self.pings = 0
+        self.script_calls = 0
+        self.synced = []
+
+    def register_script(self, script):
+        return self._run_script
+
+    async def _run_script(self, keys, args):
+        self.script_calls += 1
+        if self.down:
+            msg = "redis down"
+            raise ConnectionError(msg)
+        return [1] + [1, "10", 1, 1, 0] * (len(keys) // 3)
+
+    async def ping(self):
+        self.pings += 1
+        if self.down:
+            msg = "redis down"
+            raise ConnectionError(msg)
+        return True
+
+    def pipeline(self, transaction=False):
+        return FakePipeline(self)
+
+
+@pytest.fixture
+def user():
+    return AuthenticatedUser(user_id="dr_1", role=HealthcareRole.DOCTOR)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend_limiter(request):
+    """Limiter on the in-process path or on the Lua script against fakeredis"""
+    if request.param == "memory":
+        return HealthcareRateLimiter(None)
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # fakeredis needs it for EVALSHA
+    return HealthcareRateLimiter(fakeredis.FakeAsyncRedis())
+
+
+@pytest.fixture
+def limiter():
+    limiter = HealthcareRateLimiter(FlakyRedis())
+    limiter.redis_recovery_interval = 60.0
+    return limiter
+
+
+class TestInMemoryRateLimitStore:
+    def test_burst_is_denied_until_tokens_refill(self):
+        store = InMemoryRateLimitStore()
+        for _ in range(3):
+            assert store.consume("u", "api", NOW, 3, 1.0, 100, 1000)[0]
+
+        allowed, tokens, _, _, retry_after = store.consume("u", "api", NOW, 3, 1.0, 100, 1000)
+        assert not allowed
+        assert tokens == 0
+        assert retry_after == 1
+        assert store.consume("u", "api", NOW + 1.0, 3, 1.0, 100, 1000)[0]
+
+    def test_minute_window_denies_then_rolls_over(self):
+        store = InMemoryRateLimitStore()
+        for _ in range(2):
+            assert store.consume("u", "api", NOW, 100, 100.0, 2, 1000)[0]
+
+        allowed, _, minute_count, _, retry_after = store.consume("u", "api", NOW, 100, 100.0, 2, 1000)
+        assert (allowed, minute_count, retry_after) == (False, 2, 60)
+        assert store.consume("u", "api", NOW + 60, 100, 100.0, 2, 1000)[0]
+
+    def test_least_recently_used_buckets_are_evicted(self):
+        store = InMemoryRateLimitStore(max_keys=2)
+        for user_id in ("a", "b", "c"):
+            store.consume(user_id, "api", NOW, 5, 1.0, 100, 1000)
+
+        assert len(store) == 2
+        assert store.evictions == 1
+        assert [user_id for user_id, _, _ in store.drain(NOW)] == ["b", "c"]
+
+    def test_restore_puts_drained_buckets_back(self):
+        store = InMemoryRateLimitStore()
+        store.consume("u", "api", NOW, 5, 1.0, 100, 1000)
+        buckets = store.drain(NOW)
+        assert len(store) == 0
+
+        store.restore(buckets)
+        _, tokens, minute_count, _, _ = store.consume("u", "api", NOW, 5, 1.0, 100, 1000)
+        assert (tokens, minute_count) == (3, 2)
+
+
+class TestRedisDegradedMode:
+    async def test_outage_switches_to_in_process_limits(self, limiter, user):
+        status = await limiter.check_rate_limit(user, RateLimitType.API_GENERAL)
+
+        assert status.allowed
+        assert limiter._redis_degraded
+        assert len(limiter.memory_store) == 1
+
+    async def test_recovery_is_probed_once_per_interval(self, limiter, user):
+        redis = limiter.redis_client
+        for _ in range(5):
+            await limiter.check_rate_limit(user, RateLimitType.API_GENERAL)
+        assert (redis.script_calls, redis.pings) == (1, 0)
+
+        limiter._next_recovery_attempt = 0.0  # interval elapsed
+        for _ in range(5):
+            await limiter.check_rate_limit(user, RateLimitType.API_GENERAL)
+
+        assert (redis.script_calls, redis.pings) == (1, 1)
+        assert redis.synced == []
+        assert limiter._redis_degraded
+
+    async def test_recovery_syncs_local_state_and_leaves_degraded_mode(self, limiter, user):
+        redis = limiter.redis_client
+        for _ in range(3):
+            await limiter.check_rate_limit(user, RateLimitType.API_GENERAL)
+
+        redis.down = False
+        limiter._next_recovery_attempt = 0.0
+        status = await limiter.check_rate_limit(user, RateLimitType.API_GENERAL)
+
+        assert status.allowed
+        assert not limiter._redis_degraded
+        assert len(limiter.memory_store) == 0
+        assert redis.pings == 1
+        assert redis.script_calls == 2
+        minute_syncs = [c for c in redis.synced if c[0] == "incrby" and ":minute:" in c[1]]
+        assert [amount for _, _, amount in minute_syncs] == [3]
+
+
+class TestMultiTypeConsumption:
+    def test_store_consumes_from_no_type_when_one_denies(self):
+        store = InMemoryRateLimitStore()
+        limits = [("api", 5, 1.0, 100, 1000), ("upload", 1, 0.0, 100, 1000)]
+        assert store.consume_many("u", limits, NOW)[0]
+
+        all_allowed, checks = store.consume_many("u", limits, NOW)
+
+        assert not all_allowed
+        assert [check[0] for check in checks] == [True, False]
+        assert checks[0][1:3] == (4, 1)  # api tokens and minute count untouched
+        assert store.consume("u", "api", NOW, 5, 1.0, 100, 1000)[1:3] == (3, 2)
+
+    async def test_denied_request_consumes_nothing(self, backend_limiter, user):
+        other, exhausted = RateLimitType.API_GENERAL, RateLimitType.DOCUMENT_UPLOAD
+        for _ in range(1000):
+            if not (await backend_limiter.check_rate_limit(user, exhausted)).allowed:
+                break
+        else:
+            pytest.fail("limit never exhausted")
+
+        before = await backend_limiter.check_rate_limit(user, other)
+        status = await backend_limiter.check_rate_limits(user, [other, exhausted])
+        after = await backend_limiter.check_rate_limit(user, other)
+
+        assert not status.allowed
+        assert status.limit_type == exhausted
+        assert after.requests_remaining == before.requests_remaining - 1
+        assert not backend_limiter._redis_degraded
+
+    async def test_allowed_request_counts_against_every_type(self, backend_limiter, user):
+        types = [RateLimitType.API_GENERAL, RateLimitType.MEDICAL_QUERY]
+        before = [await backend_limiter.check_rate_limit(user, t) for t in types]
+        assert (await backend_limiter.check_rate_limits(user, types)).allowed
+        after = [await backend_limiter.check_rate_limit(user, t) for t in types]
+
+        assert [a.requests_remaining for a in after] == [b.requests_remaining - 2 for b in before]
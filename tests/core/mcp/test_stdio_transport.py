@@ -0,0 +1,133 @@
+import asyncio
+import gc
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add healthcare-api service module to path
+SERVICE_DIR = Path(__file__).resolve().parents[3] / "services" / "user" / "healthcare-api"
+sys.path.insert(0, str(SERVICE_DIR))
+
+from core.mcp.stdio_transport import MCPConnectionPool, MCPTransportError  # type: ignore
+
+# Replies to tools/call in reverse arrival order once two requests are pending,
+# so responses only line up if they are matched by id. tools/list crashes the
+# process the first time, when the marker file in argv[1] does not exist yet.
+STUB_SERVER = r"""
+import json, os, sys
+held = []
+for line in sys.stdin:
+    msg = json.loads(line)
+    if "id" not in msg:
+        continue
+    if msg["method"] == "initialize":
+        print(json.dumps({"jsonrpc": "2.0", "id": msg["id"], "result": {"serverInfo": {"name": "stub"}}}), flush=True)
+        continue
+    if msg["method"] == "tools/list":
+        if not os.path.exists(sys.argv[1]):
+            open(sys.argv[1], "w").close()
+            sys.exit(1)
+        print(json.dumps({"jsonrpc": "2.0", "id": msg["id"], "result": {"tools": []}}), flush=True)
+        continue
+    if msg["params"].get("name") == "crash":
+        sys.exit(1)
+    if msg["params"].get("name") == "fail":
+        print(json.dumps({"jsonrpc": "2.0", "id": msg["id"], "error": {"code": -1, "message": "boom"}}), flush=True)
+        continue
+    held.append(msg)
+    if len(held) == 2:
+        for m in reversed(held):
+            print(json.dumps({"jsonrpc": "2.0", "id": m["id"], "result": m["params"]}), flush=True)
+        held.clear()
+"""
+
+
+def _pool(size: int = 1, marker: str = os.devnull) -> MCPConnectionPool:
+    return MCPConnectionPool(lambda: [sys.executable, "-c", STUB_SERVER, marker], size=size)
+
+
+async def test_concurrent_requests_are_matched_by_id():
+    pool = _pool()
+    try:
+        first, second = await asyncio.gather(
+            pool.request("tools/call", {"name": "a"}, timeout=5),
+            pool.request("tools/call", {"name": "b"}, timeout=5),
+        )
+        assert first == {"name": "a"}
+        assert second == {"name": "b"}
+        assert pool.stats()["live_connections"] == 1
+    finally:
+        await pool.close()
+
+
+async def test_jsonrpc_error_raises_runtime_error():
+    pool = _pool()
+    try:
+        with pytest.raises(RuntimeError, match="boom"):
+            await pool.request("tools/call", {"name": "fail"}, timeout=5)
+    finally:
+        await pool.close()
+
+
+async def test_process_exit_fails_pending_and_pool_respawns():
+    pool = _pool()
+    try:
+        with pytest.raises(MCPTransportError):
+            await pool.request("tools/call", {"name": "crash"}, timeout=5)
+        # Next request lands on a freshly spawned process
+        results = await asyncio.gather(
+            pool.request("tools/call", {"name": "c"}, timeout=5),
+            pool.request("tools/call", {"name": "d"}, timeout=5),
+        )
+        assert results == [{"name": "c"}, {"name": "d"}]
+        assert pool.stats()["processes_spawned"] >= 2
+    finally:
+        await pool.close()
+
+
+async def test_tools_call_is_not_resent_after_process_exit():
+    pool = _pool()
+    try:
+        with pytest.raises(MCPTransportError):
+            await pool.request("tools/call", {"name": "crash"}, timeout=5)
+        # The call may have taken effect before the crash, so it is not retried
+        assert pool.stats()["processes_spawned"] == 1
+    finally:
+        await pool.close()
+
+
+async def test_read_only_request_is_retried_on_fresh_process(tmp_path):
+    pool = _pool(marker=str(tmp_path / "crashed-once"))
+    try:
+        assert await pool.request("tools/list", timeout=5) == {"tools": []}
+        assert pool.stats()["processes_spawned"] == 2
+    finally:
+        await pool.close()
+
+
+@pytest.mark.filterwarnings("error::pytest.PytestUnraisableExceptionWarning")
+def test_pool_serves_requests_from_successive_event_loops():
+    # safe_async_call runs each call in a new loop that is closed afterwards
+    pool = _pool()
+
+    async def call(name: str):
+        return await asyncio.gather(
+            pool.request("tools/call", {"name": name}, timeout=5),
+            pool.request("tools/call", {"name": name + "2"}, timeout=5),
+        )
+
+    try:
+        assert asyncio.run(call("a")) == [{"name": "a"}, {"name": "a2"}]
+        first = pool.connections[0]
+        assert asyncio.run(call("b")) == [{"name": "b"}, {"name": "b2"}]
+        assert first not in pool.connections
+        assert first.is_alive is False
+        assert pool.stats()["event_loops"] == 1
+        # Collecting the abandoned process must not touch its closed loop
+        # ("Exception ignored in BaseSubprocessTransport.__del__")
+        del first
+        gc.collect()
+    finally:
+        asyncio.run(pool.close())
@@ -0,0 +1,110 @@
+"""
+Tests that streaming drug consolidation (one ordered scan, grouped in a
+single pass) produces the same consolidated rows as the per-generic path
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+# Add medical-mirrors source directory to path
+MIRRORS_SRC = Path(__file__).resolve().parents[2] / "services" / "user" / "medical-mirrors" / "src"
+sys.path.insert(0, str(MIRRORS_SRC))
+
+from database import DrugInformation  # type: ignore
+from drug_consolidator import DrugConsolidationEngine, _consolidate_groups  # type: ignore
+
+SOURCE_ROWS = [
+    {"generic_name": "Metformin", "brand_name": "Glucophage", "manufacturer": "BMS",
+     "strength": "500 mg", "dosage_form": "TABLET", "route": "ORAL",
+     "therapeutic_class": "Biguanide", "indications_and_usage": "Type 2 diabetes mellitus"},
+    {"generic_name": " metformin ", "brand_name": "Fortamet", "manufacturer": "Andrx",
+     "strength": "1000 mg", "dosage_form": "TABLET, EXTENDED RELEASE", "route": "ORAL",
+     "therapeutic_class": "Biguanide",
+     "indications_and_usage": "Adjunct to diet and exercise in type 2 diabetes mellitus"},
+    {"generic_name": "METFORMIN", "manufacturer": "Teva", "therapeutic_class": "Antidiabetic",
+     "mechanism_of_action": "Decreases hepatic glucose production"},
+    {"generic_name": "Lisinopril", "brand_name": "Zestril", "strength": "10 mg",
+     "dosage_form": "TABLET", "route": "ORAL", "approval_date": "1987-05-19"},
+    {"generic_name": "warfarin", "brand_name": "Coumadin", "strength": "5 mg",
+     "boxed_warning": "May cause major or fatal bleeding"},
+    {"generic_name": "Warfarin", "brand_name": "Jantoven", "strength": "5 mg"},
+    {"generic_name": "", "brand_name": "Unlabeled"},
+]
+
+# Product-level columns of the unconsolidated rows that the merge reads
+PRODUCT_COLUMNS = (
+    "ndc", "name", "brand_name", "manufacturer", "strength", "dosage_form", "route",
+    "application_number", "product_number", "approval_date", "orange_book_code",
+    "reference_listed_drug",
+)
+
+
+@pytest.fixture
+def consolidator():
+    # ARRAY/JSON columns are declared as TEXT and left NULL
+    columns = [c.name for c in DrugInformation.__table__.columns if c.name != "id"]
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE drug_information (id INTEGER PRIMARY KEY, "
+            + ", ".join(f"{name} TEXT" for name in columns + list(PRODUCT_COLUMNS)) + ")"
+        ))
+        for row in SOURCE_ROWS:
+            conn.execute(
+                text(f"INSERT INTO drug_information ({', '.join(row)}) "
+                     f"VALUES ({', '.join(':' + name for name in row)})"),
+                row,
+            )
+
+    consolidator = DrugConsolidationEngine.__new__(DrugConsolidationEngine)
+    consolidator.session = Session(engine)
+    yield consolidator
+    consolidator.session.close()
+    engine.dispose()
+
+
+def per_generic_rows(consolidator):
+    rows = {}
+    for normalized_generic, _count in consolidator.get_generic_drug_groups():
+        records = consolidator.get_records_for_generic(normalized_generic)
+        for record in records:
+            # Unconsolidated rows carry product columns the model does not map
+            product = consolidator.session.execute(
+                text(f"SELECT {', '.join(PRODUCT_COLUMNS)} FROM drug_information WHERE id = :id"),
+                {"id": record.id},
+            ).one()
+            for name, value in product._mapping.items():
+                setattr(record, name, value)
+        rows[normalized_generic] = consolidator.consolidate_drug_group_data(normalized_generic, records)
+    return rows
+
+
+class TestStreamingConsolidation:
+    def test_groups_match_per_generic_lookups(self, consolidator):
+        groups = list(consolidator.stream_drug_groups(chunk_size=2))
+
+        assert [(generic, len(records)) for generic, records in groups] == [
+            ("lisinopril", 1), ("metformin", 3), ("warfarin", 2),
+        ]
+        assert sorted(consolidator.get_generic_drug_groups()) == [
+            (generic, len(records)) for generic, records in groups
+        ]
+
+    def test_consolidated_rows_match_per_generic_path(self, consolidator):
+        expected = per_generic_rows(consolidator)
+
+        rows, failed = _consolidate_groups(list(consolidator.stream_drug_groups(chunk_size=2)))
+
+        assert failed == []
+        assert {row["generic_name"]: row for row in rows} == expected
+        assert expected["metformin"]["therapeutic_class"] == "Biguanide"
+        assert len(expected["metformin"]["formulations"]) == 2
+
+    def test_streaming_leaves_the_session_connection_options_alone(self, consolidator):
+        list(consolidator.stream_drug_groups(chunk_size=2))
+
+        assert "stream_results" not in consolidator.session.connection().get_execution_options()
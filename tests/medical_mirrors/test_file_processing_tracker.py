@@ -0,0 +1,175 @@
+"""
+Tests for FileProcessingTracker change detection: the (size, mtime, inode)
+fast path, the hash fallback that records stat values, and batched lookups
+"""
+
+import os
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+# Add medical-mirrors source directory to path
+MIRRORS_SRC = Path(__file__).resolve().parents[2] / "services" / "user" / "medical-mirrors" / "src"
+sys.path.insert(0, str(MIRRORS_SRC))
+
+from database import ProcessedFile  # type: ignore
+from file_processing_tracker import FileProcessingTracker  # type: ignore
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    ProcessedFile.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def data_files(tmp_path):
+    paths = []
+    for number in range(5):
+        path = tmp_path / f"pubmed25n{number:04d}.xml.gz"
+        path.write_bytes(b"<PubmedArticleSet/>" * (number + 1))
+        paths.append(str(path))
+    return paths
+
+
+def counting_hashes(tracker):
+    hashed = []
+    calculate = tracker.calculate_file_hash
+
+    def calculate_file_hash(file_path):
+        hashed.append(Path(file_path).name)
+        return calculate(file_path)
+
+    tracker.calculate_file_hash = calculate_file_hash
+    return hashed
+
+
+def mark_all(tracker, paths):
+    for path in paths:
+        tracker.mark_file_processed(path, "pubmed", 10, 10, 0.1)
+
+
+def test_constructor_does_not_touch_the_database():
+    session = MagicMock()
+
+    FileProcessingTracker(session)
+
+    assert session.mock_calls == []
+
+
+class TestStatFastPath:
+    def test_matching_stat_skips_hashing(self, session, data_files):
+        tracker = FileProcessingTracker(session)
+        mark_all(tracker, data_files)
+        hashed = counting_hashes(tracker)
+
+        unprocessed, skipped = tracker.filter_unprocessed_files(data_files, "pubmed")
+
+        assert (unprocessed, skipped) == ([], data_files)
+        assert hashed == []
+
+    def test_size_change_needs_processing_without_hashing(self, session, data_files):
+        tracker = FileProcessingTracker(session)
+        mark_all(tracker, data_files)
+        with open(data_files[0], "ab") as f:
+            f.write(b"<PubmedArticle/>")
+        hashed = counting_hashes(tracker)
+
+        unprocessed, _ = tracker.filter_unprocessed_files(data_files, "pubmed")
+
+        assert unprocessed == data_files[:1]
+        assert hashed == []
+
+    def test_same_size_rewrite_is_caught_by_hash(self, session, data_files):
+        tracker = FileProcessingTracker(session)
+        mark_all(tracker, data_files)
+        path = Path(data_files[1])
+        path.write_bytes(path.read_bytes().upper())
+        os.utime(path, ns=(0, 10**18))
+        hashed = counting_hashes(tracker)
+
+        unprocessed, _ = tracker.filter_unprocessed_files(data_files, "pubmed")
+
+        assert unprocessed == data_files[1:2]
+        assert hashed == [path.name]
+
+    def test_untrusted_stat_always_hashes(self, session, data_files):
+        mark_all(FileProcessingTracker(session), data_files)
+        tracker = FileProcessingTracker(session, trust_file_stat=False)
+        hashed = counting_hashes(tracker)
+
+        _, skipped = tracker.filter_unprocessed_files(data_files, "pubmed")
+
+        assert skipped == data_files
+        assert len(hashed) == len(data_files)
+
+
+class TestHashFallback:
+    def test_hash_match_records_stat_values_for_the_next_scan(self, engine, session, data_files):
+        tracker = FileProcessingTracker(session)
+        mark_all(tracker, data_files)
+        # Rows written before the stat columns existed
+        session.query(ProcessedFile).update({"file_mtime_ns": None, "file_inode": None})
+        session.commit()
+        hashed = counting_hashes(tracker)
+
+        _, skipped = tracker.filter_unprocessed_files(data_files, "pubmed")
+        assert skipped == data_files
+        assert len(hashed) == len(data_files)
+
+        with Session(engine) as other:
+            rows = other.query(ProcessedFile).order_by(ProcessedFile.file_name).all()
+            assert [row.file_mtime_ns for row in rows] == [
+                Path(path).stat().st_mtime_ns for path in data_files
+            ]
+            assert all(row.file_inode is not None for row in rows)
+
+        hashed.clear()
+        tracker.filter_unprocessed_files(data_files, "pubmed")
+        assert hashed == []
+
+    def test_is_file_already_processed_uses_the_same_checks(self, session, data_files):
+        tracker = FileProcessingTracker(session)
+        mark_all(tracker, data_files[:1])
+        hashed = counting_hashes(tracker)
+
+        assert tracker.is_file_already_processed(data_files[0], "pubmed") is not None
+        assert tracker.is_file_already_processed(data_files[1], "pubmed") is None
+        assert hashed == []
+
+
+class TestBatchedLookup:
+    def test_one_query_for_the_whole_batch(self, engine, session, data_files):
+        tracker = FileProcessingTracker(session)
+        mark_all(tracker, data_files[:3])
+        selects = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                selects.append(statement)
+
+        unprocessed, skipped = tracker.filter_unprocessed_files(data_files, "pubmed")
+
+        assert len(selects) == 1
+        assert (unprocessed, skipped) == (data_files[3:], data_files[:3])
+
+    def test_other_sources_are_not_matched(self, session, data_files):
+        tracker = FileProcessingTracker(session)
+        mark_all(tracker, data_files)
+
+        unprocessed, _ = tracker.filter_unprocessed_files(data_files, "clinical_trials")
+
+        assert unprocessed == data_files
@@ -0,0 +1,200 @@
+"""
+Tests for the shared Ollama request scheduler: priority ordering, handing a
+cancelled waiter's slot on, and AIMD adjustment of the concurrency limit
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add medical-mirrors source directory to path
+MIRRORS_SRC = Path(__file__).resolve().parents[2] / "services" / "user" / "medical-mirrors" / "src"
+sys.path.insert(0, str(MIRRORS_SRC))
+
+from llm_scheduler import EndpointScheduler, LLMPriority, LLMScheduler  # type: ignore
+
+OLLAMA = "http://ollama:11434"
+
+
+def finish(scheduler, slot, latency):
+    """Release ``slot`` as if its request took ``latency`` seconds"""
+    slot.started = time.monotonic() - latency
+    scheduler.release(slot)
+
+
+async def queue(scheduler, priority, order=None, name=None):
+    """Start a waiting acquire_async and let it reach the queue"""
+
+    async def request():
+        slot = await scheduler.acquire_async(priority)
+        if order is not None:
+            order.append(name)
+        return slot
+
+    task = asyncio.create_task(request())
+    await asyncio.sleep(0)
+    return task
+
+
+class TestPriority:
+    async def test_interactive_overtakes_queued_batch_work(self):
+        scheduler = EndpointScheduler(OLLAMA, initial_concurrency=1)
+        held = await scheduler.acquire_async()
+        order = []
+        batch_1 = await queue(scheduler, LLMPriority.BATCH, order, "batch_1")
+        batch_2 = await queue(scheduler, LLMPriority.BATCH, order, "batch_2")
+        interactive = await queue(scheduler, LLMPriority.INTERACTIVE, order, "interactive")
+        assert scheduler.get_metrics()["queued"] == {"interactive": 1, "batch": 2}
+
+        scheduler.release(held)
+        for task in (interactive, batch_1, batch_2):
+            scheduler.release(await asyncio.wait_for(task, 1))
+
+        assert order == ["interactive", "batch_1", "batch_2"]
+
+    async def test_new_request_does_not_jump_the_queue(self):
+        scheduler = EndpointScheduler(OLLAMA, initial_concurrency=1)
+        held = await scheduler.acquire_async()
+        queued = await queue(scheduler, LLMPriority.BATCH)
+        scheduler.release(held)  # grants the queued waiter before it runs
+        late = await queue(scheduler, LLMPriority.BATCH)
+
+        scheduler.release(await asyncio.wait_for(queued, 1))
+        scheduler.release(await asyncio.wait_for(late, 1))
+        assert scheduler.get_metrics()["in_flight"] == 0
+
+    def test_blocking_acquire_waits_for_release(self):
+        scheduler = EndpointScheduler(OLLAMA, initial_concurrency=1)
+        held = scheduler.acquire()
+        acquired = threading.Event()
+
+        def request():
+            scheduler.release(scheduler.acquire(LLMPriority.BATCH))
+            acquired.set()
+
+        thread = threading.Thread(target=request)
+        thread.start()
+        assert not acquired.wait(0.05)
+
+        scheduler.release(held)
+        assert acquired.wait(1)
+        thread.join()
+
+
+class TestCancellation:
+    async def test_cancelled_waiter_is_skipped(self):
+        scheduler = EndpointScheduler(OLLAMA, initial_concurrency=1)
+        held = await scheduler.acquire_async()
+        first = await queue(scheduler, LLMPriority.INTERACTIVE)
+        second = await queue(scheduler, LLMPriority.BATCH)
+
+        first.cancel()
+        await asyncio.gather(first, return_exceptions=True)
+        scheduler.release(held)
+
+        await asyncio.wait_for(second, 1)
+        assert scheduler.get_metrics()["in_flight"] == 1
+
+    async def test_slot_granted_during_cancellation_goes_to_next_waiter(self):
+        scheduler = EndpointScheduler(OLLAMA, initial_concurrency=1)
+        held = await scheduler.acquire_async()
+        first = await queue(scheduler, LLMPriority.INTERACTIVE)
+        second = await queue(scheduler, LLMPriority.BATCH)
+
+        scheduler.release(held)  # grants first ...
+        first.cancel()  # ... which is cancelled before it wakes up
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        await asyncio.wait_for(second, 1)
+        assert scheduler.get_metrics()["in_flight"] == 1
+
+
+class TestAdaptiveConcurrency:
+    async def test_limit_grows_while_requests_queue_at_baseline_latency(self):
+        scheduler = EndpointScheduler(OLLAMA, initial_concurrency=2, max_concurrency=3)
+        held = [await scheduler.acquire_async() for _ in range(2)]
+        waiter = await queue(scheduler, LLMPriority.BATCH)
+
+        finish(scheduler, held[0], 1.0)
+        assert scheduler._limit == pytest.approx(2.5)  # + 1 / limit
+
+        held[0] = await asyncio.wait_for(waiter, 1)
+        waiter = await queue(scheduler, LLMPriority.BATCH)
+        finish(scheduler, held[0], 1.0)
+        assert scheduler._limit == pytest.approx(2.5 + 1 / 2.5)
+
+        finish(scheduler, await asyncio.wait_for(waiter, 1), 1.0)
+        finish(scheduler, held[1], 1.0)
+
+    async def test_limit_holds_without_queued_requests(self):
+        scheduler = EndpointScheduler(OLLAMA, initial_concurrency=2)
+        for _ in range(5):
+            finish(scheduler, await scheduler.acquire_async(), 1.0)
+
+        assert scheduler._limit == 2.0
+
+    async def test_limit_is_capped_at_max_concurrency(self):
+        scheduler = EndpointScheduler(OLLAMA, initial_concurrency=2, max_concurrency=3)
+        for _ in range(10):
+            held = [await scheduler.acquire_async() for _ in range(scheduler.limit)]
+            waiter = await queue(scheduler, LLMPriority.BATCH)
+            for slot in held:
+                finish(scheduler, slot, 1.0)
+            scheduler.release(await asyncio.wait_for(waiter, 1))
+
+        assert scheduler.limit == 3
+        assert scheduler._limit == 3.0
+
+    async def test_failure_shrinks_limit_multiplicatively(self):
+        scheduler = EndpointScheduler(OLLAMA, initial_concurrency=4)
+        slot = await scheduler.acquire_async()
+        slot.mark_failed()
+        scheduler.release(slot)
+
+        assert scheduler._limit == pytest.approx(3.0)
+        assert scheduler.get_metrics()["failed"] == 1
+
+    async def test_failures_stop_at_min_concurrency(self):
+        scheduler = EndpointScheduler(OLLAMA, min_concurrency=2, initial_concurrency=4)
+        for _ in range(10):
+            slot = await scheduler.acquire_async()
+            slot.mark_failed()
+            scheduler.release(slot)
+
+        assert scheduler._limit == 2.0
+
+    async def test_slow_responses_shrink_limit(self):
+        scheduler = EndpointScheduler(OLLAMA, initial_concurrency=4, latency_tolerance=2.0)
+        finish(scheduler, await scheduler.acquire_async(), 1.0)  # sets the baseline
+        finish(scheduler, await scheduler.acquire_async(), 20.0)
+
+        assert scheduler._limit == pytest.approx(3.6)
+        assert scheduler.limit == 3
+        assert scheduler.get_metrics()["completed"] == 2
+
+
+class TestLLMScheduler:
+    async def test_exception_in_slot_counts_as_failure(self):
+        scheduler = LLMScheduler({"initial_concurrency": 4})
+        with pytest.raises(RuntimeError):
+            async with scheduler.aslot(OLLAMA + "/"):
+                raise RuntimeError("connection reset")
+
+        endpoint = scheduler.endpoint(OLLAMA)
+        assert endpoint._limit == pytest.approx(3.0)
+        assert scheduler.get_metrics()["in_flight"] == 0
+
+    def test_tokens_are_reported_per_endpoint(self):
+        scheduler = LLMScheduler()
+        with scheduler.slot(OLLAMA, LLMPriority.BATCH) as slot:
+            slot.record_tokens(120)
+        with scheduler.slot("http://other:11434") as slot:
+            slot.record_tokens(None)
+
+        metrics = scheduler.get_metrics()
+        assert [e["total_tokens"] for e in metrics["endpoints"]] == [120, 0]
@@ -0,0 +1,138 @@
+"""
+Tests for MinHash/LSH near-duplicate detection: field normalization, the
+band/row choice per threshold and clustering of trial records
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+# Add medical-mirrors source directory to path
+MIRRORS_SRC = Path(__file__).resolve().parents[2] / "services" / "user" / "medical-mirrors" / "src"
+sys.path.insert(0, str(MIRRORS_SRC))
+
+from near_duplicate import (  # type: ignore
+    LSH_TARGET_RECALL,
+    NearDuplicateDetector,
+    lsh_parameters,
+    normalize_tokens,
+)
+
+DRUG_THRESHOLD = 0.85
+
+TRIAL_FIELDS = ["title", "status", "phase", "conditions", "interventions"]
+
+TRIAL = {
+    "nct_id": "NCT00000001",
+    "title": "A Randomized, Double-Blind Study of Metformin Versus Placebo in Adults "
+             "With Newly Diagnosed Type 2 Diabetes Mellitus and Obesity",
+    "status": "RECRUITING",
+    "phase": "Phase 3",
+    "conditions": ["Type 2 Diabetes Mellitus", "Obesity"],
+    "interventions": ["Drug: Metformin", "Drug: Placebo"],
+}
+
+
+def recall_at(threshold, bands, rows):
+    return 1 - (1 - threshold ** rows) ** bands
+
+
+def summary(words):
+    return " ".join(f"finding{n}" for n in words)
+
+
+class TestNormalizeTokens:
+    def test_case_punctuation_and_spacing_are_ignored(self):
+        assert normalize_tokens("  Type-2  Diabetes, (T2DM)\n") == ["type", "2", "diabetes", "t2dm"]
+
+    def test_list_order_is_ignored(self):
+        assert normalize_tokens(["Obesity", "Type 2 Diabetes"]) == normalize_tokens(
+            ["type 2 diabetes", "OBESITY"],
+        )
+
+    def test_dict_items_keep_their_keys(self):
+        assert normalize_tokens({"dose": "500 mg", "route": "oral"}) == [
+            "dose", "500", "mg", "route", "oral",
+        ]
+
+    def test_missing_values_have_no_tokens(self):
+        assert normalize_tokens(None) == []
+        assert normalize_tokens("") == []
+
+
+class TestLshParameters:
+    @pytest.mark.parametrize(("threshold", "expected"), [(0.9, (12, 10)), (0.85, (16, 8))])
+    def test_bands_and_rows_for_configured_thresholds(self, threshold, expected):
+        assert lsh_parameters(threshold, 128) == expected
+
+    @pytest.mark.parametrize("threshold", [0.85, 0.9])
+    def test_most_rows_that_still_meet_target_recall(self, threshold):
+        bands, rows = lsh_parameters(threshold, 128)
+
+        assert recall_at(threshold, bands, rows) >= LSH_TARGET_RECALL
+        assert recall_at(threshold, 128 // (rows + 1), rows + 1) < LSH_TARGET_RECALL
+
+
+class TestFindClusters:
+    def test_near_identical_trials_cluster(self):
+        copy = dict(TRIAL, nct_id="NCT00000002",
+                    title=TRIAL["title"].upper().replace(",", "") + ".",
+                    status="recruiting",
+                    conditions=["Obesity", "Type 2 Diabetes Mellitus"])
+        other = dict(TRIAL, nct_id="NCT00000003",
+                     title="Exercise Training and Sleep Quality in Older Adults With Insomnia",
+                     phase="Not Applicable",
+                     conditions=["Insomnia"], interventions=["Behavioral: Exercise"])
+
+        clusters = NearDuplicateDetector().find_clusters([TRIAL, other, copy], TRIAL_FIELDS, 0.9)
+
+        assert len(clusters) == 1
+        assert clusters[0].members == [0, 2]
+        assert clusters[0].min_similarity == 1.0
+
+    def test_distinct_trials_do_not_cluster(self):
+        placebo_only = dict(TRIAL, nct_id="NCT00000002",
+                            title="Metformin Pharmacokinetics in Healthy Volunteers",
+                            phase="Phase 1", conditions=["Healthy"])
+        other_drug = dict(TRIAL, nct_id="NCT00000003",
+                          title=TRIAL["title"].replace("Metformin", "Semaglutide"),
+                          interventions=["Drug: Semaglutide", "Drug: Placebo"])
+
+        clusters = NearDuplicateDetector().find_clusters(
+            [TRIAL, placebo_only, other_drug], TRIAL_FIELDS, 0.9,
+        )
+
+        assert clusters == []
+
+    def test_clusters_merge_transitively(self):
+        # Each neighbour differs in a few words at one end, so first and last
+        # are only similar through the middle record
+        records = [
+            {"summary": summary(range(100))},
+            {"summary": summary(range(6, 106))},
+            {"summary": summary(range(12, 112))},
+        ]
+        detector = NearDuplicateDetector()
+        signatures, _ = detector.signatures(records, ["summary"])
+
+        assert (signatures[0] == signatures[1]).mean() >= DRUG_THRESHOLD
+        assert (signatures[1] == signatures[2]).mean() >= DRUG_THRESHOLD
+        assert (signatures[0] == signatures[2]).mean() < DRUG_THRESHOLD
+
+        clusters = detector.find_clusters(records, ["summary"], DRUG_THRESHOLD)
+
+        assert [cluster.members for cluster in clusters] == [[0, 1, 2]]
+        assert clusters[0].min_similarity < DRUG_THRESHOLD
+
+    def test_empty_records_are_never_clustered(self):
+        clusters = NearDuplicateDetector().find_clusters(
+            [{"title": None}, TRIAL, {"title": ""}, dict(TRIAL)], TRIAL_FIELDS, 0.9,
+        )
+
+        assert [cluster.members for cluster in clusters] == [[1, 3]]
+
+    def test_single_record_has_no_clusters(self):
+        assert NearDuplicateDetector().find_clusters([TRIAL], TRIAL_FIELDS, 0.9) == []
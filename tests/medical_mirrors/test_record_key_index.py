@@ -0,0 +1,83 @@
+"""
+Tests for RecordKeyIndex: loading keys from a table, batch membership and
+key counting while keys wait in the pending set
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+# Add medical-mirrors source directory to path
+MIRRORS_SRC = Path(__file__).resolve().parents[2] / "services" / "user" / "medical-mirrors" / "src"
+sys.path.insert(0, str(MIRRORS_SRC))
+
+from record_key_index import RecordKeyIndex  # type: ignore
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE clinical_trials (nct_id TEXT PRIMARY KEY)"))
+        conn.execute(
+            text("INSERT INTO clinical_trials (nct_id) VALUES (:nct_id)"),
+            [{"nct_id": f"NCT{n:08d}"} for n in range(1, 251)] + [{"nct_id": "ISRCTN123"}],
+        )
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+class TestFromTable:
+    def test_loads_every_key_in_chunks(self, session):
+        index = RecordKeyIndex.from_table(session, "clinical_trials", "nct_id", chunk_size=100)
+
+        assert len(index) == 251
+        assert index.get_stats()["numeric_keys"] == 250
+        assert index.get_stats()["other_keys"] == 1
+
+    def test_leaves_the_session_connection_options_alone(self, session):
+        RecordKeyIndex.from_table(session, "clinical_trials", "nct_id", chunk_size=100)
+
+        assert "stream_results" not in session.connection().get_execution_options()
+
+
+class TestLookup:
+    def test_contains_many_covers_sorted_pending_and_other_keys(self, session):
+        index = RecordKeyIndex.from_table(session, "clinical_trials", "nct_id")
+        index.update(["NCT00000300", "EUCTR2020-1"])
+
+        found = index.contains_many(
+            ["NCT00000001", "NCT00000300", "ISRCTN123", "EUCTR2020-1", "NCT00000999", "NCT1"]
+        )
+
+        assert found == [True, True, True, True, False, False]
+        assert index.lookups == 6
+
+    def test_non_canonical_pmid_is_not_confused_with_its_number(self):
+        index = RecordKeyIndex.for_key_field("pmid")
+        index.update(["12345"])
+
+        assert "12345" in index
+        assert "012345" not in index
+
+
+class TestLen:
+    def test_re_added_keys_are_counted_once(self, session):
+        index = RecordKeyIndex.from_table(session, "clinical_trials", "nct_id")
+        index.update(["NCT00000001", "NCT00000002", "NCT00000300", "ISRCTN123"])
+
+        assert len(index) == 252
+        assert index.get_stats()["numeric_keys"] == 251
+
+    def test_count_is_unchanged_by_merging_pending_keys(self):
+        index = RecordKeyIndex.for_key_field("pmid", merge_threshold=3)
+        index.update(["1", "2", "3"])  # merged into the sorted array
+        index.update(["2", "4"])
+        assert len(index) == 4
+
+        index.update(["3"])  # reaches the threshold again
+        assert len(index) == 4
@@ -0,0 +1,271 @@
+"""
+Tests for the data-key cache, batched key usage logging and bulk encryption
+in HealthcareEncryptionManager, against an in-memory key table
+"""
+
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add the healthcare-api directory to the path for imports
+healthcare_api_path = Path(__file__).parent.parent.parent / "services" / "user" / "healthcare-api"
+sys.path.insert(0, str(healthcare_api_path))
+os.environ.setdefault("ENVIRONMENT", "testing")
+
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from src.security.encryption_manager import EncryptionLevel, HealthcareEncryptionManager
+
+
+class FakeDatabaseError(Exception):
+    def __init__(self, message, pgcode=None):
+        super().__init__(message)
+        self.pgcode = pgcode
+
+
+class KeyTableCursor:
+    def __init__(self, db):
+        self.db = db
+        self.result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return None
+
+    def execute(self, sql, params=()):
+        statement = " ".join(sql.split())
+        self.db.statements.append(statement)
+        if self.db.aborted:
+            msg = "current transaction is aborted, commands ignored until end of transaction block"
+            raise FakeDatabaseError(msg, "25P02")
+        keys = self.db.keys
+        if statement.startswith("INSERT INTO encryption_keys"):
+            key_id, *_, encrypted_key, is_active, expires_at = params
+            keys[key_id] = [encrypted_key, is_active, expires_at]
+        elif statement.startswith("SELECT key_id, encryption_level"):
+            self.result = [(key_id, key_id.removeprefix("default_")) for key_id in keys]
+        elif statement.startswith("UPDATE encryption_keys SET key_id"):
+            new_id, old_id = params
+            keys[new_id] = keys.pop(old_id)
+        elif statement.startswith("SELECT encrypted_key"):
+            row = keys.get(params[0])
+            self.result = [tuple(row)] if row else []
+        elif statement.startswith("INSERT INTO key_usage_log"):
+            rows = list(zip(*[iter(params)] * 6, strict=True))
+            if self.db.usage_log_down:
+                self.db.aborted = True
+                msg = "server closed the connection unexpectedly"
+                raise FakeDatabaseError(msg)
+            if any(user_id and len(user_id) > 255 for _, _, _, user_id, _, _ in rows):
+                self.db.aborted = True
+                msg = "value too long for type character varying(255)"
+                raise FakeDatabaseError(msg, "22001")
+            self.db.pending_usage_rows.extend(rows)
+
+    def fetchone(self):
+        return self.result[0] if self.result else None
+
+    def fetchall(self):
+        return self.result
+
+
+class KeyTableConnection:
+    def __init__(self):
+        self.keys = {}
+        self.statements = []
+        self.usage_rows = []
+        self.pending_usage_rows = []
+        self.aborted = False
+        self.usage_log_down = False
+
+    def create_connection(self):
+        return self
+
+    def cursor(self):
+        return KeyTableCursor(self)
+
+    def commit(self):
+        if self.aborted:
+            msg = "current transaction is aborted"
+            raise FakeDatabaseError(msg, "25P02")
+        self.usage_rows.extend(self.pending_usage_rows)
+        self.pending_usage_rows.clear()
+
+    def rollback(self):
+        self.aborted = False
+        self.pending_usage_rows.clear()
+
+    def close(self):
+        return None
+
+    def key_lookups(self):
+        return sum(statement.startswith("SELECT encrypted_key") for statement in self.statements)
+
+
+@pytest.fixture
+def db():
+    return KeyTableConnection()
+
+
+def make_manager(db, **config):
+    manager = HealthcareEncryptionManager(
+        db,
+        {"master_key_override": Fernet.generate_key(), **config},
+    )
+    db.statements.clear()
+    return manager
+
+
+class TestDataKeyCache:
+    def test_repeated_encryption_unwraps_key_once(self, db):
+        manager = make_manager(db)
+
+        for value in ("a", "b", "c"):
+            manager.encrypt_phi_data(value)
+
+        assert db.key_lookups() == 1
+
+    def test_stale_entry_is_revalidated_and_deactivation_honoured(self, db):
+        manager = make_manager(db, key_cache_ttl_seconds=0.05)
+        manager.encrypt_phi_data("a")
+
+        db.keys["default_healthcare"][1] = False  # deactivated elsewhere
+        manager.encrypt_phi_data("b")  # still within TTL
+        time.sleep(0.06)
+
+        with pytest.raises(ValueError):
+            manager.encrypt_phi_data("c")
+
+    def test_expired_key_is_not_served_from_cache(self, db):
+        manager = make_manager(db)
+        db.keys["default_healthcare"][2] = datetime.now() + timedelta(milliseconds=50)
+        manager.encrypt_phi_data("a")
+        time.sleep(0.06)
+
+        with pytest.raises(ValueError):
+            manager.encrypt_phi_data("b")
+
+    def test_invalidate_forces_reload(self, db):
+        manager = make_manager(db)
+        manager.encrypt_phi_data("a")
+        manager.key_manager.invalidate_key("default_healthcare")
+        manager.encrypt_phi_data("b")
+
+        assert db.key_lookups() == 2
+
+
+class TestKeyUsageLog:
+    def test_usage_rows_are_written_in_one_batch(self, db):
+        manager = make_manager(db)
+        packages = manager.encrypt_many(["a", "b", "c"])
+        manager.decrypt_many(packages, user_id="dr_smith")
+
+        assert db.usage_rows == []
+        assert manager.flush_key_usage_log() == 7  # retrieve + 3 encrypt + 3 decrypt
+
+        inserts = [s for s in db.statements if s.startswith("INSERT INTO key_usage_log")]
+        assert len(inserts) == 1
+        assert [row[1] for row in db.usage_rows].count("decrypt") == 3
+        assert all(row[3] == "dr_smith" for row in db.usage_rows if row[1] == "decrypt")
+
+    def test_batch_size_triggers_flush(self, db):
+        manager = make_manager(db, key_usage_log_batch_size=2)
+        manager.encrypt_phi_data("a")
+
+        assert len(db.usage_rows) == 2
+
+    def test_quiet_buffer_is_flushed_on_interval(self, db):
+        manager = make_manager(db, key_usage_log_flush_seconds=0.05)
+        manager.encrypt_phi_data("a")
+
+        deadline = time.monotonic() + 2
+        while not db.usage_rows and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(db.usage_rows) == 2  # retrieve + encrypt, with no further calls
+        manager.close()
+
+    def test_close_flushes_buffer(self, db):
+        manager = make_manager(db)
+        manager.encrypt_phi_data("a")
+        assert db.usage_rows == []
+
+        manager.close()
+
+        assert len(db.usage_rows) == 2
+
+
+class TestUsageLogFailures:
+    def test_failed_flush_does_not_block_key_lookups(self, db):
+        manager = make_manager(db)
+        manager.encrypt_phi_data("a")
+        db.usage_log_down = True
+
+        assert manager.flush_key_usage_log() == 0
+        manager.key_manager.invalidate_key()
+        assert manager.key_manager.get_key("default_healthcare") is not None
+
+        db.usage_log_down = False
+        assert manager.flush_key_usage_log() == 3  # the kept rows plus the new retrieve
+        assert not db.aborted
+
+    def test_invalid_row_is_dropped_and_the_rest_written(self, db):
+        manager = make_manager(db)
+        packages = manager.encrypt_many(["a", "b", "c"])
+        manager.decrypt_many(packages[:1], user_id="x" * 300)
+        manager.decrypt_many(packages[1:], user_id="dr_smith")
+
+        assert manager.flush_key_usage_log() == 6
+        assert [row[3] for row in db.usage_rows if row[1] == "decrypt"] == ["dr_smith"] * 2
+        assert manager.key_manager._usage_buffer == []
+        assert manager.key_manager.get_key("default_critical") is not None
+
+    def test_flush_waits_for_statements_of_other_threads(self, db):
+        manager = make_manager(db)
+        manager.encrypt_phi_data("a")
+        key_manager = manager.key_manager
+
+        with key_manager.connection_lock:  # e.g. a rotate_key in progress
+            flusher = threading.Thread(target=manager.flush_key_usage_log)
+            flusher.start()
+            flusher.join(0.05)
+            assert flusher.is_alive()
+            assert db.usage_rows == []
+        flusher.join(1)
+
+        assert len(db.usage_rows) == 2
+
+
+class TestBulkEncryption:
+    @pytest.mark.parametrize("level", list(EncryptionLevel))
+    def test_round_trip(self, db, level):
+        manager = make_manager(db)
+        records = [{"name": "Maria Garcia", "mrn": "MED482913"}, "free text note"]
+
+        packages = manager.encrypt_many(records, level)
+        assert manager.decrypt_many(packages) == records
+        assert [manager.decrypt_data(package) for package in packages] == records
+
+    def test_packages_match_single_record_shape(self, db):
+        manager = make_manager(db)
+        single = manager.encrypt_critical_data("x")
+        bulk = manager.encrypt_many(["x"], EncryptionLevel.CRITICAL)[0]
+
+        assert set(single) == set(bulk)
+        assert single["algorithm"] == bulk["algorithm"] == "AES-256-GCM"
+
+    def test_existing_aes_gcm_ciphertext_still_decrypts(self, db):
+        manager = make_manager(db)
+        raw_key = manager.key_manager.get_key("default_critical")
+        iv = os.urandom(12)
+        encryptor = Cipher(algorithms.AES(raw_key[:32]), modes.GCM(iv)).encryptor()
+        ciphertext = encryptor.update(b"legacy value") + encryptor.finalize()
+
+        legacy = iv + encryptor.tag + ciphertext
+        assert manager._decrypt_aes_gcm(legacy, raw_key) == b"legacy value"
@@ -0,0 +1,184 @@
+"""
+Tests for memoized query routing, pinned prepared statements and
+per-statement latency stats in SecureDatabaseManager, against in-memory pools
+"""
+
+import os
+import sys
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import pytest
+
+# Add the healthcare-api directory to the path for imports
+healthcare_api_path = Path(__file__).parent.parent.parent / "services" / "user" / "healthcare-api"
+sys.path.insert(0, str(healthcare_api_path))
+os.environ.setdefault("ENVIRONMENT", "testing")
+
+from asyncpg.exceptions import InvalidCachedStatementError
+from core.database.secure_db_manager import (
+    DatabaseType,
+    HotStatementConnection,
+    QueryType,
+    SecureDatabaseManager,
+)
+
+PUBMED_SEARCH = "SELECT pmid, title FROM pubmed_articles WHERE search_vector @@ plainto_tsquery($1) LIMIT $2"
+
+
+class FakeStatement:
+    def __init__(self, conn, query):
+        self.conn = conn
+        self.query = query
+
+    async def fetch(self, *params):
+        if self.conn.invalidate_next:
+            self.conn.invalidate_next = False
+            msg = "cached statement plan is invalid due to a database schema change"
+            raise InvalidCachedStatementError(msg)
+        self.conn.calls.append(("prepared", self.query, params))
+        return [{"pmid": "1"}]
+
+
+class FakeConnection:
+    # The real per-connection statement cache, over a fake prepare()
+    prepare_hot = HotStatementConnection.prepare_hot
+    drop_hot = HotStatementConnection.drop_hot
+
+    def __init__(self):
+        self.hot_statements = OrderedDict()
+        self.prepares = 0
+        self.calls = []
+        self.invalidate_next = False
+
+    async def prepare(self, query):
+        self.prepares += 1
+        return FakeStatement(self, query)
+
+    async def fetch(self, query, *params):
+        self.calls.append(("text", query, params))
+        if "missing_table" in query:
+            msg = 'relation "missing_table" does not exist'
+            raise RuntimeError(msg)
+        return []
+
+
+class FakePool:
+    def __init__(self):
+        self.conn = FakeConnection()
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+    def get_size(self):
+        return 1
+
+    def get_idle_size(self):
+        return 1
+
+    def get_max_size(self):
+        return 1
+
+    def get_min_size(self):
+        return 1
+
+
+@pytest.fixture
+def manager(monkeypatch, tmp_path):
+    monkeypatch.setenv("AUDIT_SPILL_DIR", str(tmp_path))
+    manager = SecureDatabaseManager()
+    manager.public_pool = FakePool()
+    manager.private_pool = FakePool()
+    return manager
+
+
+class TestRouteCache:
+    def test_route_is_computed_once_per_statement(self, manager):
+        query = "SELECT * FROM appointments WHERE provider_id = $1"
+        for _ in range(3):
+            assert manager._determine_database(query) == DatabaseType.PRIVATE
+            assert manager._classify_query(query) == QueryType.SELECT
+
+        assert manager.route_cache_misses == 1
+        assert manager.route_cache_hits == 5
+        assert manager._route_query(query).tables == ("appointments",)
+
+    def test_cache_is_bounded(self, manager):
+        manager.route_cache_size = 2
+        for table in ("pubmed_articles", "clinical_trials", "fda_drugs"):
+            manager._route_query(f"SELECT COUNT(*) FROM {table}")
+
+        assert len(manager._route_cache) == 2
+        assert "SELECT COUNT(*) FROM pubmed_articles" not in manager._route_cache
+
+    def test_explicit_phi_tables_override_cached_route(self, manager):
+        query = "SELECT * FROM v_schedule_summary"
+        assert manager._determine_database(query) == DatabaseType.PUBLIC
+        assert manager._determine_database(query, ["appointments"]) == DatabaseType.PRIVATE
+
+
+class TestPreparedStatements:
+    async def test_hot_query_is_prepared_once_per_connection(self, manager):
+        for term in ("asthma", "copd", "asthma"):
+            await manager.fetch(PUBMED_SEARCH, term, 10, database=DatabaseType.PUBLIC, prepared=True)
+
+        conn = manager.public_pool.conn
+        assert conn.prepares == 1
+        assert [call[0] for call in conn.calls] == ["prepared"] * 3
+
+    async def test_unprepared_query_goes_through_connection(self, manager):
+        await manager.fetch(PUBMED_SEARCH, "asthma", 10, database=DatabaseType.PUBLIC)
+
+        conn = manager.public_pool.conn
+        assert conn.prepares == 0
+        assert conn.calls == [("text", PUBMED_SEARCH, ("asthma", 10))]
+
+    async def test_statement_limit_evicts_least_recently_used(self, manager):
+        manager.max_prepared_statements = 2
+        conn = manager.public_pool.conn
+        for table in ("pubmed_articles", "clinical_trials", "pubmed_articles", "fda_drugs"):
+            await manager.fetch(f"SELECT * FROM {table}", database=DatabaseType.PUBLIC, prepared=True)
+
+        assert list(conn.hot_statements) == ["SELECT * FROM pubmed_articles", "SELECT * FROM fda_drugs"]
+
+    async def test_invalidated_statement_is_prepared_again(self, manager):
+        conn = manager.public_pool.conn
+        await manager.fetch(PUBMED_SEARCH, "asthma", 10, database=DatabaseType.PUBLIC, prepared=True)
+        conn.invalidate_next = True
+
+        rows = await manager.fetch(PUBMED_SEARCH, "copd", 10, database=DatabaseType.PUBLIC, prepared=True)
+
+        assert rows == [{"pmid": "1"}]
+        assert conn.prepares == 2
+
+
+class TestStatementLatency:
+    async def test_pool_stats_include_statement_histograms(self, manager):
+        for _ in range(4):
+            await manager.fetch(PUBMED_SEARCH, "asthma", 10, database=DatabaseType.PUBLIC, prepared=True)
+
+        stats = await manager.get_pool_stats()
+        label = manager._route_query(PUBMED_SEARCH).label
+        histogram = stats["statements"][label]
+
+        assert label.startswith("SELECT pubmed_articles ")
+        assert histogram["count"] == 4
+        assert histogram["buckets_ms"]["+Inf"] == 4
+        assert stats["query_routing"]["misses"] == 1
+
+    async def test_each_query_looks_up_its_route_once(self, manager):
+        for _ in range(4):
+            await manager.fetch(PUBMED_SEARCH, "asthma", 10, prepared=True)
+
+        assert manager.route_cache_misses == 1
+        assert manager.route_cache_hits == 3
+
+    async def test_failed_query_latency_is_recorded(self, manager):
+        query = "SELECT * FROM missing_table"
+        with pytest.raises(RuntimeError):
+            await manager.fetch(query, database=DatabaseType.PUBLIC)
+
+        stats = await manager.get_pool_stats()
+        assert stats["statements"][manager._route_cache[query].label]["count"] == 1
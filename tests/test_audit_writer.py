@@ -0,0 +1,224 @@
+"""
+Test the batched audit writer used for phi_access_audit
+
+Checks size and time flush triggers, that records survive a failing sink and
+a process restart through the local spill, that an overflowing queue keeps
+records on disk in order instead of dropping them, and that records the sink
+never accepts are set aside instead of blocking the queue.
+"""
+
+import asyncio
+import json
+import stat
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Add the healthcare-api directory to the path for imports
+healthcare_api_path = Path(__file__).parent.parent / "services" / "user" / "healthcare-api"
+sys.path.insert(0, str(healthcare_api_path))
+
+from core.database.audit_writer import BatchedAuditWriter
+
+PRIVATE_FILE_MODE = 0o600
+
+
+class RecordingSink:
+    def __init__(self):
+        self.batches = []
+        self.fail = False
+        self.invalid_seqs = set()
+
+    async def __call__(self, records):
+        if self.fail:
+            msg = "database unavailable"
+            raise ConnectionError(msg)
+        if any(record["seq"] in self.invalid_seqs for record in records):
+            msg = "value too long for type character varying(255)"
+            raise ValueError(msg)
+        self.batches.append(list(records))
+
+    @property
+    def records(self):
+        return [record for batch in self.batches for record in batch]
+
+
+def audit_record(index):
+    return {"table_name": "appointments", "operation": "SELECT", "seq": index}
+
+
+@pytest.fixture
+def sink():
+    return RecordingSink()
+
+
+class TestFlushTriggers:
+    async def test_full_batch_flushes_without_waiting_for_interval(self, sink):
+        writer = BatchedAuditWriter(sink, batch_size=3, flush_interval_seconds=60)
+        await writer.start()
+        for index in range(3):
+            writer.submit(audit_record(index))
+        await asyncio.sleep(0.01)
+
+        assert [len(batch) for batch in sink.batches] == [3]
+        await writer.close()
+
+    async def test_interval_flushes_partial_batch(self, sink):
+        writer = BatchedAuditWriter(sink, batch_size=100, flush_interval_seconds=0.02)
+        await writer.start()
+        writer.submit(audit_record(0))
+        await asyncio.sleep(0.08)
+
+        assert sink.records == [audit_record(0)]
+        assert writer.get_metrics()["flush_count"] == 1
+        await writer.close()
+
+    async def test_close_drains_queue(self, sink):
+        writer = BatchedAuditWriter(sink, batch_size=4, flush_interval_seconds=60)
+        await writer.start()
+        for index in range(10):
+            writer.submit(audit_record(index))
+        await writer.close()
+
+        assert [record["seq"] for record in sink.records] == list(range(10))
+        with pytest.raises(RuntimeError):
+            writer.submit(audit_record(11))
+
+
+class TestSpill:
+    async def test_failed_flush_keeps_records_and_retries(self, sink, tmp_path):
+        writer = BatchedAuditWriter(sink, batch_size=2, spill_dir=tmp_path)
+        sink.fail = True
+        writer.submit(audit_record(0))
+        writer.submit(audit_record(1))
+
+        assert await writer.flush() == 0
+        assert writer.get_metrics()["failed_flushes"] == 1
+        assert writer.pending_records == 2
+
+        sink.fail = False
+        assert await writer.flush() == 2
+        assert writer.pending_records == 0
+        assert list(tmp_path.iterdir()) == []
+
+    async def test_records_survive_restart(self, sink, tmp_path):
+        accessed_at = datetime(2024, 3, 1, 9, 30)
+        crashed = BatchedAuditWriter(sink, spill_dir=tmp_path)
+        crashed.submit({**audit_record(0), "accessed_at": accessed_at})
+        crashed.submit(audit_record(1))
+        # No flush or close: the process died with both records queued
+
+        restarted = BatchedAuditWriter(sink, spill_dir=tmp_path)
+        assert restarted.pending_records == 2
+        restarted.submit(audit_record(2))
+        await restarted.close()
+
+        assert [record["seq"] for record in sink.records] == [0, 1, 2]
+        assert sink.records[0]["accessed_at"] == accessed_at
+        assert list(tmp_path.iterdir()) == []
+
+    async def test_torn_last_line_is_ignored_on_recovery(self, sink, tmp_path):
+        crashed = BatchedAuditWriter(sink, spill_dir=tmp_path)
+        crashed.submit(audit_record(0))
+        segment = next(tmp_path.iterdir())
+        with segment.open("a") as f:
+            f.write('{"table_name": "appoi')
+
+        restarted = BatchedAuditWriter(sink, spill_dir=tmp_path)
+        await restarted.close()
+
+        assert sink.records == [audit_record(0)]
+
+    async def test_overflow_waits_on_disk_in_order(self, sink, tmp_path):
+        writer = BatchedAuditWriter(
+            sink, batch_size=2, max_queue_size=4, spill_dir=tmp_path, segment_max_records=3,
+        )
+        for index in range(11):
+            writer.submit(audit_record(index))
+
+        metrics = writer.get_metrics()
+        assert metrics["queue_depth"] == 4
+        assert metrics["spilled_records"] == 7
+        assert metrics["dropped_records"] == 0
+
+        assert await writer.flush() == 11
+        assert [record["seq"] for record in sink.records] == list(range(11))
+        assert writer.get_metrics()["replayed_records"] == 7
+        assert list(tmp_path.iterdir()) == []
+
+    async def test_overflow_without_spill_dir_is_counted(self, sink):
+        writer = BatchedAuditWriter(sink, batch_size=1, max_queue_size=2)
+        for index in range(3):
+            writer.submit(audit_record(index))
+
+        assert writer.get_metrics()["dropped_records"] == 1
+        assert await writer.flush() == 2
+
+
+    async def test_spill_files_are_private(self, sink, tmp_path):
+        writer = BatchedAuditWriter(sink, batch_size=2, spill_dir=tmp_path, max_batch_failures=1)
+        sink.invalid_seqs = {1}
+        writer.submit(audit_record(0))
+        writer.submit(audit_record(1))
+        segment = next(tmp_path.glob("audit-*.jsonl"))
+
+        assert stat.S_IMODE(segment.stat().st_mode) == PRIVATE_FILE_MODE
+        await writer.flush()
+        assert stat.S_IMODE((tmp_path / "audit.rejected").stat().st_mode) == PRIVATE_FILE_MODE
+
+    def test_relative_spill_dir_is_refused(self, sink):
+        with pytest.raises(ValueError, match="absolute"):
+            BatchedAuditWriter(sink, spill_dir="logs/audit_spill")
+
+
+class TestRejectedRecords:
+    async def test_invalid_record_is_isolated_after_repeated_failures(self, sink, tmp_path):
+        writer = BatchedAuditWriter(sink, batch_size=8, spill_dir=tmp_path, max_batch_failures=2)
+        sink.invalid_seqs = {5}
+        for index in range(8):
+            writer.submit(audit_record(index))
+
+        assert await writer.flush() == 0
+        assert await writer.flush() == 8
+
+        assert sorted(record["seq"] for record in sink.records) == [0, 1, 2, 3, 4, 6, 7]
+        assert writer.get_metrics()["rejected_records"] == 1
+        assert writer.pending_records == 0
+        rejected = [json.loads(line) for line in (tmp_path / "audit.rejected").read_text().splitlines()]
+        assert [entry["record"]["seq"] for entry in rejected] == [5]
+        assert "too long" in rejected[0]["error"]
+        assert [path.name for path in tmp_path.iterdir()] == ["audit.rejected"]
+        assert writer.get_metrics()["rejected_file_bytes"] == (tmp_path / "audit.rejected").stat().st_size
+
+    async def test_outage_does_not_reject_records(self, sink, tmp_path):
+        writer = BatchedAuditWriter(sink, batch_size=4, spill_dir=tmp_path, max_batch_failures=1)
+        sink.fail = True
+        for index in range(4):
+            writer.submit(audit_record(index))
+
+        assert await writer.flush() == 0
+        assert writer.get_metrics()["rejected_records"] == 0
+        assert writer.pending_records == 4
+
+        sink.fail = False
+        assert await writer.flush() == 4
+        assert [record["seq"] for record in sink.records] == [0, 1, 2, 3]
+
+    async def test_permanent_error_rejects_a_lone_record(self, sink):
+        writer = BatchedAuditWriter(
+            sink, batch_size=4, max_batch_failures=1,
+            is_permanent_error=lambda error: isinstance(error, ValueError),
+        )
+        sink.invalid_seqs = {0}
+        writer.submit(audit_record(0))
+
+        assert await writer.flush() == 1
+        assert writer.get_metrics()["rejected_records"] == 1
+        assert writer.queue_depth == 0
+
+
+def test_batch_size_cannot_exceed_queue(sink):
+    with pytest.raises(ValueError):
+        BatchedAuditWriter(sink, batch_size=10, max_queue_size=5)
@@ -0,0 +1,98 @@
+"""
+Test incremental PHI scanning for live transcripts
+
+Checks that PHI split across chunk boundaries is redacted, that streamed deltas
+concatenate to the same text as masking the whole transcript, and that the
+work per chunk stays bounded as the session grows.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the healthcare-api directory to the path for imports
+healthcare_api_path = Path(__file__).parent.parent / "services" / "user" / "healthcare-api"
+sys.path.insert(0, str(healthcare_api_path))
+
+from src.healthcare_mcp.incremental_phi_scanner import (
+    IncrementalPHIScanner,
+    create_transcript_scanner,
+)
+from src.healthcare_mcp.phi_scan_engine import PHIScanEngine
+
+CHUNKS = [
+    "Patient says the best number to call is 415",
+    "832 1190 after five.",
+    "Results can go to maria.g@mailhost.org and her",
+    "social is 321-54-9876 for the form.",
+]
+
+
+def stream(scanner, chunks):
+    return "".join(scanner.feed(chunk) for chunk in chunks) + scanner.flush()
+
+
+def whole(chunks, boundary_window=64):
+    scanner = create_transcript_scanner(boundary_window)
+    transcript = " ".join(chunks)
+    return scanner.feed(transcript) + scanner.flush()
+
+
+class TestIncrementalPHIScanner:
+    """Streaming redaction semantics."""
+
+    def test_phi_split_across_chunks_is_redacted(self):
+        scanner = create_transcript_scanner()
+        text = stream(scanner, ["Call me at 415", "832 1190 tomorrow."])
+
+        assert text == "Call me at [PHONE_REDACTED] tomorrow."
+        assert scanner.phi_counts == {"phone": 1}
+
+    def test_deltas_concatenate_to_whole_transcript_masking(self):
+        for window in (16, 32, 64):
+            assert stream(create_transcript_scanner(window), CHUNKS) == whole(CHUNKS)
+
+    def test_emitted_text_lags_by_at_most_two_windows(self):
+        scanner = create_transcript_scanner(boundary_window=20)
+        scanner.feed("No identifiers in this first sentence at all.")
+
+        assert 20 <= scanner.pending_length <= 40
+        assert scanner.flush().endswith("at all.")
+        assert scanner.pending_length == 0
+
+    def test_deltas_end_on_word_boundaries(self):
+        scanner = create_transcript_scanner(boundary_window=16)
+        chunks = ["Patient reports the cough is worsening", "at night and", "improves by morning."]
+        deltas = [scanner.feed(chunk) for chunk in chunks]
+
+        assert all(delta.endswith(" ") for delta in deltas if delta)
+        assert "".join(deltas) + scanner.flush() == " ".join(chunks)
+
+    def test_match_straddling_the_cut_is_held_back_whole(self):
+        scanner = create_transcript_scanner(boundary_window=10)
+        first = scanner.feed("Send it to pt4821@mailhost.org")
+
+        assert "@" not in first
+        assert first + scanner.flush() == "Send it to [EMAIL_REDACTED]"
+
+    def test_scan_cost_is_linear_in_transcript_length(self):
+        scanner = create_transcript_scanner(boundary_window=32)
+        sentence = "Blood pressure is stable, call 415 832 1190 with any concerns."
+        for _ in range(500):
+            scanner.feed(sentence)
+        scanner.flush()
+
+        # Each character is scanned as new text, lookback and held-back boundary at most
+        assert scanner.scanned_chars < 4 * scanner.transcript_length
+        assert scanner.phi_counts == {"phone": 500}
+
+    def test_mask_char_used_without_replacement_label(self):
+        engine = PHIScanEngine([("mrn", r"\bMRN\s*\d{6}\b")])
+        scanner = IncrementalPHIScanner(engine, boundary_window=16)
+
+        assert stream(scanner, ["chart MRN", "482913 reviewed"]) == "chart ********** reviewed"
+
+    def test_boundary_window_must_be_positive(self):
+        with pytest.raises(ValueError):
+            create_transcript_scanner(boundary_window=0)
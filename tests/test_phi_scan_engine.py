@@ -0,0 +1,109 @@
+"""
+Test the single-pass PHI scanning engine
+
+Checks that the combined sweep finds exactly what separate per-pattern
+finditer passes find, that the synthetic allowlist is applied per match, and
+that BasicPHIDetector results are unchanged by the engine.
+"""
+
+import re
+import sys
+from pathlib import Path
+
+# Add the healthcare-api directory to the path for imports
+healthcare_api_path = Path(__file__).parent.parent / "services" / "user" / "healthcare-api"
+sys.path.insert(0, str(healthcare_api_path))
+
+from src.healthcare_mcp.phi_detection import BasicPHIDetector, PHIDetector
+from src.healthcare_mcp.phi_scan_engine import PHIScanEngine
+
+CLINICAL_NOTE = (
+    "Patient Maria Garcia seen today. DOB: 03/14/1962. MRN: MED482913. "
+    "Contact 415-832-1190 or maria.g@mailhost.org. Lives at 42 Cedar Road, "
+    "Springfield 62704. Insurance number: BC482019384. BP 142/88, HR 92. "
+    "Teaching case reviewed with Jane Doe, callback 555-555-1234."
+)
+
+
+def per_pattern_matches(patterns, text):
+    return sorted(
+        (phi_type, match.start(), match.end())
+        for phi_type, pattern in patterns
+        for match in re.finditer(pattern, text, re.IGNORECASE)
+    )
+
+
+class TestPHIScanEngine:
+    """Combined sweep semantics."""
+
+    def test_matches_equal_separate_finditer_passes(self):
+        detector = BasicPHIDetector()
+        patterns = [(t, info["pattern"]) for t, info in detector.phi_patterns.items()]
+        engine = PHIScanEngine(patterns)
+
+        found = sorted((m.phi_type, m.start, m.end) for m in engine.scan(CLINICAL_NOTE))
+        assert found == per_pattern_matches(patterns, CLINICAL_NOTE)
+
+    def test_overlapping_types_are_all_reported(self):
+        # The broad name pattern starts earlier and covers "MRN"; the MRN match must survive
+        patterns = [("mrn", r"\bMRN\s*:?\s*[A-Z0-9]{6,}\b"), ("name", r"\b[a-z]+\s+[a-z]+\b")]
+        engine = PHIScanEngine(patterns)
+
+        types = {m.phi_type for m in engine.scan("Patient MRN 12345678")}
+        assert types == {"mrn", "name"}
+
+    def test_unanchored_patterns_are_scanned(self):
+        engine = PHIScanEngine(
+            [("ssn", r"\b\d{3}-\d{2}-\d{4}\b"), ("email", r"[a-z]+@[a-z]+\.org")],
+        )
+
+        found = {(m.phi_type, m.text) for m in engine.scan("x123-45-9876 and bob@host.org")}
+        assert found == {("email", "bob@host.org")}
+
+    def test_allowlist_drops_synthetic_but_not_masked_values(self):
+        engine = PHIScanEngine(
+            [("ssn", r"\b\d{3}-\d{2}-\d{4}\b|XXX-XX-XXXX")],
+            allowlist_patterns=[r"123-45-6789|XXX-XX-XXXX"],
+        )
+
+        found = [m.text for m in engine.scan("SSN 123-45-6789, 321-54-9876, XXX-XX-XXXX")]
+        assert found == ["321-54-9876", "XXX-XX-XXXX"]
+
+    def test_mask_merges_overlapping_spans(self):
+        engine = PHIScanEngine([("a", r"abcd"), ("b", r"cdef")])
+        text = "xxabcdefyy"
+
+        assert engine.mask(text, engine.scan(text)) == "xx******yy"
+
+    def test_scan_batch(self):
+        engine = PHIScanEngine([("phone", r"\b\d{3}-\d{3}-\d{4}\b")])
+
+        results = engine.scan_batch(["call 415-832-1190", "", "no phi here"])
+        assert [len(matches) for matches in results] == [1, 0, 0]
+
+
+class TestBasicDetectorOnEngine:
+    """BasicPHIDetector behaviour on top of the engine."""
+
+    def test_detect_phi_masks_every_match(self):
+        result = BasicPHIDetector().detect_phi(CLINICAL_NOTE)
+
+        assert result.phi_detected
+        assert {"name", "dob", "mrn", "phone", "email", "address", "insurance_id"} <= set(
+            result.phi_types,
+        )
+        for detail in result.detection_details:
+            assert result.masked_text[detail["start"] : detail["end"]] == "*" * len(detail["text"])
+        # Synthetic values stay readable
+        assert "Jane Doe" in result.masked_text
+        assert "555-555-1234" in result.masked_text
+
+    def test_batch_matches_single_detection(self):
+        detector = PHIDetector(use_presidio=False)
+        fields = {"note": CLINICAL_NOTE, "empty": "", "phone": "415-832-1190"}
+
+        batch = detector.detect_phi_batch(fields)
+        assert list(batch) == list(fields)
+        assert batch["note"] == detector.detect_phi_sync(CLINICAL_NOTE)
+        assert not batch["empty"].phi_detected
+        assert batch["phone"].masked_text == "************"